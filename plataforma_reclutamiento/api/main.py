@@ -12,13 +12,15 @@ O:
     python -m api.main
 """
 
-from fastapi import FastAPI, Request, HTTPException
+from fastapi import Depends, FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, Response, PlainTextResponse
 from contextlib import asynccontextmanager
+import logging
 import os
 import sys
 from pathlib import Path
+from typing import Optional
 import urllib.parse
 
 # Asegurar que el engine esté en el path
@@ -32,8 +34,24 @@ from .routes import (
     config_router,
     auth_router,
     applications_router,
-    cargos_router
+    cargos_router,
+    admin_router
 )
+from .routes.admin import require_superadmin
+from .services import instrumentation, prometheus, tracing, profiler, logging_setup, uploads
+from .services.airtable import close_shared_client
+from .services.report_cache import report_cache
+from .services.blobs import BlobNotFound, cv_store
+from .services.container import services
+from .services.file_serving import serve_blob
+from .services.sessions import SWEEP_INTERVAL, session_store
+from .services.users import last_login_writer
+from .services.passwords import password_hasher
+from .services.warmup import warmup
+
+# Logging JSON con request_id y handler en cola (LOG_FORMAT, LOG_LEVEL, LOG_LEVELS)
+logging_setup.configure_logging()
+logger = logging.getLogger("api")
 
 
 # ============================================================================
@@ -44,26 +62,47 @@ from .routes import (
 async def lifespan(app: FastAPI):
     """Lifecycle manager para la app."""
     # Startup
-    print("🚀 The Wingman API starting...")
+    logger.info("The Wingman API starting...")
     
     # Verificar variables de entorno
     required_env = ["AIRTABLE_API_KEY", "AIRTABLE_BASE_ID"]
     missing = [v for v in required_env if not os.getenv(v)]
     
     if missing:
-        print(f"⚠️  Variables de entorno faltantes: {missing}")
-        print("   Algunas funcionalidades estarán deshabilitadas.")
+        logger.warning("Variables de entorno faltantes: %s. Algunas funcionalidades estarán deshabilitadas.", missing)
     else:
-        print("✅ Conexión a Airtable configurada")
+        logger.info("Conexión a Airtable configurada")
     
-    print("✅ Motor de evaluación cargado")
-    print("📊 API lista en http://localhost:8000")
-    print("📚 Documentación en http://localhost:8000/docs")
+    # Barrido periódico de sesiones vencidas (SESSION_BACKEND)
+    session_store.start_sweeper(SWEEP_INTERVAL)
+    logger.info("Sesiones: backend %s", session_store.name)
+    # Índice en memoria de los CVs locales (servir sin tocar el disco por request)
+    indexed = await cv_store.build_index()
+    logger.info("CVs: backend %s, %d archivos indexados", cv_store.name, indexed)
+    # Servicios compartidos por los routers (Airtable ya; motor y OpenAI en el warm-up)
+    services.start()
+    # Pool de Airtable, tablas de referencia y motor (WARMUP_STEPS) en segundo
+    # plano: /health responde ya, /ready cuando termina
+    warmup.start()
+    
+    logger.info("API iniciada en http://localhost:8000 (docs en /docs); warm-up: %s",
+                ", ".join(warmup.steps) or "deshabilitado")
     
     yield
     
     # Shutdown
-    print("👋 The Wingman API shutting down...")
+    await warmup.shutdown()
+    await uploads.cv_attachments.shutdown()
+    await cv_store.close()
+    await report_cache.shutdown()
+    await session_store.close()
+    await last_login_writer.shutdown()
+    password_hasher.shutdown()
+    services.close()
+    await close_shared_client()
+    tracing.shutdown_tracing()
+    logger.info("The Wingman API shutting down...")
+    logging_setup.shutdown_logging()
 
 
 # ============================================================================
@@ -108,8 +147,25 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "X-Request-ID", "ETag"],
 )
 
+# 413 si el body de un CV excede CV_MAX_BYTES: por Content-Length antes de
+# leerlo, o contando los bytes mientras llegan (subidas sin Content-Length)
+app.add_middleware(uploads.UploadSizeLimitMiddleware)
+
+# Métricas por request: llamadas a Airtable/OpenAI, Server-Timing y /api/metrics
+app.middleware("http")(instrumentation.instrumentation_middleware)
+
+# Profiling opt-in (X-Profile: 1 de superadmin o PROFILE_SAMPLE_RATE). Se
+# registra después para quedar por fuera y medir también la instrumentación
+app.middleware("http")(profiler.profiler_middleware)
+
+# Exportador Prometheus y trazas OpenTelemetry (opcionales): se registran
+# antes del primer request
+prometheus.get_exporter()
+tracing.configure_tracing()
+
 
 # ============================================================================
 # Exception Handlers
@@ -162,6 +218,48 @@ async def health_check():
     }
 
 
+@app.get("/ready", tags=["Health"])
+@app.get("/api/ready", tags=["Health"])
+async def readiness_check():
+    """
+    Readiness: 200 cuando terminó el warm-up, 503 mientras corre.
+    
+    A diferencia de /health (liveness: el proceso responde), el balanceador
+    usa este endpoint para no mandar tráfico a una instancia fría. El body
+    trae el resultado y la duración de cada paso (WARMUP_STEPS) y qué
+    servicios compartidos ya están creados.
+    """
+    snapshot = warmup.snapshot()
+    return JSONResponse(
+        status_code=200 if snapshot["ready"] else 503,
+        content={"status": "ready" if snapshot["ready"] else "warming_up", **snapshot,
+                 "services": services.snapshot()}
+    )
+
+
+@app.get("/api/metrics", tags=["Health"])
+async def get_metrics(user: dict = Depends(require_superadmin)):
+    """
+    Métricas agregadas por endpoint desde el inicio del proceso (solo superadmin).
+    
+    Por endpoint: requests, errores, latencia (avg/p50/p95) y llamadas
+    externas por tabla de Airtable / modelo de OpenAI (llamadas por request,
+    bytes, reintentos por 429, tiempo). Para limpiar el agregado:
+    `POST /api/admin/metrics/reset`.
+    """
+    return {"endpoints": instrumentation.registry.snapshot()}
+
+
+@app.get("/metrics", tags=["Health"], include_in_schema=False)
+async def prometheus_metrics():
+    """Exposición Prometheus (requiere prometheus_client)."""
+    exporter = prometheus.get_exporter()
+    if exporter is None:
+        return PlainTextResponse("prometheus_client no está instalado\n", status_code=503)
+    body, content_type = exporter.render()
+    return Response(content=body, media_type=content_type)
+
+
 # Registrar routers
 app.include_router(candidates_router, prefix="/api")
 app.include_router(processes_router, prefix="/api")
@@ -170,61 +268,29 @@ app.include_router(config_router, prefix="/api")
 app.include_router(auth_router, prefix="/api")
 app.include_router(applications_router, prefix="/api")
 app.include_router(cargos_router, prefix="/api")
+app.include_router(admin_router, prefix="/api")
 
 
 # ============================================================================
 # File Server - Servir CVs
 # ============================================================================
 
-# Directorios de CVs (unificados en data/cvs)
-CVS_DIR = Path(__file__).parent.parent / "data" / "cvs"
-CVS_DIR.mkdir(parents=True, exist_ok=True)
-CVS_UPLOADS_DIR = CVS_DIR  # Mismo directorio para uploads
-
-
-@app.get("/files/{filename}", tags=["Files"])
-async def serve_cv_file(filename: str):
+@app.api_route("/files/{filename}", methods=["GET", "HEAD"], tags=["Files"])
+async def serve_cv_file(filename: str, request: Request, name: Optional[str] = None):
     """
-    Sirve archivos PDF de CVs.
+    Sirve CVs desde el store (BLOB_BACKEND), con Range, ETag y caché.
     
-    Busca en ambos directorios: CVs existentes y uploads nuevos.
+    `filename` es la clave del blob: `<sha256>.pdf` para los CVs nuevos
+    (inmutables: se cachean un año) o el nombre de los archivos anteriores.
+    `name` es el nombre de la descarga.
     El filename debe estar URL-encoded si contiene caracteres especiales.
     """
-    # Decodificar el nombre del archivo
-    decoded_filename = urllib.parse.unquote(filename)
+    key = urllib.parse.unquote(filename)
     
-    # Buscar en ambos directorios
-    file_path = None
-    allowed_dirs = [CVS_DIR, CVS_UPLOADS_DIR]
-    
-    for dir_path in allowed_dirs:
-        potential_path = dir_path / decoded_filename
-        if potential_path.exists():
-            try:
-                resolved = potential_path.resolve()
-                if str(resolved).startswith(str(dir_path.resolve())):
-                    file_path = resolved
-                    break
-            except Exception:
-                continue
-    
-    if not file_path:
-        raise HTTPException(status_code=404, detail=f"Archivo no encontrado: {decoded_filename}")
-    
-    # Detectar tipo MIME
-    ext = decoded_filename.split(".")[-1].lower()
-    media_types = {
-        "pdf": "application/pdf",
-        "doc": "application/msword",
-        "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-    }
-    media_type = media_types.get(ext, "application/octet-stream")
-    
-    return FileResponse(
-        path=str(file_path),
-        filename=decoded_filename,
-        media_type=media_type
-    )
+    try:
+        return await serve_blob(request, cv_store, key, filename=name)
+    except BlobNotFound:
+        raise HTTPException(status_code=404, detail=f"Archivo no encontrado: {key}")
 
 
 # ============================================================================
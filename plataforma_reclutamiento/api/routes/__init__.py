@@ -5,6 +5,7 @@ from .config import router as config_router
 from .auth import router as auth_router
 from .applications import router as applications_router
 from .cargos import router as cargos_router
+from .admin import router as admin_router
 
 __all__ = [
     'candidates_router',
@@ -13,6 +14,7 @@ __all__ = [
     'config_router',
     'auth_router',
     'applications_router',
-    'cargos_router'
+    'cargos_router',
+    'admin_router'
 ]
 
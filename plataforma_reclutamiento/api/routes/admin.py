@@ -0,0 +1,118 @@
+"""
+Rutas de administración (solo superadmin).
+Profiles de requests capturados en producción, reset de métricas y
+export analítico.
+"""
+
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import FileResponse, StreamingResponse
+
+from .auth import require_auth
+from ..services.airtable import AirtableService
+from ..services.container import get_airtable_service
+from ..services.instrumentation import registry
+from ..services.profiler import profiler
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+
+def require_superadmin(user: dict = Depends(require_auth)) -> dict:
+    """Dependency: solo superadmin."""
+    if user["rol"] != "superadmin":
+        raise HTTPException(status_code=403, detail="Solo superadmin")
+    return user
+
+
+@router.get("/profiles")
+async def list_profiles(user: dict = Depends(require_superadmin)):
+    """
+    Lista los profiles guardados (más recientes primero).
+    
+    Para perfilar un request: header `X-Profile: 1` (o `?__profile=1`) con
+    token de superadmin. La respuesta trae `X-Profile-Id`.
+    """
+    return {
+        "sample_rate": profiler.sample_rate,
+        "routes": sorted(profiler.routes),
+        "profiles": [
+            {k: v for k, v in meta.items() if k != "summary"}
+            for meta in profiler.list_profiles()
+        ]
+    }
+
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(profile_id: str, user: dict = Depends(require_superadmin)):
+    """Metadatos y resumen de texto de un profile."""
+    meta = profiler.get(profile_id)
+    if not meta:
+        raise HTTPException(status_code=404, detail="Profile no encontrado")
+    meta.pop("path_on_disk", None)
+    return meta
+
+
+@router.get("/profiles/{profile_id}/download")
+async def download_profile(profile_id: str, user: dict = Depends(require_superadmin)):
+    """Descarga el profile (HTML de pyinstrument o .prof de cProfile para snakeviz)."""
+    meta = profiler.get(profile_id)
+    if not meta:
+        raise HTTPException(status_code=404, detail="Profile no encontrado")
+    media_type = "text/html" if meta["file"].endswith(".html") else "application/octet-stream"
+    return FileResponse(meta["path_on_disk"], filename=meta["file"], media_type=media_type)
+
+
+@router.post("/metrics/reset")
+async def reset_metrics(user: dict = Depends(require_superadmin)):
+    """
+    Limpia el agregado de `GET /api/metrics` de este worker.
+    
+    Retorna el agregado tal como estaba antes de limpiarlo.
+    """
+    snapshot = registry.snapshot()
+    registry.reset()
+    return {"endpoints": snapshot}
+
+
+@router.get("/export/analytics.parquet")
+async def export_analytics_parquet(
+    proceso_id: Optional[str] = Query(None, description="Solo postulaciones de este proceso"),
+    desde: Optional[date] = Query(None, description="Fecha de postulación mínima"),
+    hasta: Optional[date] = Query(None, description="Fecha de postulación máxima"),
+    user: dict = Depends(require_superadmin),
+    airtable: AirtableService = Depends(get_airtable_service)
+):
+    """
+    Postulaciones unidas con sus evaluaciones (scores, hands-on, potencial,
+    perfil, industria, keywords) como Parquet, en streaming.
+    
+    Ej: `pandas.read_parquet("analytics.parquet")` o `duckdb`. Requiere
+    pyarrow; sin él responde 503.
+    """
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise HTTPException(status_code=503, detail="pyarrow no está instalado")
+    from ..services.exports import iter_parquet
+    
+    codigo_proceso = None
+    if proceso_id:
+        proceso = await airtable.get_proceso_by_id(proceso_id, count_postulaciones=False, resolve_names=False)
+        if not proceso:
+            raise HTTPException(status_code=404, detail="Proceso no encontrado")
+        codigo_proceso = proceso.get("codigo_proceso")
+    
+    filename = f"postulaciones_{codigo_proceso or 'todas'}.parquet"
+    return StreamingResponse(
+        iter_parquet(
+            airtable,
+            proceso_id=proceso_id,
+            codigo_proceso=codigo_proceso,
+            desde=desde.isoformat() if desde else None,
+            hasta=hasta.isoformat() if hasta else None
+        ),
+        media_type="application/vnd.apache.parquet",
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
@@ -7,60 +7,17 @@ from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form
 from pydantic import BaseModel, EmailStr
 from typing import Optional, List
 from datetime import datetime
+import logging
 import os
-import shutil
-from pathlib import Path
-import httpx
 
 from ..services.airtable import AirtableService
+from ..services.container import get_airtable_service
+from ..services.blobs import cv_store, file_url
+from ..services.uploads import UploadTooLarge, cv_attachments, save_upload
 
-router = APIRouter(prefix="/applications", tags=["Public Applications"])
-
-# Directorio para guardar CVs (unificado en data/cvs)
-CVS_DIR = Path(__file__).parent.parent.parent / "data" / "cvs"
-CVS_DIR.mkdir(parents=True, exist_ok=True)
-
+logger = logging.getLogger(__name__)
 
-async def upload_to_temp_storage(file_content: bytes, filename: str) -> Optional[str]:
-    """
-    Sube un archivo a un servicio de almacenamiento temporal para obtener URL pública.
-    Airtable descargará el archivo y lo almacenará permanentemente.
-    
-    Usa catbox.moe (gratis, sin límite de tiempo para archivos <200MB)
-    """
-    try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            # Usar catbox.moe - servicio gratuito que mantiene archivos indefinidamente
-            files = {
-                'reqtype': (None, 'fileupload'),
-                'fileToUpload': (filename, file_content, 'application/pdf')
-            }
-            
-            response = await client.post(
-                'https://catbox.moe/user/api.php',
-                files=files
-            )
-            
-            if response.status_code == 200 and response.text.startswith('https://'):
-                return response.text.strip()
-            
-            # Fallback: usar file.io
-            files_fileio = {'file': (filename, file_content, 'application/pdf')}
-            response = await client.post(
-                'https://file.io/?expires=1d',
-                files=files_fileio
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('success'):
-                    return data.get('link')
-            
-            return None
-            
-    except Exception as e:
-        print(f"[WARN] Error subiendo a storage temporal: {e}")
-        return None
+router = APIRouter(prefix="/applications", tags=["Public Applications"])
 
 # ============================================================================
 # Models
@@ -99,10 +56,6 @@ class TrackingResponse(BaseModel):
 # Helpers
 # ============================================================================
 
-def get_airtable_service() -> AirtableService:
-    """Dependency para obtener el servicio de Airtable."""
-    return AirtableService.from_env()
-
 def generate_tracking_code() -> str:
     """Genera un código de tracking único."""
     timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
@@ -164,13 +117,14 @@ async def submit_application(
     Endpoint público, no requiere autenticación.
     
     El CV se:
-    1. Guarda localmente como backup
-    2. Sube a un servicio temporal para obtener URL pública
-    3. Se registra en Airtable como attachment (Airtable lo descarga y guarda)
+    1. Guarda localmente por chunks (máximo CV_MAX_BYTES, 413 si excede)
+    2. Se registra la postulación en Airtable con la URL local
+    3. En segundo plano: se sube a un servicio temporal y se agrega como
+       attachment (Airtable lo descarga y guarda)
     """
     try:
-        # Validar proceso
-        proceso = await airtable.get_proceso_by_id(proceso_id)
+        # Validar proceso (solo estado y cargo: sin resolver nombres ni contar postulaciones)
+        proceso = await airtable.get_proceso_by_id(proceso_id, count_postulaciones=False, resolve_names=False)
         if not proceso:
             raise HTTPException(status_code=404, detail="Proceso no encontrado")
         
@@ -188,21 +142,15 @@ async def submit_application(
         # Generar código tracking
         tracking_code = generate_tracking_code()
         
-        # Leer contenido del archivo
-        cv_content = await cv_file.read()
-        
-        # Guardar archivo localmente como backup
+        # Guardar el CV en el store por chunks (sin cargarlo entero en memoria)
         nombre_limpio = nombre_completo.replace(" ", "_").replace("/", "_")
         filename = f"{tracking_code}_{nombre_limpio}.{file_ext}"
-        file_path = CVS_DIR / filename
-        
-        with open(file_path, "wb") as buffer:
-            buffer.write(cv_content)
+        stored = await save_upload(cv_file, cv_store, ext=f".{file_ext}")
         
-        print(f"[INFO] CV guardado localmente: {file_path}")
+        logger.info("CV guardado: %s (%d bytes) como %s", filename, stored.size, stored.key)
         
-        # URL del CV servido por la API (backup local)
-        cv_url = f"http://localhost:8000/files/{filename}"
+        # URL del CV servido por la API (el nombre queda para la descarga)
+        cv_url = file_url(stored.key, filename)
         
         # Obtener cargo del proceso
         cargo_id = None
@@ -223,22 +171,12 @@ async def submit_application(
             "estado_candidato": "nuevo"
         }
         
-        # =====================================================================
-        # SUBIR CV A AIRTABLE
-        # =====================================================================
-        # Subir a servicio temporal para obtener URL pública
-        public_cv_url = await upload_to_temp_storage(cv_content, filename)
-        
-        if public_cv_url:
-            print(f"[INFO] CV subido a storage temporal: {public_cv_url}")
-            # Agregar attachment para que Airtable descargue y guarde el archivo
-            candidato_data["cv_archivo"] = [{"url": public_cv_url}]
-        else:
-            print(f"[WARN] No se pudo subir CV a storage temporal, usando solo local")
-        
         # Crear candidato en Airtable
         candidato = await airtable.create_candidato(candidato_data)
         
+        # Subir el CV como attachment de Airtable sin demorar la respuesta
+        cv_attachments.submit(airtable, candidato["id"], stored.key, filename)
+        
         return PostulacionResponse(
             id=candidato["id"],
             codigo_tracking=tracking_code,
@@ -247,10 +185,12 @@ async def submit_application(
             mensaje="¡Postulación recibida exitosamente! Guarda tu código de tracking para consultar el estado."
         )
         
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except HTTPException:
         raise
     except Exception as e:
-        print(f"[ERROR] Error en submit_application: {e}")
+        logger.exception("Error en submit_application: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -280,17 +220,13 @@ async def upload_cv_to_airtable(
         if file_ext not in ["pdf", "doc", "docx"]:
             raise HTTPException(status_code=400, detail="Solo se permiten archivos PDF, DOC o DOCX")
         
-        # Leer y guardar archivo
-        cv_content = await cv_file.read()
+        # Guardar el CV en el store por chunks
         nombre_limpio = candidato["nombre_completo"].replace(" ", "_").replace("/", "_")
         filename = f"{tracking_code}_{nombre_limpio}.{file_ext}"
-        file_path = CVS_DIR / filename
-        
-        with open(file_path, "wb") as buffer:
-            buffer.write(cv_content)
+        stored = await save_upload(cv_file, cv_store, ext=f".{file_ext}")
         
         # Actualizar URL local
-        cv_url = f"http://localhost:8000/files/{filename}"
+        cv_url = file_url(stored.key, filename)
         await airtable.update_candidato(candidato["id"], {"cv_url": cv_url})
         
         # Si hay URL pública, intentar subir a Airtable
@@ -299,13 +235,13 @@ async def upload_cv_to_airtable(
         
         if public_url:
             try:
-                attachment_url = f"{public_url}/files/{filename}"
+                attachment_url = file_url(stored.key, filename, base_url=public_url)
                 await airtable.update_candidato(candidato["id"], {
                     "cv_archivo": [{"url": attachment_url}]
                 })
                 attachment_uploaded = True
             except Exception as e:
-                print(f"[WARN] No se pudo subir a Airtable attachment: {e}")
+                logger.warning("No se pudo subir a Airtable attachment: %s", e)
         
         return {
             "success": True,
@@ -315,6 +251,8 @@ async def upload_cv_to_airtable(
             "message": "CV actualizado" + (" y subido a Airtable" if attachment_uploaded else " (solo local)")
         }
         
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except HTTPException:
         raise
     except Exception as e:
@@ -7,18 +7,22 @@ from fastapi import APIRouter, HTTPException, Depends, Response, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel, EmailStr
 from typing import Optional
-from datetime import datetime, timedelta
-import hashlib
-import secrets
-import os
+import asyncio
+import logging
 
 from ..services.airtable import AirtableService
+from ..services.container import get_airtable_service
+from ..services.passwords import password_hasher
+from ..services.sessions import session_store
+from ..services.users import last_login_writer, user_cache
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 security = HTTPBearer(auto_error=False)
 
-# Almacenamiento de sesiones en memoria (en producción usar Redis)
-active_sessions: dict = {}
+# Referencias a las tareas en segundo plano (re-hash de contraseñas)
+_background_tasks: set = set()
 
 # ============================================================================
 # Models
@@ -51,42 +55,26 @@ class UpdateRoleRequest(BaseModel):
 # Helpers
 # ============================================================================
 
-def get_airtable_service() -> AirtableService:
-    """Dependency para obtener el servicio de Airtable."""
-    return AirtableService.from_env()
-
-def hash_password(password: str) -> str:
-    """Hashea una contraseña con salt."""
-    salt = os.getenv("PASSWORD_SALT", "neat-platform-salt")
-    return hashlib.sha256(f"{password}{salt}".encode()).hexdigest()
-
-def verify_password(password: str, hashed: str) -> bool:
-    """Verifica una contraseña contra su hash."""
-    return hash_password(password) == hashed
-
-def generate_token() -> str:
-    """Genera un token de sesión seguro."""
-    return secrets.token_urlsafe(32)
+async def _upgrade_password_hash(airtable: AirtableService, user_id: str, password: str) -> None:
+    """Re-hashea con el esquema actual y guarda el hash (tras un login válido)."""
+    try:
+        new_hash = await password_hasher.hash(password)
+        await airtable.update_usuario_password_hash(user_id, new_hash)
+        logger.info("Hash de contraseña actualizado para %s", user_id)
+    except Exception:
+        logger.exception("Error actualizando el hash de contraseña de %s", user_id)
 
 async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    airtable: AirtableService = Depends(get_airtable_service)
+    credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> Optional[dict]:
-    """Obtiene el usuario actual desde el token."""
+    """Obtiene el usuario actual desde el token (sesiones vencidas → None)."""
     if not credentials:
         return None
     
-    token = credentials.credentials
-    session = active_sessions.get(token)
-    
+    session = await session_store.get(credentials.credentials)
     if not session:
         return None
     
-    # Verificar expiración
-    if datetime.now() > session["expires_at"]:
-        del active_sessions[token]
-        return None
-    
     return session["user"]
 
 async def require_auth(
@@ -119,38 +107,40 @@ async def login(
     Retorna un token de sesión.
     """
     try:
-        # Buscar usuario por email
-        user = await airtable.get_usuario_by_email(data.email)
+        # Buscar usuario por email (cacheado; ver services/users.py)
+        user = await user_cache.get_by_email(airtable, data.email)
         
         if not user:
+            # Mismo costo que una contraseña incorrecta (no revela qué emails existen)
+            await password_hasher.verify(data.password, None)
             raise HTTPException(status_code=401, detail="Credenciales inválidas")
         
-        # Verificar contraseña
-        if not verify_password(data.password, user.get("password_hash", "")):
+        # Verificar contraseña (en el pool de hashing; ver services/passwords.py)
+        valid, needs_update = await password_hasher.verify(data.password, user.get("password_hash"))
+        if not valid:
             raise HTTPException(status_code=401, detail="Credenciales inválidas")
         
         # Verificar que esté activo
         if not user.get("activo", False):
             raise HTTPException(status_code=401, detail="Usuario desactivado")
         
-        # Generar token
-        token = generate_token()
+        # Hash con esquema viejo: se re-hashea (solo usuarios activos) sin demorar la respuesta
+        if needs_update:
+            task = asyncio.create_task(_upgrade_password_hash(airtable, user["id"], data.password))
+            _background_tasks.add(task)
+            task.add_done_callback(_background_tasks.discard)
         
-        # Guardar sesión (expira en 24 horas)
-        expires_at = datetime.now() + timedelta(hours=24)
-        active_sessions[token] = {
-            "user": {
-                "id": user["id"],
-                "email": user["email"],
-                "nombre_completo": user["nombre_completo"],
-                "rol": user["rol"],
-                "activo": user["activo"]
-            },
-            "expires_at": expires_at
-        }
+        # Crear sesión (expira en SESSION_TTL_HOURS)
+        token = await session_store.create({
+            "id": user["id"],
+            "email": user["email"],
+            "nombre_completo": user["nombre_completo"],
+            "rol": user["rol"],
+            "activo": user["activo"]
+        })
         
-        # Actualizar last_login en Airtable
-        await airtable.update_usuario_last_login(user["id"])
+        # last_login se escribe en lote, en segundo plano
+        await last_login_writer.record(airtable, user["id"])
         
         return LoginResponse(
             token=token,
@@ -173,8 +163,8 @@ async def logout(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ):
     """Cierra la sesión actual."""
-    if credentials and credentials.credentials in active_sessions:
-        del active_sessions[credentials.credentials]
+    if credentials:
+        await session_store.delete(credentials.credentials)
     
     return {"message": "Sesión cerrada"}
 
@@ -204,7 +194,7 @@ async def register(
         user = await airtable.create_usuario({
             "email": data.email,
             "nombre_completo": data.nombre_completo,
-            "password_hash": hash_password(data.password),
+            "password_hash": await password_hasher.hash(data.password),
             "rol": "usuario",
             "activo": True
         })
@@ -258,7 +248,7 @@ async def create_user(
     new_user = await airtable.create_usuario({
         "email": data.email,
         "nombre_completo": data.nombre_completo,
-        "password_hash": hash_password(data.password),
+        "password_hash": await password_hasher.hash(data.password),
         "rol": "usuario",
         "activo": True
     })
@@ -17,15 +17,11 @@ from ..models import (
     DashboardStats
 )
 from ..services.airtable import AirtableService
+from ..services.container import get_airtable_service
 
 router = APIRouter(prefix="/candidates", tags=["Candidates"])
 
 
-def get_airtable_service() -> AirtableService:
-    """Dependency para obtener el servicio de Airtable."""
-    return AirtableService.from_env()
-
-
 def generate_tracking_code() -> str:
     """Genera un código de tracking único."""
     timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
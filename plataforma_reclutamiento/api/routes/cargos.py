@@ -7,15 +7,11 @@ from typing import List, Optional
 
 from ..models import CargoResponse, CargoCreate, CargoUpdate
 from ..services.airtable import AirtableService
+from ..services.container import get_airtable_service
 
 router = APIRouter(prefix="/cargos", tags=["Cargos"])
 
 
-def get_airtable_service() -> AirtableService:
-    """Dependency para obtener el servicio de Airtable."""
-    return AirtableService.from_env()
-
-
 @router.get("/", response_model=List[CargoResponse])
 async def list_cargos(
     solo_activos: bool = Query(False, description="Solo cargos activos"),
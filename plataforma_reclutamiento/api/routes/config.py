@@ -13,16 +13,11 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from ..models import EvaluationConfigResponse
 from ..services.airtable import AirtableService
-from engine import EvaluationConfig
+from ..services.container import get_airtable_service
 
 router = APIRouter(prefix="/config", tags=["Configuration"])
 
 
-def get_airtable_service() -> AirtableService:
-    """Dependency para obtener el servicio de Airtable."""
-    return AirtableService.from_env()
-
-
 # ============================================================================
 # Configuration Endpoints
 # ============================================================================
@@ -32,6 +27,7 @@ async def get_active_config(
     airtable: AirtableService = Depends(get_airtable_service)
 ):
     """Obtiene la configuración de evaluación activa."""
+    from engine import EvaluationConfig
     try:
         config = await airtable.get_active_config()
         
@@ -56,6 +52,7 @@ async def get_active_config(
 @router.get("/default")
 async def get_default_config():
     """Obtiene la configuración por defecto del motor."""
+    from engine import EvaluationConfig
     try:
         default_config = EvaluationConfig.default_config()
         return default_config.model_dump()
@@ -69,6 +66,7 @@ async def create_config(
     airtable: AirtableService = Depends(get_airtable_service)
 ):
     """Crea una nueva configuración de evaluación."""
+    from engine import EvaluationConfig
     try:
         # Validar que la configuración sea válida
         try:
@@ -91,6 +89,7 @@ async def create_config(
 @router.get("/keywords")
 async def get_keywords():
     """Obtiene las keywords de la configuración por defecto."""
+    from engine import EvaluationConfig
     try:
         config = EvaluationConfig.default_config()
         
@@ -3,33 +3,30 @@ Rutas de la API para evaluación de candidatos.
 """
 
 from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 import sys
+import logging
 import os
 
+import httpx
+
 # Agregar el path del engine
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from ..models import EvaluateRequest, EvaluationResponse, CategoryResultSchema, InferenceResultSchema
 from ..services.airtable import AirtableService
-from engine import CandidateEvaluator, PDFExtractor, CVProcessor, EvaluationConfig
-
-router = APIRouter(prefix="/evaluations", tags=["Evaluations"])
-
+from ..services.container import get_airtable_service, get_evaluator, get_pdf_extractor, services
+from ..services.blobs import CHUNK_SIZE, BlobNotFound, cv_store, key_from_url
+from engine import telemetry
+from engine.pdf_source import PDFSource, spool
 
-def get_airtable_service() -> AirtableService:
-    """Dependency para obtener el servicio de Airtable."""
-    return AirtableService.from_env()
+if TYPE_CHECKING:
+    # El evaluador y los extractores se importan en el primer request
+    from engine import CandidateEvaluator, PDFExtractor
 
+logger = logging.getLogger(__name__)
 
-def get_evaluator() -> CandidateEvaluator:
-    """Dependency para obtener el evaluador."""
-    return CandidateEvaluator()
-
-
-def get_pdf_extractor() -> PDFExtractor:
-    """Dependency para obtener el extractor de PDFs."""
-    return PDFExtractor()
+router = APIRouter(prefix="/evaluations", tags=["Evaluations"])
 
 
 # ============================================================================
@@ -59,15 +56,11 @@ async def analyze_interview_feedback(comentarios: list) -> dict:
         return {}
     
     try:
-        from openai import OpenAI
-        
-        api_key = os.getenv("OPENAI_API") or os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            print("[WARN] No hay API key de OpenAI para análisis de comentarios")
+        client = services.openai()
+        if client is None:
+            logger.warning("No hay API key de OpenAI para análisis de comentarios")
             return {}
         
-        client = OpenAI(api_key=api_key)
-        
         prompt = """Analiza los siguientes comentarios de entrevista de un candidato y extrae ajustes de evaluación.
 
 COMENTARIOS DE EVALUADORES:
@@ -97,7 +90,9 @@ Responde SOLO con JSON válido, sin explicaciones:
 
 IMPORTANTE: Si el evaluador indica que quiere descartar o sacar del proceso al candidato, el score_promedio debe ser 40% o menos."""
 
-        response = client.chat.completions.create(
+        response = telemetry.chat_completion(
+            client,
+            site="analyze_interview_feedback",
             model="gpt-4o-mini",
             messages=[
                 {"role": "user", "content": prompt.format(feedback=feedback_text)}
@@ -107,7 +102,7 @@ IMPORTANTE: Si el evaluador indica que quiere descartar o sacar del proceso al c
         )
         
         response_text = response.choices[0].message.content.strip()
-        print(f"[DEBUG] Respuesta OpenAI: {response_text[:200]}...")
+        logger.debug("Respuesta OpenAI (%d chars): %.200s", len(response_text), response_text)
         
         # Limpiar respuesta de markdown
         import re as regex_module
@@ -117,7 +112,7 @@ IMPORTANTE: Si el evaluador indica que quiere descartar o sacar del proceso al c
         
         import json
         adjustments = json.loads(response_text)
-        print(f"[DEBUG] Ajustes parseados: {adjustments}")
+        logger.debug("Ajustes parseados: %s", adjustments)
         
         # Filtrar valores null
         result = {}
@@ -126,21 +121,92 @@ IMPORTANTE: Si el evaluador indica que quiere descartar o sacar del proceso al c
                 result[key] = adjustments[key]
         
         if result:
-            print(f"[INFO] ✅ Ajustes IA de comentarios: {result}")
+            logger.info("Ajustes IA de comentarios: %s", result)
             if adjustments.get('reasoning'):
-                print(f"[INFO] Razón: {adjustments['reasoning']}")
+                logger.info("Razón: %s", adjustments["reasoning"])
         else:
-            print(f"[WARN] No se detectaron ajustes en la respuesta")
+            logger.warning("No se detectaron ajustes en la respuesta")
         
         return result
         
     except Exception as e:
-        import traceback
-        print(f"[ERROR] Error analizando comentarios con IA: {e}")
-        traceback.print_exc()
+        logger.exception("Error analizando comentarios con IA: %s", e)
         return {}
 
 
+async def _fetch_cv(url: str, source: str):
+    """
+    Descarga un CV a memoria (span "download" con bytes y origen).
+    
+    El body se escribe por chunks en un SpooledTemporaryFile: queda en
+    memoria hasta PDF_SPOOL_MAX_BYTES y solo pasa a disco si lo supera.
+    
+    Args:
+        url: URL del PDF
+        source: Origen para la telemetría ("attachment", "cv_url")
+        
+    Returns:
+        Buffer con el PDF, posicionado al inicio
+    """
+    buffer = spool()
+    with telemetry.span("download", "cv", source=source) as span:
+        try:
+            async with httpx.AsyncClient(timeout=60.0, follow_redirects=True) as client:
+                async with client.stream("GET", url) as response:
+                    span.set(status=response.status_code)
+                    response.raise_for_status()
+                    async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                        buffer.write(chunk)
+        except BaseException:
+            buffer.close()
+            raise
+        span.set(bytes_in=buffer.tell())
+    buffer.seek(0)
+    return buffer
+
+
+async def _load_cv(candidato: dict) -> Optional[PDFSource]:
+    """
+    PDF del candidato para los extractores, sin temporales.
+    
+    Orden: el CV ya guardado en el store (cv_url de la API, `/files/<clave>`,
+    sin red; se lee directo de su archivo), el attachment de Airtable y por
+    último un cv_url remoto. Las descargas quedan en memoria (ver
+    `_fetch_cv`); el llamador cierra el buffer con `_close_cv`.
+    
+    Returns:
+        Path del PDF o buffer con el contenido, o None si no se encontró
+    """
+    cv_url = candidato.get("cv_url") or ""
+    cv_attachment = candidato.get("cv_archivo") or candidato.get("cv_attachment")
+    
+    key = key_from_url(cv_url) if cv_url else None
+    if key:
+        try:
+            return await cv_store.local_path(key)
+        except BlobNotFound:
+            logger.info("CV %s no está en el store", key)
+    
+    remote = []
+    if cv_attachment and isinstance(cv_attachment, list) and cv_attachment[0].get("url"):
+        remote.append((cv_attachment[0]["url"], "attachment"))
+    if cv_url.startswith("http") and not key:
+        remote.append((cv_url, "cv_url"))
+    
+    for url, source in remote:
+        try:
+            return await _fetch_cv(url, source)
+        except httpx.HTTPError as e:
+            logger.warning("No se pudo descargar el CV (%s): %s", source, e)
+    return None
+
+
+def _close_cv(cv_source: Optional[PDFSource]) -> None:
+    """Libera el buffer de una descarga (los paths del store no se tocan)."""
+    if hasattr(cv_source, "close"):
+        cv_source.close()
+
+
 # ============================================================================
 # Evaluation Endpoints
 # ============================================================================
@@ -149,8 +215,8 @@ IMPORTANTE: Si el evaluador indica que quiere descartar o sacar del proceso al c
 async def evaluate_candidate(
     request: EvaluateRequest,
     airtable: AirtableService = Depends(get_airtable_service),
-    evaluator: CandidateEvaluator = Depends(get_evaluator),
-    pdf_extractor: PDFExtractor = Depends(get_pdf_extractor)
+    evaluator: "CandidateEvaluator" = Depends(get_evaluator),
+    pdf_extractor: "PDFExtractor" = Depends(get_pdf_extractor)
 ):
     """
     Evalúa un candidato usando el motor de IA.
@@ -192,21 +258,15 @@ async def evaluate_candidate(
             # Extraer texto del PDF
             cv_url = candidato["cv_url"]
             
-            # Si es una URL remota, necesitamos descargar primero
+            # Si es una URL (de la API o remota), el PDF se obtiene del store
             if cv_url.startswith("http"):
-                import httpx
-                import tempfile
-                
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(cv_url)
-                    response.raise_for_status()
-                    
-                    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
-                        tmp.write(response.content)
-                        tmp_path = tmp.name
-                
-                cv_text = pdf_extractor.extract_with_fallback(tmp_path)
-                os.unlink(tmp_path)  # Limpiar archivo temporal
+                cv_source = await _load_cv(candidato)
+                if cv_source is None:
+                    raise HTTPException(status_code=400, detail=f"No se encontró el CV. CV URL: {cv_url}")
+                try:
+                    cv_text = pdf_extractor.extract_with_fallback(cv_source)
+                finally:
+                    _close_cv(cv_source)
             else:
                 # Es un path local
                 cv_text = pdf_extractor.extract_with_fallback(cv_url)
@@ -217,66 +277,21 @@ async def evaluate_candidate(
                 detail="No se pudo extraer texto del CV"
             )
         
-        # Ejecutar evaluación
-        result = evaluator.evaluate(cv_text)
-        
-        # Preparar datos para Airtable
-        evaluation_data = {
-            "score_promedio": result.score_promedio,
-            "config_version": result.config_version,
-            "fits": {
-                k: {
-                    "score": v.score,
-                    "found": v.found,
-                    "missing": v.missing,
-                    "reasoning": v.reasoning,
-                    "questions": v.questions
-                }
-                for k, v in result.fits.items()
-            },
-            "inference": {
-                "profile_type": result.inference.profile_type.value,
-                "hands_on_index": result.inference.hands_on_index,
-                "risk_warning": result.inference.risk_warning,
-                "retention_risk": result.inference.retention_risk.value,
-                "scope_intensity": result.inference.scope_intensity,
-                "potential_score": result.inference.potential_score,
-                "industry_tier": result.inference.industry_tier.value
-            }
-        }
+        # Ejecutar evaluación (resultado compacto, se convierte una sola vez)
+        record = evaluator.evaluate_record(cv_text)
+        evaluation_data = record.to_dict()
         
         # Guardar en Airtable
         saved = await airtable.create_evaluacion(request.candidato_id, evaluation_data)
         
-        # Formatear respuesta
-        fits_response = {
-            k: CategoryResultSchema(
-                score=v.score,
-                found=v.found,
-                missing=v.missing,
-                reasoning=v.reasoning,
-                questions=v.questions
-            )
-            for k, v in result.fits.items()
-        }
-        
-        inference_response = InferenceResultSchema(
-            profile_type=result.inference.profile_type.value,
-            hands_on_index=result.inference.hands_on_index,
-            risk_warning=result.inference.risk_warning,
-            retention_risk=result.inference.retention_risk.value,
-            scope_intensity=result.inference.scope_intensity,
-            potential_score=result.inference.potential_score,
-            industry_tier=result.inference.industry_tier.value
-        )
-        
+        # Formatear respuesta (los dicts se validan directo contra los schemas)
         return EvaluationResponse(
             id=saved.get("id"),
             candidato_id=request.candidato_id,
-            score_promedio=result.score_promedio,
-            fits=fits_response,
-            inference=inference_response,
-            config_version=result.config_version,
+            score_promedio=evaluation_data["score_promedio"],
+            fits=evaluation_data["fits"],
+            inference=evaluation_data["inference"],
+            config_version=evaluation_data["config_version"],
             cached=False
         )
         
@@ -350,7 +365,7 @@ async def evaluate_by_tracking_code(
     candidate_id_or_tracking: str,
     force_reprocess: bool = False,
     airtable: AirtableService = Depends(get_airtable_service),
-    evaluator: CandidateEvaluator = Depends(get_evaluator)
+    evaluator: "CandidateEvaluator" = Depends(get_evaluator)
 ):
     """
     Evalúa un candidato usando OpenAI.
@@ -368,11 +383,6 @@ async def evaluate_by_tracking_code(
         candidate_id_or_tracking: Record ID o código de tracking del candidato
         force_reprocess: Si True, reprocesa el CV aunque ya exista evaluación
     """
-    from pathlib import Path
-    import tempfile
-    import httpx
-    import urllib.parse
-    
     try:
         # Detectar si es record ID o tracking code
         if candidate_id_or_tracking.startswith("rec"):
@@ -389,6 +399,7 @@ async def evaluate_by_tracking_code(
         
         candidato_id = candidato["id"]
         estado_candidato = candidato.get("estado_candidato", "nuevo")
+        telemetry.annotate(tracking_code=codigo_tracking, force_reprocess=force_reprocess)
         
         # =====================================================================
         # VALIDACIONES Y LÓGICA INTELIGENTE DE RE-EVALUACIÓN
@@ -446,12 +457,12 @@ async def evaluate_by_tracking_code(
         
         if not tiene_cache_cv:
             # ⚡ SIN CACHE DE CV → Siempre procesar para llenar el cache
-            print(f"[INFO] {codigo_tracking}: 📄 Sin cache de CV, procesando para llenar cache...")
+            logger.info("%s: sin cache de CV, procesando para llenar cache", codigo_tracking)
             # NO retornar, continuar con el procesamiento
         elif force_reprocess and existing and existing.get("id"):
             # ✓ Con cache de CV → Aplicar lógica de comentarios nuevos
             if not comentarios_check or len(comentarios_check) == 0:
-                print(f"[INFO] {codigo_tracking}: Sin comentarios, retornando evaluación existente")
+                logger.info("%s: sin comentarios, retornando evaluación existente", codigo_tracking)
                 return {
                     "id": existing["id"],
                     "candidato_codigo": codigo_tracking,
@@ -478,7 +489,7 @@ async def evaluate_by_tracking_code(
             ]
             
             if not comentarios_humanos:
-                print(f"[INFO] {codigo_tracking}: Solo comentarios del sistema, saltando")
+                logger.info("%s: solo comentarios del sistema, saltando", codigo_tracking)
                 return {
                     "id": existing["id"],
                     "candidato_codigo": codigo_tracking,
@@ -502,10 +513,10 @@ async def evaluate_by_tracking_code(
                 if c_time and (not comentario_mas_reciente or c_time > comentario_mas_reciente):
                     comentario_mas_reciente = c_time
             
-            print(f"[DEBUG] {codigo_tracking}: eval_time={eval_time}, comentario_mas_reciente={comentario_mas_reciente}")
+            logger.debug("%s: eval_time=%s, comentario_mas_reciente=%s", codigo_tracking, eval_time, comentario_mas_reciente)
             
             if eval_time and comentario_mas_reciente and eval_time > comentario_mas_reciente:
-                print(f"[INFO] {codigo_tracking}: Evaluación más reciente que comentarios, saltando")
+                logger.info("%s: evaluación más reciente que comentarios, saltando", codigo_tracking)
                 return {
                     "id": existing["id"],
                     "candidato_codigo": codigo_tracking,
@@ -523,7 +534,7 @@ async def evaluate_by_tracking_code(
                     "skip_reason": "ya_actualizado"
                 }
             
-            print(f"[INFO] {codigo_tracking}: Hay comentarios nuevos, re-evaluando...")
+            logger.info("%s: hay comentarios nuevos, re-evaluando", codigo_tracking)
         
         # =====================================================================
         # CACHE DE CV: Verificar si ya tenemos el texto extraído
@@ -534,53 +545,19 @@ async def evaluate_by_tracking_code(
         
         if cv_text and len(cv_text) > 100:
             # ✅ CACHE HIT: Usar texto ya extraído
-            print(f"[INFO] ⚡ {codigo_tracking}: Usando cache de CV ({len(cv_text)} chars)")
+            logger.info("%s: usando cache de CV (%d chars)", codigo_tracking, len(cv_text))
             used_cache = True
+            telemetry.annotate(cv_cache_hit=True)
         else:
             # ❌ CACHE MISS: Necesitamos procesar el PDF
-            print(f"[INFO] {codigo_tracking}: Cache vacío, procesando PDF...")
+            logger.info("%s: cache vacío, procesando PDF", codigo_tracking)
+            telemetry.annotate(cv_cache_hit=False)
             
-            # Obtener path al PDF
+            # Obtener el PDF (store de CVs, o attachment/cv_url descargado a memoria)
             cv_url = candidato.get("cv_url")
-            cv_attachment = candidato.get("cv_archivo") or candidato.get("cv_attachment")
-            pdf_path = None
-            temp_file = None
-            
-            # Intentar primero con attachment de Airtable
-            if cv_attachment and isinstance(cv_attachment, list) and len(cv_attachment) > 0:
-                attachment_url = cv_attachment[0].get("url")
-                if attachment_url:
-                    async with httpx.AsyncClient(timeout=60.0) as client:
-                        response = await client.get(attachment_url)
-                        response.raise_for_status()
-                        
-                        temp_file = tempfile.NamedTemporaryFile(suffix=".pdf", delete=False)
-                        temp_file.write(response.content)
-                        temp_file.close()
-                        pdf_path = temp_file.name
+            cv_source = await _load_cv(candidato)
             
-            # Si no hay attachment, buscar archivo local
-            if not pdf_path and cv_url:
-                if "localhost:8000/files/" in cv_url or "/files/" in cv_url:
-                    filename = cv_url.split("/files/")[-1]
-                    filename = urllib.parse.unquote(filename)
-                    
-                    cvs_dir = Path(__file__).parent.parent.parent / "data" / "cvs"
-                    local_path = cvs_dir / filename
-                    
-                    if local_path.exists():
-                        pdf_path = str(local_path)
-                elif cv_url.startswith("http"):
-                    async with httpx.AsyncClient(timeout=60.0) as client:
-                        response = await client.get(cv_url)
-                        response.raise_for_status()
-                        
-                        temp_file = tempfile.NamedTemporaryFile(suffix=".pdf", delete=False)
-                        temp_file.write(response.content)
-                        temp_file.close()
-                        pdf_path = temp_file.name
-            
-            if not pdf_path:
+            if cv_source is None:
                 raise HTTPException(
                     status_code=400,
                     detail=f"No se encontró el CV para {codigo_tracking}. CV URL: {cv_url}"
@@ -591,13 +568,14 @@ async def evaluate_by_tracking_code(
             # =====================================================================
             
             try:
-                print(f"[INFO] Procesando CV con OpenAI: {codigo_tracking}")
+                logger.info("%s: procesando CV con OpenAI", codigo_tracking)
                 
-                # Crear procesador de CV
-                cv_processor = CVProcessor()
+                # Procesador de CV (con el cliente de OpenAI compartido)
+                cv_processor = services.cv_processor()
                 
                 # Extraer información estructurada del CV
-                cv_data = cv_processor.process_pdf(pdf_path)
+                with telemetry.span("pipeline", "process_cv"):
+                    cv_data = cv_processor.process_pdf(cv_source)
                 
                 # Obtener texto completo para evaluación
                 cv_text = cv_data.texto_completo
@@ -614,14 +592,12 @@ async def evaluate_by_tracking_code(
                     "resumen_perfil": cv_data.resumen_perfil,
                 })
                 
-                print(f"[INFO] ✅ CV procesado y cacheado: {len(cv_text)} caracteres")
+                logger.info("%s: CV procesado y cacheado (%d chars)", codigo_tracking, len(cv_text))
                 
             except Exception as e:
-                print(f"[WARN] Error procesando CV con OpenAI: {e}")
+                logger.warning("%s: error procesando CV con OpenAI: %s", codigo_tracking, e)
                 # Fallback a extractor tradicional
-                from engine import PDFExtractor
-                pdf_extractor = PDFExtractor()
-                cv_text = pdf_extractor.extract_with_fallback(pdf_path)
+                cv_text = services.pdf_extractor().extract_with_fallback(cv_source)
                 cv_data = None
                 
                 # Guardar también el texto del fallback como cache
@@ -632,15 +608,9 @@ async def evaluate_by_tracking_code(
                         })
                     except:
                         pass
-            
             finally:
-                # Limpiar archivo temporal si existe
-                if temp_file:
-                    try:
-                        os.unlink(temp_file.name)
-                    except:
-                        pass
-        
+                _close_cv(cv_source)
+
         if not cv_text or not cv_text.strip():
             raise HTTPException(
                 status_code=400,
@@ -669,14 +639,15 @@ async def evaluate_by_tracking_code(
                 nota_texto = c.get('comentario', '')
                 notas_contexto += f"- {c.get('autor', 'Usuario')}: {nota_texto}\n"
             
-            print(f"[INFO] Incluyendo {len(comentarios)} notas HUMANAS en la evaluación (excluidas {len(comentarios_raw) - len(comentarios)} del sistema)")
+            logger.info("Incluyendo %d notas humanas en la evaluación (excluidas %d del sistema)", len(comentarios), len(comentarios_raw) - len(comentarios))
             
             # =====================================================================
             # PASO 1: ANÁLISIS INTELIGENTE CON IA (comentarios de texto libre)
             # =====================================================================
-            ajustes_ia = await analyze_interview_feedback(comentarios)
+            with telemetry.span("pipeline", "analyze_feedback", comments=len(comentarios)):
+                ajustes_ia = await analyze_interview_feedback(comentarios)
             if ajustes_ia:
-                print(f"[INFO] Ajustes IA detectados: {ajustes_ia}")
+                logger.info("Ajustes IA detectados: %s", ajustes_ia)
             
             # =====================================================================
             # PASO 2: PARSEAR AJUSTES MANUALES EXPLÍCITOS (tienen prioridad)
@@ -733,7 +704,7 @@ async def evaluate_by_tracking_code(
                     ajustes_manuales['score_biz'] = int(match.group(1))
             
             if ajustes_manuales:
-                print(f"[INFO] Ajustes manuales explícitos: {ajustes_manuales}")
+                logger.info("Ajustes manuales explícitos: %s", ajustes_manuales)
             
             # =====================================================================
             # PASO 3: COMBINAR AJUSTES (manuales tienen prioridad sobre IA)
@@ -743,7 +714,7 @@ async def evaluate_by_tracking_code(
             ajustes_manuales = ajustes_finales
             
             if ajustes_manuales:
-                print(f"[INFO] Ajustes finales aplicados: {ajustes_manuales}")
+                logger.info("Ajustes finales aplicados: %s", ajustes_manuales)
         
         # Combinar CV con notas para evaluación completa
         texto_completo = cv_text
@@ -754,9 +725,9 @@ async def evaluate_by_tracking_code(
         # EJECUTAR EVALUACIÓN
         # =====================================================================
         
-        result = evaluator.evaluate(texto_completo)
-        print(f"[DEBUG] Score base del motor: {result.score_promedio}")
-        print(f"[DEBUG] Ajustes a aplicar: {ajustes_manuales}")
+        result = evaluator.evaluate_record(texto_completo)
+        logger.debug("Score base del motor: %s", result.score_promedio)
+        logger.debug("Ajustes a aplicar: %s", ajustes_manuales)
         
         # Preparar datos para Airtable (aplicando ajustes manuales si existen)
         # Si hay ajuste de score_promedio, también ajustar proporcionalmente admin/ops/biz
@@ -766,14 +737,14 @@ async def evaluate_by_tracking_code(
         # Si el score fue ajustado, calcular factor de ajuste para las subcategorías
         if 'score_promedio' in ajustes_manuales and base_score > 0:
             adjustment_factor = adjusted_score / base_score
-            print(f"[DEBUG] Factor de ajuste: {adjustment_factor:.2f}")
+            logger.debug("Factor de ajuste: %.2f", adjustment_factor)
         else:
             adjustment_factor = 1.0
         
         # Obtener scores base
-        admin_base = result.fits.get("admin", type("obj", (), {"score": 0})).score if "admin" in result.fits else 0
-        ops_base = result.fits.get("ops", type("obj", (), {"score": 0})).score if "ops" in result.fits else 0
-        biz_base = result.fits.get("biz", type("obj", (), {"score": 0})).score if "biz" in result.fits else 0
+        admin_base = result.fits["admin"].score if "admin" in result.fits else 0
+        ops_base = result.fits["ops"].score if "ops" in result.fits else 0
+        biz_base = result.fits["biz"].score if "biz" in result.fits else 0
         
         evaluation_data = {
             "score_promedio": adjusted_score,
@@ -788,12 +759,15 @@ async def evaluate_by_tracking_code(
             "config_version": result.config_version
         }
         
-        print(f"[INFO] ✅ Evaluación final: score={evaluation_data['score_promedio']}, "
-              f"admin={evaluation_data['score_admin']}, ops={evaluation_data['score_ops']}, "
-              f"biz={evaluation_data['score_biz']}, hands_on={evaluation_data['hands_on_index']}")
+        logger.info(
+            "Evaluación final: score=%s admin=%s ops=%s biz=%s hands_on=%s",
+            evaluation_data['score_promedio'], evaluation_data['score_admin'],
+            evaluation_data['score_ops'], evaluation_data['score_biz'], evaluation_data['hands_on_index']
+        )
         
         # Guardar evaluación en Airtable
-        saved = await airtable.create_evaluacion(candidato_id, evaluation_data, codigo_tracking)
+        with telemetry.span("pipeline", "save_evaluation"):
+            saved = await airtable.create_evaluacion(candidato_id, evaluation_data, codigo_tracking)
         
         # =====================================================================
         # CREAR COMENTARIO AUTOMÁTICO CON AJUSTES APLICADOS
@@ -831,9 +805,9 @@ SCORES APLICADOS:
                         autor="Sistema (Re-evaluación IA)",
                         comentario=comentario_auto
                     )
-                    print(f"[INFO] ✅ Comentario automático creado con ajustes")
+                    logger.info("Comentario automático creado con ajustes")
                 except Exception as e:
-                    print(f"[WARN] No se pudo crear comentario automático: {e}")
+                    logger.warning("No se pudo crear comentario automático: %s", e)
         
         # Calcular potencial basado en el score (con ajuste manual aplicado)
         potential = evaluation_data["potential_score"]
@@ -860,44 +834,26 @@ SCORES APLICADOS:
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error al evaluar %s", candidate_id_or_tracking)
         raise HTTPException(status_code=500, detail=f"Error al evaluar: {str(e)}")
 
 
 @router.post("/evaluate-text")
 async def evaluate_text_only(
     cv_text: str,
-    evaluator: CandidateEvaluator = Depends(get_evaluator)
+    evaluator: "CandidateEvaluator" = Depends(get_evaluator)
 ):
     """
     Evalúa un texto de CV sin guardarlo.
     Útil para testing y demos.
     """
     try:
-        result = evaluator.evaluate(cv_text)
+        data = evaluator.evaluate_record(cv_text).to_dict()
         
         return {
-            "score_promedio": result.score_promedio,
-            "fits": {
-                k: {
-                    "score": v.score,
-                    "found": v.found,
-                    "missing": v.missing,
-                    "reasoning": v.reasoning,
-                    "questions": v.questions
-                }
-                for k, v in result.fits.items()
-            },
-            "inference": {
-                "profile_type": result.inference.profile_type.value,
-                "hands_on_index": result.inference.hands_on_index,
-                "risk_warning": result.inference.risk_warning,
-                "retention_risk": result.inference.retention_risk.value,
-                "scope_intensity": result.inference.scope_intensity,
-                "potential_score": result.inference.potential_score,
-                "industry_tier": result.inference.industry_tier.value
-            }
+            "score_promedio": data["score_promedio"],
+            "fits": data["fits"],
+            "inference": data["inference"]
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
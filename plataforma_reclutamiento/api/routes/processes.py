@@ -3,37 +3,18 @@ Rutas de la API para gestión de procesos de reclutamiento.
 """
 
 from fastapi import APIRouter, HTTPException, Depends, Query, Header
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 from typing import List, Optional
-import csv
-import io
+import logging
 
 from ..models import ProcesoResponse, ProcesoCreate, ProcesoUpdate
 from ..services.airtable import AirtableService
+from ..services.container import get_airtable_service
+from .auth import require_auth
 
-router = APIRouter(prefix="/processes", tags=["Processes"])
-
-
-def get_airtable_service() -> AirtableService:
-    """Dependency para obtener el servicio de Airtable."""
-    return AirtableService.from_env()
+logger = logging.getLogger(__name__)
 
-
-async def get_current_user_id(
-    authorization: str = Header(None),
-    airtable: AirtableService = Depends(get_airtable_service)
-) -> Optional[str]:
-    """Extrae el usuario actual del token."""
-    if not authorization:
-        return None
-    try:
-        token = authorization.replace("Bearer ", "")
-        import jwt
-        import os
-        payload = jwt.decode(token, os.getenv("JWT_SECRET", "your-secret-key"), algorithms=["HS256"])
-        return payload.get("user_id")
-    except:
-        return None
+router = APIRouter(prefix="/processes", tags=["Processes"])
 
 
 # ============================================================================
@@ -55,16 +36,12 @@ async def list_processes(
 
 @router.get("/mine", response_model=List[ProcesoResponse])
 async def list_my_processes(
-    authorization: str = Header(None),
+    user: dict = Depends(require_auth),
     airtable: AirtableService = Depends(get_airtable_service)
 ):
     """Lista los procesos asignados al usuario actual."""
     try:
-        user_id = await get_current_user_id(authorization, airtable)
-        if not user_id:
-            raise HTTPException(status_code=401, detail="No autenticado")
-        
-        procesos = await airtable.get_procesos(usuario_id=user_id)
+        procesos = await airtable.get_procesos(usuario_id=user["id"])
         return [ProcesoResponse(**p) for p in procesos]
     except HTTPException:
         raise
@@ -160,56 +137,65 @@ async def delete_process(
 @router.get("/{proceso_id}/export")
 async def export_process_csv(
     proceso_id: str,
+    columns: Optional[str] = Query(None, description="Columnas separadas por coma (ver services/exports.py)"),
+    estado: Optional[str] = Query(None, description="Filtrar por estado_candidato"),
     airtable: AirtableService = Depends(get_airtable_service)
 ):
-    """Exporta los candidatos de un proceso a CSV."""
+    """
+    Exporta los candidatos de un proceso a CSV, en streaming.
+    
+    Las filas se escriben a medida que llegan las páginas de Airtable (el
+    filtro por proceso y estado se aplica en Airtable) y las columnas de
+    evaluación se unen en lote por página.
+    """
+    from ..services.exports import iter_csv, parse_columns
+    
     try:
-        proceso = await airtable.get_proceso_by_id(proceso_id)
+        selected = parse_columns(columns)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        proceso = await airtable.get_proceso_by_id(proceso_id, count_postulaciones=False, resolve_names=False)
         if not proceso:
             raise HTTPException(status_code=404, detail="Proceso no encontrado")
-        
-        candidatos = await airtable.get_candidatos(proceso_id=proceso_id)
-        
-        # Crear CSV en memoria
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Header
-        writer.writerow([
-            "Código Tracking", "Nombre", "Email", "Teléfono",
-            "Fecha Postulación", "Estado", "CV URL"
-        ])
-        
-        # Data
-        for c in candidatos:
-            writer.writerow([
-                c.get("codigo_tracking", ""),
-                c.get("nombre_completo", ""),
-                c.get("email", ""),
-                c.get("telefono", ""),
-                c.get("fecha_postulacion", ""),
-                c.get("estado_candidato", ""),
-                c.get("cv_url", "")
-            ])
-        
-        output.seek(0)
-        
-        return StreamingResponse(
-            iter([output.getvalue()]),
-            media_type="text/csv",
-            headers={
-                "Content-Disposition": f"attachment; filename={proceso.get('codigo_proceso', 'proceso')}_candidatos.csv"
-            }
-        )
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    
+    filter_formula = None
+    if estado:
+        filter_formula = "{estado_candidato} = '%s'" % estado.replace("'", "\\'")
+    
+    async def content():
+        try:
+            async for chunk in iter_csv(
+                airtable,
+                selected,
+                proceso_id=proceso_id,
+                codigo_proceso=proceso.get("codigo_proceso"),
+                filter_formula=filter_formula
+            ):
+                yield chunk
+        except Exception:
+            # Los headers ya se enviaron: solo queda cortar el archivo
+            logger.exception("Error exportando CSV del proceso %s", proceso_id)
+            raise
+    
+    return StreamingResponse(
+        content(),
+        media_type="text/csv",
+        headers={
+            "Content-Disposition": f"attachment; filename={proceso.get('codigo_proceso', 'proceso')}_candidatos.csv"
+        }
+    )
 
 
 @router.get("/{proceso_id}/export-pdf")
 async def export_process_pdf(
     proceso_id: str,
+    if_none_match: Optional[str] = Header(None),
     airtable: AirtableService = Depends(get_airtable_service)
 ):
     """
@@ -219,58 +205,41 @@ async def export_process_pdf(
     - Resumen ejecutivo con estadísticas
     - Vista Canvas con pipeline de candidatos (4 columnas)
     - Fichas individuales de candidatos con evaluaciones y comentarios
+    
+    El PDF se cachea en disco por fingerprint de los datos del proceso
+    (ver services/report_cache.py): si nada cambió se sirve el guardado, y
+    con `If-None-Match` igual al ETag se responde 304.
     """
     try:
-        from ..services.pdf_generator import generate_proceso_pdf
+        from ..services.report_cache import fetch_report_data, report_cache
         
-        # Obtener datos del proceso
-        proceso = await airtable.get_proceso_by_id(proceso_id)
-        if not proceso:
+        # Obtener proceso, candidatos, evaluaciones y comentarios
+        data = await fetch_report_data(airtable, proceso_id)
+        if data is None:
             raise HTTPException(status_code=404, detail="Proceso no encontrado")
         
-        # Obtener candidatos
-        candidatos = await airtable.get_candidatos(proceso_id=proceso_id)
-        
-        # Obtener evaluaciones y comentarios para cada candidato
-        evaluaciones = {}
-        comentarios = {}
+        etag = f'"{data.fingerprint()[:32]}"'
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if if_none_match and etag in [t.strip() for t in if_none_match.split(",")]:
+            return Response(status_code=304, headers=headers)
         
-        for c in candidatos:
-            cid = c['id']
-            tracking = c.get('codigo_tracking')
-            
-            # Evaluación
-            eval_data = await airtable.get_evaluacion(cid, tracking)
-            if eval_data:
-                evaluaciones[cid] = eval_data
-            
-            # Comentarios
-            coms = await airtable.get_comentarios(cid)
-            if coms:
-                comentarios[cid] = coms
-        
-        # Generar PDF (async para usar IA en resumen de comentarios)
-        pdf_bytes = await generate_proceso_pdf(
-            proceso=proceso,
-            candidatos=candidatos,
-            evaluaciones=evaluaciones,
-            comentarios=comentarios
-        )
+        # Desde disco, o generado (async para usar IA en resumen de comentarios)
+        pdf_bytes = await report_cache.get_or_generate(data)
         
         # Nombre del archivo
-        codigo = proceso.get('codigo_proceso', 'proceso')
+        codigo = data.proceso.get('codigo_proceso', 'proceso')
         filename = f"{codigo}_resumen.pdf"
         
-        return StreamingResponse(
-            io.BytesIO(pdf_bytes),
+        return Response(
+            content=pdf_bytes,
             media_type="application/pdf",
             headers={
+                **headers,
                 "Content-Disposition": f"attachment; filename={filename}"
             }
         )
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error generando PDF del proceso")
         raise HTTPException(status_code=500, detail=str(e))
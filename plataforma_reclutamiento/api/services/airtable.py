@@ -1,19 +1,178 @@
 """
 Servicio de integración con Airtable.
 Proporciona una capa de abstracción para todas las operaciones CRUD con Airtable.
+
+Todas las llamadas comparten un cliente httpx por event loop (keep-alive:
+el handshake TLS se paga una vez, no en cada request). Las tablas chicas de
+referencia (Cargos, Procesos, Usuarios, Config_Evaluacion) se pueden tener
+completas en memoria con `prefetch_reference_tables` (lo hace el warm-up al
+iniciar): las lecturas por ID y los listados de cargos, usuarios y config
+activa salen de ahí mientras no venza REFERENCE_CACHE_TTL, y las escrituras
+desde esta API actualizan la copia.
+
+Variables de entorno:
+    AIRTABLE_MAX_CONNECTIONS=10     (conexiones del pool)
+    REFERENCE_CACHE_TTL=60          (segundos; 0 = sin caché)
 """
 
+import logging
+import asyncio
 import os
-from typing import Optional, List, Dict, Any
+import time
+from typing import Optional, List, Dict, Any, AsyncIterator, Callable, Tuple
 from datetime import datetime
 import httpx
 from pydantic import BaseModel, Field
 
+from engine import telemetry
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_AIRTABLE_API_URL = "https://api.airtable.com/v0"
+
+
+# ============================================================================
+# Notificación de cambios
+# ============================================================================
+
+# Funciones (service, table_name, record) llamadas tras cada create/update
+_change_listeners: List[Callable[["AirtableService", str, Dict[str, Any]], None]] = []
+
+
+def add_change_listener(listener: Callable[["AirtableService", str, Dict[str, Any]], None]) -> None:
+    """
+    Registra una función a llamar cada vez que se crea o actualiza un registro.
+
+    La usan las cachés derivadas de los datos de Airtable (p.ej. los reportes
+    PDF de procesos) para invalidarse o regenerarse.
+    """
+    _change_listeners.append(listener)
+
+
+def remove_change_listener(listener: Callable[["AirtableService", str, Dict[str, Any]], None]) -> None:
+    if listener in _change_listeners:
+        _change_listeners.remove(listener)
+
+
+# ============================================================================
+# Pool de conexiones
+# ============================================================================
+
+AIRTABLE_MAX_CONNECTIONS = int(os.getenv("AIRTABLE_MAX_CONNECTIONS", "10"))
+
+# (event loop, cliente): un AsyncClient no se puede usar desde otro loop
+_shared: Optional[Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = None
+
+
+def shared_client() -> httpx.AsyncClient:
+    """Cliente httpx compartido (keep-alive) del event loop actual."""
+    global _shared
+    loop = asyncio.get_running_loop()
+    if _shared is None or _shared[0] is not loop or _shared[1].is_closed:
+        limits = httpx.Limits(max_connections=AIRTABLE_MAX_CONNECTIONS,
+                              max_keepalive_connections=AIRTABLE_MAX_CONNECTIONS)
+        _shared = (loop, httpx.AsyncClient(limits=limits))
+    return _shared[1]
+
+
+async def close_shared_client() -> None:
+    """Cierra el pool (al apagar la app)."""
+    global _shared
+    if _shared is not None:
+        _, client = _shared
+        _shared = None
+        await client.aclose()
+
+
+# ============================================================================
+# Caché de tablas de referencia
+# ============================================================================
+
+class ReferenceCache:
+    """
+    Tablas completas en memoria, por ID de registro (registros crudos de Airtable).
+
+    Solo guarda las tablas cargadas con `load` (prefetch o primer listado).
+    Una tabla vence entera a los `ttl` segundos de cargada; las escrituras
+    hechas desde esta API la mantienen al día vía `on_change`.
+    """
+
+    def __init__(self, ttl: float = 60.0):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._tables: Dict[str, Tuple[float, Dict[str, Dict[str, Any]]]] = {}
+
+    @classmethod
+    def from_env(cls) -> "ReferenceCache":
+        return cls(ttl=float(os.getenv("REFERENCE_CACHE_TTL", "60")))
+
+    @property
+    def currsize(self) -> int:
+        return sum(len(records) for _, records in self._tables.values())
+
+    def info(self) -> "ReferenceCache":
+        """Compatible con `telemetry.register_cache` (hits, misses, currsize)."""
+        return self
+
+    def _fresh(self, table_name: str) -> Optional[Dict[str, Dict[str, Any]]]:
+        entry = self._tables.get(table_name)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+    def records(self, table_name: str) -> Optional[List[Dict[str, Any]]]:
+        """Todos los registros de la tabla, o None si no está cargada (o venció)."""
+        table = self._fresh(table_name)
+        if table is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return list(table.values())
+
+    def get(self, table_name: str, record_id: str) -> Optional[Dict[str, Any]]:
+        """Un registro, o None si la tabla no está cargada o no lo tiene."""
+        table = self._fresh(table_name)
+        record = table.get(record_id) if table is not None else None
+        if table is not None:
+            if record is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return record
+
+    def load(self, table_name: str, records: List[Dict[str, Any]]) -> None:
+        if self.ttl <= 0:
+            return
+        self._tables[table_name] = (time.monotonic() + self.ttl, {r["id"]: r for r in records})
+
+    def on_change(self, airtable: "AirtableService", table_name: str, record: Dict[str, Any]) -> None:
+        """Listener de AirtableService: reemplaza o descarta el registro escrito."""
+        entry = self._tables.get(table_name)
+        if entry is None or not record.get("id"):
+            return
+        if record.get("deleted"):
+            entry[1].pop(record["id"], None)
+        else:
+            # Airtable responde create/update con el registro completo
+            entry[1][record["id"]] = record
+
+    def clear(self) -> None:
+        self._tables.clear()
+        self.hits = self.misses = 0
+
+
+reference_cache = ReferenceCache.from_env()
+add_change_listener(reference_cache.on_change)
+telemetry.register_cache("referencias", reference_cache.info)
+
 
 class AirtableConfig(BaseModel):
     """Configuración para conexión a Airtable."""
     api_key: str
     base_id: str
+    api_url: str = DEFAULT_AIRTABLE_API_URL  # Apuntar a un stub local para pruebas de carga
     table_cargos: str = "Cargos"
     table_procesos: str = "Procesos"  # Tabla nueva
     table_candidatos: str = "Postulaciones"  # Tabla nueva (antes "Candidatos")
@@ -38,6 +197,7 @@ class AirtableConfig(BaseModel):
         return cls(
             api_key=api_key,
             base_id=base_id,
+            api_url=os.getenv("AIRTABLE_API_URL", DEFAULT_AIRTABLE_API_URL).rstrip("/"),
             table_cargos=os.getenv("AIRTABLE_TABLE_CARGOS", "Cargos"),
             table_procesos=os.getenv("AIRTABLE_TABLE_PROCESOS", "Procesos"),
             table_candidatos=os.getenv("AIRTABLE_TABLE_CANDIDATOS", "Postulaciones"),
@@ -67,7 +227,10 @@ class AirtableService:
         })
     """
     
-    BASE_URL = "https://api.airtable.com/v0"
+    BASE_URL = DEFAULT_AIRTABLE_API_URL
+    
+    # Máximo de registros por request de escritura en lote (límite de Airtable)
+    WRITE_BATCH = 10
     
     def __init__(self, config: AirtableConfig):
         self.config = config
@@ -83,22 +246,79 @@ class AirtableService:
     
     def _get_table_url(self, table_name: str) -> str:
         """Construye la URL para una tabla."""
-        return f"{self.BASE_URL}/{self.config.base_id}/{table_name}"
+        return f"{self.config.api_url}/{self.config.base_id}/{table_name}"
     
     # =========================================================================
     # Generic CRUD Operations
     # =========================================================================
     
-    async def _get_records(
+    # Airtable permite 5 req/s por base y responde 429 al excederlo
+    MAX_RETRIES = 3
+    RETRY_BACKOFF = 0.5  # segundos, se duplica en cada reintento
+    
+    async def _request(
+        self,
+        method: str,
+        table_name: str,
+        url: str,
+        client: Optional[httpx.AsyncClient] = None,
+        **kwargs
+    ) -> httpx.Response:
+        """
+        Ejecuta un request a Airtable con reintentos ante 429 y telemetría.
+        
+        Todas las llamadas a Airtable pasan por aquí, así cada request HTTP
+        de la API puede contar cuántas llamadas, bytes y reintentos hizo
+        por tabla (ver api/services/instrumentation.py).
+        
+        Args:
+            method: Método HTTP
+            table_name: Tabla (para la telemetría)
+            url: URL completa
+            client: Cliente a usar; por defecto el compartido (`shared_client`)
+            **kwargs: params / json para httpx
+            
+        Returns:
+            Respuesta de Airtable (sin raise_for_status)
+        """
+        with telemetry.span("airtable", table_name, method=method) as span:
+            client = client or shared_client()
+            retries = 0
+            while True:
+                response = await client.request(method, url, headers=self._headers, **kwargs)
+                if response.status_code != 429 or retries >= self.MAX_RETRIES:
+                    break
+                retry_after = response.headers.get("Retry-After")
+                try:
+                    delay = float(retry_after)
+                except (TypeError, ValueError):
+                    delay = self.RETRY_BACKOFF * (2 ** retries)
+                retries += 1
+                await asyncio.sleep(delay)
+            
+            span.set(
+                status=response.status_code,
+                retries=retries,
+                bytes_out=len(response.request.content or b""),
+                bytes_in=len(response.content)
+            )
+            return response
+    
+    async def iter_records(
         self,
         table_name: str,
         filter_formula: Optional[str] = None,
         sort: Optional[List[Dict[str, str]]] = None,
         max_records: Optional[int] = None,
-        view: Optional[str] = None
-    ) -> List[Dict[str, Any]]:
+        view: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        page_size: Optional[int] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
         """
-        Obtiene registros de una tabla.
+        Recorre una tabla página por página (hasta 100 registros cada una).
+        
+        Permite procesar tablas grandes sin tenerlas completas en memoria:
+        cada página se entrega apenas llega.
         
         Args:
             table_name: Nombre de la tabla
@@ -106,12 +326,14 @@ class AirtableService:
             sort: Lista de ordenamientos [{field, direction}]
             max_records: Límite de registros
             view: Nombre de la vista a usar
+            fields: Campos a traer (default: todos)
+            page_size: Registros por página (máx. 100)
             
-        Returns:
-            Lista de registros
+        Yields:
+            Lista de registros de cada página
         """
         url = self._get_table_url(table_name)
-        params = {}
+        params: Dict[str, Any] = {}
         
         if filter_formula:
             params["filterByFormula"] = filter_formula
@@ -123,48 +345,77 @@ class AirtableService:
             params["maxRecords"] = max_records
         if view:
             params["view"] = view
+        if fields:
+            params["fields[]"] = list(fields)
+        if page_size:
+            params["pageSize"] = min(page_size, 100)
         
-        all_records = []
         offset = None
         
-        async with httpx.AsyncClient() as client:
-            while True:
-                if offset:
-                    params["offset"] = offset
-                
-                response = await client.get(url, headers=self._headers, params=params)
-                response.raise_for_status()
-                data = response.json()
-                
-                records = data.get("records", [])
-                all_records.extend(records)
-                
-                offset = data.get("offset")
-                if not offset:
-                    break
+        while True:
+            if offset:
+                params["offset"] = offset
+            
+            response = await self._request("GET", table_name, url, params=params)
+            response.raise_for_status()
+            data = response.json()
+            
+            yield data.get("records", [])
+            
+            offset = data.get("offset")
+            if not offset:
+                break
+    
+    async def _get_records(
+        self,
+        table_name: str,
+        filter_formula: Optional[str] = None,
+        sort: Optional[List[Dict[str, str]]] = None,
+        max_records: Optional[int] = None,
+        view: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Obtiene registros de una tabla.
         
+        Args:
+            table_name: Nombre de la tabla
+            filter_formula: Fórmula de filtro de Airtable
+            sort: Lista de ordenamientos [{field, direction}]
+            max_records: Límite de registros
+            view: Nombre de la vista a usar
+            
+        Returns:
+            Lista de registros
+        """
+        all_records = []
+        async for records in self.iter_records(table_name, filter_formula, sort, max_records, view):
+            all_records.extend(records)
         return all_records
     
     async def _get_record(self, table_name: str, record_id: str) -> Optional[Dict[str, Any]]:
-        """Obtiene un registro por ID."""
+        """Obtiene un registro por ID (de la caché si su tabla está cargada)."""
+        cached = reference_cache.get(table_name, record_id)
+        if cached is not None:
+            return cached
+        
         url = f"{self._get_table_url(table_name)}/{record_id}"
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=self._headers)
-            if response.status_code == 404:
-                return None
-            response.raise_for_status()
-            return response.json()
+        response = await self._request("GET", table_name, url)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response.json()
     
     async def _create_record(self, table_name: str, fields: Dict[str, Any]) -> Dict[str, Any]:
         """Crea un nuevo registro."""
         url = self._get_table_url(table_name)
         payload = {"fields": fields}
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, headers=self._headers, json=payload)
-            response.raise_for_status()
-            return response.json()
+        response = await self._request("POST", table_name, url, json=payload)
+        response.raise_for_status()
+        record = response.json()
+        self._notify_change(table_name, record)
+        return record
     
     async def _update_record(
         self,
@@ -176,18 +427,77 @@ class AirtableService:
         url = f"{self._get_table_url(table_name)}/{record_id}"
         payload = {"fields": fields}
         
-        async with httpx.AsyncClient() as client:
-            response = await client.patch(url, headers=self._headers, json=payload)
+        response = await self._request("PATCH", table_name, url, json=payload)
+        response.raise_for_status()
+        record = response.json()
+        self._notify_change(table_name, record)
+        return record
+    
+    async def _update_records(
+        self,
+        table_name: str,
+        updates: Dict[str, Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Actualiza varios registros en lotes de 10 (máximo de Airtable por request).
+        
+        Args:
+            table_name: Nombre de la tabla
+            updates: {record_id: fields}
+            
+        Returns:
+            Registros actualizados
+        """
+        url = self._get_table_url(table_name)
+        items = list(updates.items())
+        updated = []
+        for i in range(0, len(items), self.WRITE_BATCH):
+            payload = {"records": [{"id": rid, "fields": fields} for rid, fields in items[i:i + self.WRITE_BATCH]]}
+            response = await self._request("PATCH", table_name, url, json=payload)
             response.raise_for_status()
-            return response.json()
+            for record in response.json().get("records", []):
+                self._notify_change(table_name, record)
+                updated.append(record)
+        return updated
     
     async def _delete_record(self, table_name: str, record_id: str) -> bool:
         """Elimina un registro."""
         url = f"{self._get_table_url(table_name)}/{record_id}"
         
-        async with httpx.AsyncClient() as client:
-            response = await client.delete(url, headers=self._headers)
-            return response.status_code == 200
+        response = await self._request("DELETE", table_name, url)
+        deleted = response.status_code == 200
+        if deleted:
+            self._notify_change(table_name, {"id": record_id, "fields": {}, "deleted": True})
+        return deleted
+    
+    async def _get_reference_table(self, table_name: str) -> List[Dict[str, Any]]:
+        """Tabla completa desde `reference_cache`; si no está, se lee y se guarda."""
+        records = reference_cache.records(table_name)
+        if records is None:
+            records = await self._get_records(table_name)
+            reference_cache.load(table_name, records)
+        return records
+    
+    async def prefetch_reference_tables(self) -> Dict[str, int]:
+        """
+        Carga en `reference_cache` las tablas de referencia (para el warm-up).
+        
+        Returns:
+            Registros cargados por tabla
+        """
+        tables = [self.config.table_cargos, self.config.table_procesos, "Usuarios", self.config.table_config]
+        results = await asyncio.gather(*(self._get_records(t) for t in tables))
+        for table_name, records in zip(tables, results):
+            reference_cache.load(table_name, records)
+        return {t: len(r) for t, r in zip(tables, results)}
+    
+    def _notify_change(self, table_name: str, record: Dict[str, Any]) -> None:
+        """Avisa a los listeners registrados; sus errores no afectan la escritura."""
+        for listener in list(_change_listeners):
+            try:
+                listener(self, table_name, record)
+            except Exception:
+                logger.exception("Error en listener de cambios de Airtable")
     
     async def _find_record_by_field(
         self,
@@ -231,6 +541,56 @@ class AirtableService:
         
         return candidatos
     
+    @staticmethod
+    def proceso_filter(proceso_id: str, codigo_proceso: Optional[str] = None) -> str:
+        """
+        Fórmula que deja solo los candidatos de un proceso.
+        
+        ARRAYJOIN de un link devuelve el campo primario del proceso
+        (codigo_proceso); se compara también con el record ID por si el
+        campo primario es otro. Igual conviene verificar `proceso` del lado
+        del cliente.
+        """
+        joined = "',' & ARRAYJOIN({proceso}, ',') & ','"
+        conditions = [f"FIND(',{proceso_id},', {joined})"]
+        if codigo_proceso:
+            conditions.append("FIND(',%s,', %s)" % (codigo_proceso.replace("'", "\\'"), joined))
+        return conditions[0] if len(conditions) == 1 else f"OR({', '.join(conditions)})"
+    
+    async def iter_candidatos(
+        self,
+        proceso_id: Optional[str] = None,
+        codigo_proceso: Optional[str] = None,
+        filter_formula: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Candidatos página por página, con el filtro por proceso en Airtable.
+        
+        Args:
+            proceso_id: Record ID del proceso
+            codigo_proceso: Código del proceso (mejora el filtro en Airtable)
+            filter_formula: Condición adicional (se combina con AND)
+            fields: Campos de Airtable a traer (default: todos)
+            
+        Yields:
+            Lista de candidatos formateados de cada página
+        """
+        conditions = []
+        if proceso_id:
+            conditions.append(self.proceso_filter(proceso_id, codigo_proceso))
+            if fields and "proceso" not in fields:
+                fields = [*fields, "proceso"]
+        if filter_formula:
+            conditions.append(filter_formula)
+        formula = conditions[0] if len(conditions) == 1 else (f"AND({', '.join(conditions)})" if conditions else None)
+        
+        async for records in self.iter_records(self.config.table_candidatos, filter_formula=formula, fields=fields):
+            candidatos = [self._format_candidato(r) for r in records]
+            if proceso_id:
+                candidatos = [c for c in candidatos if proceso_id in (c.get("proceso") or [])]
+            yield candidatos
+    
     async def get_candidato(self, tracking_code: str) -> Optional[Dict[str, Any]]:
         """Obtiene un candidato por su código de tracking."""
         record = await self._find_record_by_field(
@@ -311,7 +671,7 @@ class AirtableService:
         except Exception as e:
             # Si falla, intentar sin los campos que pueden no existir
             # NOTA: cv_texto SÍ existe (creado por el usuario), NO excluirlo
-            print(f"[WARN] Error actualizando candidato, reintentando sin campos OpenAI extras: {e}")
+            logger.warning("Error actualizando candidato, reintentando sin campos OpenAI extras: %s", e)
             basic_fields = {k: v for k, v in safe_fields.items() 
                           if k not in ["cv_data_json", "años_experiencia", 
                                        "titulo_profesional", "resumen_perfil"]}
@@ -320,7 +680,7 @@ class AirtableService:
                     record = await self._update_record(self.config.table_candidatos, record_id, basic_fields)
                     return self._format_candidato(record)
                 except Exception as e2:
-                    print(f"[ERROR] Segundo intento falló: {e2}")
+                    logger.error("Segundo intento falló: %s", e2)
             return await self.get_candidato_by_id(record_id) or {}
     
     def _format_candidato(self, record: Dict[str, Any]) -> Dict[str, Any]:
@@ -352,6 +712,7 @@ class AirtableService:
             "proceso": fields.get("proceso", []),
             "cargo": fields.get("cargo", []),
             "evaluacion": fields.get("evaluacion", []),
+            "fecha_postulacion": fields.get("fecha_postulacion"),
             "created_at": record.get("createdTime")
         }
     
@@ -393,6 +754,49 @@ class AirtableService:
         
         return self._format_evaluacion(record) if record else None
     
+    # Códigos por request en get_evaluaciones_by_tracking: una página de
+    # candidatos en una llamada (~5 KB de fórmula, bajo el límite de 16 KB de URL)
+    EVALUACIONES_BATCH = 100
+    
+    async def get_evaluaciones_by_tracking(
+        self,
+        tracking_codes: List[str],
+        fields: Optional[List[str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Obtiene las evaluaciones de varios candidatos en pocas llamadas.
+        
+        Equivale a llamar `get_evaluacion(id, tracking)` por candidato, pero
+        con un filtro OR por lote de códigos.
+        
+        Args:
+            tracking_codes: Códigos de tracking de los candidatos
+            fields: Campos de Airtable a traer (default: todos)
+            
+        Returns:
+            Dict {codigo_tracking: evaluación}, solo para los que tienen una
+        """
+        codes = list(dict.fromkeys(c for c in tracking_codes if c))
+        evaluaciones: Dict[str, Dict[str, Any]] = {}
+        for i in range(0, len(codes), self.EVALUACIONES_BATCH):
+            batch = codes[i:i + self.EVALUACIONES_BATCH]
+            conditions = ", ".join("{candidato} = '%s'" % code.replace("'", "\\'") for code in batch)
+            if fields and "candidato" not in fields:
+                fields = [*fields, "candidato"]
+            records = []
+            async for page in self.iter_records(
+                self.config.table_evaluaciones,
+                filter_formula=f"OR({conditions})",
+                fields=fields
+            ):
+                records.extend(page)
+            for record in records:
+                tracking = record.get("fields", {}).get("candidato")
+                # Como get_evaluacion: el primer registro por candidato
+                if tracking and tracking not in evaluaciones:
+                    evaluaciones[tracking] = self._format_evaluacion(record)
+        return evaluaciones
+    
     async def create_evaluacion(self, candidato_id: str, evaluation_data: Dict[str, Any], codigo_tracking: Optional[str] = None) -> Dict[str, Any]:
         """Crea o actualiza la evaluación de un candidato.
         
@@ -406,7 +810,7 @@ class AirtableService:
         existing_record_id = existing_eval.get("id") if existing_eval else None
         
         if existing_record_id:
-            print(f"[INFO] Evaluación existente encontrada ({existing_record_id}), se actualizará")
+            logger.info("Evaluación existente encontrada (%s), se actualizará", existing_record_id)
         
         # Soportar tanto formato anidado (fits/inference) como formato plano
         fits = evaluation_data.get("fits", {})
@@ -492,11 +896,11 @@ class AirtableService:
         if existing_record_id:
             # ACTUALIZAR el registro existente
             record = await self._update_record(self.config.table_evaluaciones, existing_record_id, fields)
-            print(f"[INFO] ✅ Evaluación ACTUALIZADA: {existing_record_id}")
+            logger.info("Evaluación actualizada: %s", existing_record_id)
         else:
             # CREAR nuevo registro
             record = await self._create_record(self.config.table_evaluaciones, fields)
-            print(f"[INFO] ✅ Evaluación CREADA: {record.get('id')}")
+            logger.info("Evaluación creada: %s", record.get("id"))
         
         return self._format_evaluacion(record)
     
@@ -533,6 +937,10 @@ class AirtableService:
             "industry_tier": fields.get("industry_tier"),
             "risk_warning": fields.get("risk_warning"),
             "analysis_json": fields.get("analysis_json"),
+            "keywords_found_admin": fields.get("keywords_found_admin", ""),
+            "keywords_found_ops": fields.get("keywords_found_ops", ""),
+            "keywords_found_biz": fields.get("keywords_found_biz", ""),
+            "config_version": fields.get("config_version"),
             "created_at": record.get("createdTime"),
             "updated_at": updated_at  # Fecha de última actualización
         }
@@ -547,33 +955,41 @@ class AirtableService:
         Los comentarios se guardan como JSON en el campo 'notas' del candidato.
         """
         try:
-            import json
             candidato = await self.get_candidato_by_id(candidato_id)
             if not candidato:
                 return []
-            
-            notas_raw = candidato.get("notas", "")
-            if not notas_raw:
-                return []
-            
-            # Intentar parsear como JSON (lista de comentarios)
-            try:
-                comentarios = json.loads(notas_raw)
-                if isinstance(comentarios, list):
-                    return comentarios
-            except json.JSONDecodeError:
-                # Si no es JSON, crear un comentario con el texto plano
-                return [{
-                    "id": "legacy-1",
-                    "autor": "Sistema",
-                    "comentario": notas_raw,
-                    "created_at": candidato.get("created_at", "")
-                }]
-            
-            return []
+            return self.parse_comentarios(candidato)
         except Exception as e:
-            print(f"[WARN] Error al obtener comentarios: {e}")
+            logger.warning("Error al obtener comentarios: %s", e)
+            return []
+    
+    @staticmethod
+    def parse_comentarios(candidato: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Comentarios guardados en el campo 'notas' de un candidato ya obtenido
+        (evita volver a pedir el registro cuando se tiene la lista completa).
+        """
+        import json
+        
+        notas_raw = candidato.get("notas", "")
+        if not notas_raw:
             return []
+        
+        # Intentar parsear como JSON (lista de comentarios)
+        try:
+            comentarios = json.loads(notas_raw)
+            if isinstance(comentarios, list):
+                return comentarios
+        except json.JSONDecodeError:
+            # Si no es JSON, crear un comentario con el texto plano
+            return [{
+                "id": "legacy-1",
+                "autor": "Sistema",
+                "comentario": notas_raw,
+                "created_at": candidato.get("created_at", "")
+            }]
+        
+        return []
     
     async def create_comentario(
         self,
@@ -611,7 +1027,7 @@ class AirtableService:
             
             return nuevo_comentario
         except Exception as e:
-            print(f"[ERROR] Error al crear comentario: {e}")
+            logger.error("Error al crear comentario: %s", e)
             raise
     
     def _format_comentario(self, record: Dict[str, Any]) -> Dict[str, Any]:
@@ -706,12 +1122,8 @@ class AirtableService:
     
     async def get_active_config(self) -> Optional[Dict[str, Any]]:
         """Obtiene la configuración de evaluación activa."""
-        filter_formula = "{is_active} = TRUE()"
-        records = await self._get_records(
-            self.config.table_config,
-            filter_formula=filter_formula,
-            max_records=1
-        )
+        records = [r for r in await self._get_reference_table(self.config.table_config)
+                   if r.get("fields", {}).get("is_active")]
         return self._format_config(records[0]) if records else None
     
     async def create_config(self, config_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -745,11 +1157,10 @@ class AirtableService:
     
     async def get_cargos(self, solo_activos: bool = True) -> List[Dict[str, Any]]:
         """Obtiene todos los cargos."""
-        filter_formula = "{activo} = TRUE()" if solo_activos else None
-        records = await self._get_records(
-            self.config.table_cargos,
-            filter_formula=filter_formula
-        )
+        records = await self._get_reference_table(self.config.table_cargos)
+        if solo_activos:
+            # Equivale a {activo} = TRUE(): un checkbox sin marcar no viene en fields
+            records = [r for r in records if r.get("fields", {}).get("activo")]
         return [self._format_cargo(r) for r in records]
     
     async def get_cargo(self, codigo: str) -> Optional[Dict[str, Any]]:
@@ -778,14 +1189,8 @@ class AirtableService:
     
     async def get_cargo_by_id(self, cargo_id: str) -> Optional[Dict[str, Any]]:
         """Obtiene un cargo por su ID de Airtable."""
-        url = f"{self._get_table_url(self.config.table_cargos)}/{cargo_id}"
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=self._headers)
-            if response.status_code == 404:
-                return None
-            response.raise_for_status()
-            return self._format_cargo(response.json())
+        record = await self._get_record(self.config.table_cargos, cargo_id)
+        return self._format_cargo(record) if record else None
     
     # =========================================================================
     # Usuarios
@@ -793,7 +1198,7 @@ class AirtableService:
     
     async def get_usuarios(self) -> List[Dict[str, Any]]:
         """Obtiene todos los usuarios."""
-        records = await self._get_records("Usuarios")
+        records = await self._get_reference_table("Usuarios")
         return [self._format_usuario(r) for r in records]
     
     async def get_usuario_by_email(self, email: str) -> Optional[Dict[str, Any]]:
@@ -808,14 +1213,8 @@ class AirtableService:
     
     async def get_usuario_by_id(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Obtiene un usuario por ID."""
-        url = f"{self._get_table_url('Usuarios')}/{user_id}"
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=self._headers)
-            if response.status_code == 404:
-                return None
-            response.raise_for_status()
-            return self._format_usuario(response.json())
+        record = await self._get_record("Usuarios", user_id)
+        return self._format_usuario(record) if record else None
     
     async def create_usuario(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Crea un nuevo usuario."""
@@ -835,6 +1234,14 @@ class AirtableService:
         fields = {"last_login": datetime.now().isoformat()}
         await self._update_record("Usuarios", user_id, fields)
     
+    async def update_usuarios_last_login(self, logins: Dict[str, str]) -> None:
+        """Actualiza el último login de varios usuarios ({user_id: fecha ISO}) en lotes."""
+        await self._update_records("Usuarios", {uid: {"last_login": ts} for uid, ts in logins.items()})
+    
+    async def update_usuario_password_hash(self, user_id: str, password_hash: str) -> None:
+        """Reemplaza el hash de contraseña de un usuario."""
+        await self._update_record("Usuarios", user_id, {"password_hash": password_hash})
+    
     async def update_usuario_role(self, user_id: str, rol: str) -> None:
         """Actualiza el rol de un usuario."""
         await self._update_record("Usuarios", user_id, {"rol": rol})
@@ -872,38 +1279,51 @@ class AirtableService:
         )
         return [self._format_proceso(r) for r in records]
     
-    async def get_proceso_by_id(self, proceso_id: str) -> Optional[Dict[str, Any]]:
-        """Obtiene un proceso por ID con nombres resueltos."""
-        url = f"{self._get_table_url(self.config.table_procesos)}/{proceso_id}"
+    async def get_proceso_by_id(
+        self,
+        proceso_id: str,
+        count_postulaciones: bool = True,
+        resolve_names: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Obtiene un proceso por ID con nombres resueltos.
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=self._headers)
-            if response.status_code == 404:
-                return None
-            response.raise_for_status()
-            proceso = self._format_proceso_completo(response.json())
-            
-            # Resolver nombre del cargo
-            if not proceso.get("cargo_nombre") and proceso.get("cargo"):
-                cargo_id = proceso["cargo"][0] if isinstance(proceso["cargo"], list) else proceso["cargo"]
-                cargo = await self.get_cargo_by_id(cargo_id)
-                if cargo:
-                    proceso["cargo_nombre"] = cargo.get("nombre")
-                    proceso["cargo_id"] = cargo_id
-            
-            # Resolver nombre del usuario asignado
-            if not proceso.get("usuario_asignado_nombre") and proceso.get("usuario_asignado"):
-                user_id = proceso["usuario_asignado"][0] if isinstance(proceso["usuario_asignado"], list) else proceso["usuario_asignado"]
-                user = await self.get_usuario_by_id(user_id)
-                if user:
-                    proceso["usuario_asignado_nombre"] = user.get("nombre_completo")
-                    proceso["usuario_asignado_id"] = user_id
-            
-            # Contar postulaciones
+        Args:
+            proceso_id: Record ID del proceso
+            count_postulaciones: Contar postulaciones (lee la tabla completa de
+                candidatos; omitirlo si el llamador ya los va a pedir)
+            resolve_names: Buscar nombres de cargo y usuario si no vienen en
+                los lookups (una llamada más por cada uno)
+        """
+        record = await self._get_record(self.config.table_procesos, proceso_id)
+        if not record:
+            return None
+        proceso = self._format_proceso_completo(record)
+        if not resolve_names:
+            return proceso
+        
+        # Resolver nombre del cargo
+        if not proceso.get("cargo_nombre") and proceso.get("cargo"):
+            cargo_id = proceso["cargo"][0] if isinstance(proceso["cargo"], list) else proceso["cargo"]
+            cargo = await self.get_cargo_by_id(cargo_id)
+            if cargo:
+                proceso["cargo_nombre"] = cargo.get("nombre")
+                proceso["cargo_id"] = cargo_id
+        
+        # Resolver nombre del usuario asignado
+        if not proceso.get("usuario_asignado_nombre") and proceso.get("usuario_asignado"):
+            user_id = proceso["usuario_asignado"][0] if isinstance(proceso["usuario_asignado"], list) else proceso["usuario_asignado"]
+            user = await self.get_usuario_by_id(user_id)
+            if user:
+                proceso["usuario_asignado_nombre"] = user.get("nombre_completo")
+                proceso["usuario_asignado_id"] = user_id
+        
+        # Contar postulaciones
+        if count_postulaciones:
             postulaciones = await self.get_candidatos(proceso_id=proceso_id)
             proceso["postulaciones_count"] = len(postulaciones)
-            
-            return proceso
+        
+        return proceso
     
     def _format_proceso_completo(self, record: Dict[str, Any]) -> Dict[str, Any]:
         """Formatea un registro de proceso con todos los campos."""
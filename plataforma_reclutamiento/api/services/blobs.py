@@ -0,0 +1,789 @@
+"""
+Almacenamiento de CVs (blobs) detrás de una interfaz única.
+
+Los CVs nuevos se guardan direccionados por contenido: la clave es el
+SHA-256 del archivo más su extensión (`<sha256>.pdf`) y el path se reparte
+en dos niveles de directorios (`ab/cd/<sha256>.pdf`) para no tener miles
+de archivos en una sola carpeta. El mismo CV subido dos veces ocupa un solo
+blob. Los archivos anteriores de `data/cvs` (`NEAT-POST-..._Nombre.pdf`)
+siguen siendo legibles con su nombre como clave.
+
+Backends (BLOB_BACKEND):
+
+- `local`: sistema de archivos, en BLOB_DIR
+- `s3`: cualquier servicio compatible con S3 (AWS, MinIO, R2...), con
+  firma SigV4 sobre httpx. Lo leído se guarda en una caché local de
+  lectura (BLOB_CACHE_DIR, acotada a BLOB_CACHE_MAX_MB, se descartan los
+  menos usados), así el extractor de PDFs y FileResponse trabajan sobre un
+  archivo local y un CV se descarga una sola vez por máquina
+
+Lectura y escritura son por chunks: `put_stream` recibe un iterador
+asíncrono (el upload del formulario, una descarga) y `get_stream` entrega
+el contenido sin cargarlo entero en memoria.
+
+Cada store mantiene un índice en memoria de sus archivos locales
+(`FileIndex`: path, tamaño, mtime y SHA-256). Se arma al iniciar
+(`build_index`) y se actualiza en cada escritura, borrado o descarte de la
+caché, así servir un CV no hace `exists()`/`stat()` por request. Una clave
+que no está en el índice (escrita por otro worker) se busca en disco una
+vez y queda indexada.
+
+Variables de entorno:
+    BLOB_BACKEND=local|s3               (default: local)
+    BLOB_DIR=data/cvs                   (local)
+    BLOB_CACHE_DIR=data/blob_cache      (s3)
+    BLOB_CACHE_MAX_MB=512               (s3)
+    S3_ENDPOINT_URL=http://127.0.0.1:9000
+    S3_BUCKET=neat-cvs
+    S3_REGION=us-east-1
+    S3_ACCESS_KEY_ID=...
+    S3_SECRET_ACCESS_KEY=...
+"""
+
+import asyncio
+import hashlib
+import hmac
+import logging
+import os
+import re
+import secrets
+import stat
+import time
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote, unquote, urlparse
+
+import anyio
+import httpx
+
+from engine import telemetry
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_BLOB_DIR = Path(__file__).parent.parent.parent / "data" / "cvs"
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent.parent / "data" / "blob_cache"
+CHUNK_SIZE = 256 * 1024
+
+CONTENT_TYPES = {
+    ".pdf": "application/pdf",
+    ".doc": "application/msword",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+}
+
+_CONTENT_KEY = re.compile(r"^[0-9a-f]{64}(\.[a-z0-9]{1,8})?$")
+
+
+class BlobNotFound(KeyError):
+    """No hay blob con esa clave."""
+
+
+@dataclass
+class BlobInfo:
+    """Metadatos de un blob guardado."""
+    key: str
+    size: int
+    sha256: Optional[str] = None    # None en los nombres anteriores (no direccionados por contenido)
+
+    @property
+    def content_type(self) -> str:
+        return content_type_for(self.key)
+
+
+# ============================================================================
+# Claves
+# ============================================================================
+
+def is_content_addressed(key: str) -> bool:
+    """True si la clave es `<sha256>[.ext]`."""
+    return _CONTENT_KEY.match(key) is not None
+
+
+def check_key(key: str) -> str:
+    """Valida una clave (sin directorios ni nombres ocultos). Retorna la clave."""
+    if not key or key.startswith(".") or "/" in key or "\\" in key or "\x00" in key:
+        raise ValueError(f"Clave de blob inválida: {key!r}")
+    return key
+
+
+def shard(key: str) -> str:
+    """Path relativo del blob: `ab/cd/<clave>` si es por contenido, la clave si no."""
+    if is_content_addressed(key):
+        return f"{key[:2]}/{key[2:4]}/{key}"
+    return key
+
+
+def content_type_for(key: str) -> str:
+    return CONTENT_TYPES.get(Path(key).suffix.lower(), "application/octet-stream")
+
+
+def key_from_url(url: str) -> Optional[str]:
+    """Clave de un URL de la API (`.../files/<clave>?name=...`), o None."""
+    path = urlparse(url).path
+    if "/files/" not in path:
+        return None
+    key = unquote(path.split("/files/")[-1])
+    return key or None
+
+
+def file_url(key: str, filename: Optional[str] = None, base_url: str = "http://localhost:8000") -> str:
+    """URL con que la API sirve el blob; `filename` es el nombre de descarga."""
+    url = f"{base_url}/files/{quote(key)}"
+    if filename:
+        url += f"?name={quote(filename)}"
+    return url
+
+
+async def iter_file(path: Path, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Lee un archivo por chunks sin bloquear el event loop."""
+    async with await anyio.open_file(path, "rb") as f:
+        while chunk := await f.read(chunk_size):
+            yield chunk
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# ============================================================================
+# Índice de archivos locales
+# ============================================================================
+
+@dataclass
+class LocalBlob:
+    """Archivo local de un blob, con lo necesario para servirlo sin tocar el disco."""
+    key: str
+    path: Path
+    size: int
+    mtime: float
+    sha256: Optional[str] = None
+    touched: float = 0.0            # time.time() del último uso (orden de descarte de la caché)
+
+    async def content_sha256(self) -> str:
+        """SHA-256 del contenido; en los nombres anteriores se calcula una vez y queda guardado."""
+        if self.sha256 is None:
+            self.sha256 = await anyio.to_thread.run_sync(_file_sha256, self.path)
+        return self.sha256
+
+
+class FileIndex:
+    """Clave → LocalBlob de los archivos presentes en un directorio."""
+
+    def __init__(self):
+        self._entries: Dict[str, LocalBlob] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[LocalBlob]:
+        return self._entries.get(key)
+
+    def keys(self) -> List[str]:
+        return list(self._entries)
+
+    def values(self) -> List[LocalBlob]:
+        return list(self._entries.values())
+
+    def add(self, key: str, path: Path, st: os.stat_result, sha256: Optional[str] = None) -> LocalBlob:
+        if sha256 is None and is_content_addressed(key):
+            sha256 = key.split(".")[0]
+        entry = LocalBlob(key=key, path=path, size=st.st_size, mtime=st.st_mtime,
+                          sha256=sha256, touched=st.st_mtime)
+        self._entries[key] = entry
+        return entry
+
+    def discard(self, key: str) -> Optional[LocalBlob]:
+        return self._entries.pop(key, None)
+
+    def replace(self, entries: List[Tuple[str, Path, os.stat_result]]) -> None:
+        self._entries = {}
+        for key, path, st in entries:
+            self.add(key, path, st)
+
+    async def probe(self, key: str, path: Path) -> Optional[LocalBlob]:
+        """Busca en disco una clave que no está en el índice; si existe la indexa."""
+        try:
+            st = await anyio.Path(path).stat()
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        if not stat.S_ISREG(st.st_mode):
+            return None
+        return self.add(key, path, st)
+
+
+def _scan_dir(root: Path) -> List[Tuple[str, Path, os.stat_result]]:
+    """Archivos de un directorio de blobs: nombres en la raíz y `ab/cd/<sha256>.ext`."""
+    found = []
+    if not root.is_dir():
+        return found
+    for entry in os.scandir(root):
+        if entry.name.startswith("."):
+            continue
+        if entry.is_file():
+            found.append((entry.name, Path(entry.path), entry.stat()))
+        elif entry.is_dir() and len(entry.name) == 2:
+            for path in Path(entry.path).glob("??/*"):
+                if is_content_addressed(path.name):
+                    found.append((path.name, path, path.stat()))
+    return found
+
+
+# ============================================================================
+# Interfaz
+# ============================================================================
+
+class BlobStore:
+    """
+    Almacenamiento de blobs.
+
+    Las subclases implementan `_commit` (publicar un archivo temporal ya
+    hasheado), `stat`, `local_file`, `delete` y `list_keys`. La escritura
+    por chunks, el hash y la limpieza de temporales son comunes.
+    """
+
+    name = "base"
+
+    def _tmp_dir(self) -> Path:
+        raise NotImplementedError
+
+    async def _commit(self, tmp: Path, info: BlobInfo) -> None:
+        """Publica `tmp` como el blob `info.key` (y lo consume)."""
+        raise NotImplementedError
+
+    async def stat(self, key: str) -> Optional[BlobInfo]:
+        """Metadatos del blob, o None si no existe."""
+        raise NotImplementedError
+
+    async def local_file(self, key: str) -> LocalBlob:
+        """
+        Archivo local con el contenido del blob (el blob mismo o su copia en caché).
+
+        Raises:
+            BlobNotFound: Si no existe
+        """
+        raise NotImplementedError
+
+    async def local_path(self, key: str) -> Path:
+        """Path de `local_file`. Raises BlobNotFound."""
+        return (await self.local_file(key)).path
+
+    def forget(self, key: str) -> None:
+        """Saca la clave del índice (su archivo desapareció del disco)."""
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    async def list_keys(self) -> List[str]:
+        """Claves de todos los blobs."""
+        raise NotImplementedError
+
+    async def build_index(self) -> int:
+        """Arma el índice de archivos locales (al iniciar). Retorna cuántos hay."""
+        return 0
+
+    async def close(self) -> None:
+        pass
+
+    # =========================================================================
+    # Escritura
+    # =========================================================================
+
+    async def put_stream(self, chunks: AsyncIterable[bytes], ext: str = "", key: Optional[str] = None) -> BlobInfo:
+        """
+        Guarda el contenido de `chunks`.
+
+        Se escribe primero a un temporal mientras se calcula el SHA-256; si el
+        iterador falla (p. ej. UploadTooLarge) el temporal se borra y no queda
+        nada guardado.
+
+        Args:
+            chunks: Contenido, por chunks
+            ext: Extensión (".pdf") de la clave por contenido
+            key: Clave explícita (nombres anteriores); por defecto `<sha256><ext>`
+
+        Returns:
+            BlobInfo del blob guardado
+        """
+        tmp_dir = self._tmp_dir()
+        await anyio.Path(tmp_dir).mkdir(parents=True, exist_ok=True)
+        tmp = tmp_dir / f"{secrets.token_hex(8)}.part"
+        digest = hashlib.sha256()
+        size = 0
+        with telemetry.span("blob", "put", backend=self.name) as span:
+            try:
+                async with await anyio.open_file(tmp, "wb") as out:
+                    async for chunk in chunks:
+                        size += len(chunk)
+                        digest.update(chunk)
+                        await out.write(chunk)
+                sha = digest.hexdigest()
+                info = BlobInfo(key=check_key(key or f"{sha}{ext.lower()}"), size=size, sha256=sha)
+                await self._commit(tmp, info)
+            except BaseException:
+                await anyio.Path(tmp).unlink(missing_ok=True)
+                raise
+            span.set(bytes=size)
+        return info
+
+    async def put_file(self, path: Path, key: Optional[str] = None) -> BlobInfo:
+        """Guarda un archivo local (scripts). Clave por contenido salvo `key`."""
+        return await self.put_stream(iter_file(Path(path)), ext=Path(path).suffix, key=key)
+
+    async def fetch_url(self, url: str, ext: Optional[str] = None, timeout: float = 60.0) -> BlobInfo:
+        """
+        Descarga `url` directo al store (sin temporales propios ni el archivo en memoria).
+
+        Args:
+            url: URL del archivo
+            ext: Extensión de la clave; por defecto la del URL si es conocida, si no ".pdf"
+
+        Raises:
+            httpx.HTTPStatusError: Si la descarga responde con error
+        """
+        if ext is None:
+            suffix = Path(urlparse(url).path).suffix.lower()
+            ext = suffix if suffix in CONTENT_TYPES else ".pdf"
+        async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as client:
+            async with client.stream("GET", url) as response:
+                response.raise_for_status()
+                return await self.put_stream(response.aiter_bytes(CHUNK_SIZE), ext=ext)
+
+    # =========================================================================
+    # Lectura
+    # =========================================================================
+
+    async def get_stream(self, key: str, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+        """Contenido del blob por chunks. Raises BlobNotFound."""
+        path = await self.local_path(key)
+        async for chunk in iter_file(path, chunk_size):
+            yield chunk
+
+    async def read(self, key: str) -> bytes:
+        """Contenido completo del blob (solo para archivos chicos)."""
+        return b"".join([chunk async for chunk in self.get_stream(key)])
+
+
+# ============================================================================
+# Sistema de archivos local
+# ============================================================================
+
+class LocalBlobStore(BlobStore):
+    """Blobs en un directorio: `ab/cd/<sha256>.ext` y nombres anteriores en la raíz."""
+
+    name = "local"
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.index = FileIndex()
+
+    def _tmp_dir(self) -> Path:
+        return self.root / ".tmp"
+
+    def path_for(self, key: str) -> Path:
+        return self.root / shard(check_key(key))
+
+    async def _commit(self, tmp: Path, info: BlobInfo) -> None:
+        dest = anyio.Path(self.path_for(info.key))
+        if is_content_addressed(info.key) and await dest.exists():
+            # Mismo contenido ya guardado
+            await anyio.Path(tmp).unlink()
+        else:
+            await dest.parent.mkdir(parents=True, exist_ok=True)
+            await anyio.Path(tmp).rename(dest)
+        self.index.add(info.key, Path(dest), await dest.stat(), info.sha256)
+
+    async def stat(self, key: str) -> Optional[BlobInfo]:
+        try:
+            entry = await self.local_file(key)
+        except BlobNotFound:
+            return None
+        return BlobInfo(key=key, size=entry.size, sha256=entry.sha256)
+
+    async def local_file(self, key: str) -> LocalBlob:
+        entry = self.index.get(key)
+        if entry is not None:
+            return entry
+        try:
+            path = self.path_for(key)
+        except ValueError:
+            raise BlobNotFound(key)
+        entry = await self.index.probe(key, path)
+        if entry is None:
+            raise BlobNotFound(key)
+        return entry
+
+    def forget(self, key: str) -> None:
+        self.index.discard(key)
+
+    async def delete(self, key: str) -> None:
+        self.index.discard(key)
+        await anyio.Path(self.path_for(key)).unlink(missing_ok=True)
+
+    async def list_keys(self) -> List[str]:
+        # Del disco y no del índice: incluye lo escrito por otros workers
+        return sorted(key for key, _, _ in await anyio.to_thread.run_sync(_scan_dir, self.root))
+
+    async def build_index(self) -> int:
+        self.index.replace(await anyio.to_thread.run_sync(_scan_dir, self.root))
+        return len(self.index)
+
+
+# ============================================================================
+# S3 (SigV4)
+# ============================================================================
+
+EMPTY_SHA256 = hashlib.sha256(b"").hexdigest()
+
+
+def _hmac(key: bytes, msg: str) -> bytes:
+    return hmac.new(key, msg.encode(), hashlib.sha256).digest()
+
+
+def sign_v4(method: str, url: str, headers: Dict[str, str], payload_sha256: str,
+            access_key: str, secret_key: str, region: str, service: str = "s3",
+            now: Optional[datetime] = None) -> Dict[str, str]:
+    """
+    Firma un request con AWS Signature Version 4.
+
+    Args:
+        method: Método HTTP
+        url: URL completo, con el path ya codificado
+        headers: Headers a firmar (además de host, x-amz-date y x-amz-content-sha256)
+        payload_sha256: SHA-256 hex del body, o "UNSIGNED-PAYLOAD"
+
+    Returns:
+        Headers para el request, con Authorization
+    """
+    now = now or datetime.now(timezone.utc)
+    amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+    date = amz_date[:8]
+    parsed = urlparse(url)
+
+    signed = {k.lower(): str(v).strip() for k, v in headers.items()}
+    signed["host"] = parsed.netloc
+    signed["x-amz-date"] = amz_date
+    signed["x-amz-content-sha256"] = payload_sha256
+    names = sorted(signed)
+
+    query = []
+    for part in filter(None, parsed.query.split("&")):
+        name, _, value = part.partition("=")
+        query.append((quote(unquote(name), safe="-_.~"), quote(unquote(value), safe="-_.~")))
+    canonical_request = "\n".join([
+        method,
+        parsed.path or "/",
+        "&".join(f"{n}={v}" for n, v in sorted(query)),
+        "".join(f"{n}:{signed[n]}\n" for n in names),
+        ";".join(names),
+        payload_sha256
+    ])
+    scope = f"{date}/{region}/{service}/aws4_request"
+    string_to_sign = "\n".join([
+        "AWS4-HMAC-SHA256", amz_date, scope, hashlib.sha256(canonical_request.encode()).hexdigest()
+    ])
+    signing_key = _hmac(_hmac(_hmac(_hmac(f"AWS4{secret_key}".encode(), date), region), service), "aws4_request")
+    signature = hmac.new(signing_key, string_to_sign.encode(), hashlib.sha256).hexdigest()
+
+    signed["authorization"] = (f"AWS4-HMAC-SHA256 Credential={access_key}/{scope}, "
+                               f"SignedHeaders={';'.join(names)}, Signature={signature}")
+    del signed["host"]
+    return signed
+
+
+class BlobCache:
+    """
+    Copia local de blobs remotos, acotada en bytes.
+
+    Al pasarse de `max_bytes` se borran los archivos usados hace más tiempo
+    hasta quedar en el 90%. El orden de uso vive en el índice; el mtime de
+    los archivos se actualiza a lo sumo cada TOUCH_INTERVAL segundos, para
+    que el orden sobreviva a un reinicio sin escribir en disco por acierto.
+    Lecturas simultáneas del mismo blob comparten la descarga.
+    """
+
+    TOUCH_INTERVAL = 300.0
+
+    def __init__(self, root: Path, max_bytes: int = 512 * 1024 * 1024):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.index = FileIndex()
+        self._loaded = False
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    @property
+    def currsize(self) -> int:
+        return len(self.index)
+
+    @property
+    def bytes_used(self) -> int:
+        return sum(e.size for e in self.index.values())
+
+    def info(self) -> "BlobCache":
+        """Compatible con `telemetry.register_cache` (hits, misses, currsize)."""
+        return self
+
+    def path_for(self, key: str) -> Path:
+        return self.root / shard(check_key(key))
+
+    def tmp_dir(self) -> Path:
+        return self.root / ".tmp"
+
+    async def load(self) -> int:
+        """Indexa lo que ya está en disco (de una ejecución anterior)."""
+        self.index.replace(await anyio.to_thread.run_sync(_scan_dir, self.root))
+        self._loaded = True
+        return len(self.index)
+
+    def _hit(self, entry: LocalBlob) -> LocalBlob:
+        self.hits += 1
+        now = time.time()
+        if now - entry.touched > self.TOUCH_INTERVAL:
+            try:
+                os.utime(entry.path)
+            except FileNotFoundError:
+                pass
+        entry.touched = now
+        return entry
+
+    async def get(self, key: str, fetch: Callable[[Path], Awaitable[None]]) -> LocalBlob:
+        """
+        Archivo en caché del blob; si no está, lo descarga con `fetch(tmp)`.
+
+        Args:
+            key: Clave del blob
+            fetch: Escribe el contenido del blob en el path recibido
+        """
+        entry = self.index.get(key)
+        if entry is not None:
+            return self._hit(entry)
+        # Puede haberlo descargado otro worker que comparte el directorio
+        entry = await self.index.probe(key, self.path_for(key))
+        if entry is not None:
+            return self._hit(entry)
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.hits += 1
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            await anyio.Path(self.tmp_dir()).mkdir(parents=True, exist_ok=True)
+            tmp = self.tmp_dir() / f"{secrets.token_hex(8)}.part"
+            try:
+                await fetch(tmp)
+                entry = await self.adopt(tmp, key)
+            except BaseException:
+                await anyio.Path(tmp).unlink(missing_ok=True)
+                raise
+            future.set_result(entry)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+        return entry
+
+    async def adopt(self, tmp: Path, key: str, sha256: Optional[str] = None) -> LocalBlob:
+        """Mueve un archivo ya escrito a la caché como copia de `key`."""
+        if not self._loaded:
+            await self.load()
+        path = anyio.Path(self.path_for(key))
+        await path.parent.mkdir(parents=True, exist_ok=True)
+        await anyio.Path(tmp).rename(path)
+        entry = self.index.add(key, Path(path), await path.stat(), sha256)
+        entry.touched = time.time()
+        if self.bytes_used > self.max_bytes:
+            await self._prune()
+        return entry
+
+    def discard(self, key: str) -> None:
+        entry = self.index.discard(key)
+        try:
+            (entry.path if entry else self.path_for(key)).unlink(missing_ok=True)
+        except ValueError:
+            pass
+
+    async def _prune(self) -> None:
+        # Se eligen y se sacan del índice en el event loop; solo el borrado va al thread
+        total = self.bytes_used
+        target = self.max_bytes * 0.9
+        victims = []
+        for entry in sorted(self.index.values(), key=lambda e: e.touched):
+            if total <= target:
+                break
+            self.index.discard(entry.key)
+            victims.append(entry.path)
+            total -= entry.size
+
+        def unlink_all() -> None:
+            for path in victims:
+                path.unlink(missing_ok=True)
+
+        await anyio.to_thread.run_sync(unlink_all)
+        logger.debug("Caché de blobs: %d archivos descartados, %d bytes en uso", len(victims), total)
+
+
+class S3BlobStore(BlobStore):
+    """Blobs en un bucket compatible con S3 (path-style), con caché local de lectura."""
+
+    name = "s3"
+
+    def __init__(self, endpoint: str, bucket: str, access_key: str, secret_key: str,
+                 cache: BlobCache, region: str = "us-east-1", timeout: float = 60.0):
+        self.endpoint = endpoint.rstrip("/")
+        self.bucket = bucket
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.region = region
+        self.cache = cache
+        self.timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+        return self._client
+
+    def _url(self, key: str = "", query: str = "") -> str:
+        path = f"/{quote(self.bucket)}"
+        if key:
+            path += "/" + quote(shard(check_key(key)), safe="/-_.~")
+        return f"{self.endpoint}{path}" + (f"?{query}" if query else "")
+
+    def _headers(self, method: str, url: str, payload_sha256: str = "UNSIGNED-PAYLOAD",
+                 extra: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        return sign_v4(method, url, extra or {}, payload_sha256,
+                       self.access_key, self.secret_key, self.region)
+
+    def _tmp_dir(self) -> Path:
+        return self.cache.tmp_dir()
+
+    async def _commit(self, tmp: Path, info: BlobInfo) -> None:
+        if not (is_content_addressed(info.key) and await self.stat(info.key)):
+            url = self._url(info.key)
+            headers = self._headers("PUT", url, info.sha256, {
+                "content-type": info.content_type,
+                "content-length": str(info.size)
+            })
+            with telemetry.span("blob", "s3_put", bytes_out=info.size) as span:
+                response = await self.client.put(url, content=iter_file(tmp), headers=headers)
+                span.set(status=response.status_code)
+            if response.status_code >= 300:
+                raise RuntimeError(f"S3 PUT {info.key}: {response.status_code} {response.text[:200]}")
+        # Lo recién escrito queda como copia en caché
+        await self.cache.adopt(tmp, info.key, info.sha256)
+
+    async def stat(self, key: str) -> Optional[BlobInfo]:
+        try:
+            url = self._url(key)
+        except ValueError:
+            return None
+        response = await self.client.head(url, headers=self._headers("HEAD", url))
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        sha = key.split(".")[0] if is_content_addressed(key) else None
+        return BlobInfo(key=key, size=int(response.headers.get("content-length", 0)), sha256=sha)
+
+    async def _download(self, key: str, dest: Path) -> None:
+        url = self._url(key)
+        with telemetry.span("blob", "s3_get") as span:
+            async with self.client.stream("GET", url, headers=self._headers("GET", url)) as response:
+                span.set(status=response.status_code)
+                if response.status_code == 404:
+                    raise BlobNotFound(key)
+                response.raise_for_status()
+                size = 0
+                async with await anyio.open_file(dest, "wb") as out:
+                    async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                        size += len(chunk)
+                        await out.write(chunk)
+                span.set(bytes_in=size)
+
+    async def local_file(self, key: str) -> LocalBlob:
+        try:
+            check_key(key)
+        except ValueError:
+            raise BlobNotFound(key)
+        return await self.cache.get(key, lambda tmp: self._download(key, tmp))
+
+    def forget(self, key: str) -> None:
+        self.cache.index.discard(key)
+
+    async def build_index(self) -> int:
+        return await self.cache.load()
+
+    async def delete(self, key: str) -> None:
+        url = self._url(key)
+        response = await self.client.delete(url, headers=self._headers("DELETE", url))
+        if response.status_code not in (200, 204, 404):
+            response.raise_for_status()
+        self.cache.discard(key)
+
+    async def list_keys(self) -> List[str]:
+        keys: List[str] = []
+        token = None
+        while True:
+            query = "list-type=2" + (f"&continuation-token={quote(token, safe='')}" if token else "")
+            url = self._url(query=query)
+            response = await self.client.get(url, headers=self._headers("GET", url))
+            response.raise_for_status()
+            root = ET.fromstring(response.content)
+            ns = root.tag[:root.tag.index("}") + 1] if root.tag.startswith("{") else ""
+            keys.extend(el.text.rsplit("/", 1)[-1] for el in root.iter(f"{ns}Key"))
+            token = root.findtext(f"{ns}NextContinuationToken")
+            if root.findtext(f"{ns}IsTruncated") != "true" or not token:
+                return sorted(keys)
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# ============================================================================
+# Configuración
+# ============================================================================
+
+def create_blob_store() -> BlobStore:
+    """Crea el backend configurado en BLOB_BACKEND."""
+    backend = os.getenv("BLOB_BACKEND", "local").strip().lower()
+
+    if backend == "s3":
+        cache = BlobCache(
+            Path(os.getenv("BLOB_CACHE_DIR", str(DEFAULT_CACHE_DIR))),
+            max_bytes=int(float(os.getenv("BLOB_CACHE_MAX_MB", "512")) * 1024 * 1024)
+        )
+        telemetry.register_cache("blobs", cache.info)
+        return S3BlobStore(
+            endpoint=os.getenv("S3_ENDPOINT_URL", "http://127.0.0.1:9000"),
+            bucket=os.getenv("S3_BUCKET", "neat-cvs"),
+            access_key=os.getenv("S3_ACCESS_KEY_ID", ""),
+            secret_key=os.getenv("S3_SECRET_ACCESS_KEY", ""),
+            region=os.getenv("S3_REGION", "us-east-1"),
+            cache=cache
+        )
+    if backend != "local":
+        logger.warning("BLOB_BACKEND=%r no soportado (local|s3); usando local", backend)
+    return LocalBlobStore(Path(os.getenv("BLOB_DIR", str(DEFAULT_BLOB_DIR))))
+
+
+cv_store = create_blob_store()
@@ -0,0 +1,273 @@
+"""
+Servicios compartidos por todos los routers (una instancia por proceso).
+
+Antes cada router definía su `get_airtable_service()` y FastAPI lo llamaba
+en cada request: releer las variables de entorno, validar un
+`AirtableConfig` y armar un `AirtableService` nuevo. `get_evaluator`
+recompilaba todas las keywords del motor, `get_pdf_extractor` armaba su
+backend y cada llamada a OpenAI creaba su propio cliente (con su propio pool
+de conexiones).
+
+`services` guarda una sola instancia de cada uno. Se construyen en el primer
+uso; el lifespan arma el servicio de Airtable (`start`) y el warm-up compila
+el evaluador de la configuración activa y crea el cliente de OpenAI antes de
+`/ready`. Las dependencias de FastAPI (`get_airtable_service`,
+`get_evaluator`, `get_pdf_extractor`) retornan esas instancias y son
+`async`: resolverlas no pasa por el threadpool.
+
+`get_evaluator` evalúa con la configuración activa de Config_Evaluacion
+(`is_active`, leída de la caché de tablas de referencia). Si no hay una, no
+se puede leer o es inválida, se usa la configuración por defecto del motor.
+
+Las cachés siguen siendo los singletons de cada módulo (`reference_cache`,
+`user_cache`, `report_cache`...) porque se mantienen al día con los
+listeners de AirtableService; el contenedor no las duplica.
+
+Para tests o scripts: `app.dependency_overrides[get_evaluator] = ...`, o
+`services.reset()` para volver a leer las variables de entorno.
+"""
+
+import ast
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple, TypeVar
+
+from .airtable import AirtableService
+
+if TYPE_CHECKING:
+    from engine import CandidateEvaluator, EvaluationConfig, PDFExtractor
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ServiceContainer:
+    """Instancias compartidas de los servicios, creadas en el primer uso."""
+
+    # Evaluadores compilados para configuraciones distintas de la por defecto
+    MAX_EVALUATORS = 8
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._airtable: Optional[AirtableService] = None
+        self._pdf_extractor: Optional["PDFExtractor"] = None
+        self._openai: Any = None
+        self._evaluators: Dict[str, "CandidateEvaluator"] = {}
+        # (config_json, evaluador, id del registro) de la última config activa leída
+        self._active: Optional[Tuple[str, "CandidateEvaluator", str]] = None
+
+    def _build(self, attr: str, factory: Callable[[], T]) -> T:
+        # Con el lock: el warm-up construye desde un thread mientras llegan requests
+        with self._lock:
+            value = getattr(self, attr)
+            if value is None:
+                value = factory()
+                setattr(self, attr, value)
+            return value
+
+    def start(self) -> None:
+        """Arma lo que no cuesta nada al iniciar (el resto lo hace el warm-up)."""
+        try:
+            self.airtable()
+        except ValueError as e:
+            logger.warning("Servicio de Airtable no disponible: %s", e)
+
+    # =========================================================================
+    # Servicios
+    # =========================================================================
+
+    def airtable(self) -> AirtableService:
+        """
+        Servicio de Airtable compartido (las conexiones ya son un pool por event loop).
+
+        Raises:
+            ValueError: Si faltan AIRTABLE_API_KEY o AIRTABLE_BASE_ID (se
+                reintenta en la próxima llamada)
+        """
+        return self._airtable or self._build("_airtable", AirtableService.from_env)
+
+    def openai(self) -> Any:
+        """Cliente de OpenAI compartido, o None si no hay API key."""
+        if self._openai is not None:
+            return self._openai
+        api_key = os.getenv("OPENAI_API") or os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            return None
+
+        def create():
+            from openai import OpenAI
+            return OpenAI(api_key=api_key)
+
+        return self._build("_openai", create)
+
+    def pdf_extractor(self) -> "PDFExtractor":
+        """Extractor de PDFs (pdfplumber, con fallback a PyPDF2 y OpenAI Vision)."""
+        if self._pdf_extractor is not None:
+            return self._pdf_extractor
+
+        def create():
+            from engine import PDFExtractor
+            return PDFExtractor(openai_client=self.openai())
+
+        return self._build("_pdf_extractor", create)
+
+    def cv_processor(self):
+        """CVProcessor con el cliente de OpenAI compartido (es liviano, no se guarda)."""
+        from engine import CVProcessor
+        return CVProcessor(client=self.openai())
+
+    def evaluator(self, config: Optional["EvaluationConfig"] = None) -> "CandidateEvaluator":
+        """
+        Evaluador compilado para `config` (None = configuración por defecto).
+
+        Compilar las keywords es lo caro del evaluador, así que se guarda uno
+        por configuración, identificada por el hash de su contenido.
+
+        Args:
+            config: Configuración de evaluación
+
+        Returns:
+            Evaluador compartido; no llamar `set_config` sobre él
+        """
+        key = "default" if config is None else hashlib.sha256(
+            config.model_dump_json().encode()
+        ).hexdigest()
+        evaluator = self._evaluators.get(key)
+        if evaluator is not None:
+            return evaluator
+
+        from engine import CandidateEvaluator
+
+        with self._lock:
+            evaluator = self._evaluators.get(key)
+            if evaluator is None:
+                evaluator = CandidateEvaluator(config)
+                if len(self._evaluators) >= self.MAX_EVALUATORS:
+                    # Se descarta el más antiguo, nunca el por defecto
+                    oldest = next(k for k in self._evaluators if k != "default")
+                    del self._evaluators[oldest]
+                self._evaluators[key] = evaluator
+        return evaluator
+
+    async def active_evaluator(self) -> "CandidateEvaluator":
+        """
+        Evaluador de la configuración activa en Config_Evaluacion.
+
+        El registro sale de la caché de tablas de referencia; la config solo se
+        vuelve a parsear y compilar cuando cambia su `config_json`.
+
+        Returns:
+            Evaluador compartido, o el de la configuración por defecto si no
+            hay config activa, Airtable falla o la config es inválida
+        """
+        try:
+            record = await self.airtable().get_active_config()
+        except ValueError:
+            record = None  # Airtable no configurado
+        except Exception as e:
+            logger.warning("No se pudo leer la config activa, se usa la por defecto: %s", e)
+            record = None
+
+        raw = (record or {}).get("config_json")
+        if not raw:
+            return self.evaluator()
+        active = self._active
+        if active is not None and active[0] == raw:
+            return active[1]
+
+        try:
+            config = parse_config(raw)
+        except Exception as e:
+            logger.warning("Config %s inválida, se usa la por defecto: %s", record.get("id"), e)
+            evaluator = self.evaluator()
+        else:
+            evaluator = self.evaluator(config)
+        self._active = (raw, evaluator, record.get("id") or "")
+        return evaluator
+
+    @property
+    def active_config_id(self) -> str:
+        """ID del registro de la config activa en uso ("default" si no hay)."""
+        active = self._active
+        return active[2] if active is not None else "default"
+
+    # =========================================================================
+    # Ciclo de vida
+    # =========================================================================
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "airtable": self._airtable is not None,
+            "openai": self._openai is not None,
+            "pdf_extractor": self._pdf_extractor is not None,
+            "evaluators": len(self._evaluators),
+            "active_config": self.active_config_id
+        }
+
+    def reset(self) -> None:
+        """Descarta las instancias (se vuelven a crear desde el entorno)."""
+        with self._lock:
+            client, self._openai = self._openai, None
+            self._airtable = None
+            self._pdf_extractor = None
+            self._evaluators.clear()
+            self._active = None
+        if client is not None:
+            client.close()
+
+    def close(self) -> None:
+        """Cierra el cliente de OpenAI (al cerrar la app)."""
+        self.reset()
+
+
+def parse_config(raw: str) -> "EvaluationConfig":
+    """
+    EvaluationConfig desde el `config_json` de Config_Evaluacion.
+
+    `create_config` guarda el body del POST (`{"config": {...}, "version", ...}`)
+    con `str()`, así que se acepta JSON o un literal de Python.
+
+    Raises:
+        ValueError: Si no se puede leer o no define categorías
+    """
+    from engine import EvaluationConfig
+
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        try:
+            data = ast.literal_eval(raw)
+        except (ValueError, SyntaxError) as e:
+            raise ValueError(f"config_json ilegible: {e}") from None
+    if not isinstance(data, dict):
+        raise ValueError("config_json no es un objeto")
+    config = EvaluationConfig(**data.get("config", data))
+    if not config.categories:
+        raise ValueError("la config no define categorías")
+    return config
+
+
+services = ServiceContainer()
+
+
+# ============================================================================
+# Dependencias de FastAPI
+# ============================================================================
+
+async def get_airtable_service() -> AirtableService:
+    """Dependency para obtener el servicio de Airtable."""
+    return services.airtable()
+
+
+async def get_evaluator() -> "CandidateEvaluator":
+    """Dependency para obtener el evaluador (configuración activa)."""
+    return await services.active_evaluator()
+
+
+async def get_pdf_extractor() -> "PDFExtractor":
+    """Dependency para obtener el extractor de PDFs."""
+    return services.pdf_extractor()
@@ -0,0 +1,410 @@
+"""
+Exportación de candidatos (con sus evaluaciones) en streaming.
+
+Los candidatos se leen de Airtable página por página (100 registros) y
+cada página se escribe apenas llega, junto con las evaluaciones de esa
+página pedidas en lote: la memoria no depende del tamaño del export.
+
+Las columnas se eligen por clave (ver `COLUMNS`); solo se piden a Airtable
+los campos de las columnas elegidas.
+
+Para analítica, `iter_parquet` escribe Postulaciones unidas con
+Evaluaciones_AI como Parquet (requiere pyarrow, opcional), acumulando a lo
+sumo un row group en memoria.
+"""
+
+import csv
+import io
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from .airtable import AirtableService
+
+
+@dataclass(frozen=True)
+class Column:
+    """Columna exportable: de dónde sale y con qué encabezado."""
+    key: str
+    header: str
+    source: str                      # "candidato" | "evaluacion"
+    fields: Tuple[str, ...] = ()     # Campos de Airtable que necesita
+    value: Optional[Callable[[Dict[str, Any]], Any]] = None
+
+    def get(self, record: Dict[str, Any]) -> Any:
+        if self.value is not None:
+            return self.value(record)
+        return record.get(self.key)
+
+
+def _candidate(key: str, header: str, *fields: str, value=None) -> Column:
+    return Column(key, header, "candidato", fields or (key,), value)
+
+
+def _evaluation(key: str, header: str) -> Column:
+    return Column(key, header, "evaluacion", (key,))
+
+
+COLUMNS: Dict[str, Column] = {c.key: c for c in [
+    _candidate("codigo_tracking", "Código Tracking"),
+    _candidate("nombre_completo", "Nombre"),
+    _candidate("email", "Email"),
+    _candidate("telefono", "Teléfono"),
+    _candidate("fecha_postulacion", "Fecha Postulación"),
+    _candidate("estado_candidato", "Estado"),
+    _candidate("cv_url", "CV URL", "cv_url", "cv_archivo"),
+    _candidate("score_ai", "Score AI"),
+    _candidate("tags", "Tags", value=lambda c: ", ".join(c.get("tags") or [])),
+    Column("created_at", "Creado", "candidato", ()),
+    _evaluation("score_promedio", "Score Promedio"),
+    _evaluation("score_admin", "Score Admin & Finanzas"),
+    _evaluation("score_ops", "Score Operaciones"),
+    _evaluation("score_biz", "Score Growth & Cultura"),
+    _evaluation("hands_on_index", "Hands-On Index"),
+    _evaluation("potential_score", "Potencial"),
+    _evaluation("retention_risk", "Riesgo Retención"),
+    _evaluation("profile_type", "Perfil"),
+    _evaluation("industry_tier", "Industria"),
+    _evaluation("updated_at", "Evaluado"),
+]}
+
+# Columnas del export histórico (antes de poder elegirlas)
+DEFAULT_COLUMNS = [
+    "codigo_tracking", "nombre_completo", "email", "telefono",
+    "fecha_postulacion", "estado_candidato", "cv_url"
+]
+
+
+def parse_columns(spec: Optional[str]) -> List[Column]:
+    """
+    `"nombre_completo,email,score_promedio"` → columnas. Vacío = DEFAULT_COLUMNS.
+
+    Raises:
+        ValueError: Si alguna clave no existe
+    """
+    keys = [k.strip() for k in (spec or "").split(",") if k.strip()] or DEFAULT_COLUMNS
+    unknown = [k for k in keys if k not in COLUMNS]
+    if unknown:
+        raise ValueError(f"Columnas desconocidas: {', '.join(unknown)}. Disponibles: {', '.join(COLUMNS)}")
+    return [COLUMNS[k] for k in keys]
+
+
+def _airtable_fields(columns: List[Column], source: str) -> List[str]:
+    fields = {f for c in columns if c.source == source for f in c.fields}
+    if source == "candidato":
+        # Necesario para unir con las evaluaciones
+        fields.add("codigo_tracking")
+    return sorted(fields)
+
+
+async def iter_rows(
+    airtable: AirtableService,
+    columns: List[Column],
+    proceso_id: Optional[str] = None,
+    codigo_proceso: Optional[str] = None,
+    filter_formula: Optional[str] = None
+) -> AsyncIterator[List[List[Any]]]:
+    """
+    Filas del export, una lista por página de Airtable.
+
+    Args:
+        airtable: Servicio de Airtable
+        columns: Columnas a exportar
+        proceso_id: Solo candidatos de este proceso
+        codigo_proceso: Código del proceso (para filtrar en Airtable)
+        filter_formula: Condición adicional sobre Postulaciones
+
+    Yields:
+        Filas (listas de valores en el orden de `columns`) de cada página
+    """
+    join = any(c.source == "evaluacion" for c in columns)
+    evaluation_fields = _airtable_fields(columns, "evaluacion")
+
+    async for candidatos in airtable.iter_candidatos(
+        proceso_id=proceso_id,
+        codigo_proceso=codigo_proceso,
+        filter_formula=filter_formula,
+        fields=_airtable_fields(columns, "candidato")
+    ):
+        evaluaciones: Dict[str, Dict[str, Any]] = {}
+        if join and candidatos:
+            evaluaciones = await airtable.get_evaluaciones_by_tracking(
+                [c.get("codigo_tracking") for c in candidatos], fields=evaluation_fields
+            )
+        rows = []
+        for c in candidatos:
+            evaluacion = evaluaciones.get(c.get("codigo_tracking")) or {}
+            rows.append([
+                col.get(c) if col.source == "candidato" else col.get(evaluacion)
+                for col in columns
+            ])
+        yield rows
+
+
+async def iter_csv(
+    airtable: AirtableService,
+    columns: List[Column],
+    **filters: Any
+) -> AsyncIterator[str]:
+    """CSV en chunks: el encabezado y luego un chunk por página de Airtable."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush() -> str:
+        chunk = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return chunk
+
+    writer.writerow([c.header for c in columns])
+    yield flush()
+    async for rows in iter_rows(airtable, columns, **filters):
+        writer.writerows(["" if v is None else v for v in row] for row in rows)
+        yield flush()
+
+
+# ============================================================================
+# Parquet para analítica
+# ============================================================================
+
+# Filas por row group: lo que se acumula en memoria antes de escribir
+ANALYTICS_ROW_GROUP = 10_000
+
+# Campos de Airtable que usa el export analítico
+_ANALYTICS_CANDIDATE_FIELDS = [
+    "codigo_tracking", "nombre_completo", "email", "estado_candidato",
+    "fecha_postulacion", "score_ai", "tags", "proceso", "cargo"
+]
+_ANALYTICS_EVALUATION_FIELDS = [
+    "score_promedio", "score_admin", "score_ops", "score_biz", "hands_on_index",
+    "potential_score", "retention_risk", "profile_type", "industry_tier",
+    "keywords_found_admin", "keywords_found_ops", "keywords_found_biz",
+    "config_version", "updated_at"
+]
+
+
+def analytics_schema():
+    """Schema Arrow de una fila: postulación + su evaluación (nulos si no tiene)."""
+    import pyarrow as pa
+
+    keywords = pa.list_(pa.string())
+    return pa.schema([
+        ("candidato_id", pa.string()),
+        ("codigo_tracking", pa.string()),
+        ("nombre_completo", pa.string()),
+        ("email", pa.string()),
+        ("estado_candidato", pa.string()),
+        ("fecha_postulacion", pa.date32()),
+        ("created_at", pa.timestamp("s", tz="UTC")),
+        ("proceso_id", pa.string()),
+        ("cargo_id", pa.string()),
+        ("score_ai", pa.float64()),
+        ("tags", pa.list_(pa.string())),
+        ("evaluacion_id", pa.string()),
+        ("score_promedio", pa.float64()),
+        ("score_admin", pa.float64()),
+        ("score_ops", pa.float64()),
+        ("score_biz", pa.float64()),
+        ("hands_on_index", pa.float64()),
+        ("potential_score", pa.float64()),
+        ("retention_risk", pa.string()),
+        ("profile_type", pa.string()),
+        ("industry_tier", pa.string()),
+        ("keywords_admin", keywords),
+        ("keywords_ops", keywords),
+        ("keywords_biz", keywords),
+        ("config_version", pa.string()),
+        ("evaluated_at", pa.timestamp("s", tz="UTC")),
+    ])
+
+
+def _first(value: Any) -> Optional[str]:
+    if isinstance(value, list):
+        return value[0] if value else None
+    return value or None
+
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _date(value: Any):
+    from datetime import date
+    try:
+        return date.fromisoformat(str(value)[:10]) if value else None
+    except ValueError:
+        return None
+
+
+def _timestamp(value: Any):
+    from datetime import datetime
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")) if value else None
+    except ValueError:
+        return None
+
+
+def _keywords(value: Any) -> Optional[List[str]]:
+    if not value:
+        return None
+    return [k.strip() for k in str(value).split(",") if k.strip()]
+
+
+def analytics_row(candidato: Dict[str, Any], evaluacion: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Fila del export analítico a partir de los dicts formateados por AirtableService."""
+    e = evaluacion or {}
+    return {
+        "candidato_id": candidato.get("id"),
+        "codigo_tracking": candidato.get("codigo_tracking") or None,
+        "nombre_completo": candidato.get("nombre_completo") or None,
+        "email": candidato.get("email") or None,
+        "estado_candidato": candidato.get("estado_candidato") or None,
+        "fecha_postulacion": _date(candidato.get("fecha_postulacion")),
+        "created_at": _timestamp(candidato.get("created_at")),
+        "proceso_id": _first(candidato.get("proceso")),
+        "cargo_id": _first(candidato.get("cargo")),
+        "score_ai": _number(candidato.get("score_ai")),
+        "tags": candidato.get("tags") or None,
+        "evaluacion_id": e.get("id"),
+        "score_promedio": _number(e.get("score_promedio")),
+        "score_admin": _number(e.get("score_admin")),
+        "score_ops": _number(e.get("score_ops")),
+        "score_biz": _number(e.get("score_biz")),
+        "hands_on_index": _number(e.get("hands_on_index")),
+        "potential_score": _number(e.get("potential_score")),
+        "retention_risk": e.get("retention_risk"),
+        "profile_type": e.get("profile_type"),
+        "industry_tier": e.get("industry_tier"),
+        "keywords_admin": _keywords(e.get("keywords_found_admin")),
+        "keywords_ops": _keywords(e.get("keywords_found_ops")),
+        "keywords_biz": _keywords(e.get("keywords_found_biz")),
+        "config_version": e.get("config_version"),
+        "evaluated_at": _timestamp(e.get("updated_at")) if e else None,
+    }
+
+
+def date_range_filter(desde: Optional[str] = None, hasta: Optional[str] = None) -> Optional[str]:
+    """
+    Fórmula sobre fecha_postulacion (YYYY-MM-DD, ambos extremos inclusive).
+
+    Raises:
+        ValueError: Si `desde` o `hasta` no es una fecha YYYY-MM-DD válida
+    """
+    conditions = []
+    if desde:
+        conditions.append(f"NOT(IS_BEFORE({{fecha_postulacion}}, '{_filter_date('desde', desde)}'))")
+    if hasta:
+        conditions.append(f"NOT(IS_AFTER({{fecha_postulacion}}, '{_filter_date('hasta', hasta)}'))")
+    if not conditions:
+        return None
+    return f"AND({{fecha_postulacion}}, {', '.join(conditions)})"
+
+
+def _filter_date(name: str, value: str) -> str:
+    from datetime import date
+    try:
+        return date.fromisoformat(str(value)).isoformat()
+    except ValueError:
+        raise ValueError(f"Fecha inválida en '{name}': {value!r} (formato esperado YYYY-MM-DD)") from None
+
+
+class _ChunkSink:
+    """Archivo de solo escritura para ParquetWriter que acumula lo escrito hasta `drain()`."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def iter_parquet(
+    airtable: AirtableService,
+    proceso_id: Optional[str] = None,
+    codigo_proceso: Optional[str] = None,
+    desde: Optional[str] = None,
+    hasta: Optional[str] = None,
+    row_group_size: int = ANALYTICS_ROW_GROUP,
+    compression: str = "zstd"
+) -> AsyncIterator[bytes]:
+    """
+    Postulaciones unidas con Evaluaciones_AI como Parquet, en chunks.
+
+    Se lee Airtable página por página y se escribe un row group cada
+    `row_group_size` filas, así la memoria queda acotada por el row group y
+    no por el total exportado.
+
+    Requiere pyarrow (ImportError si no está instalado).
+
+    Args:
+        airtable: Servicio de Airtable
+        proceso_id: Solo postulaciones de este proceso
+        codigo_proceso: Código del proceso (para filtrar en Airtable)
+        desde: Fecha de postulación mínima (YYYY-MM-DD)
+        hasta: Fecha de postulación máxima (YYYY-MM-DD)
+        row_group_size: Filas por row group
+        compression: Códec de Parquet
+
+    Yields:
+        Bytes del archivo Parquet
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = analytics_schema()
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression=compression)
+    pending: List[Dict[str, Any]] = []
+
+    def write_pending() -> bytes:
+        writer.write_table(pa.Table.from_pylist(pending, schema=schema))
+        pending.clear()
+        return sink.drain()
+
+    try:
+        async for candidatos in airtable.iter_candidatos(
+            proceso_id=proceso_id,
+            codigo_proceso=codigo_proceso,
+            filter_formula=date_range_filter(desde, hasta),
+            fields=_ANALYTICS_CANDIDATE_FIELDS
+        ):
+            if not candidatos:
+                continue
+            evaluaciones = await airtable.get_evaluaciones_by_tracking(
+                [c.get("codigo_tracking") for c in candidatos], fields=_ANALYTICS_EVALUATION_FIELDS
+            )
+            pending.extend(analytics_row(c, evaluaciones.get(c.get("codigo_tracking"))) for c in candidatos)
+            if len(pending) >= row_group_size:
+                yield write_pending()
+        if pending:
+            yield write_pending()
+    finally:
+        writer.close()
+    yield sink.drain()
@@ -0,0 +1,213 @@
+"""
+Servir blobs (CVs) por HTTP con validadores de caché y rangos.
+
+`serve_blob` responde desde el índice en memoria del store (sin
+`exists()`/`resolve()` por request) con:
+
+- ETag fuerte: el SHA-256 del contenido (la propia clave en los blobs por
+  contenido; en los nombres anteriores se calcula una vez y queda en el
+  índice). `If-None-Match` responde 304 sin abrir el archivo
+- `Cache-Control: private, max-age=31536000, immutable` en las claves por
+  contenido (la URL cambia si cambia el archivo); `no-cache` (revalidar
+  con el ETag) en los nombres anteriores. `private` porque son datos
+  personales: ningún proxy compartido debe guardarlos
+- Range de un solo tramo (`bytes=a-b`, `a-`, `-n`) → 206, con If-Range;
+  varios tramos se responden completos (200), como permite RFC 9110
+- Transferencia sin copia cuando el servidor ASGI la ofrece: la extensión
+  `http.response.zerocopysend` (sendfile del fd, también para rangos) o
+  `http.response.pathsend`. Si no (uvicorn), el archivo se lee con
+  `os.pread` por chunks de 256 KiB en un thread, sin mover el cursor
+"""
+
+import logging
+import os
+import re
+from email.utils import formatdate
+from typing import Optional, Tuple
+from urllib.parse import quote
+
+import anyio
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, Response
+from starlette.types import Receive, Scope, Send
+
+from .blobs import CHUNK_SIZE, BlobNotFound, BlobStore, LocalBlob, content_type_for, is_content_addressed
+
+logger = logging.getLogger(__name__)
+
+
+IMMUTABLE = "private, max-age=31536000, immutable"
+REVALIDATE = "private, no-cache"
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeNotSatisfiable(Exception):
+    """El rango pedido empieza después del final del archivo."""
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Tramo pedido en un header Range, como (inicio, fin) inclusivo.
+
+    Returns:
+        None si no hay Range, es inválido o pide varios tramos (→ 200 completo)
+
+    Raises:
+        RangeNotSatisfiable: Si el tramo no se puede servir (→ 416)
+    """
+    match = _RANGE.match((header or "").strip())
+    if not match or not (match.group(1) or match.group(2)):
+        return None
+    first, last = match.group(1), match.group(2)
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if last and int(last) < start:
+            return None
+    else:
+        # Sufijo: los últimos n bytes
+        if int(last) == 0:
+            raise RangeNotSatisfiable()
+        start, end = max(size - int(last), 0), size - 1
+    if start >= size:
+        raise RangeNotSatisfiable()
+    return start, end
+
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Comparación débil (If-None-Match): se ignora el prefijo W/
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+class BlobFileResponse(Response):
+    """Respuesta con el contenido (o un tramo) de un archivo ya abierto."""
+
+    def __init__(self, blob: LocalBlob, file, status_code: int = 200, headers: Optional[dict] = None,
+                 media_type: Optional[str] = None, byte_range: Optional[Tuple[int, int]] = None):
+        self.blob = blob
+        self.file = file
+        self.status_code = status_code
+        self.media_type = media_type
+        self.background = None
+        self.start, end = byte_range or (0, blob.size - 1)
+        self.length = max(end - self.start + 1, 0)
+        self.init_headers(headers)
+        self.headers["content-length"] = str(self.length)
+        if byte_range is not None:
+            self.headers["content-range"] = f"bytes {self.start}-{end}/{blob.size}"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+            if scope["method"].upper() == "HEAD" or self.length == 0:
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+                return
+
+            extensions = scope.get("extensions") or {}
+            if "http.response.zerocopysend" in extensions:
+                await send({"type": "http.response.zerocopysend", "file": self.file,
+                            "offset": self.start, "count": self.length, "more_body": False})
+            elif "http.response.pathsend" in extensions and self.status_code == 200:
+                await send({"type": "http.response.pathsend", "path": str(self.blob.path)})
+            else:
+                spec_version = tuple(map(int, scope.get("asgi", {}).get("spec_version", "2.0").split(".")))
+                if spec_version >= (2, 4):
+                    # El servidor avisa la desconexión con OSError en send
+                    await self._send_chunks(send)
+                else:
+                    await self._send_until_disconnect(receive, send)
+        finally:
+            self.file.close()
+
+    async def _send_chunks(self, send: Send) -> None:
+        fd = self.file.fileno()
+        offset, remaining = self.start, self.length
+        while remaining > 0:
+            chunk = await anyio.to_thread.run_sync(os.pread, fd, min(CHUNK_SIZE, remaining), offset)
+            if not chunk:
+                break
+            offset += len(chunk)
+            remaining -= len(chunk)
+            await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+        if remaining > 0:
+            # El archivo se achicó mientras se enviaba: cerrar el body igual
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    async def _send_until_disconnect(self, receive: Receive, send: Send) -> None:
+        """Deja de leer el archivo apenas el cliente se desconecta."""
+        async with anyio.create_task_group() as tg:
+            async def stream() -> None:
+                await self._send_chunks(send)
+                tg.cancel_scope.cancel()
+
+            tg.start_soon(stream)
+            while True:
+                if (await receive())["type"] == "http.disconnect":
+                    tg.cancel_scope.cancel()
+                    break
+
+
+async def _open(store: BlobStore, key: str) -> Tuple[LocalBlob, object]:
+    """Entrada del índice y archivo abierto. Si el índice quedó viejo, se reintenta una vez."""
+    for attempt in (1, 2):
+        blob = await store.local_file(key)
+        try:
+            return blob, open(blob.path, "rb", buffering=0)
+        except FileNotFoundError:
+            # Borrado o descartado de la caché por fuera del índice
+            store.forget(key)
+            if attempt == 2:
+                raise BlobNotFound(key)
+
+
+async def serve_blob(request: Request, store: BlobStore, key: str, filename: Optional[str] = None) -> Response:
+    """
+    Respuesta HTTP para el blob `key`.
+
+    Args:
+        request: Request (Range, If-None-Match, If-Range, método)
+        store: Store del blob
+        key: Clave
+        filename: Nombre de la descarga (Content-Disposition); por defecto la clave
+
+    Raises:
+        BlobNotFound: Si el blob no existe (→ 404)
+    """
+    blob = await store.local_file(key)
+    etag = f'"{await blob.content_sha256()}"'
+    headers = {
+        "etag": etag,
+        "last-modified": formatdate(blob.mtime, usegmt=True),
+        "cache-control": IMMUTABLE if is_content_addressed(key) else REVALIDATE,
+        "accept-ranges": "bytes"
+    }
+
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    name = filename or key
+    quoted = quote(name)
+    headers["content-disposition"] = (f"attachment; filename*=utf-8''{quoted}" if quoted != name
+                                      else f'attachment; filename="{name}"')
+
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    if if_range is None or if_range.strip() in (etag, headers["last-modified"]):
+        try:
+            byte_range = parse_range(request.headers.get("range"), blob.size)
+        except RangeNotSatisfiable:
+            return PlainTextResponse(status_code=416, headers={**headers, "content-range": f"bytes */{blob.size}"})
+
+    blob, file = await _open(store, key)
+    return BlobFileResponse(
+        blob, file,
+        status_code=206 if byte_range else 200,
+        headers=headers,
+        media_type=content_type_for(key),
+        byte_range=byte_range
+    )
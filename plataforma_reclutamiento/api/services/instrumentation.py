@@ -0,0 +1,255 @@
+"""
+Instrumentación por request: llamadas a Airtable/OpenAI y latencia.
+
+Cada request HTTP abre un `RequestMetrics` en un contextvar. Los spans de
+`engine.telemetry` (AirtableService, wrappers de OpenAI, extractores) se
+acumulan ahí por servicio y recurso (tabla / modelo): llamadas, bytes,
+reintentos, errores y tiempo. Al terminar el request:
+
+- Se agrega un header `Server-Timing` (visible en DevTools)
+- Se loguea una línea estructurada con el resumen (logger `api.metrics`)
+- Se acumula en `registry` por endpoint, expuesto en `/api/metrics`
+
+El middleware también fija el `request_id` (header `X-Request-ID` entrante
+o uno nuevo) para que todas las líneas de log del request lo incluyan, y
+lo devuelve en la respuesta.
+
+Así un N+1 (p.ej. 60 llamadas a Airtable en /api/candidates/stats) se ve
+en la primera respuesta.
+"""
+
+import logging
+import re
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any, Dict, List, Optional
+
+from engine import telemetry
+
+from .logging_setup import new_request_id, request_id_var
+
+logger = logging.getLogger("api.metrics")
+
+# ============================================================================
+# Métricas de un request
+# ============================================================================
+
+@dataclass(slots=True)
+class CallStats:
+    """Acumulado de llamadas a un recurso externo."""
+    calls: int = 0
+    errors: int = 0
+    retries: int = 0
+    bytes_out: int = 0
+    bytes_in: int = 0
+    tokens: int = 0
+    seconds: float = 0.0
+
+    def add(self, span: telemetry.Span) -> None:
+        attrs = span.attrs
+        self.calls += 1
+        self.errors += 1 if span.error or attrs.get("status", 200) >= 400 else 0
+        self.retries += attrs.get("retries", 0)
+        self.bytes_out += attrs.get("bytes_out", 0)
+        self.bytes_in += attrs.get("bytes_in", 0)
+        self.tokens += attrs.get("tokens_in", 0) + attrs.get("tokens_out", 0)
+        self.seconds += span.duration
+
+    def merge(self, other: "CallStats") -> None:
+        self.calls += other.calls
+        self.errors += other.errors
+        self.retries += other.retries
+        self.bytes_out += other.bytes_out
+        self.bytes_in += other.bytes_in
+        self.tokens += other.tokens
+        self.seconds += other.seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "retries": self.retries,
+            "bytes_out": self.bytes_out,
+            "bytes_in": self.bytes_in,
+            "tokens": self.tokens,
+            "ms": round(self.seconds * 1000, 1)
+        }
+
+
+@dataclass(slots=True)
+class RequestMetrics:
+    """Llamadas externas de un request, por (servicio, recurso)."""
+    method: str = ""
+    path: str = ""
+    started: float = field(default_factory=time.perf_counter)
+    calls: Dict[tuple, CallStats] = field(default_factory=dict)
+
+    def record(self, span: telemetry.Span) -> None:
+        key = (span.kind, span.name)
+        stats = self.calls.get(key)
+        if stats is None:
+            stats = self.calls[key] = CallStats()
+        stats.add(span)
+
+    def by_kind(self) -> Dict[str, CallStats]:
+        """Totales por servicio (airtable, openai...)."""
+        totals: Dict[str, CallStats] = {}
+        for (kind, _), stats in self.calls.items():
+            totals.setdefault(kind, CallStats()).merge(stats)
+        return totals
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+
+_current: ContextVar[Optional[RequestMetrics]] = ContextVar("request_metrics", default=None)
+
+
+def current() -> Optional[RequestMetrics]:
+    """Métricas del request en curso (None fuera de un request)."""
+    return _current.get()
+
+
+def _observe(span: telemetry.Span) -> None:
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.record(span)
+
+
+telemetry.add_observer(_observe)
+
+
+# ============================================================================
+# Agregado por endpoint
+# ============================================================================
+
+class MetricsRegistry:
+    """Agregado en memoria por endpoint (método + ruta), para /api/metrics."""
+
+    # Muestras de latencia que se guardan por endpoint para percentiles
+    MAX_SAMPLES = 512
+
+    def __init__(self):
+        self._lock = Lock()
+        self._endpoints: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, endpoint: str, status: int, metrics: RequestMetrics, elapsed_ms: float) -> None:
+        with self._lock:
+            entry = self._endpoints.get(endpoint)
+            if entry is None:
+                entry = self._endpoints[endpoint] = {
+                    "requests": 0, "errors": 0, "total_ms": 0.0, "samples": [], "calls": {}
+                }
+            entry["requests"] += 1
+            entry["errors"] += 1 if status >= 500 else 0
+            entry["total_ms"] += elapsed_ms
+            samples: List[float] = entry["samples"]
+            if len(samples) >= self.MAX_SAMPLES:
+                samples.pop(0)
+            samples.append(elapsed_ms)
+            for (kind, name), stats in metrics.calls.items():
+                entry["calls"].setdefault(f"{kind}:{name}", CallStats()).merge(stats)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            result = {}
+            for endpoint, entry in sorted(self._endpoints.items()):
+                samples = sorted(entry["samples"])
+                n = entry["requests"]
+                result[endpoint] = {
+                    "requests": n,
+                    "errors": entry["errors"],
+                    "avg_ms": round(entry["total_ms"] / n, 1),
+                    "p50_ms": round(samples[len(samples) // 2], 1) if samples else 0.0,
+                    "p95_ms": round(samples[min(int(len(samples) * 0.95), len(samples) - 1)], 1) if samples else 0.0,
+                    "external": {
+                        key: {**stats.to_dict(), "calls_per_request": round(stats.calls / n, 2)}
+                        for key, stats in sorted(entry["calls"].items())
+                    }
+                }
+            return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints.clear()
+
+
+registry = MetricsRegistry()
+
+
+# ============================================================================
+# Middleware
+# ============================================================================
+
+_TOKEN_RE = re.compile(r"[^A-Za-z0-9_-]+")
+
+
+def server_timing(metrics: RequestMetrics, total_ms: float) -> str:
+    """
+    Header Server-Timing: total, un ítem por servicio y uno por recurso.
+
+    Ej: `total;dur=532.1, airtable;dur=480.2;desc="41 calls", airtable_Postulaciones;dur=...`
+    """
+    items = [f"total;dur={total_ms:.1f}"]
+    for kind, stats in metrics.by_kind().items():
+        items.append(f'{kind};dur={stats.seconds * 1000:.1f};desc="{stats.calls} calls"')
+    for (kind, name), stats in metrics.calls.items():
+        token = _TOKEN_RE.sub("_", f"{kind}.{name}")
+        items.append(f'{token};dur={stats.seconds * 1000:.1f};desc="{stats.calls} calls"')
+    return ", ".join(items)
+
+
+def _endpoint_name(request) -> str:
+    """Template de la ruta (/api/candidates/{candidate_id}), no la URL concreta."""
+    template = getattr(request.scope.get("route"), "path", None)
+    if not template:
+        return ""
+    # Las rutas de routers incluidos no traen el prefijo (/api): se toma de la URL
+    segments = request.url.path.rstrip("/").split("/")
+    depth = template.rstrip("/").count("/")
+    return "/".join(segments[:len(segments) - depth]) + template
+
+
+async def instrumentation_middleware(request, call_next):
+    """
+    Middleware HTTP: abre las métricas del request, agrega Server-Timing
+    y registra el resumen. Registrar con `app.middleware("http")`.
+
+    El request completo es un span "http" (raíz de la traza si hay
+    OpenTelemetry configurado); su nombre se fija al template de la ruta
+    al terminar, cuando ya se resolvió el routing.
+    """
+    metrics = RequestMetrics(method=request.method, path=request.url.path)
+    request_id = request.headers.get("x-request-id") or new_request_id()
+    request_id_token = request_id_var.set(request_id[:64])
+    with telemetry.span("http", request.url.path, method=request.method) as span:
+        token = _current.set(metrics)
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            total_ms = metrics.elapsed_ms()
+            response.headers["Server-Timing"] = server_timing(metrics, total_ms)
+            response.headers["X-Request-ID"] = request_id_var.get()
+            return response
+        finally:
+            _current.reset(token)
+            total_ms = metrics.elapsed_ms()
+            # Rutas sin match (404) se agrupan para no crear una serie por URL
+            route = _endpoint_name(request) or "<unmatched>"
+            span.name = route
+            span.set(status=status)
+            
+            if request.url.path.startswith("/api/") and request.url.path != "/api/metrics":
+                endpoint = f"{request.method} {route}"
+                registry.add(endpoint, status, metrics, total_ms)
+                summary = {
+                    "endpoint": endpoint,
+                    "status": status,
+                    "ms": round(total_ms, 1),
+                    **{kind: stats.to_dict() for kind, stats in metrics.by_kind().items()}
+                }
+                logger.info("%s %s %.1fms", endpoint, status, total_ms, extra=summary)
+            request_id_var.reset(request_id_token)
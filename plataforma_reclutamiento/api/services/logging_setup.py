@@ -0,0 +1,232 @@
+"""
+Configuración de logging de la API y del motor.
+
+Los módulos usan `logging.getLogger(__name__)`; acá se configura el root:
+
+- Salida JSON (una línea por evento, con los campos `extra` como claves) o
+  texto legible para desarrollo
+- Handler no bloqueante: los records van a una cola y un thread
+  (QueueListener) los escribe, así el event loop no espera a stdout
+- Niveles por módulo. httpx y httpcore quedan en WARNING por defecto: en
+  INFO loguean la URL completa de cada llamada a Airtable, y los
+  `filterByFormula` llevan emails de candidatos y usuarios
+- `request_id` en cada línea emitida durante un request
+- Rate limit de DEBUG por mensaje, para que un loop no inunde el log
+
+Variables de entorno:
+    LOG_FORMAT=json|text          (default: json)
+    LOG_LEVEL=INFO
+    LOG_LEVELS=engine=WARNING,api.services.airtable=DEBUG   (pisan DEFAULT_LEVELS)
+    LOG_DEBUG_RATE=20             (máx. DEBUG por mensaje cada 10 s; 0 = sin límite)
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+
+
+def new_request_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+# Atributos estándar de LogRecord: lo demás viene de `extra=` y va al JSON
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "request_id", "taskName"}
+
+
+# ============================================================================
+# Filtros y formatters
+# ============================================================================
+
+class RequestIdFilter(logging.Filter):
+    """Agrega `record.request_id` (se evalúa en el thread que loguea, no en el listener)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class DebugRateLimitFilter(logging.Filter):
+    """
+    Limita los DEBUG a `rate` por mensaje (logger + template) cada `window` s.
+
+    Al abrirse una nueva ventana, el primer record lleva `suppressed` con
+    cuántos se descartaron en la anterior.
+    """
+
+    def __init__(self, rate: int = 20, window: float = 10.0):
+        super().__init__()
+        self.rate = rate
+        self.window = window
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, str], list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or self.rate <= 0:
+            return True
+        key = (record.name, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is None or now - counter[0] >= self.window:
+                suppressed = counter[2] if counter else 0
+                self._counters[key] = [now, 1, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+                return True
+            if counter[1] < self.rate:
+                counter[1] += 1
+                return True
+            counter[2] += 1
+            return False
+
+
+class JsonFormatter(logging.Formatter):
+    """Una línea JSON por record, con los campos de `extra`."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "msg": record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED and not key.startswith("_"):
+                data[key] = value
+        if record.exc_info:
+            data["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            data["exc"] = record.exc_text
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Formato legible para desarrollo: `HH:MM:SS LEVEL logger [request_id] msg k=v`."""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-5s %(name)s [%(request_id)s] %(message)s", "%H:%M:%S")
+
+    def format(self, record: logging.LogRecord) -> str:
+        if not hasattr(record, "request_id"):
+            record.request_id = "-"
+        line = super().format(record)
+        extras = {k: v for k, v in vars(record).items() if k not in _RESERVED and not k.startswith("_")}
+        if extras:
+            line += " " + " ".join(f"{k}={v}" for k, v in extras.items())
+        return line
+
+
+# ============================================================================
+# Configuración
+# ============================================================================
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+# Niveles por logger que aplican salvo que LOG_LEVELS (o `levels`) diga otra cosa
+DEFAULT_LEVELS = {"httpx": "WARNING", "httpcore": "WARNING"}
+
+
+def parse_levels(spec: str) -> Dict[str, str]:
+    """`engine=WARNING,api.routes=DEBUG` → {"engine": "WARNING", "api.routes": "DEBUG"}."""
+    levels = {}
+    for item in spec.split(","):
+        if "=" in item:
+            name, level = item.split("=", 1)
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def configure_logging(
+    fmt: Optional[str] = None,
+    level: Optional[str] = None,
+    levels: Optional[Dict[str, str]] = None,
+    debug_rate: Optional[int] = None,
+    stream=None
+) -> None:
+    """
+    Configura el logging del proceso (idempotente; los argumentos pisan las
+    variables de entorno).
+
+    Args:
+        fmt: "json" o "text"
+        level: Nivel del root
+        levels: Niveles por logger (se suman a DEFAULT_LEVELS y los pisan)
+        debug_rate: Máximo de DEBUG por mensaje cada 10 s (0 = sin límite)
+        stream: Destino (default: stdout)
+    """
+    global _listener
+    if _listener is not None:
+        shutdown_logging()
+
+    fmt = (fmt or os.getenv("LOG_FORMAT", "json")).lower()
+    level = (level or os.getenv("LOG_LEVEL", "INFO")).upper()
+    if levels is None:
+        levels = parse_levels(os.getenv("LOG_LEVELS", ""))
+    if debug_rate is None:
+        debug_rate = int(os.getenv("LOG_DEBUG_RATE", "20"))
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter())
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = _QueueHandler(log_queue)
+    queue_handler.addFilter(RequestIdFilter())
+    queue_handler.addFilter(DebugRateLimitFilter(rate=debug_rate))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+    # multiprocessing no se usa: evita un lookup en sys.modules por record
+    logging.logMultiprocessing = False
+    for name, logger_level in {**DEFAULT_LEVELS, **levels}.items():
+        logging.getLogger(name).setLevel(logger_level)
+
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=False)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Vacía la cola y detiene el listener."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler que conserva los campos `extra` y `request_id`.
+
+    El `prepare()` estándar formatea el mensaje y descarta args/exc_info;
+    acá solo se resuelve el mensaje y el traceback a texto, dejando el resto
+    de los atributos para el formatter del listener. El record se modifica
+    en el lugar (es el único handler del root): copiarlo duplicaba el costo
+    de cada línea de log.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
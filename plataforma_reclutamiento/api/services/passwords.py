@@ -0,0 +1,235 @@
+"""
+Hash de contraseñas fuera del event loop.
+
+El esquema actual es scrypt (stdlib, sin dependencias): ~100 ms de CPU y
+32 MB por hash con los parámetros por defecto. Hecho en línea bloquearía
+el event loop ese tiempo en cada login, así que corre en un
+ThreadPoolExecutor acotado (hashlib.scrypt libera el GIL). El tamaño del
+pool limita también la memoria usada por logins simultáneos.
+
+Esquemas soportados (se reconocen por el formato del hash guardado):
+- `scrypt`: `$scrypt$n=32768,r=8,p=1$<salt>$<hash>` (base64)
+- `sha256`: el hash anterior, SHA-256 hex de contraseña + PASSWORD_SALT.
+  Solo se verifica; al entrar con uno se re-hashea con el esquema actual
+
+También se re-hashea si el hash es scrypt con parámetros más bajos que
+los configurados, así subir PASSWORD_SCRYPT_N migra a los usuarios a
+medida que entran.
+
+Todo login fallido cuesta un KDF del esquema actual (email inexistente o
+contraseña incorrecta, también contra un hash sha256), así el tiempo de
+respuesta no revela qué cuentas existen.
+
+Variables de entorno:
+    PASSWORD_HASH_WORKERS=4     (threads; 0 = en el event loop, solo para comparar)
+    PASSWORD_SCRYPT_N=32768
+    PASSWORD_SALT=...           (solo para verificar hashes sha256 anteriores)
+"""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import logging
+import os
+import re
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from engine import telemetry
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordScheme:
+    """Un formato de hash de contraseñas."""
+
+    name = "base"
+
+    def identify(self, stored: str) -> bool:
+        raise NotImplementedError
+
+    def hash(self, password: str) -> str:
+        raise NotImplementedError
+
+    def verify(self, password: str, stored: str) -> bool:
+        raise NotImplementedError
+
+    def needs_update(self, stored: str) -> bool:
+        return False
+
+
+class ScryptScheme(PasswordScheme):
+    """scrypt con salt aleatorio por usuario y parámetros en el hash."""
+
+    name = "scrypt"
+
+    _FORMAT = re.compile(r"^\$scrypt\$n=(\d+),r=(\d+),p=(\d+)\$([A-Za-z0-9+/=]+)\$([A-Za-z0-9+/=]+)$")
+
+    def __init__(self, n: int = 2 ** 15, r: int = 8, p: int = 1, salt_bytes: int = 16, dklen: int = 32):
+        self.n = n
+        self.r = r
+        self.p = p
+        self.salt_bytes = salt_bytes
+        self.dklen = dklen
+
+    @staticmethod
+    def _derive(password: str, salt: bytes, n: int, r: int, p: int, dklen: int) -> bytes:
+        # maxmem por encima de lo que usa scrypt (128 * r * n bytes)
+        return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p,
+                              maxmem=256 * r * n + 1024 * 1024, dklen=dklen)
+
+    def identify(self, stored: str) -> bool:
+        return stored.startswith("$scrypt$")
+
+    def hash(self, password: str) -> str:
+        salt = secrets.token_bytes(self.salt_bytes)
+        derived = self._derive(password, salt, self.n, self.r, self.p, self.dklen)
+        return "$scrypt$n=%d,r=%d,p=%d$%s$%s" % (
+            self.n, self.r, self.p, base64.b64encode(salt).decode(), base64.b64encode(derived).decode()
+        )
+
+    def verify(self, password: str, stored: str) -> bool:
+        match = self._FORMAT.match(stored)
+        if not match:
+            return False
+        n, r, p = (int(v) for v in match.group(1, 2, 3))
+        salt, expected = base64.b64decode(match.group(4)), base64.b64decode(match.group(5))
+        derived = self._derive(password, salt, n, r, p, len(expected))
+        return hmac.compare_digest(derived, expected)
+
+    def needs_update(self, stored: str) -> bool:
+        match = self._FORMAT.match(stored)
+        if not match:
+            return True
+        n, r, p = (int(v) for v in match.group(1, 2, 3))
+        return (n, r, p) < (self.n, self.r, self.p)
+
+
+class LegacySha256Scheme(PasswordScheme):
+    """SHA-256 hex de contraseña + salt global (solo verificación)."""
+
+    name = "sha256"
+
+    _FORMAT = re.compile(r"^[0-9a-f]{64}$")
+
+    def __init__(self, salt: str = "neat-platform-salt"):
+        self.salt = salt
+
+    def identify(self, stored: str) -> bool:
+        return self._FORMAT.match(stored) is not None
+
+    def hash(self, password: str) -> str:
+        return hashlib.sha256(f"{password}{self.salt}".encode()).hexdigest()
+
+    def verify(self, password: str, stored: str) -> bool:
+        return hmac.compare_digest(self.hash(password), stored)
+
+    def needs_update(self, stored: str) -> bool:
+        return True
+
+
+class PasswordHasher:
+    """
+    Hashea y verifica contraseñas en un pool de threads acotado.
+
+    El primer esquema es con el que se hashea; los demás solo se verifican
+    y marcan el hash para actualizar.
+    """
+
+    def __init__(self, schemes: Tuple[PasswordScheme, ...], workers: int = 4):
+        self.schemes = schemes
+        self.workers = workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._dummy: Optional[str] = None
+        self.counts: Dict[str, int] = {}
+
+    @classmethod
+    def from_env(cls) -> "PasswordHasher":
+        return cls(
+            schemes=(
+                ScryptScheme(n=int(os.getenv("PASSWORD_SCRYPT_N", str(2 ** 15)))),
+                LegacySha256Scheme(os.getenv("PASSWORD_SALT", "neat-platform-salt")),
+            ),
+            workers=int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+        )
+
+    @property
+    def default(self) -> PasswordScheme:
+        return self.schemes[0]
+
+    def _scheme_for(self, stored: str) -> Optional[PasswordScheme]:
+        for scheme in self.schemes:
+            if scheme.identify(stored):
+                return scheme
+        return None
+
+    async def _run(self, fn, *args):
+        """Ejecuta `fn` en el pool (o en línea con workers=0)."""
+        if self.workers <= 0:
+            return fn(*args)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    # =========================================================================
+    # API
+    # =========================================================================
+
+    def hash_sync(self, password: str) -> str:
+        """Hash con el esquema actual, en el thread que llama (scripts)."""
+        return self.default.hash(password)
+
+    async def hash(self, password: str) -> str:
+        """Hash con el esquema actual."""
+        with telemetry.span("password", "hash", scheme=self.default.name):
+            return await self._run(self.default.hash, password)
+
+    async def verify(self, password: str, stored: Optional[str]) -> Tuple[bool, bool]:
+        """
+        Verifica la contraseña contra el hash guardado.
+
+        Args:
+            password: Contraseña ingresada
+            stored: Hash guardado (vacío/None si el usuario no existe o no tiene)
+
+        Returns:
+            (válida, actualizar). `actualizar` es True cuando la contraseña es
+            válida pero el hash guardado usa un esquema o parámetros viejos; el
+            nuevo hash se calcula aparte (`hash`), fuera del camino del login.
+        """
+        scheme = self._scheme_for(stored or "")
+        if scheme is None:
+            # Mismo costo que una verificación real: no revela si el email existe
+            await self._dummy_verify(password)
+            return False, False
+
+        self.counts[scheme.name] = self.counts.get(scheme.name, 0) + 1
+        with telemetry.span("password", "verify", scheme=scheme.name):
+            valid = await self._run(scheme.verify, password, stored)
+            if not valid:
+                if scheme is not self.default:
+                    # sha256 falla en microsegundos: sin esto un email existente con
+                    # hash viejo respondería mucho antes que uno inexistente
+                    await self._dummy_verify(password)
+                return False, False
+            return True, scheme.needs_update(stored)
+
+    async def _dummy_verify(self, password: str) -> None:
+        """Un KDF del esquema actual contra un hash de relleno (login fallido)."""
+        await self._run(self.default.verify, password, await self._dummy_hash())
+
+    async def _dummy_hash(self) -> str:
+        if self._dummy is None:
+            self._dummy = await self._run(self.default.hash, secrets.token_urlsafe(16))
+        return self._dummy
+
+    def shutdown(self) -> None:
+        """Libera los threads del pool (al cerrar la app)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher.from_env()
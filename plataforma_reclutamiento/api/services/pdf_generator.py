@@ -3,12 +3,22 @@ Generador de PDF para resumen de procesos de reclutamiento.
 """
 
 from fpdf import FPDF
-from typing import List, Dict, Any
+from collections import OrderedDict
+from typing import List, Dict, Any, Awaitable, Callable, Optional
 from datetime import datetime
+import asyncio
+import hashlib
+import logging
 import io
 import re
 import os
 
+from engine import telemetry
+
+from .container import services
+
+logger = logging.getLogger(__name__)
+
 
 def clean_text_for_pdf(text: str) -> str:
     """
@@ -98,39 +108,111 @@ def clean_text_for_pdf(text: str) -> str:
     return text
 
 
-async def summarize_comments_with_ai(comentarios: List[Dict], nombre_candidato: str) -> str:
+# ============================================================================
+# Resúmenes de comentarios con IA
+# ============================================================================
+
+SUMMARY_MODEL = "gpt-4o-mini"
+
+# Llamadas simultáneas a OpenAI por export
+SUMMARY_CONCURRENCY = int(os.getenv("PDF_SUMMARY_CONCURRENCY", "4"))
+
+
+class SummaryCache:
     """
-    Usa IA para resumir todos los comentarios de un candidato en un solo parrafo.
+    LRU en memoria de resúmenes, por hash del conjunto de comentarios.
+
+    Los exports repetidos del mismo proceso no vuelven a llamar a OpenAI
+    mientras los comentarios no cambien. Si dos exports piden el mismo
+    resumen a la vez, el segundo espera al primero en vez de duplicar la
+    llamada.
     """
-    if not comentarios:
-        return "Sin notas de entrevista."
-    
-    # Construir texto de comentarios
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._items: "OrderedDict[str, str]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    @property
+    def currsize(self) -> int:
+        return len(self._items)
+
+    def info(self) -> "SummaryCache":
+        """Compatible con `telemetry.register_cache` (hits, misses, currsize)."""
+        return self
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[Optional[str]]]) -> Optional[str]:
+        """
+        Resumen cacheado para `key`, o el resultado de `compute()`.
+
+        Un resultado None (fallo de OpenAI) se devuelve pero no se cachea.
+        """
+        if key in self._items:
+            self.hits += 1
+            self._items.move_to_end(key)
+            return self._items[key]
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.hits += 1
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await compute()
+            future.set_result(value)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Evita el warning de excepción nunca leída si nadie esperaba
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+        if value is not None:
+            self._items[key] = value
+            if len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        self._items.clear()
+        self.hits = self.misses = 0
+
+
+summary_cache = SummaryCache()
+telemetry.register_cache("comment_summaries", summary_cache.info)
+
+
+def human_comments(comentarios: List[Dict]) -> List[Dict]:
+    """Comentarios escritos por personas (excluye los automáticos del sistema)."""
+    return [c for c in comentarios if 'Sistema' not in c.get('autor', '')]
+
+
+def _combined_comments(comentarios: List[Dict]) -> str:
     all_comments = []
     for c in comentarios:
         autor = c.get('autor', 'Evaluador')
         texto = c.get('comentario', '')
         if texto:
             all_comments.append(f"{autor}: {texto}")
-    
-    if not all_comments:
-        return "Sin notas de entrevista."
-    
-    combined_text = "\n\n".join(all_comments)
-    
-    # Si es corto, no usar IA
-    if len(combined_text) < 300:
-        return clean_text_for_pdf(combined_text[:500])
-    
+    return "\n\n".join(all_comments)
+
+
+def _summarize_sync(combined_text: str, nombre_candidato: str) -> Optional[str]:
+    """Llamada bloqueante a OpenAI (corre en un thread). None si falla."""
     try:
-        from openai import OpenAI
-        
-        api_key = os.getenv("OPENAI_API") or os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            # Sin API key, retornar resumen manual
-            return clean_text_for_pdf(combined_text[:500] + "...")
-        
-        client = OpenAI(api_key=api_key)
+        # Cliente compartido: las conexiones se reutilizan entre resúmenes
+        client = services.openai()
+        if client is None:
+            return None
         
         prompt = f"""Resume las siguientes notas de entrevista sobre el candidato {nombre_candidato} en un solo parrafo conciso (maximo 150 palabras). 
 Destaca los puntos positivos y negativos mas importantes. No uses bullet points, escribe en prosa.
@@ -140,8 +222,10 @@ NOTAS:
 
 RESUMEN (en espanol, un solo parrafo):"""
         
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
+        response = telemetry.chat_completion(
+            client,
+            site="summarize_comments_with_ai",
+            model=SUMMARY_MODEL,
             messages=[{"role": "user", "content": prompt}],
             max_tokens=300,
             temperature=0.3
@@ -151,8 +235,77 @@ RESUMEN (en espanol, un solo parrafo):"""
         return clean_text_for_pdf(resumen)
         
     except Exception as e:
-        print(f"[WARN] Error resumiendo con IA: {e}")
-        return clean_text_for_pdf(combined_text[:500] + "...")
+        logger.warning("Error resumiendo con IA: %s", e)
+        return None
+
+
+async def summarize_comments_with_ai(comentarios: List[Dict], nombre_candidato: str) -> str:
+    """
+    Usa IA para resumir todos los comentarios de un candidato en un solo parrafo.
+
+    El resultado se cachea por hash de (modelo, candidato, comentarios); la
+    llamada a OpenAI corre en un thread para no bloquear el event loop.
+    """
+    if not comentarios:
+        return "Sin notas de entrevista."
+    
+    combined_text = _combined_comments(comentarios)
+    
+    if not combined_text:
+        return "Sin notas de entrevista."
+    
+    # Si es corto, no usar IA
+    if len(combined_text) < 300:
+        return clean_text_for_pdf(combined_text[:500])
+    
+    fallback = clean_text_for_pdf(combined_text[:500] + "...")
+    
+    api_key = os.getenv("OPENAI_API") or os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        # Sin API key, retornar resumen manual
+        return fallback
+    
+    key = hashlib.sha256(
+        "\x00".join((SUMMARY_MODEL, nombre_candidato, combined_text)).encode()
+    ).hexdigest()
+    resumen = await summary_cache.get_or_compute(
+        key, lambda: asyncio.to_thread(_summarize_sync, combined_text, nombre_candidato)
+    )
+    return resumen or fallback
+
+
+async def summarize_candidates(
+    candidatos: List[Dict[str, Any]],
+    comentarios: Dict[str, List[Dict[str, Any]]],
+    concurrency: int = SUMMARY_CONCURRENCY
+) -> Dict[str, str]:
+    """
+    Resume en paralelo las notas humanas de cada candidato (una vez por candidato).
+
+    Args:
+        candidatos: Candidatos a resumir (los repetidos se resumen una vez)
+        comentarios: Comentarios por ID de candidato
+        concurrency: Máximo de llamadas simultáneas a OpenAI
+
+    Returns:
+        Dict {candidato_id: resumen}, solo para candidatos con notas humanas
+    """
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    
+    async def summarize(candidato: Dict[str, Any], coms: List[Dict]) -> str:
+        async with semaphore:
+            nombre = clean_text_for_pdf(candidato.get('nombre_completo', 'N/A'))
+            return await summarize_comments_with_ai(coms, nombre)
+    
+    pending = {}
+    for candidato in candidatos:
+        cid = candidato['id']
+        coms = human_comments(comentarios.get(cid, []))
+        if coms and cid not in pending:
+            pending[cid] = summarize(candidato, coms)
+    
+    resumenes = await asyncio.gather(*pending.values())
+    return dict(zip(pending.keys(), resumenes))
 
 
 class ProcesoReportPDF(FPDF):
@@ -335,6 +488,26 @@ async def generate_proceso_pdf(
                 score_str = f" ({score})" if isinstance(score, (int, float)) else ""
                 pdf.cell(col_width - 2, col_height - 1, f"{nombre}{score_str}", border=1, align='L')
     
+    # Orden de las fichas: Finalistas > En Entrevista > En Revision > Descartados
+    en_revision = [c for c in candidatos if c.get('estado_candidato') in ['nuevo', 'en_revision']]
+    
+    # Ordenar cada grupo por score (mayor primero)
+    def get_score(c):
+        eval_data = evaluaciones.get(c['id'], {})
+        return eval_data.get('score_promedio', 0) or 0
+    
+    avanzan_sorted = sorted(avanzan, key=get_score, reverse=True)
+    entrevista_sorted = sorted(en_entrevista, key=get_score, reverse=True)
+    revision_sorted = sorted(en_revision, key=get_score, reverse=True)
+    rechazados_sorted = sorted(rechazados, key=get_score, reverse=True)
+    
+    # Todos los candidatos en orden de prioridad
+    candidatos_detalle = avanzan_sorted + entrevista_sorted + revision_sorted + rechazados_sorted
+    
+    # Resúmenes de notas con IA: todos de antemano, en paralelo y una vez por
+    # candidato (los de entrevista aparecen en la página 2 y en su ficha)
+    resumenes = await summarize_candidates(candidatos_detalle, comentarios)
+    
     # ==========================================================================
     # PAGINA 2: RESUMEN DE CANDIDATOS EN ENTREVISTA
     # ==========================================================================
@@ -345,10 +518,6 @@ async def generate_proceso_pdf(
         for candidato in en_entrevista:
             cid = candidato['id']
             eval_data = evaluaciones.get(cid, {})
-            coms = comentarios.get(cid, [])
-            
-            # Filtrar solo comentarios humanos
-            coms_humanos = [c for c in coms if 'Sistema' not in c.get('autor', '')]
             
             nombre = clean_text_for_pdf(candidato.get('nombre_completo', 'N/A'))
             score = eval_data.get('score_promedio', 0)
@@ -375,8 +544,8 @@ async def generate_proceso_pdf(
             pdf.cell(0, 5, f"Perfil: {profile}", ln=True)
             
             # Resumen de notas con IA
-            if coms_humanos:
-                resumen = await summarize_comments_with_ai(coms_humanos, nombre)
+            if cid in resumenes:
+                resumen = resumenes[cid]
                 pdf.set_font('Helvetica', '', 9)
                 pdf.set_text_color(60, 60, 60)
                 pdf.multi_cell(0, 5, resumen)
@@ -396,32 +565,13 @@ async def generate_proceso_pdf(
     # PAGINAS SIGUIENTES: FICHAS DE TODOS LOS CANDIDATOS
     # Orden: Finalistas > En Entrevista > En Revision > Descartados
     # ==========================================================================
-    en_revision = [c for c in candidatos if c.get('estado_candidato') in ['nuevo', 'en_revision']]
-    
-    # Ordenar cada grupo por score (mayor primero)
-    def get_score(c):
-        eval_data = evaluaciones.get(c['id'], {})
-        return eval_data.get('score_promedio', 0) or 0
-    
-    avanzan_sorted = sorted(avanzan, key=get_score, reverse=True)
-    entrevista_sorted = sorted(en_entrevista, key=get_score, reverse=True)
-    revision_sorted = sorted(en_revision, key=get_score, reverse=True)
-    rechazados_sorted = sorted(rechazados, key=get_score, reverse=True)
-    
-    # Todos los candidatos en orden de prioridad
-    candidatos_detalle = avanzan_sorted + entrevista_sorted + revision_sorted + rechazados_sorted
-    
     for candidato in candidatos_detalle:
         pdf.add_page()
         
         cid = candidato['id']
         eval_data = evaluaciones.get(cid, {})
-        coms = comentarios.get(cid, [])
         estado = candidato.get('estado_candidato', 'nuevo')
         
-        # Filtrar comentarios humanos
-        coms_humanos = [c for c in coms if 'Sistema' not in c.get('autor', '')]
-        
         # Header del candidato
         pdf.set_font('Helvetica', 'B', 18)
         pdf.set_text_color(30, 30, 30)
@@ -506,8 +656,8 @@ async def generate_proceso_pdf(
         # Resumen de notas (usando IA para consolidar)
         pdf.subsection_title('Resumen de Entrevistas')
         
-        if coms_humanos:
-            resumen = await summarize_comments_with_ai(coms_humanos, nombre)
+        if cid in resumenes:
+            resumen = resumenes[cid]
             pdf.set_font('Helvetica', '', 10)
             pdf.set_text_color(60, 60, 60)
             pdf.multi_cell(0, 5, resumen)
@@ -0,0 +1,305 @@
+"""
+Profiling opt-in de requests en producción.
+
+Un request se perfila si:
+- Trae `X-Profile: 1` o `?__profile=1` y el token es de un superadmin, o
+- Cae en el muestreo aleatorio (PROFILE_SAMPLE_RATE, opcionalmente solo
+  para las rutas de PROFILE_ROUTES).
+
+Backend: pyinstrument si está instalado (entiende async y guarda HTML),
+si no cProfile (guarda el .prof para snakeviz y un resumen de texto). Se
+perfila un request a la vez: cProfile mide el thread completo, así que
+dos profiles simultáneos se mezclarían.
+
+Los profiles quedan en PROFILE_DIR (default data/profiles) con un .json de
+metadatos al lado; se conservan los últimos PROFILE_KEEP. Se listan y
+descargan en /api/admin/profiles.
+
+Variables de entorno:
+    PROFILE_SAMPLE_RATE=0.01
+    PROFILE_ROUTES=/api/candidates/stats,/api/processes/{proceso_id}/export-pdf
+    PROFILE_DIR=data/profiles
+    PROFILE_KEEP=50
+"""
+
+import io
+import json
+import os
+import random
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+
+DEFAULT_PROFILE_DIR = Path(__file__).parent.parent.parent / "data" / "profiles"
+
+_PROFILE_ID_RE = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+
+class RequestProfiler:
+    """Decide qué requests perfilar, los perfila y guarda los resultados."""
+
+    def __init__(
+        self,
+        directory: Path = DEFAULT_PROFILE_DIR,
+        sample_rate: float = 0.0,
+        routes: Optional[List[str]] = None,
+        keep: int = 50
+    ):
+        self.directory = Path(directory)
+        self.sample_rate = sample_rate
+        self.routes = set(routes or [])
+        self.keep = keep
+        self._busy = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "RequestProfiler":
+        routes = [r.strip() for r in os.getenv("PROFILE_ROUTES", "").split(",") if r.strip()]
+        return cls(
+            directory=Path(os.getenv("PROFILE_DIR", str(DEFAULT_PROFILE_DIR))),
+            sample_rate=float(os.getenv("PROFILE_SAMPLE_RATE", "0") or 0),
+            routes=routes,
+            keep=int(os.getenv("PROFILE_KEEP", "50"))
+        )
+
+    # =========================================================================
+    # Decisión
+    # =========================================================================
+
+    async def requested(self, request) -> bool:
+        """True si el request pide profiling explícito y viene de un superadmin."""
+        flag = request.headers.get("x-profile") or request.query_params.get("__profile")
+        if flag not in ("1", "true", "yes"):
+            return False
+        return await _is_superadmin(request)
+
+    def sampled(self, path: str) -> bool:
+        """Muestreo aleatorio. Con PROFILE_ROUTES, solo esas rutas (prefijo o template)."""
+        if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            return False
+        if not self.routes:
+            return True
+        return any(_route_matches(route, path) for route in self.routes)
+
+    # =========================================================================
+    # Profiling
+    # =========================================================================
+
+    async def profile(self, request, call_next, reason: str):
+        """
+        Ejecuta el request bajo el profiler y guarda el resultado.
+
+        La respuesta se retorna tal cual (mismos headers, incluidos los
+        repetidos como `set-cookie`, más `X-Profile-Id`) y su body sigue en
+        streaming: el profile termina cuando se envió el último chunk (o se
+        cortó la conexión), sin juntar el body en memoria.
+        """
+        if not self._busy.acquire(blocking=False):
+            # Ya hay otro request perfilándose
+            return await call_next(request)
+
+        profile_id = self._new_id(request)
+        session = _Session.start()
+        started = time.perf_counter()
+        status = 500
+        finished = False
+
+        def finish() -> None:
+            nonlocal finished
+            if finished:
+                return
+            finished = True
+            try:
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                content, extension, summary = session.stop()
+                self._save(profile_id, request, status, elapsed_ms, reason, session.backend,
+                           content, extension, summary)
+            finally:
+                self._busy.release()
+
+        try:
+            response = await call_next(request)
+        except BaseException:
+            finish()
+            raise
+        status = response.status_code
+
+        response.headers["X-Profile-Id"] = profile_id
+        body = getattr(response, "body_iterator", None)
+        if body is None:
+            finish()
+        else:
+            response.body_iterator = _ProfiledBody(body, finish)
+        return response
+
+    def _new_id(self, request) -> str:
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", request.url.path).strip("-")[:60] or "root"
+        return f"{datetime.now().strftime('%Y%m%dT%H%M%S%f')}_{request.method}_{slug}"
+
+    def _save(
+        self,
+        profile_id: str,
+        request,
+        status: int,
+        elapsed_ms: float,
+        reason: str,
+        backend: str,
+        content: bytes,
+        extension: str,
+        summary: str
+    ) -> str:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        (self.directory / f"{profile_id}.{extension}").write_bytes(content)
+        meta = {
+            "id": profile_id,
+            "file": f"{profile_id}.{extension}",
+            "method": request.method,
+            "path": request.url.path,
+            "status": status,
+            "ms": round(elapsed_ms, 1),
+            "reason": reason,
+            "backend": backend,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "summary": summary
+        }
+        (self.directory / f"{profile_id}.json").write_text(json.dumps(meta, ensure_ascii=False, indent=2))
+        self._prune()
+
+    def _prune(self) -> None:
+        """Conserva solo los últimos `keep` profiles."""
+        metas = sorted(self.directory.glob("*.json"))
+        for meta_path in metas[:-self.keep] if self.keep > 0 else metas:
+            for path in self.directory.glob(f"{meta_path.stem}.*"):
+                path.unlink(missing_ok=True)
+
+    # =========================================================================
+    # Consulta
+    # =========================================================================
+
+    def list_profiles(self) -> List[Dict[str, Any]]:
+        """Metadatos de los profiles guardados, más recientes primero."""
+        if not self.directory.exists():
+            return []
+        profiles = []
+        for meta_path in sorted(self.directory.glob("*.json"), reverse=True):
+            try:
+                profiles.append(json.loads(meta_path.read_text()))
+            except (OSError, ValueError):
+                continue
+        return profiles
+
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        """Metadatos de un profile (None si no existe o el ID es inválido)."""
+        if not _PROFILE_ID_RE.match(profile_id):
+            return None
+        meta_path = self.directory / f"{profile_id}.json"
+        if not meta_path.exists():
+            return None
+        meta = json.loads(meta_path.read_text())
+        meta["path_on_disk"] = str(self.directory / meta["file"])
+        return meta
+
+
+class _ProfiledBody:
+    """
+    Body de la respuesta perfilada: pasa los chunks sin copiarlos y cierra el
+    profile al terminar el stream, si falla o si se corta la conexión.
+    """
+
+    def __init__(self, body: Any, finish: Callable[[], None]):
+        self._body = body
+        self._finish = finish
+
+    def __aiter__(self) -> "_ProfiledBody":
+        return self
+
+    async def __anext__(self) -> bytes:
+        try:
+            return await self._body.__anext__()
+        except BaseException:  # StopAsyncIteration, error o cancelación
+            self._finish()
+            raise
+
+    async def aclose(self) -> None:
+        self._finish()
+        close = getattr(self._body, "aclose", None)
+        if close is not None:
+            await close()
+
+    def __del__(self) -> None:
+        # Stream que nunca se empezó a enviar (el cliente se fue antes)
+        self._finish()
+
+
+class _Session:
+    """Un profile en curso: pyinstrument si está disponible, si no cProfile."""
+
+    def __init__(self, backend: str, profiler: Any):
+        self.backend = backend
+        self.profiler = profiler
+
+    @classmethod
+    def start(cls) -> "_Session":
+        try:
+            from pyinstrument import Profiler
+            profiler = Profiler(async_mode="enabled")
+            profiler.start()
+            return cls("pyinstrument", profiler)
+        except ImportError:
+            import cProfile
+            profiler = cProfile.Profile()
+            profiler.enable()
+            return cls("cprofile", profiler)
+
+    def stop(self) -> tuple:
+        """Retorna (contenido, extensión, resumen de texto)."""
+        if self.backend == "pyinstrument":
+            self.profiler.stop()
+            summary = self.profiler.output_text(unicode=True, color=False, show_all=False)
+            return self.profiler.output_html().encode(), "html", summary[:4000]
+
+        import marshal
+        import pstats
+        self.profiler.disable()
+        self.profiler.create_stats()
+        # Serializar antes de pstats.Stats, que vacía profiler.stats al cargarlas
+        content = marshal.dumps(self.profiler.stats)
+        buffer = io.StringIO()
+        pstats.Stats(self.profiler, stream=buffer).sort_stats("cumulative").print_stats(30)
+        return content, "prof", buffer.getvalue()[:4000]
+
+
+def _route_matches(route: str, path: str) -> bool:
+    """`/api/processes/{proceso_id}/export-pdf` coincide con `/api/processes/rec1/export-pdf`."""
+    if "{" not in route:
+        return path.startswith(route)
+    pattern = "^" + re.sub(r"\\\{[^/]+?\\\}", "[^/]+", re.escape(route)) + "/?$"
+    return re.match(pattern, path) is not None
+
+
+async def _is_superadmin(request) -> bool:
+    """Valida el Bearer token contra las sesiones activas (sin tocar Airtable)."""
+    from .sessions import session_store
+
+    auth_header = request.headers.get("authorization", "")
+    if not auth_header.lower().startswith("bearer "):
+        return False
+    session = await session_store.get(auth_header[7:].strip())
+    if not session:
+        return False
+    return session["user"].get("rol") == "superadmin"
+
+
+profiler = RequestProfiler.from_env()
+
+
+async def profiler_middleware(request, call_next):
+    """Middleware HTTP: perfila el request si se pidió o si cae en el muestreo."""
+    if await profiler.requested(request):
+        return await profiler.profile(request, call_next, reason="requested")
+    if profiler.sampled(request.url.path):
+        return await profiler.profile(request, call_next, reason="sampled")
+    return await call_next(request)
@@ -0,0 +1,172 @@
+"""
+Exportador Prometheus para GET /metrics.
+
+Se alimenta de los spans de `engine.telemetry` (mismo bus que la
+instrumentación por request) y expone:
+
+- neat_http_request_duration_seconds{method, route, status}
+- neat_airtable_request_duration_seconds{table, method, status}
+- neat_airtable_retries_total{table}
+- neat_openai_request_duration_seconds{model, site}
+- neat_openai_tokens_total{model, site, type}
+- neat_pdf_extraction_duration_seconds{backend, outcome}
+- neat_engine_duration_seconds{stage}
+- neat_cache_hits_total / neat_cache_misses_total / neat_cache_size{cache}
+- neat_threadpool_busy / neat_threadpool_waiting / neat_threadpool_capacity
+
+`prometheus_client` es opcional: sin él `get_exporter()` retorna None y
+/metrics responde 503.
+"""
+
+import logging
+from typing import Any, Optional
+
+from engine import telemetry
+
+logger = logging.getLogger(__name__)
+
+
+# Latencias de llamadas remotas: de 10 ms a 2 min (Vision puede tardar)
+REMOTE_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# Etapas locales del motor: de 0.5 ms a 5 s
+LOCAL_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+
+
+class PrometheusExporter:
+    """
+    Métricas Prometheus en un registry propio (no el global del proceso).
+
+    Uso:
+        exporter = get_exporter()
+        if exporter:
+            body, content_type = exporter.render()
+    """
+
+    def __init__(self):
+        # Import lazy: prometheus_client es opcional
+        from prometheus_client import CollectorRegistry, Counter, Histogram
+
+        self.registry = CollectorRegistry(auto_describe=True)
+        self.http_duration = Histogram(
+            "neat_http_request_duration_seconds", "Latencia de requests HTTP por ruta",
+            ["method", "route", "status"], buckets=REMOTE_BUCKETS, registry=self.registry
+        )
+        self.airtable_duration = Histogram(
+            "neat_airtable_request_duration_seconds", "Latencia de llamadas a Airtable (incluye reintentos)",
+            ["table", "method", "status"], buckets=REMOTE_BUCKETS, registry=self.registry
+        )
+        self.airtable_retries = Counter(
+            "neat_airtable_retries", "Reintentos por 429 de Airtable",
+            ["table"], registry=self.registry
+        )
+        self.openai_duration = Histogram(
+            "neat_openai_request_duration_seconds", "Latencia de llamadas a OpenAI",
+            ["model", "site"], buckets=REMOTE_BUCKETS, registry=self.registry
+        )
+        self.openai_tokens = Counter(
+            "neat_openai_tokens", "Tokens consumidos en OpenAI",
+            ["model", "site", "type"], registry=self.registry
+        )
+        self.pdf_duration = Histogram(
+            "neat_pdf_extraction_duration_seconds", "Extracción de texto de PDF por backend",
+            ["backend", "outcome"], buckets=REMOTE_BUCKETS, registry=self.registry
+        )
+        self.engine_duration = Histogram(
+            "neat_engine_duration_seconds", "Etapas del motor de evaluación",
+            ["stage"], buckets=LOCAL_BUCKETS, registry=self.registry
+        )
+        self.registry.register(_RuntimeCollector())
+
+        telemetry.add_observer(self.observe)
+
+    def observe(self, span: telemetry.Span) -> None:
+        """Observador de telemetría: traduce cada span a su métrica."""
+        attrs = span.attrs
+        kind = span.kind
+
+        if kind == "http":
+            self.http_duration.labels(
+                attrs.get("method", ""), span.name, str(attrs.get("status", ""))
+            ).observe(span.duration)
+        elif kind == "airtable":
+            status = "error" if span.error and "status" not in attrs else str(attrs.get("status", ""))
+            self.airtable_duration.labels(span.name, attrs.get("method", ""), status).observe(span.duration)
+            if attrs.get("retries"):
+                self.airtable_retries.labels(span.name).inc(attrs["retries"])
+        elif kind == "openai":
+            site = attrs.get("site", "unknown")
+            self.openai_duration.labels(span.name, site).observe(span.duration)
+            for key, token_type in (("tokens_in", "prompt"), ("tokens_out", "completion")):
+                if attrs.get(key):
+                    self.openai_tokens.labels(span.name, site, token_type).inc(attrs[key])
+        elif kind == "pdf":
+            outcome = "error" if span.error else ("ok" if attrs.get("chars") else "empty")
+            self.pdf_duration.labels(span.name, outcome).observe(span.duration)
+        elif kind == "engine":
+            self.engine_duration.labels(span.name).observe(span.duration)
+
+    def render(self) -> tuple:
+        """Retorna (body, content_type) en formato de exposición de Prometheus."""
+        from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+        return generate_latest(self.registry), CONTENT_TYPE_LATEST
+
+
+class _RuntimeCollector:
+    """Valores leídos al momento del scrape: cachés y thread pool de anyio."""
+
+    def describe(self):
+        return []
+
+    def collect(self):
+        from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+        hits = CounterMetricFamily("neat_cache_hits", "Aciertos de caché", labels=["cache"])
+        misses = CounterMetricFamily("neat_cache_misses", "Fallos de caché", labels=["cache"])
+        size = GaugeMetricFamily("neat_cache_size", "Entradas en caché", labels=["cache"])
+        for name, stats in telemetry.cache_stats().items():
+            hits.add_metric([name], stats["hits"])
+            misses.add_metric([name], stats["misses"])
+            size.add_metric([name], stats["size"])
+        yield hits
+        yield misses
+        yield size
+
+        # Thread pool donde corren las rutas/dependencias sync (anyio.to_thread)
+        limiter = _thread_limiter()
+        if limiter is not None:
+            yield GaugeMetricFamily(
+                "neat_threadpool_busy", "Threads del pool en uso", value=limiter.borrowed_tokens
+            )
+            yield GaugeMetricFamily(
+                "neat_threadpool_waiting", "Tareas esperando un thread del pool",
+                value=limiter.statistics().tasks_waiting
+            )
+            yield GaugeMetricFamily(
+                "neat_threadpool_capacity", "Tamaño del pool", value=limiter.total_tokens
+            )
+
+
+def _thread_limiter() -> Optional[Any]:
+    """Limiter del thread pool de anyio (solo disponible dentro del event loop)."""
+    try:
+        import anyio.to_thread
+        return anyio.to_thread.current_default_thread_limiter()
+    except Exception:
+        return None
+
+
+_exporter: Optional[PrometheusExporter] = None
+_unavailable = False
+
+
+def get_exporter() -> Optional[PrometheusExporter]:
+    """Exportador singleton, o None si prometheus_client no está instalado."""
+    global _exporter, _unavailable
+    if _exporter is None and not _unavailable:
+        try:
+            _exporter = PrometheusExporter()
+        except ImportError:
+            logger.warning("prometheus_client no está instalado; /metrics deshabilitado")
+            _unavailable = True
+    return _exporter
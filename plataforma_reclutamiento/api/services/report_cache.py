@@ -0,0 +1,278 @@
+"""
+Caché en disco de los reportes PDF de procesos.
+
+El reporte de un proceso depende del proceso, de sus candidatos (estado,
+datos de contacto y notas, donde viven los comentarios) y de sus
+evaluaciones. Con esos datos se calcula un fingerprint:
+
+- Si ya hay un PDF en disco con ese fingerprint se sirve sin regenerar
+  (el fingerprint es también el ETag, así un `If-None-Match` responde 304)
+- Si no, se genera, se guarda y se borran las versiones anteriores
+
+Las evaluaciones se identifican por su `updated_at` (Airtable no devuelve
+la fecha de modificación de los registros por REST); los candidatos, por
+el hash de los campos que se imprimen.
+
+Cuando AirtableService escribe un candidato o una evaluación de un
+proceso que ya tiene reporte en disco, se agenda su regeneración en
+segundo plano (con una espera para agrupar ráfagas de cambios). Los
+resúmenes de notas con IA de candidatos sin cambios salen de la caché de
+`pdf_generator`, así que regenerar solo paga por lo nuevo.
+
+Variables de entorno:
+    REPORT_CACHE_DIR=data/reports
+    REPORT_REFRESH_DELAY=5      (segundos; 0 = sin regeneración en segundo plano)
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+
+from engine import telemetry
+
+from .airtable import AirtableService, add_change_listener
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_REPORT_DIR = Path(__file__).parent.parent.parent / "data" / "reports"
+
+# Subir al cambiar el layout del PDF: invalida todos los reportes guardados
+REPORT_VERSION = "1"
+
+_RECORD_ID_RE = re.compile(r"^[A-Za-z0-9_-]+$")
+
+
+@dataclass
+class ReportData:
+    """Datos de Airtable con los que se arma el reporte de un proceso."""
+    proceso: Dict[str, Any]
+    candidatos: List[Dict[str, Any]]
+    evaluaciones: Dict[str, Dict[str, Any]]
+    comentarios: Dict[str, List[Dict[str, Any]]]
+
+    def fingerprint(self) -> str:
+        """Hash de todo lo que se imprime en el reporte."""
+        proceso = self.proceso
+        candidatos = sorted(
+            [
+                c["id"], c.get("nombre_completo"), c.get("email"), c.get("telefono"),
+                c.get("estado_candidato"), c.get("notas")
+            ]
+            for c in self.candidatos
+        )
+        evaluaciones = sorted(
+            [cid, e.get("id"), e.get("updated_at"), e.get("score_promedio")]
+            for cid, e in self.evaluaciones.items()
+        )
+        payload = json.dumps(
+            [REPORT_VERSION, proceso.get("codigo_proceso"), proceso.get("cargo_nombre"),
+             proceso.get("cargo"), candidatos, evaluaciones],
+            ensure_ascii=False, default=str
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+
+async def fetch_report_data(airtable: AirtableService, proceso_id: str) -> Optional[ReportData]:
+    """
+    Lee de Airtable lo necesario para el reporte (None si el proceso no existe).
+
+    Las evaluaciones se piden en lote por código de tracking y los
+    comentarios se leen de las notas de cada candidato, en vez de dos
+    llamadas por candidato.
+    """
+    proceso = await airtable.get_proceso_by_id(proceso_id, count_postulaciones=False)
+    if not proceso:
+        return None
+
+    candidatos = await airtable.get_candidatos(proceso_id=proceso_id)
+    proceso["postulaciones_count"] = len(candidatos)
+
+    por_tracking = await airtable.get_evaluaciones_by_tracking(
+        [c.get("codigo_tracking") for c in candidatos]
+    )
+    evaluaciones = {}
+    comentarios = {}
+    for c in candidatos:
+        evaluacion = por_tracking.get(c.get("codigo_tracking"))
+        if evaluacion:
+            evaluaciones[c["id"]] = evaluacion
+        coms = airtable.parse_comentarios(c)
+        if coms:
+            comentarios[c["id"]] = coms
+
+    return ReportData(proceso, candidatos, evaluaciones, comentarios)
+
+
+class ReportCache:
+    """Reportes PDF por proceso, guardados en disco por fingerprint."""
+
+    def __init__(self, directory: Path = DEFAULT_REPORT_DIR, refresh_delay: float = 5.0):
+        self.directory = Path(directory)
+        self.refresh_delay = refresh_delay
+        # Proceso → [lock, requests que lo usan]; se borra al quedar sin uso
+        self._locks: Dict[str, list] = {}
+        self._pending: Dict[str, asyncio.Task] = {}
+        # Candidato (ID y tracking) → proceso, solo de los reportes vigentes
+        self._owners: Dict[str, str] = {}
+        self._owned: Dict[str, Set[str]] = {}
+
+    @classmethod
+    def from_env(cls) -> "ReportCache":
+        return cls(
+            directory=Path(os.getenv("REPORT_CACHE_DIR", str(DEFAULT_REPORT_DIR))),
+            refresh_delay=float(os.getenv("REPORT_REFRESH_DELAY", "5"))
+        )
+
+    # =========================================================================
+    # Lectura / generación
+    # =========================================================================
+
+    def _path(self, proceso_id: str, fingerprint: str) -> Path:
+        return self.directory / f"{proceso_id}-{fingerprint[:32]}.pdf"
+
+    def has_report(self, proceso_id: str) -> bool:
+        return _RECORD_ID_RE.match(proceso_id) is not None and any(self.directory.glob(f"{proceso_id}-*.pdf"))
+
+    async def get_or_generate(self, data: ReportData) -> bytes:
+        """
+        PDF del proceso para estos datos: desde disco si existe, si no se genera.
+
+        Args:
+            data: Datos leídos con `fetch_report_data`
+
+        Returns:
+            Bytes del PDF
+        """
+        proceso_id = data.proceso["id"]
+        if not _RECORD_ID_RE.match(proceso_id):
+            raise ValueError(f"ID de proceso inválido: {proceso_id!r}")
+
+        fingerprint = data.fingerprint()
+        path = self._path(proceso_id, fingerprint)
+
+        async with self._lock(proceso_id):
+            # Si otro request lo generó mientras se esperaba el lock, ya está en disco
+            if path.exists():
+                telemetry.annotate(report_cache="hit")
+                self._set_owners(proceso_id, data.candidatos)
+                return await asyncio.to_thread(path.read_bytes)
+
+            telemetry.annotate(report_cache="miss")
+            from .pdf_generator import generate_proceso_pdf
+            pdf_bytes = await generate_proceso_pdf(
+                proceso=data.proceso,
+                candidatos=data.candidatos,
+                evaluaciones=data.evaluaciones,
+                comentarios=data.comentarios
+            )
+            await asyncio.to_thread(self._store, proceso_id, path, pdf_bytes)
+            self._set_owners(proceso_id, data.candidatos)
+            return pdf_bytes
+
+    @asynccontextmanager
+    async def _lock(self, proceso_id: str) -> AsyncIterator[None]:
+        """Lock del proceso; se descarta cuando no queda nadie usándolo."""
+        entry = self._locks.get(proceso_id)
+        if entry is None:
+            entry = self._locks[proceso_id] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._locks[proceso_id]
+
+    def _store(self, proceso_id: str, path: Path, pdf_bytes: bytes) -> None:
+        """Escribe el PDF (atómico) y borra las versiones anteriores del proceso."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(pdf_bytes)
+        tmp.replace(path)
+        for old in self.directory.glob(f"{proceso_id}-*.pdf"):
+            if old != path:
+                old.unlink(missing_ok=True)
+
+    def _set_owners(self, proceso_id: str, candidatos: List[Dict[str, Any]]) -> None:
+        """Reemplaza los candidatos del proceso por los del reporte vigente."""
+        keys = {c["id"] for c in candidatos}
+        keys.update(c["codigo_tracking"] for c in candidatos if c.get("codigo_tracking"))
+        for key in self._owned.pop(proceso_id, set()) - keys:
+            # Salvo que ya figure en el reporte de otro proceso
+            if self._owners.get(key) == proceso_id:
+                del self._owners[key]
+        for key in keys:
+            self._owners[key] = proceso_id
+        self._owned[proceso_id] = keys
+
+    # =========================================================================
+    # Regeneración en segundo plano
+    # =========================================================================
+
+    def on_change(self, airtable: AirtableService, table_name: str, record: Dict[str, Any]) -> None:
+        """Listener de AirtableService: agenda la regeneración de los procesos afectados."""
+        if self.refresh_delay <= 0:
+            return
+        fields = record.get("fields", {})
+        procesos: Set[str] = set()
+        if table_name == airtable.config.table_candidatos:
+            procesos.update(fields.get("proceso") or [])
+            if record.get("id") in self._owners:
+                procesos.add(self._owners[record["id"]])
+        elif table_name == airtable.config.table_evaluaciones:
+            for key in [fields.get("candidato")] + list(fields.get("postulacion") or []):
+                if key in self._owners:
+                    procesos.add(self._owners[key])
+        else:
+            return
+
+        for proceso_id in procesos:
+            if self.has_report(proceso_id):
+                self.schedule_refresh(airtable, proceso_id)
+
+    def schedule_refresh(self, airtable: AirtableService, proceso_id: str) -> None:
+        """Regenera el reporte tras `refresh_delay` s (una vez por ráfaga de cambios)."""
+        if proceso_id in self._pending:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._pending[proceso_id] = loop.create_task(self._refresh(airtable, proceso_id))
+
+    async def _refresh(self, airtable: AirtableService, proceso_id: str) -> None:
+        try:
+            await asyncio.sleep(self.refresh_delay)
+            # Los cambios que lleguen desde acá agendan una nueva regeneración
+            self._pending.pop(proceso_id, None)
+            with telemetry.span("pipeline", "refresh_report", proceso_id=proceso_id):
+                data = await fetch_report_data(airtable, proceso_id)
+                if data is not None:
+                    await self.get_or_generate(data)
+            logger.info("Reporte de %s regenerado en segundo plano", proceso_id)
+        except Exception:
+            logger.exception("Error regenerando el reporte de %s", proceso_id)
+        finally:
+            if self._pending.get(proceso_id) is asyncio.current_task():
+                del self._pending[proceso_id]
+
+    async def shutdown(self) -> None:
+        """Cancela las regeneraciones pendientes (al cerrar la app)."""
+        tasks = list(self._pending.values())
+        self._pending.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+report_cache = ReportCache.from_env()
+add_change_listener(report_cache.on_change)
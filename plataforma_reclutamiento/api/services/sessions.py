@@ -0,0 +1,452 @@
+"""
+Almacenamiento de sesiones de login.
+
+Con más de un worker de uvicorn (o tras un reinicio) un dict en memoria
+no alcanza: el login hecho en un worker no existe en los otros. Backends
+disponibles (SESSION_BACKEND):
+
+- `memory`: dict del proceso (un solo worker, desarrollo)
+- `sqlite`: archivo SQLite compartido entre los workers de una máquina
+- `redis`: cualquier servidor que hable RESP (Redis, Valkey, KeyDB...);
+  el propio servidor expira las claves
+- `token`: sin almacenamiento. El token es un JWT HS256 firmado con
+  SESSION_SECRET que lleva el usuario adentro, así `get_current_user`
+  solo verifica la firma. Contrapartida: logout no invalida el token en
+  el servidor y los cambios de rol se ven recién al volver a entrar
+
+Las sesiones vencidas se borran con un barrido periódico
+(`start_sweeper`) en vez de al leerlas.
+
+Variables de entorno:
+    SESSION_BACKEND=memory|sqlite|redis|token   (default: memory)
+    SESSION_TTL_HOURS=24
+    SESSION_SWEEP_INTERVAL=300                  (segundos; 0 = sin barrido)
+    SESSION_DB=data/sessions.db                 (sqlite)
+    SESSION_REDIS_URL=redis://localhost:6379/0  (redis)
+    SESSION_SECRET=...                          (token)
+"""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_SESSION_DB = Path(__file__).parent.parent.parent / "data" / "sessions.db"
+DEFAULT_TTL = timedelta(hours=24)
+
+
+def generate_token() -> str:
+    """Genera un token de sesión seguro."""
+    return secrets.token_urlsafe(32)
+
+
+def _token_key(token: str) -> str:
+    """Clave de almacenamiento: hash del token (el token no queda guardado)."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class SessionStore:
+    """
+    Interfaz de los backends de sesiones.
+
+    Una sesión es `{"user": {...}, "expires_at": datetime}`.
+    """
+
+    name = "base"
+
+    def __init__(self, ttl: timedelta = DEFAULT_TTL):
+        self.ttl = ttl
+        self._sweeper: Optional[asyncio.Task] = None
+
+    async def create(self, user: Dict[str, Any]) -> str:
+        """
+        Crea una sesión para el usuario.
+
+        Args:
+            user: Datos públicos del usuario (id, email, nombre_completo, rol, activo)
+
+        Returns:
+            Token de la sesión
+        """
+        raise NotImplementedError
+
+    async def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Sesión vigente del token, o None si no existe o venció."""
+        raise NotImplementedError
+
+    async def delete(self, token: str) -> None:
+        """Cierra la sesión del token."""
+        raise NotImplementedError
+
+    async def sweep(self) -> int:
+        """Borra las sesiones vencidas. Retorna cuántas se borraron."""
+        return 0
+
+    async def close(self) -> None:
+        """Detiene el barrido y libera conexiones."""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            await asyncio.gather(self._sweeper, return_exceptions=True)
+            self._sweeper = None
+
+    def start_sweeper(self, interval: float) -> None:
+        """Barre las sesiones vencidas cada `interval` segundos (requiere event loop)."""
+        if interval <= 0 or self._sweeper is not None:
+            return
+        self._sweeper = asyncio.get_running_loop().create_task(self._sweep_loop(interval))
+
+    async def _sweep_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                removed = await self.sweep()
+                if removed:
+                    logger.info("Sesiones vencidas borradas: %d", removed)
+            except Exception:
+                logger.exception("Error barriendo sesiones vencidas")
+
+    def _expires_at(self) -> datetime:
+        return datetime.now() + self.ttl
+
+
+# =============================================================================
+# Memoria
+# =============================================================================
+
+class MemorySessionStore(SessionStore):
+    """Sesiones en un dict del proceso (un solo worker)."""
+
+    name = "memory"
+
+    def __init__(self, ttl: timedelta = DEFAULT_TTL):
+        super().__init__(ttl)
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+
+    async def create(self, user: Dict[str, Any]) -> str:
+        token = generate_token()
+        self._sessions[token] = {"user": user, "expires_at": self._expires_at()}
+        return token
+
+    async def get(self, token: str) -> Optional[Dict[str, Any]]:
+        session = self._sessions.get(token)
+        if session is None or datetime.now() > session["expires_at"]:
+            return None
+        return session
+
+    async def delete(self, token: str) -> None:
+        self._sessions.pop(token, None)
+
+    async def sweep(self) -> int:
+        now = datetime.now()
+        expired = [token for token, s in self._sessions.items() if now > s["expires_at"]]
+        for token in expired:
+            del self._sessions[token]
+        return len(expired)
+
+
+# =============================================================================
+# SQLite
+# =============================================================================
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Sesiones en SQLite (modo WAL), compartidas por los workers de una máquina.
+
+    Las consultas corren en un thread para no bloquear el event loop.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: Path = DEFAULT_SESSION_DB, ttl: timedelta = DEFAULT_TTL):
+        super().__init__(ttl)
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                " token_hash TEXT PRIMARY KEY,"
+                " user TEXT NOT NULL,"
+                " expires_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS sessions_expires_at ON sessions (expires_at)")
+            self._conn = conn
+        return self._conn
+
+    def _query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._lock:
+            return self._connection().execute(sql, params).fetchall()
+
+    def _write(self, sql: str, params: tuple = ()) -> int:
+        with self._lock:
+            return self._connection().execute(sql, params).rowcount
+
+    async def create(self, user: Dict[str, Any]) -> str:
+        token = generate_token()
+        await asyncio.to_thread(
+            self._write,
+            "INSERT INTO sessions (token_hash, user, expires_at) VALUES (?, ?, ?)",
+            (_token_key(token), json.dumps(user), self._expires_at().timestamp())
+        )
+        return token
+
+    async def get(self, token: str) -> Optional[Dict[str, Any]]:
+        rows = await asyncio.to_thread(
+            self._query,
+            "SELECT user, expires_at FROM sessions WHERE token_hash = ? AND expires_at > ?",
+            (_token_key(token), time.time())
+        )
+        if not rows:
+            return None
+        user, expires_at = rows[0]
+        return {"user": json.loads(user), "expires_at": datetime.fromtimestamp(expires_at)}
+
+    async def delete(self, token: str) -> None:
+        await asyncio.to_thread(self._write, "DELETE FROM sessions WHERE token_hash = ?", (_token_key(token),))
+
+    async def sweep(self) -> int:
+        return await asyncio.to_thread(self._write, "DELETE FROM sessions WHERE expires_at <= ?", (time.time(),))
+
+    async def close(self) -> None:
+        await super().close()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# =============================================================================
+# Redis (protocolo RESP)
+# =============================================================================
+
+class RespError(Exception):
+    """Error devuelto por el servidor RESP."""
+
+
+class RespClient:
+    """
+    Cliente RESP mínimo sobre asyncio (una conexión, comandos serializados).
+
+    Alcanza para GET/SET/DEL y no agrega dependencias; reconecta si la
+    conexión se cae.
+    """
+
+    def __init__(self, url: str):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.username = parsed.username
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+
+    async def _connect(self) -> None:
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        if self.password:
+            auth = [self.username, self.password] if self.username else [self.password]
+            await self._roundtrip("AUTH", *auth)
+        if self.db:
+            await self._roundtrip("SELECT", str(self.db))
+
+    async def _roundtrip(self, *args: str) -> Any:
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg.encode() if isinstance(arg, str) else arg
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        self._writer.write(b"".join(parts))
+        await self._writer.drain()
+        return await self._read_reply()
+
+    async def _read_reply(self) -> Any:
+        line = await self._reader.readline()
+        if not line:
+            raise ConnectionError("Conexión RESP cerrada")
+        prefix, payload = line[:1], line[1:-2]
+        if prefix == b"+":
+            return payload.decode()
+        if prefix == b"-":
+            raise RespError(payload.decode())
+        if prefix == b":":
+            return int(payload)
+        if prefix == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = await self._reader.readexactly(length + 2)
+            return data[:-2]
+        if prefix == b"*":
+            length = int(payload)
+            if length < 0:
+                return None
+            return [await self._read_reply() for _ in range(length)]
+        raise RespError(f"Respuesta RESP inválida: {line!r}")
+
+    async def execute(self, *args: str) -> Any:
+        """Envía un comando y retorna la respuesta (un reintento si la conexión se cayó)."""
+        async with self._lock:
+            for attempt in range(2):
+                try:
+                    if self._writer is None:
+                        await self._connect()
+                    return await self._roundtrip(*args)
+                except (ConnectionError, asyncio.IncompleteReadError, OSError):
+                    await self._disconnect()
+                    if attempt:
+                        raise
+
+    async def _disconnect(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except Exception:
+                pass
+        self._reader = self._writer = None
+
+    async def close(self) -> None:
+        async with self._lock:
+            await self._disconnect()
+
+
+class RedisSessionStore(SessionStore):
+    """Sesiones en un servidor RESP; el TTL lo aplica el servidor (PX)."""
+
+    name = "redis"
+
+    def __init__(self, url: str = "redis://localhost:6379/0", ttl: timedelta = DEFAULT_TTL,
+                 prefix: str = "neat:session:"):
+        super().__init__(ttl)
+        self.client = RespClient(url)
+        self.prefix = prefix
+
+    def _key(self, token: str) -> str:
+        return self.prefix + _token_key(token)
+
+    async def create(self, user: Dict[str, Any]) -> str:
+        token = generate_token()
+        expires_at = self._expires_at()
+        value = json.dumps({"user": user, "expires_at": expires_at.timestamp()})
+        await self.client.execute("SET", self._key(token), value, "PX", str(int(self.ttl.total_seconds() * 1000)))
+        return token
+
+    async def get(self, token: str) -> Optional[Dict[str, Any]]:
+        value = await self.client.execute("GET", self._key(token))
+        if value is None:
+            return None
+        data = json.loads(value)
+        return {"user": data["user"], "expires_at": datetime.fromtimestamp(data["expires_at"])}
+
+    async def delete(self, token: str) -> None:
+        await self.client.execute("DEL", self._key(token))
+
+    async def close(self) -> None:
+        await super().close()
+        await self.client.close()
+
+
+# =============================================================================
+# Tokens firmados (sin almacenamiento)
+# =============================================================================
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+class SignedTokenSessionStore(SessionStore):
+    """
+    Sesiones como JWT HS256: el token lleva el usuario y la expiración.
+
+    `get` no consulta nada, solo verifica firma y `exp`. `delete` no puede
+    revocar el token (expira solo).
+    """
+
+    name = "token"
+
+    _HEADER = _b64encode(json.dumps({"alg": "HS256", "typ": "JWT"}, separators=(",", ":")).encode())
+
+    def __init__(self, secret: str, ttl: timedelta = DEFAULT_TTL):
+        super().__init__(ttl)
+        self._secret = secret.encode()
+
+    def _sign(self, signing_input: str) -> str:
+        return _b64encode(hmac.new(self._secret, signing_input.encode(), hashlib.sha256).digest())
+
+    async def create(self, user: Dict[str, Any]) -> str:
+        now = int(time.time())
+        payload = {"sub": user.get("id"), "user": user, "iat": now, "exp": now + int(self.ttl.total_seconds())}
+        signing_input = f"{self._HEADER}.{_b64encode(json.dumps(payload, separators=(',', ':')).encode())}"
+        return f"{signing_input}.{self._sign(signing_input)}"
+
+    async def get(self, token: str) -> Optional[Dict[str, Any]]:
+        try:
+            header, payload, signature = token.split(".")
+        except ValueError:
+            return None
+        if header != self._HEADER or not hmac.compare_digest(signature, self._sign(f"{header}.{payload}")):
+            return None
+        try:
+            data = json.loads(_b64decode(payload))
+        except ValueError:
+            return None
+        if time.time() >= data.get("exp", 0):
+            return None
+        return {"user": data["user"], "expires_at": datetime.fromtimestamp(data["exp"])}
+
+    async def delete(self, token: str) -> None:
+        return None
+
+
+# =============================================================================
+# Configuración
+# =============================================================================
+
+def create_session_store() -> SessionStore:
+    """Crea el backend configurado en SESSION_BACKEND."""
+    backend = os.getenv("SESSION_BACKEND", "memory").strip().lower()
+    ttl = timedelta(hours=float(os.getenv("SESSION_TTL_HOURS", "24")))
+
+    if backend == "sqlite":
+        return SQLiteSessionStore(Path(os.getenv("SESSION_DB", str(DEFAULT_SESSION_DB))), ttl=ttl)
+    if backend == "redis":
+        return RedisSessionStore(os.getenv("SESSION_REDIS_URL", "redis://localhost:6379/0"), ttl=ttl)
+    if backend == "token":
+        secret = os.getenv("SESSION_SECRET")
+        if not secret:
+            logger.warning("SESSION_SECRET no configurado: los tokens firmados no sobreviven a un reinicio "
+                           "ni sirven entre workers")
+            secret = secrets.token_urlsafe(32)
+        return SignedTokenSessionStore(secret, ttl=ttl)
+    if backend != "memory":
+        logger.warning("SESSION_BACKEND=%r no soportado (memory|sqlite|redis|token); usando memory", backend)
+    return MemorySessionStore(ttl=ttl)
+
+
+SWEEP_INTERVAL = float(os.getenv("SESSION_SWEEP_INTERVAL", "300"))
+
+session_store = create_session_store()
@@ -0,0 +1,136 @@
+"""
+Trazas OpenTelemetry a partir de los spans de `engine.telemetry`.
+
+Cada `telemetry.span()` (request HTTP, llamadas a Airtable y OpenAI,
+descarga y rasterizado del CV, evaluación, análisis de comentarios,
+guardado) se convierte en un span OTel anidado bajo el span del request,
+con sus atributos (tabla, status, bytes, páginas, tokens, tracking code,
+cache hit...).
+
+Configuración por variables de entorno (nombres estándar de OTel):
+    OTEL_TRACES_EXPORTER=console|otlp|none   (default: none → deshabilitado)
+    OTEL_SERVICE_NAME=neat-api
+    OTEL_EXPORTER_OTLP_ENDPOINT=http://localhost:4318   (para otlp)
+
+Requiere `opentelemetry-sdk` (y `opentelemetry-exporter-otlp` para otlp);
+si no están instalados las trazas quedan deshabilitadas.
+"""
+
+import logging
+import os
+from typing import Any, Optional, Tuple
+
+from engine import telemetry
+
+logger = logging.getLogger(__name__)
+
+
+# Tipos de span que representan llamadas salientes (SpanKind.CLIENT)
+CLIENT_KINDS = {"airtable", "openai", "download"}
+
+
+class OpenTelemetryTracer:
+    """Tracer de `engine.telemetry` que abre/cierra spans OTel."""
+
+    def __init__(self, tracer: Any):
+        from opentelemetry import context, trace
+        self._tracer = tracer
+        self._context = context
+        self._trace = trace
+
+    def start(self, span: telemetry.Span) -> Tuple[Any, Any]:
+        trace = self._trace
+        if span.kind == "http":
+            # Versiones recientes de FastAPI ya abren un span SERVER propio
+            parent = trace.get_current_span().get_span_context()
+            kind = trace.SpanKind.INTERNAL if parent.is_valid else trace.SpanKind.SERVER
+        elif span.kind in CLIENT_KINDS:
+            kind = trace.SpanKind.CLIENT
+        else:
+            kind = trace.SpanKind.INTERNAL
+        otel_span = self._tracer.start_span(f"{span.kind} {span.name}", kind=kind)
+        token = self._context.attach(trace.set_span_in_context(otel_span))
+        return otel_span, token
+
+    def end(self, span: telemetry.Span, state: Optional[Tuple[Any, Any]]) -> None:
+        if state is None:
+            return
+        otel_span, token = state
+        # El nombre puede cambiar durante el span (template de la ruta HTTP)
+        if span.kind == "http":
+            otel_span.update_name(f"{span.attrs.get('method', '')} {span.name}")
+        else:
+            otel_span.update_name(f"{span.kind} {span.name}")
+        otel_span.set_attribute("neat.kind", span.kind)
+        for key, value in span.attrs.items():
+            if value is None:
+                continue
+            if not isinstance(value, (str, bool, int, float)):
+                value = str(value)
+            otel_span.set_attribute(f"neat.{key}", value)
+        if span.error or span.attrs.get("status", 0) >= 500:
+            otel_span.set_status(self._trace.Status(self._trace.StatusCode.ERROR))
+        self._context.detach(token)
+        otel_span.end()
+
+
+_configured: Optional[OpenTelemetryTracer] = None
+
+
+def configure_tracing() -> bool:
+    """
+    Configura OpenTelemetry según OTEL_TRACES_EXPORTER.
+
+    Returns:
+        True si las trazas quedaron activas
+    """
+    global _configured
+    if _configured is not None:
+        return True
+
+    exporter_name = os.getenv("OTEL_TRACES_EXPORTER", "none").strip().lower()
+    if exporter_name in ("", "none"):
+        return False
+
+    try:
+        from opentelemetry import trace
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+    except ImportError:
+        logger.warning("opentelemetry-sdk no está instalado; trazas deshabilitadas")
+        return False
+
+    if exporter_name == "console":
+        exporter = ConsoleSpanExporter()
+    elif exporter_name == "otlp":
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        except ImportError:
+            logger.warning("opentelemetry-exporter-otlp no está instalado; trazas deshabilitadas")
+            return False
+        exporter = OTLPSpanExporter()
+    else:
+        logger.warning("OTEL_TRACES_EXPORTER=%r no soportado (console|otlp|none)", exporter_name)
+        return False
+
+    provider = TracerProvider(resource=Resource.create({
+        "service.name": os.getenv("OTEL_SERVICE_NAME", "neat-api")
+    }))
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+
+    _configured = OpenTelemetryTracer(trace.get_tracer("neat"))
+    telemetry.add_tracer(_configured)
+    logger.info("Trazas OpenTelemetry activas (exporter: %s)", exporter_name)
+    return True
+
+
+def shutdown_tracing() -> None:
+    """Envía los spans pendientes al cerrar la app."""
+    if _configured is None:
+        return
+    from opentelemetry import trace
+    provider = trace.get_tracer_provider()
+    if hasattr(provider, "shutdown"):
+        provider.shutdown()
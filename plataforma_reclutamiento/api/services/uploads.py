@@ -0,0 +1,242 @@
+"""
+Recepción de CVs subidos y su publicación como attachment de Airtable.
+
+`save_upload` copia el archivo subido al BlobStore de CVs por chunks (clave
+por contenido, ver `blobs`) y corta con `UploadTooLarge` apenas se pasa de
+CV_MAX_BYTES. Ojo: el `UploadFile` ya lo armó el parser multipart de
+Starlette con el body completo (en memoria hasta 1 MB, después en un archivo
+temporal), así que esa copia no achica lo que ocupa el request; el límite
+del body lo pone `UploadSizeLimitMiddleware`, que responde 413:
+- sin leer nada si el Content-Length ya excede el límite, y
+- mientras llega el body (también sin Content-Length, p.ej. chunked) apenas
+  los bytes recibidos lo superan, antes de que el parser termine de
+  guardarlo.
+
+Subir el CV a un almacenamiento temporal (catbox.moe, luego file.io) para
+que Airtable lo descargue puede tardar decenas de segundos. Por eso se
+hace en segundo plano con `CVAttachmentQueue`: la postulación se crea con
+la URL local del CV y el attachment se agrega después, con reintentos.
+
+Variables de entorno:
+    CV_MAX_BYTES=10485760           (10 MB)
+    TEMP_STORAGE_URL=https://catbox.moe/user/api.php
+    CV_UPLOAD_CONCURRENCY=2         (subidas simultáneas en segundo plano)
+"""
+
+import asyncio
+import logging
+import os
+from pathlib import Path
+from typing import AsyncIterator, Optional, Set
+
+import httpx
+from fastapi import HTTPException, UploadFile
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
+
+from engine import telemetry
+
+from .airtable import AirtableService
+from .blobs import BlobInfo, BlobNotFound, BlobStore, cv_store
+
+logger = logging.getLogger(__name__)
+
+
+CV_MAX_BYTES = int(os.getenv("CV_MAX_BYTES", str(10 * 1024 * 1024)))
+CHUNK_SIZE = 256 * 1024
+
+# Servicio de almacenamiento temporal (configurable para pruebas de carga)
+TEMP_STORAGE_URL = os.getenv("TEMP_STORAGE_URL", "https://catbox.moe/user/api.php")
+FALLBACK_STORAGE_URL = "https://file.io/?expires=1d"
+
+# Rutas que reciben CVs (para el chequeo de Content-Length)
+UPLOAD_PATH_PREFIX = "/api/applications/"
+# Margen para los campos del formulario y los separadores multipart
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class UploadTooLarge(Exception):
+    """El archivo subido excede el tamaño máximo."""
+
+
+async def save_upload(upload: UploadFile, store: BlobStore, ext: str, max_bytes: int = CV_MAX_BYTES) -> BlobInfo:
+    """
+    Guarda el archivo subido en `store` por chunks, con límite de tamaño.
+
+    Args:
+        upload: Archivo del formulario
+        store: Dónde guardarlo
+        ext: Extensión de la clave (".pdf")
+        max_bytes: Tamaño máximo permitido
+
+    Returns:
+        BlobInfo con clave, tamaño y SHA-256
+
+    Raises:
+        UploadTooLarge: Si el archivo excede `max_bytes` (no queda nada guardado)
+    """
+    async def chunks() -> AsyncIterator[bytes]:
+        size = 0
+        while chunk := await upload.read(CHUNK_SIZE):
+            size += len(chunk)
+            if size > max_bytes:
+                raise UploadTooLarge(f"El archivo excede el máximo de {max_bytes // (1024 * 1024)} MB")
+            yield chunk
+
+    with telemetry.span("upload", "save_cv") as span:
+        stored = await store.put_stream(chunks(), ext=ext)
+        span.attrs["bytes"] = stored.size
+    return stored
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Middleware ASGI: 413 para las subidas cuyo body excede el límite.
+
+    Con Content-Length se rechaza sin leer el body. Si no viene (o miente),
+    se cuentan los bytes a medida que el handler los recibe y se corta con
+    HTTPException(413) al pasarse; FastAPI la deja pasar tal cual mientras
+    parsea el formulario. Registrar con `app.add_middleware`.
+    """
+
+    def __init__(self, app, max_bytes: int = CV_MAX_BYTES + MULTIPART_OVERHEAD,
+                 path_prefix: str = UPLOAD_PATH_PREFIX):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.path_prefix = path_prefix
+
+    def _detail(self) -> str:
+        return f"El archivo excede el máximo de {CV_MAX_BYTES // (1024 * 1024)} MB"
+
+    async def __call__(self, scope, receive, send):
+        if (scope["type"] != "http" or scope["method"] != "POST"
+                or not scope["path"].startswith(self.path_prefix)):
+            return await self.app(scope, receive, send)
+
+        length = Headers(scope=scope).get("content-length")
+        if length and length.isdigit() and int(length) > self.max_bytes:
+            response = JSONResponse(status_code=413, content={"detail": self._detail()})
+            return await response(scope, receive, send)
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    raise HTTPException(status_code=413, detail=self._detail())
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+# ============================================================================
+# Almacenamiento temporal + attachment en segundo plano
+# ============================================================================
+
+async def upload_to_temp_storage(path: Path, filename: str) -> Optional[str]:
+    """
+    Sube un archivo a un servicio de almacenamiento temporal para obtener URL pública.
+    Airtable descargará el archivo y lo almacenará permanentemente.
+
+    Usa catbox.moe (gratis, sin límite de tiempo para archivos <200MB) y
+    file.io como respaldo. El archivo se envía desde disco, por chunks.
+    """
+    try:
+        async with httpx.AsyncClient(timeout=60.0) as client:
+            with open(path, "rb") as f:
+                response = await client.post(TEMP_STORAGE_URL, files={
+                    'reqtype': (None, 'fileupload'),
+                    'fileToUpload': (filename, f, 'application/pdf')
+                })
+            if response.status_code == 200 and response.text.startswith('https://'):
+                return response.text.strip()
+
+            with open(path, "rb") as f:
+                response = await client.post(FALLBACK_STORAGE_URL, files={
+                    'file': (filename, f, 'application/pdf')
+                })
+            if response.status_code == 200:
+                data = response.json()
+                if data.get('success'):
+                    return data.get('link')
+            return None
+    except Exception as e:
+        logger.warning("Error subiendo a storage temporal: %s", e)
+        return None
+
+
+class CVAttachmentQueue:
+    """
+    Sube CVs al almacenamiento temporal y los adjunta al candidato, fuera del request.
+
+    Las subidas corren como tareas del event loop, `concurrency` a la vez,
+    con reintentos. Al cerrar la app se esperan las pendientes (hasta
+    `shutdown_timeout` segundos).
+    """
+
+    def __init__(self, concurrency: int = 2, attempts: int = 3, retry_delay: float = 5.0,
+                 shutdown_timeout: float = 30.0):
+        self.attempts = attempts
+        self.retry_delay = retry_delay
+        self.shutdown_timeout = shutdown_timeout
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._tasks: Set[asyncio.Task] = set()
+        self.completed = 0
+        self.failed = 0
+
+    @classmethod
+    def from_env(cls) -> "CVAttachmentQueue":
+        return cls(concurrency=int(os.getenv("CV_UPLOAD_CONCURRENCY", "2")))
+
+    @property
+    def pending(self) -> int:
+        return len(self._tasks)
+
+    def submit(self, airtable: AirtableService, candidato_id: str, key: str, filename: str) -> None:
+        """Agenda la subida del CV (clave en `cv_store`) y su registro como `cv_archivo` del candidato."""
+        task = asyncio.get_running_loop().create_task(self._run(airtable, candidato_id, key, filename))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, airtable: AirtableService, candidato_id: str, key: str, filename: str) -> None:
+        async with self._semaphore:
+            try:
+                path = await cv_store.local_path(key)
+            except BlobNotFound:
+                self.failed += 1
+                logger.warning("CV %s de %s no está en el store; no se adjunta", key, candidato_id)
+                return
+            for attempt in range(1, self.attempts + 1):
+                with telemetry.span("upload", "attach_cv", candidato_id=candidato_id, attempt=attempt):
+                    public_url = await upload_to_temp_storage(path, filename)
+                    if public_url:
+                        try:
+                            # Airtable descarga el archivo desde la URL y lo guarda
+                            await airtable.update_candidato(candidato_id, {"cv_archivo": [{"url": public_url}]})
+                            self.completed += 1
+                            logger.info("CV de %s adjuntado en Airtable: %s", candidato_id, public_url)
+                            return
+                        except Exception as e:
+                            logger.warning("No se pudo adjuntar el CV de %s: %s", candidato_id, e)
+                if attempt < self.attempts:
+                    await asyncio.sleep(self.retry_delay * attempt)
+            self.failed += 1
+            logger.warning("CV de %s sin attachment tras %d intentos; queda solo la copia en el store",
+                           candidato_id, self.attempts)
+
+    async def shutdown(self) -> None:
+        """Espera las subidas pendientes; las que no terminan a tiempo se cancelan."""
+        if not self._tasks:
+            return
+        tasks = list(self._tasks)
+        logger.info("Esperando %d subidas de CV pendientes", len(tasks))
+        done, not_done = await asyncio.wait(tasks, timeout=self.shutdown_timeout)
+        for task in not_done:
+            task.cancel()
+        await asyncio.gather(*not_done, return_exceptions=True)
+
+
+cv_attachments = CVAttachmentQueue.from_env()
@@ -0,0 +1,216 @@
+"""
+Usuarios en el camino de login: caché de lecturas y last_login diferido.
+
+Antes cada login hacía dos llamadas secuenciales a Airtable: buscar el
+usuario por email (filterByFormula) y, antes de responder, escribir su
+`last_login`. Ahora:
+
+- `UserCache` guarda los usuarios por email durante USER_CACHE_TTL
+  segundos y junta en una sola lectura los logins simultáneos del mismo
+  email. Se mantiene al día con los listeners de AirtableService: al
+  crear, actualizar (rol, last_login...) o borrar un usuario desde esta
+  API la entrada se reemplaza o se descarta. Desactivar un usuario o
+  cambiarle la contraseña se hace directamente en Airtable, donde los
+  listeners no se enteran: durante el TTL ese usuario puede seguir
+  entrando, en cada worker. Por eso el TTL es de pocos segundos; alcanza
+  para absorber ráfagas de logins sin servir credenciales viejas.
+- `LastLoginWriter` acumula los logins y los escribe en segundo plano cada
+  LAST_LOGIN_FLUSH_INTERVAL segundos, con PATCH en lotes de 10. Varios
+  logins del mismo usuario en el intervalo se escriben una sola vez. Los
+  pendientes se escriben al cerrar la app.
+
+Variables de entorno:
+    USER_CACHE_TTL=5                (segundos; 0 = sin caché)
+    LAST_LOGIN_FLUSH_INTERVAL=5     (segundos; 0 = escribir antes de responder)
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from engine import telemetry
+
+from .airtable import AirtableService, add_change_listener
+
+logger = logging.getLogger(__name__)
+
+
+USUARIOS_TABLE = "Usuarios"
+
+
+class UserCache:
+    """LRU de usuarios por email (con password_hash, solo para login)."""
+
+    def __init__(self, ttl: float = 5.0, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._by_email: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._email_by_id: Dict[str, str] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    @classmethod
+    def from_env(cls) -> "UserCache":
+        return cls(ttl=float(os.getenv("USER_CACHE_TTL", "5")))
+
+    @property
+    def currsize(self) -> int:
+        return len(self._by_email)
+
+    def info(self) -> "UserCache":
+        """Compatible con `telemetry.register_cache` (hits, misses, currsize)."""
+        return self
+
+    @staticmethod
+    def _key(email: str) -> str:
+        return email.strip().lower()
+
+    async def get_by_email(self, airtable: AirtableService, email: str) -> Optional[Dict[str, Any]]:
+        """
+        Usuario con ese email, desde la caché o desde Airtable.
+
+        Args:
+            airtable: Servicio con el que leer si no está en caché
+            email: Email del usuario
+
+        Returns:
+            Usuario formateado, o None si no existe (los inexistentes no se cachean)
+        """
+        if self.ttl <= 0:
+            return await airtable.get_usuario_by_email(email)
+
+        key = self._key(email)
+        entry = self._by_email.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self.hits += 1
+            self._by_email.move_to_end(key)
+            telemetry.annotate(user_cache="hit")
+            return dict(entry[1])
+
+        # Logins simultáneos del mismo usuario comparten la lectura
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.hits += 1
+            user = await asyncio.shield(pending)
+            return dict(user) if user else None
+
+        self.misses += 1
+        telemetry.annotate(user_cache="miss")
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            user = await airtable.get_usuario_by_email(email)
+            future.set_result(user)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+        if user:
+            self._put(user)
+        return dict(user) if user else None
+
+    def _put(self, user: Dict[str, Any]) -> None:
+        key = self._key(user.get("email", ""))
+        if not key:
+            return
+        self._by_email[key] = (time.monotonic() + self.ttl, dict(user))
+        self._by_email.move_to_end(key)
+        self._email_by_id[user["id"]] = key
+        while len(self._by_email) > self.maxsize:
+            _, (_, old) = self._by_email.popitem(last=False)
+            self._email_by_id.pop(old.get("id"), None)
+
+    def invalidate(self, user_id: str) -> None:
+        """Descarta el usuario de la caché."""
+        key = self._email_by_id.pop(user_id, None)
+        if key is not None:
+            self._by_email.pop(key, None)
+
+    def on_change(self, airtable: AirtableService, table_name: str, record: Dict[str, Any]) -> None:
+        """Listener de AirtableService: reemplaza o descarta el usuario escrito."""
+        if table_name != USUARIOS_TABLE or self.ttl <= 0:
+            return
+        self.invalidate(record.get("id"))
+        # Airtable responde create/update con el registro completo
+        if not record.get("deleted") and record.get("fields", {}).get("email"):
+            self._put(airtable._format_usuario(record))
+
+    def clear(self) -> None:
+        self._by_email.clear()
+        self._email_by_id.clear()
+        self.hits = self.misses = 0
+
+
+class LastLoginWriter:
+    """Acumula los last_login y los escribe en lote fuera del request."""
+
+    def __init__(self, interval: float = 5.0):
+        self.interval = interval
+        self._pending: Dict[str, str] = {}
+        self._airtable: Optional[AirtableService] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_env(cls) -> "LastLoginWriter":
+        return cls(interval=float(os.getenv("LAST_LOGIN_FLUSH_INTERVAL", "5")))
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    async def record(self, airtable: AirtableService, user_id: str) -> None:
+        """Registra un login; se escribe en el próximo flush (o ya, con intervalo 0)."""
+        if self.interval <= 0:
+            await airtable.update_usuario_last_login(user_id)
+            return
+        self._pending[user_id] = datetime.now().isoformat()
+        self._airtable = airtable
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        try:
+            await asyncio.sleep(self.interval)
+        finally:
+            self._task = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Escribe los logins pendientes. Si falla, quedan para el próximo flush."""
+        if not self._pending or self._airtable is None:
+            return
+        logins, self._pending = self._pending, {}
+        try:
+            with telemetry.span("pipeline", "flush_last_login", users=len(logins)):
+                await self._airtable.update_usuarios_last_login(logins)
+            logger.debug("last_login escrito para %d usuarios", len(logins))
+        except Exception:
+            logger.exception("Error escribiendo last_login de %d usuarios", len(logins))
+            # Los logins más nuevos que llegaron mientras tanto tienen prioridad
+            self._pending = {**logins, **self._pending}
+
+    async def shutdown(self) -> None:
+        """Cancela la espera y escribe lo pendiente (al cerrar la app)."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        await self.flush()
+
+
+user_cache = UserCache.from_env()
+add_change_listener(user_cache.on_change)
+telemetry.register_cache("usuarios", user_cache.info)
+
+last_login_writer = LastLoginWriter.from_env()
@@ -0,0 +1,173 @@
+"""
+Warm-up al iniciar la app y readiness (`/ready`).
+
+Sin warm-up, los primeros requests después de un deploy pagaban el
+handshake TLS con Airtable, las cachés vacías, los imports diferidos del
+motor y la compilación de la configuración. El lifespan lanza `warmup` en
+segundo plano, así el proceso responde `/health` (liveness) enseguida y
+`/ready` responde 503 hasta que el warm-up termina. El balanceador solo
+debe mandar tráfico cuando `/ready` da 200.
+
+Pasos (WARMUP_STEPS, en orden):
+- `airtable`: abre el pool de conexiones y carga las tablas de referencia
+  (Cargos, Procesos, Usuarios, Config_Evaluacion) en `reference_cache`. La
+  caché de login (`user_cache`) no se precarga: guarda credenciales y vive
+  pocos segundos
+- `engine`: importa el motor, lee la configuración activa de
+  Config_Evaluacion con el cliente compartido, compila su evaluador en
+  `services` (el mismo que usará `/evaluate`; si la lectura falla, el de la
+  configuración por defecto) y evalúa un CV de ejemplo (índice de empresas
+  y patrones)
+- `imports`: importa las dependencias pesadas que se cargan en el primer
+  uso (openai, pdfplumber, PyPDF2; las que no estén instaladas se saltan) y
+  crea el extractor de PDFs y el cliente de OpenAI compartidos
+
+Un paso que falla o supera WARMUP_TIMEOUT se registra y el warm-up sigue:
+la app queda lista igual (sin esa caché), y `/ready` informa qué falló.
+
+Variables de entorno:
+    WARMUP_STEPS=airtable,engine,imports    (default: todos; "none" = sin warm-up)
+    WARMUP_TIMEOUT=30                       (segundos por paso)
+"""
+
+import asyncio
+import importlib
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import anyio
+
+from engine import telemetry
+
+from .airtable import reference_cache
+from .container import services
+
+logger = logging.getLogger(__name__)
+
+
+STEPS = ("airtable", "engine", "imports")
+
+LAZY_IMPORTS = ("openai", "pdfplumber", "PyPDF2")
+
+SAMPLE_CV = """Juan Pérez - Ingeniero Comercial
+Experiencia: Gerente de Finanzas en Falabella (2018-2023), Analista en Banco de Chile.
+Lideré la implementación de SAP, gestioné presupuestos y reduje costos 15%.
+Educación: Universidad de Chile, MBA. Inglés avanzado, Excel avanzado, Power BI."""
+
+
+class WarmUp:
+    """Pasos de warm-up, ejecutados una vez en segundo plano."""
+
+    def __init__(self, steps: List[str], timeout: float = 30.0):
+        unknown = [s for s in steps if s not in STEPS]
+        if unknown:
+            raise ValueError(f"WARMUP_STEPS desconocidos: {unknown}. Usa: {', '.join(STEPS)}")
+        self.steps = steps
+        self.timeout = timeout
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_env(cls) -> "WarmUp":
+        raw = os.getenv("WARMUP_STEPS", ",".join(STEPS)).strip().lower()
+        steps = [] if raw in ("", "none", "0") else [s.strip() for s in raw.split(",") if s.strip()]
+        return cls(steps, timeout=float(os.getenv("WARMUP_TIMEOUT", "30")))
+
+    @property
+    def ready(self) -> bool:
+        return self.finished_at is not None
+
+    def start(self) -> None:
+        """Lanza el warm-up en segundo plano (sin pasos, la app queda lista de inmediato)."""
+        self.started_at = time.monotonic()
+        if not self.steps:
+            self.finished_at = self.started_at
+            return
+        self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def wait(self) -> None:
+        """Espera a que termine el warm-up en curso."""
+        if self._task is not None:
+            await asyncio.shield(self._task)
+
+    async def run(self) -> None:
+        if self.started_at is None:
+            self.started_at = time.monotonic()
+        for name in self.steps:
+            step: Callable[[], Awaitable[Dict[str, Any]]] = getattr(self, f"_step_{name}")
+            start = time.perf_counter()
+            try:
+                with telemetry.span("pipeline", f"warmup_{name}"):
+                    detail = await asyncio.wait_for(step(), self.timeout)
+                result = {"ok": True, **detail}
+            except asyncio.TimeoutError:
+                logger.warning("Warm-up %s: sin terminar tras %.0fs", name, self.timeout)
+                result = {"ok": False, "error": f"timeout ({self.timeout:.0f}s)"}
+            except Exception as e:
+                logger.warning("Warm-up %s falló: %s", name, e)
+                result = {"ok": False, "error": str(e)}
+            result["ms"] = round((time.perf_counter() - start) * 1000, 1)
+            self.results[name] = result
+        self.finished_at = time.monotonic()
+        logger.info("Warm-up terminado en %.0f ms: %s", (self.finished_at - self.started_at) * 1000,
+                    ", ".join(f"{n} {'ok' if r['ok'] else 'error'}" for n, r in self.results.items()))
+
+    async def shutdown(self) -> None:
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Estado para `/ready`."""
+        elapsed = None
+        if self.started_at is not None:
+            elapsed = round(((self.finished_at or time.monotonic()) - self.started_at) * 1000, 1)
+        return {
+            "ready": self.ready,
+            "elapsed_ms": elapsed,
+            "steps": {name: self.results.get(name, {"ok": None}) for name in self.steps}
+        }
+
+    # =========================================================================
+    # Pasos
+    # =========================================================================
+
+    async def _step_airtable(self) -> Dict[str, Any]:
+        if not (os.getenv("AIRTABLE_API_KEY") and os.getenv("AIRTABLE_BASE_ID")):
+            return {"skipped": "Airtable no configurado"}
+        airtable = services.airtable()
+        tables = await airtable.prefetch_reference_tables()
+        return {"tables": tables, "cached": reference_cache.currsize}
+
+    async def _step_engine(self) -> Dict[str, Any]:
+        # El motor se importa en un thread; la config activa sale de Airtable
+        await anyio.to_thread.run_sync(importlib.import_module, "engine.evaluator")
+        evaluator = await services.active_evaluator()
+        await anyio.to_thread.run_sync(evaluator.evaluate_record, SAMPLE_CV)
+        return {
+            "config": services.active_config_id,
+            "config_version": evaluator.config.version,
+            "categories": len(evaluator.config.categories)
+        }
+
+    async def _step_imports(self) -> Dict[str, Any]:
+        def import_all() -> Dict[str, Any]:
+            loaded, missing = [], []
+            for module in LAZY_IMPORTS:
+                try:
+                    importlib.import_module(module)
+                    loaded.append(module)
+                except ImportError:
+                    missing.append(module)
+            services.pdf_extractor()
+            return {"loaded": loaded, "missing": missing, "openai_client": services.openai() is not None}
+
+        return await anyio.to_thread.run_sync(import_all)
+
+
+warmup = WarmUp.from_env()
@@ -0,0 +1,515 @@
+#!/usr/bin/env python3
+"""
+Stub local compatible con la API REST de Airtable (subconjunto).
+
+Permite probar carga sin tocar la base real. Soporta:
+- GET lista con filterByFormula (subconjunto), sort, maxRecords, pageSize y offset
+- GET / POST / PATCH / DELETE de registros, individuales y en lotes de 10
+- Rate limiting por base (5 req/s por defecto) con respuestas 429
+- Latencia configurable (+ jitter)
+- Contadores de requests por método y tabla (GET /__stats, POST /__reset)
+- POST /__upload: reemplazo del almacenamiento temporal de CVs (catbox.moe)
+
+Ejecutar desde plataforma_reclutamiento/:
+    python benchmarks/airtable_stub.py --port 8787 --latency-ms 80 --seed 200
+
+Y apuntar la API al stub:
+    AIRTABLE_API_URL=http://127.0.0.1:8787/v0 AIRTABLE_API_KEY=stub AIRTABLE_BASE_ID=appSTUB \\
+    TEMP_STORAGE_URL=http://127.0.0.1:8787/__upload uvicorn api.main:app --port 8000
+"""
+
+import argparse
+import asyncio
+import random
+import re
+import string
+import time
+import uuid
+from collections import Counter, deque
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+MAX_PAGE_SIZE = 100
+MAX_BATCH = 10
+
+
+# ============================================================================
+# filterByFormula (subconjunto)
+# ============================================================================
+
+_FORMULA_TOKEN_RE = re.compile(r"""
+    \s*(?:
+        (?P<field>\{[^}]*\})
+      | (?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+      | (?P<number>\d+(?:\.\d+)?)
+      | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+      | (?P<op>!=|<>|>=|<=|=|>|<|&|\(|\)|,)
+    )""", re.VERBOSE)
+
+
+def _tokenize_formula(formula: str) -> List[tuple]:
+    tokens = []
+    pos = 0
+    formula = formula.strip()
+    while pos < len(formula):
+        match = _FORMULA_TOKEN_RE.match(formula, pos)
+        if not match or match.end() == pos:
+            raise ValueError(f"Fórmula no soportada cerca de: {formula[pos:pos + 20]!r}")
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "field":
+            value = value[1:-1]
+        elif kind == "string":
+            value = value[1:-1].replace("\\'", "'").replace('\\"', '"')
+        elif kind == "number":
+            value = float(value)
+        tokens.append((kind, value))
+        pos = match.end()
+    return tokens
+
+
+def _as_text(value: Any) -> str:
+    if value is None or value is False:
+        return ""
+    if value is True:
+        return "1"
+    if isinstance(value, list):
+        return ", ".join(_as_text(v) for v in value)
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _as_number(value: Any) -> Optional[float]:
+    if isinstance(value, bool):
+        return 1.0 if value else 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    if value in (None, ""):
+        return 0.0
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _truthy(value: Any) -> bool:
+    if isinstance(value, list):
+        return bool(value)
+    return bool(value) and value != "0"
+
+
+def _compare(op: str, left: Any, right: Any) -> bool:
+    if isinstance(left, (bool, int, float)) or isinstance(right, (bool, int, float)):
+        a, b = _as_number(left), _as_number(right)
+        if a is None or b is None:
+            a, b = _as_text(left), _as_text(right)
+    else:
+        a, b = _as_text(left), _as_text(right)
+    if op == "=":
+        return a == b
+    if op in ("!=", "<>"):
+        return a != b
+    if op == ">":
+        return a > b
+    if op == "<":
+        return a < b
+    if op == ">=":
+        return a >= b
+    return a <= b
+
+
+class _FormulaParser:
+    """Parser descendente que compila la fórmula a una función record -> valor."""
+
+    FUNCTIONS: Dict[str, Callable] = {
+        "AND": lambda *a: all(_truthy(x) for x in a),
+        "OR": lambda *a: any(_truthy(x) for x in a),
+        "NOT": lambda a: not _truthy(a),
+        "TRUE": lambda: True,
+        "FALSE": lambda: False,
+        "BLANK": lambda: "",
+        "IF": lambda c, a, b="": a if _truthy(c) else b,
+        "FIND": lambda needle, hay, start=1: _as_text(hay).find(_as_text(needle), int(start) - 1) + 1,
+        "SEARCH": lambda needle, hay, start=1: _as_text(hay).lower().find(_as_text(needle).lower(), int(start) - 1) + 1,
+        "ARRAYJOIN": lambda arr, sep=", ": sep.join(_as_text(v) for v in arr) if isinstance(arr, list) else _as_text(arr),
+        "LOWER": lambda s: _as_text(s).lower(),
+        "UPPER": lambda s: _as_text(s).upper(),
+        "LEN": lambda s: len(_as_text(s)),
+        # Fechas ISO: alcanza con comparar el texto
+        "IS_BEFORE": lambda a, b: bool(_as_text(a)) and _as_text(a)[:len(_as_text(b))] < _as_text(b),
+        "IS_AFTER": lambda a, b: bool(_as_text(a)) and _as_text(a)[:len(_as_text(b))] > _as_text(b),
+    }
+
+    def __init__(self, formula: str):
+        self.tokens = _tokenize_formula(formula)
+        self.pos = 0
+
+    def parse(self) -> Callable[[Dict[str, Any]], Any]:
+        expr = self._comparison()
+        if self.pos != len(self.tokens):
+            raise ValueError(f"Token inesperado: {self.tokens[self.pos][1]!r}")
+        return expr
+
+    def _peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def _expect(self, value: str):
+        kind, tok = self._peek()
+        if tok != value:
+            raise ValueError(f"Se esperaba {value!r}, llegó {tok!r}")
+        self.pos += 1
+
+    def _comparison(self):
+        left = self._concat()
+        kind, tok = self._peek()
+        if kind == "op" and tok in ("=", "!=", "<>", ">", "<", ">=", "<="):
+            self.pos += 1
+            right = self._concat()
+            return lambda rec, l=left, r=right, op=tok: _compare(op, l(rec), r(rec))
+        return left
+
+    def _concat(self):
+        parts = [self._primary()]
+        while self._peek() == ("op", "&"):
+            self.pos += 1
+            parts.append(self._primary())
+        if len(parts) == 1:
+            return parts[0]
+        return lambda rec: "".join(_as_text(p(rec)) for p in parts)
+
+    def _primary(self):
+        kind, tok = self._peek()
+        self.pos += 1
+        if kind == "field":
+            return lambda rec, name=tok: rec["fields"].get(name)
+        if kind in ("string", "number"):
+            return lambda rec, value=tok: value
+        if kind == "op" and tok == "(":
+            expr = self._comparison()
+            self._expect(")")
+            return expr
+        if kind == "name":
+            name = tok.upper()
+            self._expect("(")
+            args = []
+            if self._peek() != ("op", ")"):
+                args.append(self._comparison())
+                while self._peek() == ("op", ","):
+                    self.pos += 1
+                    args.append(self._comparison())
+            self._expect(")")
+            if name == "RECORD_ID":
+                return lambda rec: rec["id"]
+            fn = self.FUNCTIONS.get(name)
+            if fn is None:
+                raise ValueError(f"Función no soportada: {name}")
+            return lambda rec, f=fn, a=args: f(*(x(rec) for x in a))
+        raise ValueError(f"Token inesperado: {tok!r}")
+
+
+def compile_formula(formula: str) -> Callable[[Dict[str, Any]], bool]:
+    """Compila un filterByFormula a un predicado sobre registros."""
+    expr = _FormulaParser(formula).parse()
+    return lambda rec: _truthy(expr(rec))
+
+
+# ============================================================================
+# Store
+# ============================================================================
+
+def new_record_id() -> str:
+    return "rec" + "".join(random.choices(string.ascii_letters + string.digits, k=14))
+
+
+class StubStore:
+    """Tablas en memoria: {tabla: {record_id: record}} (orden de inserción)."""
+
+    def __init__(self):
+        self.tables: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+    def table(self, name: str) -> Dict[str, Dict[str, Any]]:
+        return self.tables.setdefault(name, {})
+
+    def create(self, table: str, fields: Dict[str, Any], created: Optional[datetime] = None) -> Dict[str, Any]:
+        record = {
+            "id": new_record_id(),
+            "createdTime": (created or datetime.utcnow()).strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+            "fields": {k: v for k, v in fields.items() if v is not None}
+        }
+        self.table(table)[record["id"]] = record
+        return record
+
+
+def seed(store: StubStore, candidates: int = 200, processes: int = 10, evaluated: float = 0.7, seed_value: int = 42) -> None:
+    """Carga datos sintéticos con los campos que usa AirtableService."""
+    rng = random.Random(seed_value)
+    base = datetime(2025, 1, 1)
+
+    users = [
+        store.create("Usuarios", {
+            "email": f"user{i}@neat.cl",
+            "nombre_completo": f"Usuario {i}",
+            "password_hash": "",
+            "rol": "admin" if i == 0 else "usuario",
+            "activo": True
+        })
+        for i in range(5)
+    ]
+    cargos = [
+        store.create("Cargos", {
+            "codigo": f"CARGO-{i:03d}",
+            "nombre": f"Cargo {i}",
+            "descripcion": "Cargo sintético",
+            "vacantes": 1,
+            "activo": True
+        })
+        for i in range(max(processes // 2, 1))
+    ]
+    procesos = [
+        store.create("Procesos", {
+            "codigo_proceso": f"PROC-{i:03d}",
+            "cargo": [rng.choice(cargos)["id"]],
+            "usuario_asignado": [rng.choice(users)["id"]],
+            "estado": "publicado" if i % 3 else "cerrado",
+            "vacantes_proceso": 1,
+            "fecha_inicio": (base + timedelta(days=i)).strftime("%Y-%m-%d")
+        })
+        for i in range(processes)
+    ]
+    for i in range(candidates):
+        tracking = f"NEAT-POST-{(base + timedelta(hours=i)).strftime('%Y%m%d-%H%M%S')}"
+        proceso = rng.choice(procesos)
+        candidato = store.create("Postulaciones", {
+            "codigo_tracking": tracking,
+            "nombre_completo": f"Candidato {i}",
+            "email": f"candidato{i}@mail.cl",
+            "telefono": "+56900000000",
+            "estado_candidato": rng.choice(["nuevo", "revision", "entrevista"]),
+            "proceso": [proceso["id"]],
+            "cargo": proceso["fields"]["cargo"],
+            "fecha_postulacion": (base + timedelta(hours=i)).strftime("%Y-%m-%d")
+        })
+        if rng.random() < evaluated:
+            score = rng.randint(20, 100)
+            store.create("Evaluaciones_AI", {
+                "candidato": tracking,
+                "postulacion": [candidato["id"]],
+                "score_promedio": score,
+                "score_admin": score,
+                "score_ops": score,
+                "score_biz": score,
+                "hands_on_index": rng.randint(0, 100),
+                "potential_score": rng.randint(0, 100),
+                "retention_risk": rng.choice(["Alto", "Bajo"]),
+                "profile_type": "Híbrido",
+                "industry_tier": "General",
+                "keywords_found_admin": ", ".join(rng.sample(["excel", "sap", "contabilidad", "ifrs", "presupuesto"], 2)),
+                "keywords_found_ops": ", ".join(rng.sample(["tesorería", "pagos", "logística", "kpi"], 2)),
+                "keywords_found_biz": ", ".join(rng.sample(["growth", "cultura", "liderazgo", "ventas"], 1)),
+                "config_version": "1.0"
+            })
+
+
+# ============================================================================
+# App
+# ============================================================================
+
+def _error(status: int, error_type: str, message: str) -> JSONResponse:
+    return JSONResponse(status_code=status, content={"error": {"type": error_type, "message": message}})
+
+
+def _sort_params(params) -> List[tuple]:
+    sorts = []
+    i = 0
+    while f"sort[{i}][field]" in params:
+        sorts.append((params[f"sort[{i}][field]"], params.get(f"sort[{i}][direction]", "asc")))
+        i += 1
+    return sorts
+
+
+def create_app(
+    store: Optional[StubStore] = None,
+    latency_ms: float = 0.0,
+    jitter_ms: float = 0.0,
+    rate_limit: int = 5
+) -> FastAPI:
+    """
+    Crea la app del stub.
+
+    Args:
+        store: Datos en memoria (vacío si es None)
+        latency_ms: Latencia base agregada a cada request de la API
+        jitter_ms: Variación aleatoria (+/-) sobre la latencia
+        rate_limit: Requests por segundo por base (0 = sin límite)
+    """
+    app = FastAPI(title="Airtable stub")
+    app.state.store = store or StubStore()
+    app.state.stats = Counter()
+    app.state.throttled = Counter()
+    windows: Dict[str, deque] = {}
+
+    @app.middleware("http")
+    async def simulate_airtable(request: Request, call_next):
+        path = request.url.path
+        if not path.startswith("/v0/"):
+            return await call_next(request)
+
+        parts = path.split("/")
+        base_id = parts[2] if len(parts) > 2 else ""
+        table = parts[3] if len(parts) > 3 else ""
+        key = f"{request.method} {table}"
+
+        if rate_limit:
+            now = time.monotonic()
+            window = windows.setdefault(base_id, deque())
+            while window and now - window[0] >= 1.0:
+                window.popleft()
+            if len(window) >= rate_limit:
+                app.state.throttled[key] += 1
+                return _error(429, "RATE_LIMIT_REACHED", "Rate limit exceeded. Please try again later")
+            window.append(now)
+
+        app.state.stats[key] += 1
+        if latency_ms or jitter_ms:
+            delay = max(latency_ms + random.uniform(-jitter_ms, jitter_ms), 0.0)
+            await asyncio.sleep(delay / 1000)
+        return await call_next(request)
+
+    @app.get("/__stats")
+    async def stats():
+        return {
+            "requests": dict(app.state.stats),
+            "throttled": dict(app.state.throttled),
+            "total": sum(app.state.stats.values()),
+            "total_throttled": sum(app.state.throttled.values())
+        }
+
+    @app.post("/__reset")
+    async def reset():
+        app.state.stats.clear()
+        app.state.throttled.clear()
+        windows.clear()
+        return {"ok": True}
+
+    @app.post("/__upload")
+    async def upload(request: Request):
+        await request.body()
+        return PlainTextResponse(f"https://stub.airtable.local/files/{uuid.uuid4().hex}.pdf")
+
+    @app.get("/v0/{base_id}/{table}")
+    async def list_records(base_id: str, table: str, request: Request):
+        params = request.query_params
+        records = list(app.state.store.table(table).values())
+
+        formula = params.get("filterByFormula")
+        if formula:
+            try:
+                predicate = compile_formula(formula)
+            except ValueError as e:
+                return _error(422, "INVALID_FILTER_BY_FORMULA", str(e))
+            records = [r for r in records if predicate(r)]
+
+        for field, direction in reversed(_sort_params(params)):
+            records.sort(key=lambda r: (r["fields"].get(field) is None, _as_text(r["fields"].get(field))),
+                         reverse=direction == "desc")
+
+        if params.get("maxRecords"):
+            records = records[:int(params["maxRecords"])]
+
+        page_size = min(int(params.get("pageSize", MAX_PAGE_SIZE)), MAX_PAGE_SIZE)
+        start = 0
+        if params.get("offset"):
+            try:
+                start = int(params["offset"].rsplit("/", 1)[-1])
+            except ValueError:
+                return _error(422, "LIST_RECORDS_ITERATOR_NOT_AVAILABLE", "Offset inválido")
+
+        page = records[start:start + page_size]
+        body: Dict[str, Any] = {"records": page}
+        if start + page_size < len(records):
+            body["offset"] = f"itr{uuid.uuid4().hex[:10]}/{start + page_size}"
+        return body
+
+    @app.get("/v0/{base_id}/{table}/{record_id}")
+    async def get_record(base_id: str, table: str, record_id: str):
+        record = app.state.store.table(table).get(record_id)
+        if not record:
+            return _error(404, "NOT_FOUND", "Could not find record")
+        return record
+
+    @app.post("/v0/{base_id}/{table}")
+    async def create_records(base_id: str, table: str, request: Request):
+        body = await request.json()
+        if "records" in body:
+            if len(body["records"]) > MAX_BATCH:
+                return _error(422, "INVALID_RECORDS", f"Máximo {MAX_BATCH} registros por request")
+            created = [app.state.store.create(table, r.get("fields", {})) for r in body["records"]]
+            return {"records": created}
+        return app.state.store.create(table, body.get("fields", {}))
+
+    def _patch(table: str, record_id: str, fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        record = app.state.store.table(table).get(record_id)
+        if record:
+            record["fields"].update({k: v for k, v in fields.items() if v is not None})
+        return record
+
+    @app.patch("/v0/{base_id}/{table}/{record_id}")
+    async def update_record(base_id: str, table: str, record_id: str, request: Request):
+        body = await request.json()
+        record = _patch(table, record_id, body.get("fields", {}))
+        if not record:
+            return _error(404, "NOT_FOUND", "Could not find record")
+        return record
+
+    @app.patch("/v0/{base_id}/{table}")
+    async def update_records(base_id: str, table: str, request: Request):
+        body = await request.json()
+        records = body.get("records", [])
+        if len(records) > MAX_BATCH:
+            return _error(422, "INVALID_RECORDS", f"Máximo {MAX_BATCH} registros por request")
+        updated = [_patch(table, r["id"], r.get("fields", {})) for r in records]
+        if any(r is None for r in updated):
+            return _error(404, "NOT_FOUND", "Could not find record")
+        return {"records": updated}
+
+    @app.delete("/v0/{base_id}/{table}/{record_id}")
+    async def delete_record(base_id: str, table: str, record_id: str):
+        if app.state.store.table(table).pop(record_id, None) is None:
+            return _error(404, "NOT_FOUND", "Could not find record")
+        return {"id": record_id, "deleted": True}
+
+    @app.delete("/v0/{base_id}/{table}")
+    async def delete_records(base_id: str, table: str, request: Request):
+        ids = request.query_params.getlist("records[]")
+        if len(ids) > MAX_BATCH:
+            return _error(422, "INVALID_RECORDS", f"Máximo {MAX_BATCH} registros por request")
+        records = app.state.store.table(table)
+        return {"records": [{"id": i, "deleted": records.pop(i, None) is not None} for i in ids]}
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=int, default=5, help="Req/s por base (0 = sin límite)")
+    parser.add_argument("--seed", type=int, default=200, help="Candidatos sintéticos a cargar")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    store = StubStore()
+    seed(store, candidates=args.seed)
+    app = create_app(store, args.latency_ms, args.jitter_ms, args.rate_limit)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
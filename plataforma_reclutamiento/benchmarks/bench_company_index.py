@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: detección de empresas con bases de conocimiento grandes.
+
+Compara el loop anterior (`company.lower() in text.lower()` por cada
+empresa) contra `CompanyIndex` (autómata Aho-Corasick por tokens) sobre
+bases sintéticas de 1k / 10k / 50k empresas más la base real.
+
+Ejecutar desde plataforma_reclutamiento/:
+    python benchmarks/bench_company_index.py
+    python benchmarks/bench_company_index.py --sizes 10000 100000 --json
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+
+from common import load_corpus
+
+from engine import CompanyIndex, TextIndex
+from engine.companies import DEFAULT_KNOWLEDGE_PATH
+
+WORDS = [
+    "andes", "austral", "pacifico", "minera", "servicios", "capital", "norte",
+    "sur", "digital", "logistica", "agro", "energia", "grupo", "holding",
+    "inversiones", "comercial", "industrial", "ingenieria", "salud", "retail"
+]
+SUFFIXES = ["S.A.", "SpA", "Ltda", "Limitada", ""]
+TIERS = ["Fintech", "Tech", "Mining", "Industrial", "Education", "Logistics"]
+
+
+def synthetic_knowledge(size: int, seed: int = 7) -> dict:
+    """Genera `size` empresas con nombres de 1-3 palabras + código + sufijo legal."""
+    rng = random.Random(seed)
+    kb = {}
+    while len(kb) < size:
+        words = rng.sample(WORDS, rng.randint(1, 3))
+        name = " ".join(w.title() for w in words) + f" {rng.randint(0, 10**6):x}"
+        suffix = rng.choice(SUFFIXES)
+        kb[f"{name} {suffix}".strip()] = {"desc": "", "tier": rng.choice(TIERS)}
+    return kb
+
+
+def legacy_detect(text: str, knowledge_base: dict) -> dict:
+    """Implementación anterior de `detect_companies`."""
+    text_lower = text.lower()
+    return {c: info for c, info in knowledge_base.items() if c.lower() in text_lower}
+
+
+def time_per_text(fn, texts: list, iterations: int) -> float:
+    """Microsegundos promedio por texto."""
+    start = time.perf_counter()
+    for i in range(iterations):
+        fn(texts[i % len(texts)])
+    return round((time.perf_counter() - start) / iterations * 1e6, 1)
+
+
+def run_size(name: str, kb: dict, texts: list, iterations: int) -> dict:
+    start = time.perf_counter()
+    index = CompanyIndex(kb)
+    build_ms = round((time.perf_counter() - start) * 1000, 1)
+
+    # El TextIndex se reutiliza con el del evaluador, así que se excluye
+    indexes = [TextIndex.for_text(t) for t in texts]
+    return {
+        "knowledge_base": name,
+        "companies": len(kb),
+        "build_ms": build_ms,
+        "legacy_us": time_per_text(lambda t: legacy_detect(t, kb), texts, iterations),
+        "index_us": time_per_text(index.find, indexes, iterations)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--corpus", type=int, default=5, help="Cantidad de CVs a usar")
+    parser.add_argument("--json", action="store_true", help="Salida JSON")
+    args = parser.parse_args()
+
+    texts = load_corpus(args.corpus)
+    if not texts:
+        print("❌ No se encontraron PDFs legibles en data/cvs")
+        sys.exit(1)
+
+    results = []
+    if DEFAULT_KNOWLEDGE_PATH.exists():
+        with open(DEFAULT_KNOWLEDGE_PATH, "r", encoding="utf-8") as f:
+            results.append(run_size("data/company_knowledge.json", json.load(f), texts, args.iterations))
+    for size in args.sizes:
+        results.append(run_size("synthetic", synthetic_knowledge(size), texts, args.iterations))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print("=" * 72)
+    print("   🏢 Detección de empresas (µs por CV)")
+    print("=" * 72)
+    for r in results:
+        print(f"{r['companies']:>7} empresas | build {r['build_ms']:>8} ms | "
+              f"legacy {r['legacy_us']:>10} µs | índice {r['index_us']:>7} µs")
+
+
+if __name__ == "__main__":
+    main()
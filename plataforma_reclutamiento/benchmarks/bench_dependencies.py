@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Costo por request de las dependencias de los routers.
+
+Compara los servicios compartidos de `api.services.container` con el
+comportamiento anterior (`per_request`: cada dependencia construye su
+instancia en cada request, como `def get_airtable_service(): return
+AirtableService.from_env()` en cada router).
+
+1. Proveedores aislados: tiempo y memoria asignada (tracemalloc) por llamada
+   de AirtableService, CandidateEvaluator, PDFExtractor y el cliente de
+   OpenAI (se salta si openai no está instalado).
+2. API in-process (httpx.ASGITransport, sin red): latencia de
+   `POST /api/evaluations/evaluate-text` (evaluador) y `GET /api/cargos/`
+   (Airtable, servido desde la caché de referencias del stub) con
+   `app.dependency_overrides` para reproducir el modo `per_request`.
+
+Ejecutar desde plataforma_reclutamiento/:
+    python benchmarks/bench_dependencies.py
+    python benchmarks/bench_dependencies.py --requests 500 --iterations 2000 --json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List
+
+import httpx
+
+from common import peak_memory, time_calls
+from load_test import STUB_BASE_ID, percentile, start_stub
+
+SAMPLE_CV = (
+    "Gerente de Finanzas en Falabella (2018-2023). Lideré la implementación de SAP, "
+    "gestioné presupuestos y reduje costos 15%. MBA Universidad de Chile, inglés avanzado."
+)
+
+
+# ============================================================================
+# Dependencias del modo anterior (una instancia por request)
+# ============================================================================
+
+def per_request_airtable():
+    from api.services.airtable import AirtableService
+    return AirtableService.from_env()
+
+
+def per_request_evaluator():
+    from engine import CandidateEvaluator
+    return CandidateEvaluator()
+
+
+def per_request_pdf_extractor():
+    from engine import PDFExtractor
+    return PDFExtractor()
+
+
+def per_request_openai():
+    from openai import OpenAI
+    return OpenAI(api_key=os.environ["OPENAI_API_KEY"])
+
+
+# ============================================================================
+# 1. Proveedores
+# ============================================================================
+
+def bench_providers(iterations: int) -> Dict[str, Any]:
+    from api.services.container import services
+
+    providers: Dict[str, Dict[str, Callable[[], Any]]] = {
+        "airtable": {"per_request": per_request_airtable, "shared": services.airtable},
+        "evaluator": {"per_request": per_request_evaluator, "shared": services.evaluator},
+        "pdf_extractor": {"per_request": per_request_pdf_extractor, "shared": services.pdf_extractor}
+    }
+    try:
+        import openai  # noqa: F401
+        providers["openai"] = {"per_request": per_request_openai, "shared": services.openai}
+    except ImportError:
+        print("⚠️  openai no está instalado: se salta el cliente", file=sys.stderr)
+
+    results = {}
+    for name, modes in providers.items():
+        results[name] = {}
+        for mode, factory in modes.items():
+            # Los clientes de OpenAI del modo anterior quedaban abiertos hasta el GC
+            n = min(iterations, 200) if name in ("evaluator", "openai") and mode == "per_request" else iterations
+            timing = time_calls(lambda _: factory(), [None], n)
+            memory = peak_memory(lambda _: factory(), [None] * 20)
+            results[name][mode] = {"us_per_call": timing["us_per_call"], "p95_us": timing["p95_us"],
+                                   "alloc_kb": memory["peak_kb_avg"]}
+    return results
+
+
+# ============================================================================
+# 2. API in-process
+# ============================================================================
+
+async def run_endpoint(client: httpx.AsyncClient, method: str, url: str, requests: int,
+                       concurrency: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            start = time.perf_counter()
+            response = await client.request(method, url)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {
+        "p50_ms": round(percentile(latencies, 0.50), 3),
+        "p95_ms": round(percentile(latencies, 0.95), 3),
+        "rps": round(requests / elapsed, 1),
+        "errors": errors
+    }
+
+
+async def bench_api(requests: int, concurrency: int) -> Dict[str, Any]:
+    from api.main import app
+    from api.services.container import get_airtable_service, get_evaluator, get_pdf_extractor
+
+    endpoints = {
+        "evaluate_text": ("POST", "/api/evaluations/evaluate-text?" + httpx.QueryParams(cv_text=SAMPLE_CV).__str__()),
+        "cargos_list": ("GET", "/api/cargos/")
+    }
+    overrides = {
+        get_airtable_service: per_request_airtable,
+        get_evaluator: per_request_evaluator,
+        get_pdf_extractor: per_request_pdf_extractor
+    }
+
+    results: Dict[str, Any] = {name: {} for name in endpoints}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://api", timeout=60) as client:
+        for mode in ("per_request", "shared"):
+            app.dependency_overrides = dict(overrides) if mode == "per_request" else {}
+            for name, (method, url) in endpoints.items():
+                await run_endpoint(client, method, url, min(requests, 20), 1)  # calentamiento
+                print(f"▶️  {mode} {name}...", file=sys.stderr)
+                results[name][mode] = await run_endpoint(client, method, url, requests, concurrency)
+    app.dependency_overrides = {}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=1000, help="Llamadas por proveedor")
+    parser.add_argument("--requests", type=int, default=300, help="Requests por endpoint y modo")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--json", action="store_true", help="Salida JSON")
+    args = parser.parse_args()
+
+    stub_url = start_stub(SimpleNamespace(seed=10, latency_ms=0, jitter_ms=0, rate_limit=0))
+    os.environ.update({
+        "AIRTABLE_API_URL": f"{stub_url}/v0",
+        "AIRTABLE_API_KEY": "stub",
+        "AIRTABLE_BASE_ID": STUB_BASE_ID,
+        "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY", "sk-bench"),
+        "LOG_LEVEL": os.getenv("LOG_LEVEL", "WARNING")
+    })
+
+    results = {
+        "providers": bench_providers(args.iterations),
+        "api": asyncio.run(bench_api(args.requests, args.concurrency))
+    }
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print("=" * 72)
+    print("   🧩 Dependencias por request: per_request (anterior) vs shared")
+    print("=" * 72)
+    print(f"   {'proveedor':<15} {'modo':<12} {'µs/llamada':>12} {'p95 µs':>10} {'asignado KB':>12}")
+    for name, modes in results["providers"].items():
+        for mode, r in modes.items():
+            print(f"   {name:<15} {mode:<12} {r['us_per_call']:>12} {r['p95_us']:>10} {r['alloc_kb']:>12}")
+    print(f"\n   API in-process ({args.requests} requests, concurrencia {args.concurrency})")
+    for name, modes in results["api"].items():
+        for mode, r in modes.items():
+            print(f"   {name:<15} {mode:<12} p50 {r['p50_ms']:>8.2f} ms   p95 {r['p95_ms']:>8.2f} ms   "
+                  f"{r['rps']:>8.1f} req/s" + (f"   ({r['errors']} errores)" if r["errors"] else ""))
+
+
+if __name__ == "__main__":
+    main()
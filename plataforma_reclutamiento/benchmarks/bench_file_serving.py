@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Servir CVs: `serve_blob` (índice en memoria, ETag, Range) vs. el anterior.
+
+Levanta uvicorn en un thread con dos rutas sobre los mismos PDFs de
+data/cvs (copiados a un directorio temporal):
+- `/old/{nombre}`: lo que hacía `serve_cv_file` antes: `exists()` +
+  `resolve()` por directorio y FileResponse sin validadores propios
+- `/new/{clave}`: `serve_blob` sobre un LocalBlobStore indexado
+
+Por ruta mide, con `--concurrency` clientes HTTP reales:
+- `full`: GET completo
+- `range`: primeros 64 KiB (lo que pide un visor de PDF para empezar)
+- `revalidate`: GET con If-None-Match del ETag anterior. La ruta nueva
+  responde 304 sin body; la anterior no compara ETags y manda el archivo
+
+Ejecutar desde plataforma_reclutamiento/:
+    python benchmarks/bench_file_serving.py
+    python benchmarks/bench_file_serving.py --requests 2000 --concurrency 32 --json
+"""
+
+import argparse
+import asyncio
+import json
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+from pathlib import Path
+from typing import Any, Dict, List
+
+import httpx
+
+from common import cv_paths
+from load_test import _free_port, percentile
+
+
+def create_app(root: Path, store):
+    from fastapi import FastAPI, HTTPException, Request
+    from fastapi.responses import FileResponse
+
+    from api.services.file_serving import serve_blob
+
+    app = FastAPI()
+
+    @app.get("/old/{filename}")
+    async def old(filename: str):
+        decoded = urllib.parse.unquote(filename)
+        for dir_path in (root, root):
+            candidate = dir_path / decoded
+            if candidate.exists():
+                resolved = candidate.resolve()
+                if str(resolved).startswith(str(dir_path.resolve())):
+                    return FileResponse(path=str(resolved), filename=decoded, media_type="application/pdf")
+        raise HTTPException(status_code=404)
+
+    @app.get("/new/{key}")
+    async def new(key: str, request: Request):
+        return await serve_blob(request, store, key)
+
+    return app
+
+
+def start_server(app) -> str:
+    import uvicorn
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+async def run_case(client: httpx.AsyncClient, urls: List[str], headers_for, requests: int,
+                   concurrency: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    bytes_in = 0
+    statuses: Dict[int, int] = {}
+    remaining = iter(range(requests))
+
+    async def worker():
+        nonlocal bytes_in
+        for i in remaining:
+            url = urls[i % len(urls)]
+            start = time.perf_counter()
+            response = await client.get(url, headers=headers_for(url))
+            latencies.append((time.perf_counter() - start) * 1000)
+            bytes_in += len(response.content)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {
+        "rps": round(requests / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50), 2),
+        "p95_ms": round(percentile(latencies, 0.95), 2),
+        "kb_per_req": round(bytes_in / requests / 1024, 1),
+        "status": statuses
+    }
+
+
+async def run(args) -> Dict[str, Any]:
+    from api.services.blobs import LocalBlobStore
+
+    root = Path(tempfile.mkdtemp(prefix="neat-files-"))
+    legacy = root / "legacy"
+    legacy.mkdir()
+    store = LocalBlobStore(root / "blobs")
+    old_urls, new_urls = [], []
+    for path in map(Path, cv_paths()[:args.files]):
+        shutil.copy(path, legacy / path.name)
+        info = await store.put_file(path)
+        old_urls.append(f"/old/{urllib.parse.quote(path.name)}")
+        new_urls.append(f"/new/{info.key}")
+    await store.build_index()
+
+    base_url = start_server(create_app(legacy, store))
+    results: Dict[str, Any] = {"files": len(new_urls)}
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        etags = {}
+        for url in old_urls + new_urls:
+            etags[url] = (await client.get(url)).headers.get("etag", "")
+        cases = {
+            "full": lambda url: {},
+            "range": lambda url: {"Range": "bytes=0-65535"},
+            "revalidate": lambda url: {"If-None-Match": etags[url]}
+        }
+        for route, urls in (("old", old_urls), ("new", new_urls)):
+            for case, headers_for in cases.items():
+                print(f"▶️  {route} {case}...", file=sys.stderr)
+                results[f"{route}.{case}"] = await run_case(client, urls, headers_for, args.requests, args.concurrency)
+    shutil.rmtree(root, ignore_errors=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500, help="Requests por caso")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--files", type=int, default=10, help="PDFs del corpus a servir")
+    parser.add_argument("--json", action="store_true", help="Salida JSON")
+    args = parser.parse_args()
+
+    if not cv_paths():
+        print("❌ No se encontraron PDFs en data/cvs")
+        sys.exit(1)
+
+    results = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print("=" * 78)
+    print(f"   📄 Servir CVs: {args.requests} req/caso, concurrencia {args.concurrency}, {results['files']} PDFs")
+    print("=" * 78)
+    for case in ("full", "range", "revalidate"):
+        for route in ("old", "new"):
+            r = results[f"{route}.{case}"]
+            statuses = " ".join(f"{code}×{n}" for code, n in sorted(r["status"].items()))
+            print(f"   {case:<10} {route:<4} {r['rps']:>8.1f} req/s   p50 {r['p50_ms']:>7.2f} ms   "
+                  f"p95 {r['p95_ms']:>7.2f} ms   {r['kb_per_req']:>7.1f} KB/req   {statuses}")
+
+
+if __name__ == "__main__":
+    main()
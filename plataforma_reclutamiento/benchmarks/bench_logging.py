@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: costo del logging en el camino de evaluación.
+
+Compara las líneas que emitía `evaluate_by_tracking_code` con `print()`
+(f-strings formateadas siempre, escritura síncrona a stdout, incluidas
+las de [DEBUG]) contra las mismas líneas vía `logging` configurado por
+`api.services.logging_setup` (JSON, QueueHandler, nivel INFO: los DEBUG
+se descartan sin formatear y la escritura la hace el thread listener).
+
+Dos destinos:
+- `file`: archivo temporal con buffer de línea (como stdout en un
+  contenedor), donde pesa sobre todo el costo de CPU de cada línea
+- `slow`: el mismo archivo con `--sink-latency-us` de espera por escritura,
+  como un pipe lleno o un colector de logs lento. Con print() esa espera
+  la paga el request; con la cola la paga el thread listener
+
+Ejecutar desde plataforma_reclutamiento/:
+    python benchmarks/bench_logging.py
+    python benchmarks/bench_logging.py --iterations 2000 --json
+"""
+
+import argparse
+import contextlib
+import json
+import logging
+import sys
+import tempfile
+import time
+
+from common import load_corpus
+
+from engine import CandidateEvaluator
+from api.services import logging_setup
+
+
+TRACKING = "NEAT-POST-20250101-120000"
+ADJUSTMENTS = {"score_promedio": 72, "hands_on_index": 61, "retention_risk": "Medium"}
+REASONING = "El candidato mostró liderazgo operativo y manejo de equipos en la entrevista. " * 3
+
+
+def print_path(record) -> None:
+    """Las líneas de una evaluación tal como se imprimían antes."""
+    print(f"[DEBUG] {TRACKING}: eval_time=2025-01-01T12:00:00, comentario_mas_reciente=2025-01-02T09:00:00")
+    print(f"[INFO] {TRACKING}: Hay comentarios nuevos, re-evaluando...")
+    print(f"[INFO] ⚡ {TRACKING}: Usando cache de CV (5321 chars)")
+    print(f"[INFO] Incluyendo 3 notas HUMANAS en la evaluación (excluidas 1 del sistema)")
+    print(f"[DEBUG] Respuesta OpenAI: {REASONING[:200]}...")
+    print(f"[DEBUG] Ajustes parseados: {ADJUSTMENTS}")
+    print(f"[INFO] ✅ Ajustes IA de comentarios: {ADJUSTMENTS}")
+    print(f"[INFO] Razón: {REASONING}")
+    print(f"[INFO] Ajustes IA detectados: {ADJUSTMENTS}")
+    print(f"[INFO] Ajustes finales aplicados: {ADJUSTMENTS}")
+    print(f"[DEBUG] Score base del motor: {record.score_promedio}")
+    print(f"[DEBUG] Ajustes a aplicar: {ADJUSTMENTS}")
+    print(f"[DEBUG] Factor de ajuste: {1.05:.2f}")
+    print(f"[INFO] ✅ Evaluación final: score={record.score_promedio}, admin=70, ops=65, biz=80, hands_on=61")
+    print(f"[INFO] ✅ Comentario automático creado con ajustes")
+
+
+logger = logging.getLogger("api.routes.evaluations")
+
+
+def logging_path(record) -> None:
+    """Las mismas líneas con el logger del módulo."""
+    logger.debug("%s: eval_time=%s, comentario_mas_reciente=%s", TRACKING, "2025-01-01T12:00:00", "2025-01-02T09:00:00")
+    logger.info("%s: hay comentarios nuevos, re-evaluando", TRACKING)
+    logger.info("%s: usando cache de CV (%d chars)", TRACKING, 5321)
+    logger.info("Incluyendo %d notas humanas en la evaluación (excluidas %d del sistema)", 3, 1)
+    logger.debug("Respuesta OpenAI (%d chars): %.200s", len(REASONING), REASONING)
+    logger.debug("Ajustes parseados: %s", ADJUSTMENTS)
+    logger.info("Ajustes IA de comentarios: %s", ADJUSTMENTS)
+    logger.info("Razón: %s", REASONING)
+    logger.info("Ajustes IA detectados: %s", ADJUSTMENTS)
+    logger.info("Ajustes finales aplicados: %s", ADJUSTMENTS)
+    logger.debug("Score base del motor: %s", record.score_promedio)
+    logger.debug("Ajustes a aplicar: %s", ADJUSTMENTS)
+    logger.debug("Factor de ajuste: %.2f", 1.05)
+    logger.info("Evaluación final: score=%s admin=%s ops=%s biz=%s hands_on=%s",
+                record.score_promedio, 70, 65, 80, 61)
+    logger.info("Comentario automático creado con ajustes")
+
+
+class SlowSink:
+    """Archivo cuyo write() tarda `latency` segundos (colector de logs lento)."""
+
+    def __init__(self, target, latency: float):
+        self.target = target
+        self.latency = latency
+
+    def write(self, text: str) -> int:
+        time.sleep(self.latency)
+        return self.target.write(text)
+
+    def flush(self) -> None:
+        self.target.flush()
+
+
+def measure(fn, records: list, iterations: int) -> float:
+    """Microsegundos por evaluación (solo las llamadas de log)."""
+    for record in records:
+        fn(record)
+    start = time.perf_counter()
+    for i in range(iterations):
+        fn(records[i % len(records)])
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--corpus", type=int, default=5, help="Cantidad de CVs a usar")
+    parser.add_argument("--sink-latency-us", type=int, default=200,
+                        help="Espera por write() del destino lento")
+    parser.add_argument("--json", action="store_true", help="Salida JSON")
+    args = parser.parse_args()
+
+    texts = load_corpus(args.corpus)
+    if not texts:
+        print("❌ No se encontraron PDFs legibles en data/cvs")
+        sys.exit(1)
+
+    evaluator = CandidateEvaluator()
+    records = [evaluator.evaluate_record(text) for text in texts]
+    start = time.perf_counter()
+    for i in range(args.iterations):
+        evaluator.evaluate_record(texts[i % len(texts)])
+    evaluate_us = (time.perf_counter() - start) / args.iterations * 1e6
+
+    results = {"evaluate_us": round(evaluate_us, 1), "sinks": {}}
+    with tempfile.TemporaryFile("w", encoding="utf-8", buffering=1) as target:
+        sinks = {"file": target, "slow": SlowSink(target, args.sink_latency_us / 1e6)}
+        for sink_name, sink in sinks.items():
+            # Con el destino lento alcanza con menos iteraciones
+            iterations = args.iterations if sink_name == "file" else max(args.iterations // 10, 10)
+            with contextlib.redirect_stdout(sink):
+                print_us = measure(print_path, records, iterations)
+
+            logging_setup.configure_logging(fmt="json", level="INFO", levels={}, stream=sink)
+            try:
+                logging_us = measure(logging_path, records, iterations)
+            finally:
+                logging_setup.shutdown_logging()
+
+            results["sinks"][sink_name] = {
+                "print_us_per_eval": round(print_us, 1),
+                "logging_us_per_eval": round(logging_us, 1),
+                "print_overhead_pct": round(print_us / evaluate_us * 100, 1),
+                "logging_overhead_pct": round(logging_us / evaluate_us * 100, 1),
+                "iterations": iterations
+            }
+    results["sink_latency_us"] = args.sink_latency_us
+    results["corpus_size"] = len(texts)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    titles = {"file": "archivo (buffer de línea)", "slow": f"destino lento ({args.sink_latency_us} µs/write)"}
+    print(f"   evaluate_record: {results['evaluate_us']:.1f} µs por evaluación")
+    for sink_name, data in results["sinks"].items():
+        print("=" * 60)
+        print(f"   📏 Logging en el camino de evaluación: {titles[sink_name]}")
+        print("=" * 60)
+        print(f"   print() (15 líneas):      {data['print_us_per_eval']:>9.1f} µs  "
+              f"({data['print_overhead_pct']}% de la evaluación)")
+        print(f"   logging (INFO, en cola):  {data['logging_us_per_eval']:>9.1f} µs  "
+              f"({data['logging_overhead_pct']}% de la evaluación)")
+
+
+if __name__ == "__main__":
+    main()
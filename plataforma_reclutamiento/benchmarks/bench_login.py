@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Latencia de POST /api/auth/login contra el stub de Airtable.
+
+Compara dos modos con la misma API in-process:
+- `inline`: sin caché de usuarios y last_login escrito antes de responder
+  (USER_CACHE_TTL=0, LAST_LOGIN_FLUSH_INTERVAL=0; el comportamiento anterior)
+- `cached`: caché de usuarios y last_login en lote en segundo plano (default)
+
+Por modo reporta p50/p95 y requests a Airtable por login, incluidas las
+escrituras diferidas (se fuerza el flush al final).
+
+Ejecutar desde plataforma_reclutamiento/:
+    python benchmarks/bench_login.py
+    python benchmarks/bench_login.py --logins 200 --concurrency 20 --latency-ms 120 --json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import httpx
+
+from load_test import STUB_BASE_ID, percentile, start_stub
+
+PASSWORD = "neat-bench-1234"
+
+
+async def prepare_users(stub: httpx.AsyncClient, password_hash: str) -> List[str]:
+    """Asigna una contraseña conocida a los usuarios del stub. Retorna sus emails."""
+    records = (await stub.get(f"/v0/{STUB_BASE_ID}/Usuarios")).json()["records"]
+    for r in records:
+        await stub.patch(f"/v0/{STUB_BASE_ID}/Usuarios/{r['id']}", json={"fields": {"password_hash": password_hash}})
+    return [r["fields"]["email"] for r in records]
+
+
+async def run_mode(client, stub, emails: List[str], logins: int, concurrency: int) -> Dict[str, Any]:
+    from api.services.users import last_login_writer
+
+    await stub.post("/__reset")
+    latencies: List[float] = []
+    errors = 0
+    remaining = iter(range(logins))
+
+    async def worker():
+        nonlocal errors
+        for i in remaining:
+            start = time.perf_counter()
+            response = await client.post("/api/auth/login", json={"email": emails[i % len(emails)], "password": PASSWORD})
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    await last_login_writer.shutdown()
+
+    stats = (await stub.get("/__stats")).json()
+    return {
+        "logins": logins,
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 0.50), 1),
+        "p95_ms": round(percentile(latencies, 0.95), 1),
+        "rps": round(logins / elapsed, 1),
+        "airtable_requests": stats["total"],
+        "airtable_per_login": round(stats["total"] / logins, 2)
+    }
+
+
+async def run(args) -> Dict[str, Any]:
+    stub_url = start_stub(SimpleNamespace(seed=10, latency_ms=args.latency_ms, jitter_ms=0, rate_limit=0))
+    os.environ.update({
+        "AIRTABLE_API_URL": f"{stub_url}/v0",
+        "AIRTABLE_API_KEY": "stub",
+        "AIRTABLE_BASE_ID": STUB_BASE_ID,
+        "LOG_LEVEL": os.getenv("LOG_LEVEL", "WARNING")
+    })
+    from api.main import app
+    from api.services.passwords import password_hasher
+    from api.services.users import last_login_writer, user_cache
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://api", timeout=60) as client, \
+            httpx.AsyncClient(base_url=stub_url) as stub:
+        emails = await prepare_users(stub, password_hasher.hash_sync(PASSWORD))
+        for mode in ("inline", "cached"):
+            user_cache.clear()
+            if mode == "inline":
+                user_cache.ttl, last_login_writer.interval = 0, 0
+            else:
+                user_cache.ttl, last_login_writer.interval = args.cache_ttl, args.flush_interval
+            print(f"▶️  {mode}...", file=sys.stderr)
+            results[mode] = await run_mode(client, stub, emails, args.logins, args.concurrency)
+    results["latency_ms"] = args.latency_ms
+    results["users"] = len(emails)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=80.0, help="Latencia del stub por request")
+    parser.add_argument("--cache-ttl", type=float, default=5.0)
+    parser.add_argument("--flush-interval", type=float, default=5.0)
+    parser.add_argument("--json", action="store_true", help="Salida JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print("=" * 60)
+    print(f"   🔐 Login: {args.logins} logins, {results['users']} usuarios, "
+          f"concurrencia {args.concurrency}, stub {args.latency_ms:.0f} ms")
+    print("=" * 60)
+    for mode in ("inline", "cached"):
+        r = results[mode]
+        print(f"   {mode:<7} p50 {r['p50_ms']:>7.1f} ms   p95 {r['p95_ms']:>7.1f} ms   "
+              f"{r['rps']:>6.1f} login/s   {r['airtable_per_login']:.2f} req Airtable/login"
+              + (f"   ({r['errors']} errores)" if r["errors"] else ""))
+
+
+if __name__ == "__main__":
+    main()
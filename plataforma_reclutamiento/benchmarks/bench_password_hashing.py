@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Carga de logins con scrypt: ¿los hashes frenan al resto de la API?
+
+Con la API in-process y el stub de Airtable sin latencia, lanza
+`--concurrency` clientes haciendo login en loop y, en paralelo, una sonda
+que pide GET /health cada `--probe-interval-ms`. Compara:
+- `inline`: scrypt en el event loop (PASSWORD_HASH_WORKERS=0)
+- `pool`: scrypt en el ThreadPoolExecutor acotado (default)
+
+Si el hash bloquea el loop, la latencia de /health sube a la de un hash
+(~100 ms) o más; en el pool se mantiene en lo que tarda el request.
+
+Ejecutar desde plataforma_reclutamiento/:
+    python benchmarks/bench_password_hashing.py
+    python benchmarks/bench_password_hashing.py --duration 10 --concurrency 16 --workers 4 --json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import httpx
+
+from bench_login import PASSWORD, prepare_users
+from load_test import STUB_BASE_ID, percentile, start_stub
+
+
+def summary(samples: List[float]) -> Dict[str, float]:
+    return {
+        "p50_ms": round(percentile(samples, 0.50), 1),
+        "p95_ms": round(percentile(samples, 0.95), 1),
+        "max_ms": round(max(samples, default=0.0), 1)
+    }
+
+
+async def run_mode(client, emails: List[str], duration: float, concurrency: int, probe_interval: float) -> Dict[str, Any]:
+    login_ms: List[float] = []
+    probe_ms: List[float] = []
+    deadline = time.perf_counter() + duration
+
+    async def login_worker(n: int):
+        i = n
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            response = await client.post("/api/auth/login", json={"email": emails[i % len(emails)], "password": PASSWORD})
+            response.raise_for_status()
+            login_ms.append((time.perf_counter() - start) * 1000)
+            i += 1
+
+    async def probe():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            await client.get("/health")
+            probe_ms.append((time.perf_counter() - start) * 1000)
+            await asyncio.sleep(probe_interval)
+
+    await asyncio.gather(probe(), *(login_worker(n) for n in range(concurrency)))
+    return {
+        "logins": len(login_ms),
+        "logins_per_s": round(len(login_ms) / duration, 1),
+        "login": summary(login_ms),
+        "health": summary(probe_ms),
+        "health_samples": len(probe_ms)
+    }
+
+
+async def run(args) -> Dict[str, Any]:
+    stub_url = start_stub(SimpleNamespace(seed=10, latency_ms=0, jitter_ms=0, rate_limit=0))
+    os.environ.update({
+        "AIRTABLE_API_URL": f"{stub_url}/v0",
+        "AIRTABLE_API_KEY": "stub",
+        "AIRTABLE_BASE_ID": STUB_BASE_ID,
+        "LOG_LEVEL": os.getenv("LOG_LEVEL", "WARNING")
+    })
+    from api.main import app
+    from api.services.passwords import password_hasher
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://api", timeout=60) as client, \
+            httpx.AsyncClient(base_url=stub_url) as stub:
+        emails = await prepare_users(stub, password_hasher.hash_sync(PASSWORD))
+        for mode in ("inline", "pool"):
+            password_hasher.shutdown()
+            password_hasher.workers = 0 if mode == "inline" else args.workers
+            print(f"▶️  {mode}...", file=sys.stderr)
+            results[mode] = await run_mode(client, emails, args.duration, args.concurrency, args.probe_interval_ms / 1000)
+    password_hasher.shutdown()
+    results["workers"] = args.workers
+    results["cpus"] = os.cpu_count()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=5.0, help="Segundos por modo")
+    parser.add_argument("--concurrency", type=int, default=8, help="Clientes haciendo login")
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1), help="Threads de hashing")
+    parser.add_argument("--probe-interval-ms", type=float, default=20.0)
+    parser.add_argument("--json", action="store_true", help="Salida JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print("=" * 60)
+    print(f"   🔑 scrypt bajo carga: {args.concurrency} clientes, {args.workers} workers, {results['cpus']} CPUs")
+    print("=" * 60)
+    for mode in ("inline", "pool"):
+        r = results[mode]
+        print(f"   {mode:<6} {r['logins_per_s']:>6.1f} login/s   login p95 {r['login']['p95_ms']:>7.1f} ms   "
+              f"/health p50 {r['health']['p50_ms']:>6.1f} ms  p95 {r['health']['p95_ms']:>6.1f} ms  "
+              f"max {r['health']['max_ms']:>6.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Extracción de PDFs descargados: archivo temporal vs. en memoria.
+
+Simula lo que hace la evaluación con un CV que llega por HTTP (los bytes ya
+están en memoria) y mide, por backend de PDFExtractor:
+- `tempfile`: lo anterior. NamedTemporaryFile + write + extract(ruta) + unlink
+- `bytes`: extract(bytes), sin tocar disco
+- `spool`: los chunks de la descarga en `spool_pdf` (SpooledTemporaryFile
+  en memoria bajo PDF_SPOOL_MAX_BYTES) + extract(buffer)
+
+Reporta ms por CV y el overhead de cada camino respecto del parseo puro
+(la diferencia es el costo de la ida y vuelta a disco).
+
+Ejecutar desde plataforma_reclutamiento/:
+    python benchmarks/bench_pdf_sources.py
+    python benchmarks/bench_pdf_sources.py --files 20 --rounds 5 --json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+from common import cv_paths
+
+CHUNK = 64 * 1024
+
+
+def via_tempfile(extractor, data: bytes) -> str:
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+        tmp.write(data)
+        path = tmp.name
+    try:
+        return extractor.extract(path)
+    finally:
+        os.unlink(path)
+
+
+def via_bytes(extractor, data: bytes) -> str:
+    return extractor.extract(data)
+
+
+def via_spool(extractor, data: bytes) -> str:
+    from engine import spool_pdf
+
+    with spool_pdf(data[i:i + CHUNK] for i in range(0, len(data), CHUNK)) as buffer:
+        return extractor.extract(buffer)
+
+
+def measure(fn: Callable, extractor, blobs: List[bytes], rounds: int) -> Dict[str, Any]:
+    per_cv: List[float] = []
+    for _ in range(rounds):
+        for data in blobs:
+            start = time.perf_counter()
+            fn(extractor, data)
+            per_cv.append((time.perf_counter() - start) * 1000)
+    return {
+        "mean_ms": round(statistics.mean(per_cv), 3),
+        "p50_ms": round(statistics.median(per_cv), 3)
+    }
+
+
+def run(args) -> Dict[str, Any]:
+    from engine import PDFExtractor
+
+    blobs = []
+    for path in cv_paths()[:args.files]:
+        with open(path, "rb") as f:
+            blobs.append(f.read())
+
+    results: Dict[str, Any] = {"files": len(blobs), "kb_mean": round(statistics.mean(map(len, blobs)) / 1024, 1)}
+    cases = {"tempfile": via_tempfile, "bytes": via_bytes, "spool": via_spool}
+    for backend in args.backends:
+        extractor = PDFExtractor(backend=backend)
+        texts = {name: [fn(extractor, data) for data in blobs] for name, fn in cases.items()}
+        if not (texts["tempfile"] == texts["bytes"] == texts["spool"]):
+            raise SystemExit(f"❌ {backend}: el texto extraído difiere entre caminos")
+        for name, fn in cases.items():
+            print(f"▶️  {backend} {name}...", file=sys.stderr)
+            results[f"{backend}.{name}"] = measure(fn, extractor, blobs, args.rounds)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=10, help="PDFs del corpus")
+    parser.add_argument("--rounds", type=int, default=3, help="Pasadas sobre los PDFs")
+    parser.add_argument("--backends", nargs="+", default=["pdfplumber", "pypdf2"])
+    parser.add_argument("--json", action="store_true", help="Salida JSON")
+    args = parser.parse_args()
+
+    if not cv_paths():
+        print("❌ No se encontraron PDFs en data/cvs")
+        sys.exit(1)
+
+    results = run(args)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print("=" * 78)
+    print(f"   📄 Extracción: {results['files']} PDFs ({results['kb_mean']} KB promedio) × {args.rounds} pasadas")
+    print("=" * 78)
+    for backend in args.backends:
+        base = results[f"{backend}.bytes"]["mean_ms"]
+        for name in ("tempfile", "bytes", "spool"):
+            r = results[f"{backend}.{name}"]
+            print(f"   {backend:<11} {name:<9} {r['mean_ms']:>9.2f} ms/CV   p50 {r['p50_ms']:>9.2f} ms   "
+                  f"{r['mean_ms'] - base:>+7.2f} ms vs bytes")
+
+
+if __name__ == "__main__":
+    main()
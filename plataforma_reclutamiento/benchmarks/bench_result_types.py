@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: asignaciones por evaluación según el tipo de resultado.
+
+Compara el camino anterior (EvaluationResult Pydantic -> dicts ->
+CategoryResultSchema/InferenceResultSchema) con el camino compacto
+(EvaluationRecord -> to_dict -> EvaluationResponse) que usan las rutas.
+
+Se reportan dos escenarios: la evaluación completa (incluye el matching
+de keywords) y solo la etapa de construcción de resultados, que es la
+que cambia entre ambos caminos.
+
+Ejecutar desde plataforma_reclutamiento/:
+    python benchmarks/bench_result_types.py
+    python benchmarks/bench_result_types.py --iterations 500 --json
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+
+from common import load_corpus
+
+from engine import CandidateEvaluator
+from api.models import EvaluationResponse, CategoryResultSchema, InferenceResultSchema
+
+
+def legacy_build(record) -> EvaluationResponse:
+    """Reproduce la triple copia que hacían las rutas antes del cambio."""
+    result = record.to_model()
+    evaluation_data = {
+        "fits": {
+            k: {"score": v.score, "found": v.found, "missing": v.missing,
+                "reasoning": v.reasoning, "questions": v.questions}
+            for k, v in result.fits.items()
+        }
+    }
+    fits = {
+        k: CategoryResultSchema(score=v.score, found=v.found, missing=v.missing,
+                                reasoning=v.reasoning, questions=v.questions)
+        for k, v in result.fits.items()
+    }
+    inference = InferenceResultSchema(
+        profile_type=result.inference.profile_type.value,
+        hands_on_index=result.inference.hands_on_index,
+        risk_warning=result.inference.risk_warning,
+        retention_risk=result.inference.retention_risk.value,
+        scope_intensity=result.inference.scope_intensity,
+        potential_score=result.inference.potential_score,
+        industry_tier=result.inference.industry_tier.value
+    )
+    del evaluation_data
+    return EvaluationResponse(candidato_id="bench", score_promedio=result.score_promedio,
+                              fits=fits, inference=inference)
+
+
+def compact_build(record) -> EvaluationResponse:
+    """Camino actual: resultado compacto y una sola conversión en el borde."""
+    data = record.to_dict()
+    return EvaluationResponse(candidato_id="bench", score_promedio=data["score_promedio"],
+                              fits=data["fits"], inference=data["inference"])
+
+
+def measure(fn, inputs: list, iterations: int) -> dict:
+    """
+    Mide tiempo, pico de memoria y bloques asignados por evaluación.
+    
+    `blocks_per_eval` cuenta los bloques vivos que deja cada respuesta
+    (resultado + copias intermedias retenidas); `peak_kb_per_eval` es el
+    pico de memoria trazada durante una evaluación completa.
+    """
+    for item in inputs:  # warm-up (caches de Pydantic, regex, etc.)
+        fn(item)
+
+    start = time.perf_counter()
+    for i in range(iterations):
+        fn(inputs[i % len(inputs)])
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    peaks = []
+    for item in inputs:
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        fn(item)
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - base)
+
+    before = tracemalloc.take_snapshot()
+    kept = [fn(item) for item in inputs]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    blocks = sum(max(s.count_diff, 0) for s in after.compare_to(before, "filename"))
+    del kept
+
+    return {
+        "us_per_eval": round(elapsed / iterations * 1e6, 1),
+        "blocks_per_eval": round(blocks / len(inputs), 1),
+        "peak_kb_per_eval": round(sum(peaks) / len(peaks) / 1024, 1)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--corpus", type=int, default=5, help="Cantidad de CVs a usar")
+    parser.add_argument("--json", action="store_true", help="Salida JSON")
+    args = parser.parse_args()
+
+    texts = load_corpus(args.corpus)
+    if not texts:
+        print("❌ No se encontraron PDFs legibles en data/cvs")
+        sys.exit(1)
+
+    evaluator = CandidateEvaluator()
+    records = [evaluator.evaluate_record(text) for text in texts]
+    results = {
+        "full": {
+            "legacy": measure(lambda t: legacy_build(evaluator.evaluate_record(t)), texts, args.iterations),
+            "compact": measure(lambda t: compact_build(evaluator.evaluate_record(t)), texts, args.iterations)
+        },
+        "result_stage": {
+            "legacy": measure(legacy_build, records, args.iterations * 10),
+            "compact": measure(compact_build, records, args.iterations * 10)
+        },
+        "corpus_size": len(texts),
+        "iterations": args.iterations
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    for scenario, title in (("full", "Evaluación completa"), ("result_stage", "Solo construcción de resultados")):
+        print("=" * 60)
+        print(f"   📏 {title}")
+        print("=" * 60)
+        for name in ("legacy", "compact"):
+            r = results[scenario][name]
+            print(f"{name:>8}: {r['us_per_eval']:>8} µs | "
+                  f"{r['blocks_per_eval']:>7} bloques | pico {r['peak_kb_per_eval']} KB")
+
+
+if __name__ == "__main__":
+    main()
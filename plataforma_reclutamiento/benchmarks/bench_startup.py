@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Arranque en frío de la API: tiempo de `import api.main` y qué se importa.
+
+Cada corrida es un proceso nuevo (como un cold start en Render) con
+`python -X importtime -c "import api.main"`. Mide:
+- `startup.import_ms`: acumulado de `api.main` según -X importtime (mediana)
+- `startup.process_ms`: reloj de pared del proceso completo (intérprete + import)
+- `startup.modules`: módulos en sys.modules al terminar el import
+
+Y audita que las dependencias pesadas NO se carguen al arrancar (deben
+importarse en el primer uso): pdfplumber, PyPDF2, fitz, pdf2image, fpdf,
+reportlab, openai, pyarrow y el motor de evaluación (engine.evaluator,
+engine.models, extractores). `tests/test_startup.py` corre la misma
+auditoría dentro de la suite.
+Si alguna aparece, o el import supera `--budget-ms`, termina con código 1.
+
+Ejecutar desde plataforma_reclutamiento/:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 10 --output startup.json
+    python benchmarks/bench_startup.py --baseline startup.json --threshold 0.2
+    python benchmarks/bench_startup.py --top 25     # módulos más caros
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+from common import ROOT, compare, environment, load_results, save_results
+
+HEAVY_MODULES = (
+    "pdfplumber", "PyPDF2", "fitz", "pdf2image", "fpdf", "reportlab", "openai", "pyarrow",
+    "engine.evaluator", "engine.models", "engine.pdf_extractor", "engine.cv_processor"
+)
+
+PROBE = (
+    "import json, sys; import api.main; "
+    "print(json.dumps({'modules': len(sys.modules), "
+    f"'heavy': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))"
+)
+
+
+def metric(value: float, unit: str, better: str = "lower") -> Dict[str, Any]:
+    return {"value": value, "unit": unit, "better": better}
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """Líneas de -X importtime como (módulo, self_us, acumulado_us)."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative)))
+    return rows
+
+
+def cold_start() -> Dict[str, Any]:
+    """Un proceso nuevo que importa la app."""
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        cwd=ROOT, capture_output=True, text=True, env={**os.environ, "PYTHONWARNINGS": "ignore"}
+    )
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        raise SystemExit(f"❌ import api.main falló:\n{proc.stderr[-2000:]}")
+    rows = parse_importtime(proc.stderr)
+    import_us = next(cum for name, _, cum in rows if name == "api.main")
+    return {"process_ms": elapsed_ms, "import_ms": import_us / 1000, "rows": rows,
+            **json.loads(proc.stdout.strip().splitlines()[-1])}
+
+
+def top_packages(rows: List[Tuple[str, int, int]], limit: int) -> List[Tuple[str, float]]:
+    """Tiempo propio (self) agregado por paquete de primer nivel, en ms."""
+    totals: Dict[str, int] = {}
+    for name, self_us, _ in rows:
+        package = name.split(".")[0] if not name.startswith(("api.", "engine.")) else name
+        totals[package] = totals.get(package, 0) + self_us
+    return [(name, us / 1000) for name, us in sorted(totals.items(), key=lambda kv: -kv[1])[:limit]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Procesos a medir (se descarta uno de calentamiento)")
+    parser.add_argument("--budget-ms", type=float, default=1500.0, help="Máximo para startup.import_ms")
+    parser.add_argument("--top", type=int, default=12, help="Paquetes más caros a listar")
+    parser.add_argument("--output", help="Guardar resultados en JSON")
+    parser.add_argument("--baseline", help="JSON de una ejecución anterior para comparar")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Regresión tolerada (0.2 = 20%%)")
+    parser.add_argument("--json", action="store_true", help="Salida JSON")
+    args = parser.parse_args()
+
+    cold_start()  # el primero compila los .pyc
+    runs = [cold_start() for _ in range(args.runs)]
+    last = runs[-1]
+
+    metrics = {
+        "startup.import_ms": metric(round(statistics.median(r["import_ms"] for r in runs), 1), "ms"),
+        "startup.process_ms": metric(round(statistics.median(r["process_ms"] for r in runs), 1), "ms"),
+        "startup.modules": metric(last["modules"], "módulos")
+    }
+    results = {
+        "environment": environment(),
+        "metrics": metrics,
+        "heavy_loaded": last["heavy"],
+        "top": top_packages(last["rows"], args.top)
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+    else:
+        print("=" * 64)
+        print(f"   🚀 Arranque en frío de la API ({args.runs} procesos)")
+        print("=" * 64)
+        for name, m in metrics.items():
+            print(f"{name:<36} {m['value']:>12} {m['unit']}")
+        print("\n   Más caros (self, agregado por paquete):")
+        for name, ms in results["top"]:
+            print(f"   {name:<40} {ms:>8.1f} ms")
+
+    if args.output:
+        save_results(results, args.output)
+        print(f"\n💾 Resultados guardados en {args.output}")
+
+    failed = False
+    if last["heavy"]:
+        print(f"\n❌ Dependencias pesadas cargadas al arrancar: {', '.join(last['heavy'])}")
+        failed = True
+    if metrics["startup.import_ms"]["value"] > args.budget_ms:
+        print(f"\n❌ import api.main: {metrics['startup.import_ms']['value']} ms > presupuesto {args.budget_ms} ms")
+        failed = True
+    if args.baseline:
+        regressions = compare(metrics, load_results(args.baseline)["metrics"], args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regresiones (umbral {args.threshold:.0%}):")
+            for r in regressions:
+                print(f"   {r['metric']}: {r['baseline']} -> {r['current']} (+{r['change']:.0%})")
+            failed = True
+        else:
+            print(f"\n✅ Sin regresiones vs {args.baseline}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Utilidades compartidas por los benchmarks.
+
+- Carga del corpus (PDFs de `data/cvs`) y de los análisis históricos
+  (`data/candidates_db.json`)
+- Medición de tiempo y de memoria por llamada
+- Lectura/escritura de resultados JSON y comparación contra un baseline
+"""
+
+import glob
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+CVS_DIR = ROOT / "data" / "cvs"
+CANDIDATES_DB = ROOT / "data" / "candidates_db.json"
+
+
+# ============================================================================
+# Corpus
+# ============================================================================
+
+def cv_paths() -> List[str]:
+    """Rutas de los PDFs del corpus, ordenadas."""
+    return sorted(glob.glob(str(CVS_DIR / "*.pdf")))
+
+
+def tracking_code(path: str) -> str:
+    """Código de tracking a partir del nombre del archivo (NEAT-POST-YYYYMMDD-HHMMSS)."""
+    return "-".join(Path(path).name.split("_")[0].split("-")[:4])
+
+
+def load_corpus(limit: Optional[int] = None, backend: str = "pdfplumber") -> List[str]:
+    """
+    Extrae el texto de los PDFs de data/cvs.
+
+    Args:
+        limit: Cantidad máxima de CVs (None = todos)
+        backend: Backend de PDFExtractor
+
+    Returns:
+        Textos no vacíos, en orden de archivo. Los PDFs ilegibles se omiten.
+    """
+    return [text for _, text in load_corpus_with_paths(limit, backend)]
+
+
+def load_corpus_with_paths(limit: Optional[int] = None, backend: str = "pdfplumber") -> List[Tuple[str, str]]:
+    """Como `load_corpus`, pero retorna pares (ruta, texto)."""
+    from engine import PDFExtractor
+
+    extractor = PDFExtractor(backend=backend)
+    corpus = []
+    for path in cv_paths():
+        try:
+            text = extractor.extract(path)
+        except Exception:
+            continue
+        if text.strip():
+            corpus.append((path, text))
+        if limit and len(corpus) >= limit:
+            break
+    return corpus
+
+
+def load_historical() -> Dict[str, Dict[str, Any]]:
+    """Análisis históricos por código de tracking (vacío si no existe el archivo)."""
+    if not CANDIDATES_DB.exists():
+        return {}
+    with open(CANDIDATES_DB, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# ============================================================================
+# Medición
+# ============================================================================
+
+def time_calls(fn: Callable, inputs: list, iterations: int, warmup: bool = True) -> Dict[str, float]:
+    """
+    Mide `iterations` llamadas a `fn` rotando sobre `inputs`.
+
+    Returns:
+        {"us_per_call", "calls_per_s", "p50_us", "p95_us"}
+    """
+    if warmup:
+        for item in inputs:
+            fn(item)
+
+    samples = []
+    for i in range(iterations):
+        item = inputs[i % len(inputs)]
+        start = time.perf_counter()
+        fn(item)
+        samples.append(time.perf_counter() - start)
+
+    total = sum(samples)
+    samples.sort()
+    return {
+        "us_per_call": round(total / iterations * 1e6, 1),
+        "calls_per_s": round(iterations / total, 1) if total else 0.0,
+        "p50_us": round(samples[len(samples) // 2] * 1e6, 1),
+        "p95_us": round(samples[min(int(len(samples) * 0.95), len(samples) - 1)] * 1e6, 1)
+    }
+
+
+def peak_memory(fn: Callable, inputs: list) -> Dict[str, float]:
+    """Pico de memoria trazada (tracemalloc) por llamada, promedio y máximo en KB."""
+    for item in inputs:
+        fn(item)
+
+    tracemalloc.start()
+    peaks = []
+    try:
+        for item in inputs:
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+            fn(item)
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - base)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "peak_kb_avg": round(sum(peaks) / len(peaks) / 1024, 1),
+        "peak_kb_max": round(max(peaks) / 1024, 1)
+    }
+
+
+# ============================================================================
+# Resultados
+# ============================================================================
+
+def environment() -> Dict[str, Any]:
+    """Metadatos del entorno para interpretar los resultados."""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")
+    }
+
+
+def save_results(results: Dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(
+    current: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    threshold: float
+) -> List[Dict[str, Any]]:
+    """
+    Compara métricas contra un baseline.
+
+    Cada métrica es {"value", "unit", "better": "lower"|"higher"}. Se
+    reporta regresión si empeora más que `threshold` (0.2 = 20%).
+
+    Returns:
+        Lista de regresiones {"metric", "baseline", "current", "change"}
+    """
+    regressions = []
+    for name, metric in current.items():
+        base = baseline.get(name)
+        if not base or not base.get("value"):
+            continue
+        change = (metric["value"] - base["value"]) / base["value"]
+        if metric.get("better", "lower") == "higher":
+            change = -change
+        if change > threshold:
+            regressions.append({
+                "metric": name,
+                "baseline": base["value"],
+                "current": metric["value"],
+                "change": round(change, 3)
+            })
+    return regressions
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Prueba de carga de la API contra el stub de Airtable.
+
+Levanta `airtable_stub` en un thread (o usa uno externo con --stub-url),
+configura la API para apuntar a él y ejecuta escenarios concurrentes con
+un driver asyncio. Por endpoint reporta latencia p50/p95/p99, errores y
+cuántos requests a Airtable (y cuántos 429) generó cada llamada.
+
+Por defecto la API corre in-process (httpx.ASGITransport); con --app-url
+se prueba un servidor ya levantado (que debe apuntar al mismo stub).
+
+Ejecutar desde plataforma_reclutamiento/:
+    python benchmarks/load_test.py
+    python benchmarks/load_test.py --requests 50 --concurrency 10 --latency-ms 80
+    python benchmarks/load_test.py --only candidates_list processes_list --rate-limit 0 --json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+from common import cv_paths, load_corpus
+from airtable_stub import StubStore, seed, create_app
+
+STUB_BASE_ID = "appSTUB"
+
+
+# ============================================================================
+# Stub en background
+# ============================================================================
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_stub(args) -> str:
+    """Levanta el stub con uvicorn en un thread daemon y retorna su URL."""
+    import uvicorn
+
+    store = StubStore()
+    seed(store, candidates=args.seed)
+    app = create_app(store, args.latency_ms, args.jitter_ms, args.rate_limit)
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+
+    deadline = time.time() + 10
+    while not server.started:
+        if time.time() > deadline:
+            raise RuntimeError("El stub no inició a tiempo")
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+# ============================================================================
+# Escenarios
+# ============================================================================
+
+class Scenarios:
+    """Construye los requests de cada escenario con datos del stub."""
+
+    def __init__(self, stub_url: str, cv_bytes: bytes, cv_texts: List[str]):
+        self.stub_url = stub_url
+        self.cv_bytes = cv_bytes
+        self.cv_texts = cv_texts
+        self.procesos: List[str] = []
+        self.candidatos: List[str] = []
+
+    async def load_ids(self) -> None:
+        """Lee IDs de procesos publicados y candidatos directo del stub (sin rate limit de la API)."""
+        async with httpx.AsyncClient(base_url=self.stub_url) as client:
+            async def ids(table: str, formula: Optional[str] = None) -> List[str]:
+                params = {"filterByFormula": formula} if formula else {}
+                for _ in range(50):
+                    response = await client.get(f"/v0/{STUB_BASE_ID}/{table}", params=params)
+                    if response.status_code != 429:
+                        return [r["id"] for r in response.json()["records"]]
+                    await asyncio.sleep(0.2)
+                raise RuntimeError(f"No se pudo leer {table} del stub")
+
+            self.procesos = await ids("Procesos", "{estado} = 'publicado'")
+            self.candidatos = await ids("Postulaciones")
+            await client.post("/__reset")
+
+    def build(self) -> Dict[str, Callable[[], Dict[str, Any]]]:
+        return {
+            "candidates_list": lambda: {"method": "GET", "url": "/api/candidates/", "params": {"limit": 50}},
+            "candidates_stats": lambda: {"method": "GET", "url": "/api/candidates/stats"},
+            "processes_list": lambda: {"method": "GET", "url": "/api/processes/"},
+            "applications_submit": lambda: {
+                "method": "POST",
+                "url": "/api/applications/submit",
+                "data": {
+                    "nombre_completo": "Carga Test",
+                    "email": f"carga{random.randint(0, 10**6)}@mail.cl",
+                    "telefono": "+56900000000",
+                    "proceso_id": random.choice(self.procesos)
+                },
+                "files": {"cv_file": ("cv.pdf", self.cv_bytes, "application/pdf")}
+            },
+            "evaluations_evaluate": lambda: {
+                "method": "POST",
+                "url": "/api/evaluations/evaluate",
+                "json": {
+                    "candidato_id": random.choice(self.candidatos),
+                    "cv_text": random.choice(self.cv_texts),
+                    "force_reeval": True
+                }
+            }
+        }
+
+
+# ============================================================================
+# Driver
+# ============================================================================
+
+def percentile(samples: List[float], p: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * p), len(ordered) - 1)]
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    stub: httpx.AsyncClient,
+    name: str,
+    build: Callable[[], Dict[str, Any]],
+    requests: int,
+    concurrency: int
+) -> Dict[str, Any]:
+    """Ejecuta `requests` llamadas con `concurrency` workers y junta métricas."""
+    await stub.post("/__reset")
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    remaining = iter(range(requests))
+
+    async def worker():
+        for _ in remaining:
+            request = build()
+            start = time.perf_counter()
+            try:
+                response = await client.request(**request)
+                status = response.status_code
+            except httpx.HTTPError:
+                status = 0
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    stats = (await stub.get("/__stats")).json()
+    ok = sum(n for s, n in statuses.items() if 200 <= s < 400)
+    return {
+        "endpoint": name,
+        "requests": requests,
+        "ok": ok,
+        "errors": requests - ok,
+        "statuses": statuses,
+        "p50_ms": round(percentile(latencies, 0.50), 1),
+        "p95_ms": round(percentile(latencies, 0.95), 1),
+        "p99_ms": round(percentile(latencies, 0.99), 1),
+        "rps": round(requests / elapsed, 1),
+        "airtable_requests": stats["total"],
+        "airtable_per_request": round(stats["total"] / requests, 1),
+        "airtable_429": stats["total_throttled"],
+        "airtable_by_table": stats["requests"]
+    }
+
+
+async def run(args) -> List[Dict[str, Any]]:
+    stub_url = args.stub_url or start_stub(args)
+
+    # Configurar la API antes de importarla
+    os.environ.update({
+        "AIRTABLE_API_URL": f"{stub_url}/v0",
+        "AIRTABLE_API_KEY": "stub",
+        "AIRTABLE_BASE_ID": STUB_BASE_ID,
+        "TEMP_STORAGE_URL": f"{stub_url}/__upload"
+    })
+
+    paths = cv_paths()
+    with open(paths[0], "rb") as f:
+        cv_bytes = f.read()
+    scenarios = Scenarios(stub_url, cv_bytes, load_corpus(5))
+    await scenarios.load_ids()
+    builders = scenarios.build()
+
+    if args.app_url:
+        client = httpx.AsyncClient(base_url=args.app_url, timeout=120)
+    else:
+        # Los CVs de prueba no deben quedar en data/cvs
+        os.environ["BLOB_DIR"] = tempfile.mkdtemp(prefix="neat-load-")
+        from api.main import app
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://api", timeout=120)
+
+    results = []
+    async with client, httpx.AsyncClient(base_url=stub_url) as stub:
+        for name in args.only or builders:
+            print(f"▶️  {name}...", file=sys.stderr)
+            results.append(await run_scenario(
+                client, stub, name, builders[name], args.requests, args.concurrency
+            ))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", nargs="+", choices=[
+        "candidates_list", "candidates_stats", "processes_list", "applications_submit", "evaluations_evaluate"
+    ])
+    parser.add_argument("--requests", type=int, default=20, help="Requests por escenario")
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=100, help="Candidatos sintéticos en el stub")
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--rate-limit", type=int, default=5, help="Req/s del stub (0 = sin límite)")
+    parser.add_argument("--stub-url", help="Usar un stub ya levantado")
+    parser.add_argument("--app-url", help="Probar una API ya levantada en vez de in-process")
+    parser.add_argument("--json", action="store_true", help="Salida JSON")
+    args = parser.parse_args()
+
+    if not cv_paths():
+        print("❌ No se encontraron PDFs en data/cvs")
+        sys.exit(1)
+
+    results = asyncio.run(run(args))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print("=" * 104)
+    print(f"   🔥 Prueba de carga ({args.requests} req/escenario, concurrencia {args.concurrency}, "
+          f"stub {args.latency_ms}ms, {args.rate_limit or '∞'} rps)")
+    print("=" * 104)
+    print(f"{'endpoint':<22} {'ok':>5} {'err':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+          f"{'rps':>7} {'airtable/req':>13} {'429s':>6}")
+    for r in results:
+        print(f"{r['endpoint']:<22} {r['ok']:>5} {r['errors']:>5} {r['p50_ms']:>9} {r['p95_ms']:>9} "
+              f"{r['p99_ms']:>9} {r['rps']:>7} {r['airtable_per_request']:>13} {r['airtable_429']:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Servidor local que habla RESP (el protocolo de Redis), subconjunto.
+
+Para probar SESSION_BACKEND=redis (y varios workers compartiendo
+sesiones) sin instalar Redis. Soporta PING, AUTH, SELECT, GET,
+SET (con EX/PX/NX), DEL, EXISTS, PTTL, DBSIZE y FLUSHDB. Las claves
+vencidas se borran al leerlas y con un barrido cada segundo, como Redis.
+
+Ejecutar desde plataforma_reclutamiento/:
+    python benchmarks/resp_stub.py --port 6390
+
+Y apuntar la API al stub:
+    SESSION_BACKEND=redis SESSION_REDIS_URL=redis://127.0.0.1:6390/0 \\
+    uvicorn api.main:app --port 8000 --workers 4
+"""
+
+import argparse
+import asyncio
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+class RespStore:
+    """Claves → (valor, vencimiento en segundos monotónicos o None)."""
+
+    def __init__(self):
+        self.data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+
+    def _alive(self, key: bytes) -> Optional[Tuple[bytes, Optional[float]]]:
+        item = self.data.get(key)
+        if item is not None and item[1] is not None and item[1] <= time.monotonic():
+            del self.data[key]
+            return None
+        return item
+
+    def sweep(self) -> None:
+        now = time.monotonic()
+        for key in [k for k, (_, exp) in self.data.items() if exp is not None and exp <= now]:
+            del self.data[key]
+
+    def execute(self, args: List[bytes]) -> bytes:
+        command = args[0].upper().decode()
+        handler = getattr(self, f"cmd_{command.lower()}", None)
+        if handler is None:
+            return b"-ERR unknown command '%s'\r\n" % command.encode()
+        try:
+            return handler(*args[1:])
+        except TypeError:
+            return b"-ERR wrong number of arguments for '%s'\r\n" % command.encode()
+
+    def cmd_ping(self, *args: bytes) -> bytes:
+        return b"+PONG\r\n"
+
+    def cmd_auth(self, *args: bytes) -> bytes:
+        return b"+OK\r\n"
+
+    def cmd_select(self, db: bytes) -> bytes:
+        return b"+OK\r\n"
+
+    def cmd_get(self, key: bytes) -> bytes:
+        item = self._alive(key)
+        if item is None:
+            return b"$-1\r\n"
+        return b"$%d\r\n%s\r\n" % (len(item[0]), item[0])
+
+    def cmd_set(self, key: bytes, value: bytes, *options: bytes) -> bytes:
+        expires_at = None
+        nx = False
+        opts = [o.upper() for o in options]
+        i = 0
+        while i < len(opts):
+            if opts[i] in (b"EX", b"PX") and i + 1 < len(opts):
+                seconds = int(opts[i + 1]) / (1000 if opts[i] == b"PX" else 1)
+                expires_at = time.monotonic() + seconds
+                i += 2
+            elif opts[i] == b"NX":
+                nx = True
+                i += 1
+            else:
+                return b"-ERR syntax error\r\n"
+        if nx and self._alive(key) is not None:
+            return b"$-1\r\n"
+        self.data[key] = (value, expires_at)
+        return b"+OK\r\n"
+
+    def cmd_del(self, *keys: bytes) -> bytes:
+        removed = sum(1 for k in keys if self._alive(k) is not None and self.data.pop(k, None) is not None)
+        return b":%d\r\n" % removed
+
+    def cmd_exists(self, *keys: bytes) -> bytes:
+        return b":%d\r\n" % sum(1 for k in keys if self._alive(k) is not None)
+
+    def cmd_pttl(self, key: bytes) -> bytes:
+        item = self._alive(key)
+        if item is None:
+            return b":-2\r\n"
+        if item[1] is None:
+            return b":-1\r\n"
+        return b":%d\r\n" % int((item[1] - time.monotonic()) * 1000)
+
+    def cmd_dbsize(self) -> bytes:
+        self.sweep()
+        return b":%d\r\n" % len(self.data)
+
+    def cmd_flushdb(self, *args: bytes) -> bytes:
+        self.data.clear()
+        return b"+OK\r\n"
+
+
+# Referencias a las tareas de barrido (el loop solo guarda referencias débiles)
+_background: set = set()
+
+
+async def _read_command(reader: asyncio.StreamReader) -> Optional[List[bytes]]:
+    line = await reader.readline()
+    if not line:
+        return None
+    if not line.startswith(b"*"):
+        # Comando inline (redis-cli / telnet)
+        return line.strip().split()
+    args = []
+    for _ in range(int(line[1:-2])):
+        header = await reader.readline()
+        length = int(header[1:-2])
+        args.append((await reader.readexactly(length + 2))[:-2])
+    return args
+
+
+async def serve(host: str = "127.0.0.1", port: int = 6390, store: Optional[RespStore] = None) -> asyncio.AbstractServer:
+    """Levanta el servidor en el loop actual."""
+    store = store or RespStore()
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                args = await _read_command(reader)
+                if not args:
+                    break
+                writer.write(store.execute(args))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def sweeper() -> None:
+        while True:
+            await asyncio.sleep(1)
+            store.sweep()
+
+    server = await asyncio.start_server(handle, host, port)
+    _background.add(asyncio.get_running_loop().create_task(sweeper()))
+    return server
+
+
+def start_in_thread(host: str = "127.0.0.1", port: int = 0) -> str:
+    """Levanta el stub en un thread (para pruebas en el mismo proceso). Retorna la URL."""
+    ready = threading.Event()
+    address = {}
+
+    def run() -> None:
+        loop = asyncio.new_event_loop()
+        server = loop.run_until_complete(serve(host, port))
+        address["port"] = server.sockets[0].getsockname()[1]
+        ready.set()
+        loop.run_forever()
+
+    threading.Thread(target=run, daemon=True).start()
+    ready.wait()
+    return f"redis://{host}:{address['port']}/0"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6390)
+    args = parser.parse_args()
+
+    async def run() -> None:
+        server = await serve(args.host, args.port)
+        print(f"RESP stub en redis://{args.host}:{args.port}/0")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
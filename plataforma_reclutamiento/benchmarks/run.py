@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Suite de benchmarks del motor de evaluación sobre el corpus de data/cvs.
+
+Suites:
+    extraction   Extracción de texto por backend (pdfplumber, pypdf2)
+    evaluate     Throughput de CandidateEvaluator.evaluate / evaluate_record
+    compile      Tiempo de compilar una configuración (CandidateEvaluator(config))
+    scaling      Scoring en batch con 1..N procesos
+    memory       Pico de memoria por evaluación (tracemalloc)
+    drift        Diferencia de score vs. los análisis históricos (candidates_db.json)
+
+Ejecutar desde plataforma_reclutamiento/:
+    python benchmarks/run.py                         # todas las suites
+    python benchmarks/run.py --only evaluate memory --quick
+    python benchmarks/run.py --output bench.json
+    python benchmarks/run.py --baseline bench.json --threshold 0.25
+
+Con --baseline el proceso termina con código 1 si alguna métrica empeora
+más que el umbral, para usarlo como gate antes de un deploy.
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List
+
+from common import (
+    cv_paths,
+    tracking_code,
+    load_corpus_with_paths,
+    load_historical,
+    time_calls,
+    peak_memory,
+    environment,
+    save_results,
+    load_results,
+    compare
+)
+
+from engine import CandidateEvaluator, PDFExtractor, EvaluationConfig
+from engine.text_index import _cached_index
+
+
+SUITES = ("extraction", "evaluate", "compile", "scaling", "memory", "drift")
+
+
+def metric(value: float, unit: str, better: str = "lower") -> Dict[str, Any]:
+    return {"value": value, "unit": unit, "better": better}
+
+
+def uncached_evaluate(evaluator: CandidateEvaluator, text: str):
+    """Evalúa sin reutilizar el TextIndex cacheado (costo de un CV nuevo)."""
+    _cached_index.cache_clear()
+    return evaluator.evaluate_record(text)
+
+
+# ============================================================================
+# Suites
+# ============================================================================
+
+def bench_extraction(corpus, args) -> Dict[str, Dict[str, Any]]:
+    paths = [path for path, _ in corpus]
+    metrics = {}
+    for backend in ("pdfplumber", "pypdf2"):
+        try:
+            extractor = PDFExtractor(backend=backend)
+        except Exception:
+            continue
+        iterations = len(paths) if args.quick else len(paths) * 2
+        r = time_calls(extractor.extract, paths, iterations, warmup=False)
+        metrics[f"extraction.{backend}.ms_per_cv"] = metric(round(r["us_per_call"] / 1000, 2), "ms")
+    return metrics
+
+
+def bench_evaluate(corpus, args) -> Dict[str, Dict[str, Any]]:
+    texts = [text for _, text in corpus]
+    evaluator = CandidateEvaluator()
+    iterations = 200 if args.quick else 1000
+
+    cold = time_calls(lambda t: uncached_evaluate(evaluator, t), texts, iterations // 4)
+    record = time_calls(evaluator.evaluate_record, texts, iterations)
+    model = time_calls(evaluator.evaluate, texts, iterations)
+    return {
+        "evaluate.cold.us_per_cv": metric(cold["us_per_call"], "us"),
+        "evaluate.cold.p95_us": metric(cold["p95_us"], "us"),
+        "evaluate.cold.cvs_per_s": metric(cold["calls_per_s"], "cv/s", "higher"),
+        "evaluate.record.us_per_cv": metric(record["us_per_call"], "us"),
+        "evaluate.model.us_per_cv": metric(model["us_per_call"], "us")
+    }
+
+
+def bench_compile(corpus, args) -> Dict[str, Dict[str, Any]]:
+    config = EvaluationConfig.default_config()
+    iterations = 50 if args.quick else 200
+    r = time_calls(lambda c: CandidateEvaluator(c), [config], iterations)
+    return {"compile.us_per_config": metric(r["us_per_call"], "us")}
+
+
+_worker_evaluator = None
+
+
+def _init_worker():
+    global _worker_evaluator
+    _worker_evaluator = CandidateEvaluator()
+
+
+def _score(text: str) -> int:
+    _cached_index.cache_clear()
+    return _worker_evaluator.evaluate_record(text).score_promedio
+
+
+def bench_scaling(corpus, args) -> Dict[str, Dict[str, Any]]:
+    texts = [text for _, text in corpus]
+    batch = texts * (20 if args.quick else 100)
+    max_workers = args.workers or min(os.cpu_count() or 1, 8)
+
+    metrics = {}
+    baseline_rate = None
+    workers = 1
+    while workers <= max_workers:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            list(pool.map(_score, texts, chunksize=1))  # warm-up de los procesos
+            start = time.perf_counter()
+            list(pool.map(_score, batch, chunksize=max(len(batch) // (workers * 8), 1)))
+            elapsed = time.perf_counter() - start
+        rate = round(len(batch) / elapsed, 1)
+        baseline_rate = baseline_rate or rate
+        metrics[f"scaling.{workers}p.cvs_per_s"] = metric(rate, "cv/s", "higher")
+        metrics[f"scaling.{workers}p.speedup"] = metric(round(rate / baseline_rate, 2), "x", "higher")
+        workers *= 2
+    return metrics
+
+
+def bench_memory(corpus, args) -> Dict[str, Dict[str, Any]]:
+    texts = [text for _, text in corpus]
+    evaluator = CandidateEvaluator()
+    r = peak_memory(lambda t: uncached_evaluate(evaluator, t), texts)
+    return {
+        "memory.evaluate.peak_kb_avg": metric(r["peak_kb_avg"], "KB"),
+        "memory.evaluate.peak_kb_max": metric(r["peak_kb_max"], "KB")
+    }
+
+
+def bench_drift(corpus, args) -> Dict[str, Dict[str, Any]]:
+    """Precisión (no velocidad): cuánto se alejan los scores de los históricos."""
+    historical = load_historical()
+    evaluator = CandidateEvaluator()
+    diffs = []
+    for path, text in corpus:
+        entry = historical.get(tracking_code(path))
+        if not entry or "analysis" not in entry:
+            continue
+        fits = entry["analysis"].get("fits") or {}
+        if not fits:
+            continue
+        old = int(sum(f.get("score", 0) for f in fits.values()) / len(fits))
+        diffs.append(abs(evaluator.evaluate_record(text).score_promedio - old))
+    if not diffs:
+        return {}
+    return {
+        "drift.matched_cvs": metric(len(diffs), "cvs", "higher"),
+        "drift.mean_abs_score_diff": metric(round(sum(diffs) / len(diffs), 2), "pts")
+    }
+
+
+BENCHES = {
+    "extraction": bench_extraction,
+    "evaluate": bench_evaluate,
+    "compile": bench_compile,
+    "scaling": bench_scaling,
+    "memory": bench_memory,
+    "drift": bench_drift
+}
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", nargs="+", choices=SUITES, help="Suites a ejecutar")
+    parser.add_argument("--quick", action="store_true", help="Menos iteraciones (CI)")
+    parser.add_argument("--corpus", type=int, default=None, help="Cantidad máxima de CVs")
+    parser.add_argument("--workers", type=int, default=None, help="Máximo de procesos en 'scaling'")
+    parser.add_argument("--output", help="Guardar resultados en JSON")
+    parser.add_argument("--baseline", help="JSON de una ejecución anterior para comparar")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Regresión tolerada (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    if not cv_paths():
+        print("❌ No se encontraron PDFs en data/cvs")
+        sys.exit(1)
+    corpus = load_corpus_with_paths(args.corpus)
+
+    metrics: Dict[str, Dict[str, Any]] = {}
+    for name in args.only or SUITES:
+        print(f"▶️  {name}...", file=sys.stderr)
+        metrics.update(BENCHES[name](corpus, args))
+
+    results = {"environment": environment(), "corpus_size": len(corpus), "metrics": metrics}
+
+    print("=" * 64)
+    print(f"   📏 Benchmarks del motor ({len(corpus)} CVs)")
+    print("=" * 64)
+    for name, m in metrics.items():
+        print(f"{name:<36} {m['value']:>12} {m['unit']}")
+
+    if args.output:
+        save_results(results, args.output)
+        print(f"\n💾 Resultados guardados en {args.output}")
+
+    if args.baseline:
+        regressions: List[Dict[str, Any]] = compare(metrics, load_results(args.baseline)["metrics"], args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regresiones (umbral {args.threshold:.0%}):")
+            for r in regressions:
+                print(f"   {r['metric']}: {r['baseline']} -> {r['current']} (+{r['change']:.0%})")
+            sys.exit(1)
+        print(f"\n✅ Sin regresiones vs {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Stub local compatible con la API de S3 (subconjunto, estilo MinIO).
+
+Para probar BLOB_BACKEND=s3 sin un bucket real. Soporta, con URLs
+path-style (`/<bucket>/<clave>`):
+- PUT / GET / HEAD / DELETE de objetos (GET con Range)
+- GET `/<bucket>?list-type=2` (ListObjectsV2, con prefix y paginación)
+- Firma SigV4 verificada (403 SignatureDoesNotMatch si no coincide) y
+  x-amz-content-sha256 contra el body del PUT
+- Los buckets se crean solos; los objetos viven en memoria
+- Latencia configurable y contadores (GET /__stats, POST /__reset)
+
+Ejecutar desde plataforma_reclutamiento/:
+    python benchmarks/s3_stub.py --port 9000
+
+Y apuntar la API al stub:
+    BLOB_BACKEND=s3 S3_ENDPOINT_URL=http://127.0.0.1:9000 S3_BUCKET=neat-cvs \\
+    S3_ACCESS_KEY_ID=stub S3_SECRET_ACCESS_KEY=stub-secret uvicorn api.main:app --port 8000
+"""
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import re
+import threading
+import time
+from collections import Counter
+from typing import Dict, Tuple
+from urllib.parse import parse_qsl, quote
+from xml.sax.saxutils import escape
+
+from fastapi import FastAPI, Request
+from fastapi.responses import Response
+
+ACCESS_KEY = "stub"
+SECRET_KEY = "stub-secret"
+
+_CREDENTIAL = re.compile(r"Credential=([^/]+)/(\d{8})/([^/]+)/s3/aws4_request, SignedHeaders=([^,]+), Signature=(\w+)")
+
+
+def _error(status: int, code: str, message: str) -> Response:
+    body = f'<?xml version="1.0" encoding="UTF-8"?><Error><Code>{code}</Code><Message>{escape(message)}</Message></Error>'
+    return Response(body, status_code=status, media_type="application/xml")
+
+
+def _check_signature(request: Request, secret_key: str) -> Tuple[bool, str]:
+    """Recalcula la firma SigV4 con los headers firmados del request (como lo hace S3)."""
+    match = _CREDENTIAL.search(request.headers.get("authorization", ""))
+    if not match:
+        return False, "Falta Authorization SigV4"
+    access_key, date, region, signed_headers, signature = match.groups()
+    if access_key != ACCESS_KEY:
+        return False, "Access key desconocida"
+
+    names = signed_headers.split(";")
+    query = parse_qsl(request.scope.get("query_string", b"").decode(), keep_blank_values=True)
+    canonical_request = "\n".join([
+        request.method,
+        request.scope.get("raw_path", b"").decode() or request.url.path,
+        "&".join(f"{quote(k, safe='-_.~')}={quote(v, safe='-_.~')}" for k, v in sorted(query)),
+        "".join(f"{n}:{request.headers.get(n, '').strip()}\n" for n in names),
+        signed_headers,
+        request.headers.get("x-amz-content-sha256", "")
+    ])
+    scope = f"{date}/{region}/s3/aws4_request"
+    string_to_sign = "\n".join([
+        "AWS4-HMAC-SHA256", request.headers.get("x-amz-date", ""), scope,
+        hashlib.sha256(canonical_request.encode()).hexdigest()
+    ])
+    key = f"AWS4{secret_key}".encode()
+    for part in (date, region, "s3", "aws4_request"):
+        key = hmac.new(key, part.encode(), hashlib.sha256).digest()
+    expected = hmac.new(key, string_to_sign.encode(), hashlib.sha256).hexdigest()
+    if not hmac.compare_digest(expected, signature):
+        return False, "La firma no coincide"
+    return True, ""
+
+
+def create_app(secret_key: str = SECRET_KEY, latency_ms: float = 0.0) -> FastAPI:
+    app = FastAPI(title="S3 Stub")
+    # bucket -> clave -> (contenido, etag, content-type)
+    app.state.buckets: Dict[str, Dict[str, Tuple[bytes, str, str]]] = {}
+    app.state.stats = Counter()
+
+    @app.middleware("http")
+    async def auth_and_count(request: Request, call_next):
+        if request.url.path.startswith("/__"):
+            return await call_next(request)
+        ok, message = _check_signature(request, secret_key)
+        if not ok:
+            return _error(403, "SignatureDoesNotMatch", message)
+        app.state.stats[request.method] += 1
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+        return await call_next(request)
+
+    @app.get("/__stats")
+    async def stats():
+        return {
+            "requests": dict(app.state.stats),
+            "total": sum(app.state.stats.values()),
+            "objects": sum(len(b) for b in app.state.buckets.values()),
+            "bytes": sum(len(o[0]) for b in app.state.buckets.values() for o in b.values())
+        }
+
+    @app.post("/__reset")
+    async def reset():
+        app.state.stats.clear()
+        return {"ok": True}
+
+    @app.get("/{bucket}")
+    async def list_objects(bucket: str, request: Request):
+        params = request.query_params
+        prefix = params.get("prefix", "")
+        max_keys = int(params.get("max-keys", "1000"))
+        start = params.get("continuation-token", "")
+        keys = sorted(k for k in app.state.buckets.get(bucket, {}) if k.startswith(prefix) and k > start)
+        page, truncated = keys[:max_keys], len(keys) > max_keys
+        objects = app.state.buckets.get(bucket, {})
+        contents = "".join(
+            f"<Contents><Key>{escape(k)}</Key><Size>{len(objects[k][0])}</Size>"
+            f"<ETag>&quot;{objects[k][1]}&quot;</ETag></Contents>" for k in page
+        )
+        body = (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<ListBucketResult xmlns="http://s3.amazonaws.com/doc/2006-03-01/">'
+            f"<Name>{escape(bucket)}</Name><Prefix>{escape(prefix)}</Prefix><KeyCount>{len(page)}</KeyCount>"
+            f"<MaxKeys>{max_keys}</MaxKeys><IsTruncated>{'true' if truncated else 'false'}</IsTruncated>"
+            + (f"<NextContinuationToken>{escape(page[-1])}</NextContinuationToken>" if truncated else "")
+            + contents + "</ListBucketResult>"
+        )
+        return Response(body, media_type="application/xml")
+
+    @app.put("/{bucket}/{key:path}")
+    async def put_object(bucket: str, key: str, request: Request):
+        body = await request.body()
+        declared = request.headers.get("x-amz-content-sha256", "")
+        if declared != "UNSIGNED-PAYLOAD" and declared != hashlib.sha256(body).hexdigest():
+            return _error(400, "XAmzContentSHA256Mismatch", "El SHA-256 del body no coincide")
+        etag = hashlib.md5(body).hexdigest()
+        content_type = request.headers.get("content-type", "application/octet-stream")
+        app.state.buckets.setdefault(bucket, {})[key] = (body, etag, content_type)
+        return Response(status_code=200, headers={"ETag": f'"{etag}"'})
+
+    def _object(bucket: str, key: str):
+        return app.state.buckets.get(bucket, {}).get(key)
+
+    @app.head("/{bucket}/{key:path}")
+    async def head_object(bucket: str, key: str):
+        obj = _object(bucket, key)
+        if obj is None:
+            return Response(status_code=404)
+        return Response(status_code=200, headers={
+            "Content-Length": str(len(obj[0])), "ETag": f'"{obj[1]}"', "Content-Type": obj[2]
+        })
+
+    @app.get("/{bucket}/{key:path}")
+    async def get_object(bucket: str, key: str, request: Request):
+        obj = _object(bucket, key)
+        if obj is None:
+            return _error(404, "NoSuchKey", "The specified key does not exist.")
+        body, etag, content_type = obj
+        headers = {"ETag": f'"{etag}"', "Accept-Ranges": "bytes"}
+        match = re.match(r"bytes=(\d*)-(\d*)$", request.headers.get("range", ""))
+        if match and (match.group(1) or match.group(2)):
+            if match.group(1):
+                start = int(match.group(1))
+                end = min(int(match.group(2)), len(body) - 1) if match.group(2) else len(body) - 1
+            else:
+                start, end = max(len(body) - int(match.group(2)), 0), len(body) - 1
+            if start >= len(body) or start > end:
+                return _error(416, "InvalidRange", "The requested range is not satisfiable")
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(body)}"
+            return Response(body[start:end + 1], status_code=206, media_type=content_type, headers=headers)
+        return Response(body, media_type=content_type, headers=headers)
+
+    @app.delete("/{bucket}/{key:path}")
+    async def delete_object(bucket: str, key: str):
+        app.state.buckets.get(bucket, {}).pop(key, None)
+        return Response(status_code=204)
+
+    return app
+
+
+def start_in_thread(latency_ms: float = 0.0, host: str = "127.0.0.1") -> Tuple[str, FastAPI]:
+    """Levanta el stub con uvicorn en un thread daemon. Retorna (URL, app)."""
+    import socket
+    import uvicorn
+
+    with socket.socket() as s:
+        s.bind((host, 0))
+        port = s.getsockname()[1]
+    app = create_app(latency_ms=latency_ms)
+    server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+
+    deadline = time.time() + 10
+    while not server.started:
+        if time.time() > deadline:
+            raise RuntimeError("El stub de S3 no inició a tiempo")
+        time.sleep(0.05)
+    return f"http://{host}:{port}", app
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Latencia por request")
+    args = parser.parse_args()
+
+    print(f"S3 stub en http://{args.host}:{args.port} (access key {ACCESS_KEY!r}, secret {SECRET_KEY!r})")
+    uvicorn.run(create_app(latency_ms=args.latency_ms), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,67 @@
 # The Wingman Evaluation Engine
 # Motor de evaluación de candidatos con IA
+#
+# Los exports se cargan en el primer acceso (PEP 562): `from engine import
+# telemetry` (lo que importan los servicios de la API) no arrastra los
+# modelos pydantic, el evaluador ni los extractores de PDF. Las
+# dependencias pesadas (pdfplumber, PyPDF2, pdf2image, PyMuPDF, openai) se
+# importan recién dentro de los métodos que las usan.
 
-from .evaluator import CandidateEvaluator
-from .pdf_extractor import PDFExtractor
-from .cv_processor import CVProcessor, CVData
-from .models import (
-    EvaluationConfig,
-    CategoryConfig,
-    InferenceConfig,
-    EvaluationResult,
-    CategoryResult,
-    InferenceResult
-)
-
-__all__ = [
-    'CandidateEvaluator',
-    'PDFExtractor',
-    'CVProcessor',
-    'CVData',
-    'EvaluationConfig',
-    'CategoryConfig',
-    'InferenceConfig',
-    'EvaluationResult',
-    'CategoryResult',
-    'InferenceResult'
-]
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .evaluator import CandidateEvaluator
+    from .pdf_extractor import PDFExtractor
+    from .pdf_source import PDFSource, spool, spool_pdf
+    from .cv_processor import CVProcessor, CVData
+    from .models import (
+        EvaluationConfig,
+        CategoryConfig,
+        InferenceConfig,
+        EvaluationResult,
+        CategoryResult,
+        InferenceResult
+    )
+    from .results import EvaluationRecord, CategoryHits, InferenceRecord
+    from .text_index import TextIndex
+    from .companies import CompanyIndex
+
+# nombre exportado -> submódulo que lo define
+_EXPORTS = {
+    'CandidateEvaluator': 'evaluator',
+    'PDFExtractor': 'pdf_extractor',
+    'PDFSource': 'pdf_source',
+    'spool': 'pdf_source',
+    'spool_pdf': 'pdf_source',
+    'CVProcessor': 'cv_processor',
+    'CVData': 'cv_processor',
+    'EvaluationConfig': 'models',
+    'CategoryConfig': 'models',
+    'InferenceConfig': 'models',
+    'EvaluationResult': 'models',
+    'CategoryResult': 'models',
+    'InferenceResult': 'models',
+    'EvaluationRecord': 'results',
+    'CategoryHits': 'results',
+    'InferenceRecord': 'results',
+    'TextIndex': 'text_index',
+    'CompanyIndex': 'companies'
+}
+
+__all__ = list(_EXPORTS)
 
 __version__ = '2.0.0'
 
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value  # los siguientes accesos no pasan por aquí
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
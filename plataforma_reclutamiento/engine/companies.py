@@ -0,0 +1,172 @@
+"""
+Índice de empresas conocidas para detectar experiencia por industria.
+
+La base de conocimiento (`data/company_knowledge.json`) se carga una sola
+vez y cada nombre (y sus alias) se normaliza con las mismas reglas que el
+texto del CV (`text_index.compile_phrase`), quitando sufijos legales
+("S.A.", "SpA", "Ltda", ...). Con todos los patrones se construye un único
+autómata Aho-Corasick sobre tokens, de modo que detectar empresas cuesta
+una pasada sobre los tokens del CV sin importar el tamaño de la base.
+
+Uso:
+    index = CompanyIndex.default()
+    companies = index.find(cv_text)   # {"Janssen S.A.": CompanyInfo(...)}
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from .models import CompanyInfo
+from .text_index import TextIndex, Phrase, compile_phrase
+
+
+DEFAULT_KNOWLEDGE_PATH = Path(__file__).parent.parent / "data" / "company_knowledge.json"
+
+# Sufijos societarios que no forman parte del nombre comercial
+LEGAL_SUFFIXES: Tuple[Phrase, ...] = tuple(
+    compile_phrase(suffix) for suffix in (
+        "S.A.", "SA", "SpA", "Ltda", "Limitada", "S.A.C.", "E.I.R.L.",
+        "Sociedad Anónima", "y Cía", "Cía", "Inc", "LLC", "Corp"
+    )
+)
+
+
+def normalize_company_name(name: str) -> Phrase:
+    """
+    Normaliza un nombre de empresa a su tupla de tokens sin sufijos legales.
+
+    'Redpath Chilena Ltda' -> ('redpath', 'chilena'),
+    'ZIPPY SPA' -> ('zippy',). Si el nombre es solo un sufijo se conserva.
+    """
+    tokens = compile_phrase(name)
+    stripped = True
+    while stripped:
+        stripped = False
+        for suffix in LEGAL_SUFFIXES:
+            n = len(suffix)
+            if len(tokens) > n and tokens[-n:] == suffix:
+                tokens = tokens[:-n]
+                stripped = True
+                break
+    return tokens
+
+
+class CompanyIndex:
+    """
+    Autómata multi-patrón (Aho-Corasick por tokens) sobre la base de empresas.
+
+    Cada estado es un dict token -> estado; `_out[state]` lista las
+    empresas cuyo nombre (o alias) termina en ese estado, ya incluyendo
+    las heredadas por los enlaces de falla.
+    """
+
+    _default: Optional["CompanyIndex"] = None
+
+    def __init__(self, knowledge_base: Optional[Dict[str, Union[CompanyInfo, dict]]] = None):
+        """
+        Construye el índice.
+
+        Args:
+            knowledge_base: Empresas por nombre canónico (CompanyInfo o dict
+                con "desc", "tier" y opcionalmente "aliases")
+        """
+        self.companies: Dict[str, CompanyInfo] = {}
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[str]] = [[]]
+
+        for name, info in (knowledge_base or {}).items():
+            if isinstance(info, dict):
+                info = CompanyInfo(**info)
+            self.companies[name] = info
+            for pattern in (name, *info.aliases):
+                self._insert(normalize_company_name(pattern), name)
+
+        self._build()
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path]) -> "CompanyIndex":
+        """Carga la base de conocimiento desde un JSON {nombre: {desc, tier}}."""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    @classmethod
+    def default(cls) -> "CompanyIndex":
+        """
+        Índice de `data/company_knowledge.json`, cargado una sola vez por proceso.
+
+        Si el archivo no existe retorna un índice vacío.
+        """
+        if cls._default is None:
+            if DEFAULT_KNOWLEDGE_PATH.exists():
+                cls._default = cls.from_file(DEFAULT_KNOWLEDGE_PATH)
+            else:
+                cls._default = cls()
+        return cls._default
+
+    def __len__(self) -> int:
+        return len(self.companies)
+
+    def _insert(self, pattern: Phrase, name: str) -> None:
+        """Agrega un patrón al trie."""
+        if not pattern:
+            return
+        state = 0
+        for token in pattern:
+            nxt = self._goto[state].get(token)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][token] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        if name not in self._out[state]:
+            self._out[state].append(name)
+
+    def _build(self) -> None:
+        """Calcula los enlaces de falla (BFS) y propaga las salidas."""
+        goto, fail, out = self._goto, self._fail, self._out
+        queue = list(goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for token, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and token not in goto[f]:
+                    f = fail[f]
+                candidate = goto[f].get(token, 0)
+                fail[nxt] = candidate if candidate != nxt else 0
+                if out[fail[nxt]]:
+                    out[nxt] = out[nxt] + [n for n in out[fail[nxt]] if n not in out[nxt]]
+
+    def find(self, text: Union[str, TextIndex]) -> Dict[str, CompanyInfo]:
+        """
+        Detecta empresas conocidas en el texto.
+
+        Args:
+            text: Texto del CV o su `TextIndex` ya construido
+
+        Returns:
+            Diccionario nombre canónico -> CompanyInfo, en orden de aparición
+        """
+        if not self.companies:
+            return {}
+        index = text if isinstance(text, TextIndex) else TextIndex.for_text(text)
+        goto, fail, out = self._goto, self._fail, self._out
+        root = goto[0]
+
+        found: Dict[str, CompanyInfo] = {}
+        state = 0
+        for token in index.tokens:
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0) if state else root.get(token, 0)
+            if state and out[state]:
+                for name in out[state]:
+                    if name not in found:
+                        found[name] = self.companies[name]
+        return found
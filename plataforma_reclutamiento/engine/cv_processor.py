@@ -4,12 +4,18 @@ Extrae información estructurada directamente del PDF usando la API de OpenAI.
 """
 
 import os
+import logging
 import json
 import base64
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 from dataclasses import dataclass
 
+from . import telemetry
+from .pdf_source import PDFSource, as_pdf_source, describe, is_path, pdf_bytes
+
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class CVData:
@@ -119,17 +125,25 @@ IMPORTANTE:
 - El texto_completo debe ser la transcripción fiel del CV
 - Calcula años_experiencia sumando la duración de cada trabajo"""
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, client: Optional[Any] = None):
+        """
+        Args:
+            api_key: API key de OpenAI (default: OPENAI_API u OPENAI_API_KEY)
+            client: Cliente de OpenAI ya creado, para reutilizar sus
+                conexiones. Si es None se crea uno por CV.
+        """
+        self.client = client
         self.api_key = api_key or os.getenv("OPENAI_API") or os.getenv("OPENAI_API_KEY")
-        if not self.api_key:
+        if not self.api_key and client is None:
             raise ValueError("OPENAI_API o OPENAI_API_KEY es requerido")
     
-    def process_pdf(self, pdf_path: str) -> CVData:
+    def process_pdf(self, source: PDFSource) -> CVData:
         """
         Procesa un PDF de CV y extrae información estructurada.
         
         Args:
-            pdf_path: Ruta al archivo PDF
+            source: Ruta al archivo PDF, o el PDF en memoria (bytes,
+                memoryview, stream o chunks de una descarga)
             
         Returns:
             CVData con toda la información extraída
@@ -137,13 +151,13 @@ IMPORTANTE:
         from openai import OpenAI
         
         # Convertir PDF a imágenes base64
-        images_base64 = self._pdf_to_images(pdf_path)
+        images_base64 = self._rasterize(source)
         
         if not images_base64:
-            raise ValueError(f"No se pudo procesar el PDF: {pdf_path}")
+            raise ValueError(f"No se pudo procesar el PDF: {describe(source)}")
         
         # Preparar mensajes para OpenAI
-        client = OpenAI(api_key=self.api_key)
+        client = self.client or OpenAI(api_key=self.api_key)
         
         # Construir contenido con imágenes
         content = [{"type": "text", "text": self.EXTRACTION_PROMPT}]
@@ -158,7 +172,9 @@ IMPORTANTE:
             })
         
         # Llamar a OpenAI
-        response = client.chat.completions.create(
+        response = telemetry.chat_completion(
+            client,
+            site="CVProcessor.process_pdf",
             model="gpt-4o",
             messages=[
                 {
@@ -182,8 +198,8 @@ IMPORTANTE:
         try:
             data = json.loads(response_text)
         except json.JSONDecodeError as e:
-            print(f"Error parseando JSON: {e}")
-            print(f"Respuesta: {response_text[:500]}")
+            logger.warning("Error parseando JSON de OpenAI: %s", e)
+            logger.debug("Respuesta (%d chars): %.500s", len(response_text), response_text)
             # Intentar extraer JSON de la respuesta
             import re
             json_match = re.search(r'\{[\s\S]*\}', response_text)
@@ -216,19 +232,19 @@ IMPORTANTE:
             areas_desarrollo=data.get("areas_desarrollo", [])
         )
     
-    def process_pdf_text_only(self, pdf_path: str) -> str:
+    def process_pdf_text_only(self, source: PDFSource) -> str:
         """
         Extrae solo el texto del CV sin análisis estructurado.
         Más rápido y económico para evaluaciones simples.
         """
         from openai import OpenAI
         
-        images_base64 = self._pdf_to_images(pdf_path)
+        images_base64 = self._rasterize(source)
         
         if not images_base64:
-            raise ValueError(f"No se pudo procesar el PDF: {pdf_path}")
+            raise ValueError(f"No se pudo procesar el PDF: {describe(source)}")
         
-        client = OpenAI(api_key=self.api_key)
+        client = self.client or OpenAI(api_key=self.api_key)
         
         content = [{
             "type": "text", 
@@ -244,7 +260,9 @@ IMPORTANTE:
                 }
             })
         
-        response = client.chat.completions.create(
+        response = telemetry.chat_completion(
+            client,
+            site="CVProcessor.process_pdf_text_only",
             model="gpt-4o",
             messages=[{"role": "user", "content": content}],
             max_tokens=4096,
@@ -253,14 +271,25 @@ IMPORTANTE:
         
         return response.choices[0].message.content.strip()
     
-    def _pdf_to_images(self, pdf_path: str) -> List[str]:
+    def _rasterize(self, source: PDFSource) -> List[str]:
+        """`_pdf_to_images` medido como span (páginas y bytes de imagen)."""
+        source = as_pdf_source(source)
+        with telemetry.span("pipeline", "rasterize", source="path" if is_path(source) else "memory") as span:
+            images_base64 = self._pdf_to_images(source)
+            span.set(pages=len(images_base64), bytes=sum(len(img) for img in images_base64))
+            return images_base64
+    
+    def _pdf_to_images(self, source: PDFSource) -> List[str]:
         """Convierte PDF a lista de imágenes en base64."""
         try:
-            from pdf2image import convert_from_path
+            from pdf2image import convert_from_bytes, convert_from_path
             import io
             
             # Convertir PDF a imágenes
-            images = convert_from_path(pdf_path, dpi=150)
+            if is_path(source):
+                images = convert_from_path(source, dpi=150)
+            else:
+                images = convert_from_bytes(pdf_bytes(source), dpi=150)
             
             images_base64 = []
             for image in images:
@@ -277,15 +306,18 @@ IMPORTANTE:
             
         except ImportError:
             # Fallback: intentar leer como imagen directamente
-            print("[WARN] pdf2image no instalado, intentando fallback...")
-            return self._fallback_pdf_read(pdf_path)
+            logger.warning("pdf2image no instalado, intentando fallback con PyMuPDF")
+            return self._fallback_pdf_read(source)
     
-    def _fallback_pdf_read(self, pdf_path: str) -> List[str]:
+    def _fallback_pdf_read(self, source: PDFSource) -> List[str]:
         """Fallback para leer PDF sin pdf2image usando PyMuPDF."""
         try:
             import fitz  # PyMuPDF
             
-            doc = fitz.open(pdf_path)
+            if is_path(source):
+                doc = fitz.open(source)
+            else:
+                doc = fitz.open(stream=pdf_bytes(source), filetype="pdf")
             images_base64 = []
             
             for page in doc:
@@ -300,7 +332,7 @@ IMPORTANTE:
             return images_base64
             
         except ImportError:
-            print("[ERROR] Ni pdf2image ni PyMuPDF están instalados")
+            logger.error("Ni pdf2image ni PyMuPDF están instalados")
             return []
 
 
@@ -5,17 +5,21 @@ Este módulo contiene la lógica principal de evaluación de CVs usando
 análisis de keywords, inferencia de perfil y multiplicadores de industria.
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Tuple
 from .models import (
     EvaluationConfig,
+    CategoryConfig,
     EvaluationResult,
-    CategoryResult,
-    InferenceResult,
     ProfileType,
     RetentionRisk,
     IndustryTier,
     CompanyInfo
 )
+from .results import EvaluationRecord, CategoryHits, InferenceRecord
+from .text_index import TextIndex, Phrase, compile_phrase
+from .companies import CompanyIndex
+from .sections import CVSections
+from . import telemetry
 
 
 class CandidateEvaluator:
@@ -23,9 +27,10 @@ class CandidateEvaluator:
     Motor de evaluación de candidatos.
     
     Analiza el texto de un CV y genera scores basados en:
-    - Coincidencia de keywords por categoría
-    - Recencia de experiencia (primeros 35% del CV)
-    - Multiplicadores por industria
+    - Coincidencia de keywords por categoría (por palabra completa,
+      sin distinguir acentos ni mayúsculas; ver `text_index`)
+    - Recencia de experiencia (cargos más recientes del CV; ver `sections`)
+    - Multiplicadores por industria (empresas conocidas del CV, ver `companies`)
     - Inferencia de tipo de perfil
     - Detección de riesgos
     
@@ -33,6 +38,10 @@ class CandidateEvaluator:
         evaluator = CandidateEvaluator()
         result = evaluator.evaluate(cv_text)
         print(result.score_promedio)
+        
+        # Hot path (batch / API): resultado compacto sin validación Pydantic
+        record = evaluator.evaluate_record(cv_text)
+        data = record.to_dict()
     """
     
     # Títulos de cargos con su nivel jerárquico
@@ -54,18 +63,66 @@ class CandidateEvaluator:
         "administré", "diseñé", "logré", "aumenté", "reduje"
     ]
     
-    def __init__(self, config: Optional[EvaluationConfig] = None):
+    # Keywords de industria (fallback cuando no hay contexto de empresas)
+    FINTECH_KEYWORDS = ["fintech", "fintoc", "mercadopago", "rappi", "klarna", "stripe"]
+    TECH_KEYWORDS = ["startup", "software", "tech", "technology", "technologies", "saas", "platform"]
+    TRADITIONAL_KEYWORDS = ["minería", "construcción", "educación", "retail", "manufactura"]
+    
+    def __init__(
+        self,
+        config: Optional[EvaluationConfig] = None,
+        company_index: Optional[CompanyIndex] = None
+    ):
         """
         Inicializa el evaluador.
         
         Args:
             config: Configuración de evaluación. Si es None, usa la config por defecto.
+            company_index: Índice de empresas conocidas. Si es None, usa
+                `data/company_knowledge.json` (cargado una vez por proceso).
         """
         self.config = config or EvaluationConfig.default_config()
+        self.company_index = company_index or CompanyIndex.default()
+        self._kb_index: Optional[Tuple[Dict[str, CompanyInfo], CompanyIndex]] = None
+        self._compile()
     
     def set_config(self, config: EvaluationConfig) -> None:
         """Actualiza la configuración del evaluador."""
         self.config = config
+        self._compile()
+    
+    def _compile(self) -> None:
+        """
+        Precalcula las estructuras derivadas de la configuración.
+        
+        Las keywords de cada categoría se congelan en tuplas (sin duplicados)
+        una sola vez, para que los resultados compactos puedan referenciarlas
+        por índice sin copiar listas en cada evaluación. Cada familia de
+        keywords se compila además a frases de tokens normalizados para
+        resolverlas contra el `TextIndex` del CV.
+        """
+        self._categories: List[Tuple[str, CategoryConfig, Tuple[str, ...], Tuple[Phrase, ...], Tuple[Phrase, ...]]] = []
+        for cat_key, cat_config in self.config.categories.items():
+            keywords = tuple(dict.fromkeys(cat_config.keywords))
+            self._categories.append((
+                cat_key,
+                cat_config,
+                keywords,
+                _compile_all(keywords),
+                _compile_all(cat_config.culture_booster_keywords or [])
+            ))
+        
+        inference_cfg = self.config.inference
+        self._technical_phrases = _compile_all(inference_cfg.technical_keywords)
+        self._strategic_phrases = _compile_all(inference_cfg.strategic_keywords)
+        self._scope_phrases = _compile_all(inference_cfg.corporate_scope_keywords)
+        self._title_phrases = tuple(
+            (compile_phrase(title), rank) for title, rank in self.TITLE_RANKS.items()
+        )
+        self._potential_phrases = _compile_all(self.POTENTIAL_KEYWORDS)
+        self._fintech_phrases = _compile_all(self.FINTECH_KEYWORDS)
+        self._tech_phrases = _compile_all(self.TECH_KEYWORDS)
+        self._traditional_phrases = _compile_all(self.TRADITIONAL_KEYWORDS)
     
     def evaluate(
         self,
@@ -77,53 +134,85 @@ class CandidateEvaluator:
         
         Args:
             text: Texto completo del CV
-            company_context: Diccionario de empresas detectadas en el CV
+            company_context: Diccionario de empresas del CV. Si es None, se
+                detectan con el índice de empresas del evaluador.
             
         Returns:
             EvaluationResult con scores y análisis completo
         """
-        text_lower = text.lower()
-        
-        # 1. Detectar industria y calcular multiplicador
-        industry_tier, industry_multiplier, industry_reasoning = self._detect_industry(
-            text_lower, company_context
-        )
+        return self.evaluate_record(text, company_context).to_model()
+    
+    def evaluate_record(
+        self,
+        text: str,
+        company_context: Optional[Dict[str, CompanyInfo]] = None
+    ) -> EvaluationRecord:
+        """
+        Evalúa el texto de un CV y retorna el resultado compacto.
         
-        # 2. Calcular texto reciente (primer 35%)
-        recent_text_limit = int(len(text_lower) * 0.35)
-        recent_text = text_lower[:recent_text_limit]
+        Misma lógica que `evaluate()`, pero sin construir modelos Pydantic.
+        Usar en rutas de la API y scoring en batch; convertir con
+        `to_dict()` / `to_model()` solo en el borde.
         
-        # 3. Evaluar cada categoría
-        category_results = {}
-        for cat_key, cat_config in self.config.categories.items():
-            category_results[cat_key] = self._evaluate_category(
-                text_lower=text_lower,
-                recent_text=recent_text,
-                category_key=cat_key,
-                category_config=cat_config,
-                industry_multiplier=industry_multiplier,
-                industry_reasoning=industry_reasoning
+        Args:
+            text: Texto completo del CV
+            company_context: Diccionario de empresas del CV. Si es None, se
+                detectan con el índice de empresas del evaluador.
+            
+        Returns:
+            EvaluationRecord con scores y análisis completo
+        """
+        with telemetry.span("engine", "evaluate"):
+            index = TextIndex.for_text(text)
+            if company_context is None:
+                company_context = self.company_index.find(index)
+            
+            # 1. Detectar industria y calcular multiplicador
+            industry_tier, industry_multiplier, industry_reasoning = self._detect_industry(
+                index, company_context
+            )
+            
+            # 2. Seccionar el CV (cargos recientes; cacheado con el índice)
+            sections = index.sections
+            
+            # 3. Evaluar cada categoría
+            category_results = {}
+            for cat_key, cat_config, keywords, phrases, booster_phrases in self._categories:
+                category_results[cat_key] = self._evaluate_category(
+                    index=index,
+                    sections=sections,
+                    category_key=cat_key,
+                    category_config=cat_config,
+                    keywords=keywords,
+                    phrases=phrases,
+                    booster_phrases=booster_phrases,
+                    industry_multiplier=industry_multiplier,
+                    industry_reasoning=industry_reasoning
+                )
+            
+            # 4. Calcular métricas de inferencia
+            inference = self._calculate_inference(
+                index=index,
+                category_results=category_results,
+                industry_tier=industry_tier
+            )
+            
+            # 5. Construir resultado final (promedio después de penalizaciones)
+            score_promedio = 0
+            if category_results:
+                scores = [cat.score for cat in category_results.values()]
+                score_promedio = int(sum(scores) / len(scores))
+            
+            return EvaluationRecord(
+                fits=category_results,
+                inference=inference,
+                score_promedio=score_promedio,
+                config_version=self.config.version
             )
-        
-        # 4. Calcular métricas de inferencia
-        inference = self._calculate_inference(
-            text_lower=text_lower,
-            category_results=category_results,
-            industry_tier=industry_tier
-        )
-        
-        # 5. Construir resultado final
-        result = EvaluationResult(
-            fits=category_results,
-            inference=inference,
-            config_version=self.config.version
-        )
-        
-        return result
     
     def _detect_industry(
         self,
-        text_lower: str,
+        index: TextIndex,
         company_context: Optional[Dict[str, CompanyInfo]] = None
     ) -> tuple[IndustryTier, float, str]:
         """
@@ -152,21 +241,17 @@ class CandidateEvaluator:
                 multiplier = self.config.industry_multipliers.traditional
                 reasoning = " **Alerta Industria:** Experiencia principal en industria tradicional."
         
-        # Fallback: detectar por keywords si no hay contexto de empresas
-        if tier == IndustryTier.GENERAL and not company_context:
-            fintech_kws = ["fintech", "fintoc", "mercadopago", "rappi", "klarna", "stripe"]
-            tech_kws = ["startup", "software", "tech", "saas", "platform"]
-            traditional_kws = ["minería", "construcción", "educación", "retail", "manufactura"]
-            
-            if any(kw in text_lower for kw in fintech_kws):
+        # Fallback: detectar por keywords si las empresas no definen industria
+        if tier == IndustryTier.GENERAL:
+            if index.any_of(self._fintech_phrases):
                 tier = IndustryTier.FINTECH
                 multiplier = self.config.industry_multipliers.fintech
                 reasoning = " **Bonus Fintech:** Keywords de industria detectadas."
-            elif any(kw in text_lower for kw in tech_kws):
+            elif index.any_of(self._tech_phrases):
                 tier = IndustryTier.TECH
                 multiplier = self.config.industry_multipliers.tech
                 reasoning = " **Bonus Tech:** Keywords de industria detectadas."
-            elif any(kw in text_lower for kw in traditional_kws):
+            elif index.any_of(self._traditional_phrases):
                 tier = IndustryTier.TRADITIONAL
                 multiplier = self.config.industry_multipliers.traditional
                 reasoning = " **Alerta Industria:** Keywords de industria tradicional detectadas."
@@ -175,46 +260,59 @@ class CandidateEvaluator:
     
     def _evaluate_category(
         self,
-        text_lower: str,
-        recent_text: str,
+        index: TextIndex,
+        sections: CVSections,
         category_key: str,
-        category_config: Any,
+        category_config: CategoryConfig,
+        keywords: Tuple[str, ...],
+        phrases: Tuple[Phrase, ...],
+        booster_phrases: Tuple[Phrase, ...],
         industry_multiplier: float,
         industry_reasoning: str
-    ) -> CategoryResult:
+    ) -> CategoryHits:
         """
         Evalúa una categoría específica.
         
         Args:
-            text_lower: Texto en minúsculas
-            recent_text: Primer 35% del texto
+            index: Índice tokenizado del CV
+            sections: Secciones del CV (máscara de tokens recientes)
             category_key: Clave de la categoría (admin, ops, biz)
             category_config: Configuración de la categoría
+            keywords: Keywords compiladas de la categoría (sin duplicados)
+            phrases: Frases normalizadas alineadas con `keywords`
+            booster_phrases: Frases del booster cultural
             industry_multiplier: Multiplicador de industria
             industry_reasoning: Texto explicativo del multiplicador
             
         Returns:
-            CategoryResult con score y análisis
+            CategoryHits con score y análisis
         """
-        keywords = category_config.keywords
         max_expected = category_config.max_expected
         
         # Detectar booster cultural
         booster = 1.0
-        culture_kws = category_config.culture_booster_keywords or []
-        if culture_kws and any(kw in text_lower for kw in culture_kws):
+        if booster_phrases and index.any_of(booster_phrases):
             booster = 1.25
         
-        # Encontrar keywords
-        found = list(set(kw for kw in keywords if kw in text_lower))
-        missing = [kw for kw in keywords if kw not in found]
+        # Encontrar keywords y su recencia en una sola pasada
+        # (índices sobre la tupla compilada)
+        found = []
+        recent = []
+        for i, phrase in enumerate(phrases):
+            positions = index.find(phrase)
+            if positions:
+                found.append(i)
+                if sections.any_recent(positions):
+                    recent.append(i)
+        found_idx = tuple(found)
+        recent_idx = tuple(recent)
+        missing_idx = [i for i in range(len(keywords)) if i not in found_idx]
         
         # Bonus por recencia
-        recent_matches = [kw for kw in found if kw in recent_text]
-        recency_bonus = len(recent_matches) * 5
+        recency_bonus = len(recent_idx) * 5
         
         # Calcular score
-        base_score = (len(found) / max_expected) * 100
+        base_score = (len(found_idx) / max_expected) * 100
         raw_score = (base_score * booster) + recency_bonus
         final_score = min(raw_score, 100)
         
@@ -222,33 +320,34 @@ class CandidateEvaluator:
         final_score = int(min(final_score * industry_multiplier, 100))
         
         # Construir razonamiento
-        reasoning = f"Detectado {len(found)}/{max_expected} conceptos."
+        reasoning = f"Detectado {len(found_idx)}/{max_expected} conceptos."
         if industry_multiplier != 1.0:
             reasoning += industry_reasoning
-        if recent_matches:
-            top_recent = ", ".join(recent_matches[:3])
+        if recent_idx:
+            top_recent = ", ".join(keywords[i] for i in recent_idx[:3])
             reasoning += f" **Inferencia Reciente:** {top_recent}."
         
         # Generar preguntas sugeridas
-        questions = []
-        if category_key == "admin" and missing:
-            top_missing = ", ".join(missing[:2])
-            questions.append(f"Faltan conceptos clave: {top_missing}. Profundizar.")
-        
-        return CategoryResult(
+        questions = ()
+        if category_key == "admin" and missing_idx:
+            top_missing = ", ".join(keywords[i] for i in missing_idx[:2])
+            questions = (f"Faltan conceptos clave: {top_missing}. Profundizar.",)
+        
+        return CategoryHits(
+            keywords=keywords,
+            found_idx=found_idx,
+            recent_idx=recent_idx,
             score=final_score,
-            found=found,
-            missing=missing,
             reasoning=reasoning,
             questions=questions
         )
     
     def _calculate_inference(
         self,
-        text_lower: str,
-        category_results: Dict[str, CategoryResult],
+        index: TextIndex,
+        category_results: Dict[str, CategoryHits],
         industry_tier: IndustryTier
-    ) -> InferenceResult:
+    ) -> InferenceRecord:
         """
         Calcula las métricas de inferencia del perfil.
         
@@ -258,30 +357,21 @@ class CandidateEvaluator:
         - Riesgo de retención
         - Score de potencial
         """
-        inference_cfg = self.config.inference
-        
         # Hands-On Index
-        tech_kws = inference_cfg.technical_keywords
-        hands_on_matches = [t for t in tech_kws if t in text_lower]
-        hands_on_index = min(int((len(hands_on_matches) / 5) * 100), 100)
+        hands_on_matches = sum(1 for p in self._technical_phrases if index.contains(p))
+        hands_on_index = min(int((hands_on_matches / 5) * 100), 100)
         
         # Strategic keywords (para referencia futura)
-        strat_kws = inference_cfg.strategic_keywords
-        found_strategic = [t for t in strat_kws if t in text_lower]
+        found_strategic = sum(1 for p in self._strategic_phrases if index.contains(p))
         
         # Corporate scope
-        scope_kws = inference_cfg.corporate_scope_keywords
-        found_scope = [t for t in scope_kws if t in text_lower]
-        scope_intensity = len(found_scope)
+        scope_intensity = sum(1 for p in self._scope_phrases if index.contains(p))
         
         # Detectar títulos de cargo
-        found_titles = []
         highest_title_rank = 0
-        for title, rank in self.TITLE_RANKS.items():
-            if title in text_lower:
-                found_titles.append(title)
-                if rank > highest_title_rank:
-                    highest_title_rank = rank
+        for phrase, rank in self._title_phrases:
+            if rank > highest_title_rank and index.contains(phrase):
+                highest_title_rank = rank
         
         # Determinar tipo de perfil y riesgo
         profile_type = ProfileType.HYBRID
@@ -309,10 +399,10 @@ class CandidateEvaluator:
             risk_warning = "✅ Match Ideal: Sabe operar."
         
         # Calcular potencial
-        found_potential = [kw for kw in self.POTENTIAL_KEYWORDS if kw in text_lower]
-        potential_score = min(int((len(found_potential) / 4) * 100), 100)
+        found_potential = sum(1 for p in self._potential_phrases if index.contains(p))
+        potential_score = min(int((found_potential / 4) * 100), 100)
         
-        return InferenceResult(
+        return InferenceRecord(
             profile_type=profile_type,
             hands_on_index=hands_on_index,
             risk_warning=risk_warning,
@@ -325,24 +415,28 @@ class CandidateEvaluator:
     def detect_companies(
         self,
         text: str,
-        knowledge_base: Dict[str, CompanyInfo]
+        knowledge_base: Optional[Dict[str, CompanyInfo]] = None
     ) -> Dict[str, CompanyInfo]:
         """
         Detecta empresas conocidas en el texto.
         
         Args:
             text: Texto del CV
-            knowledge_base: Base de conocimiento de empresas
+            knowledge_base: Base de conocimiento de empresas. Si es None, usa
+                el índice del evaluador; si no, se indexa una vez y se reutiliza
+                mientras se pase el mismo diccionario.
             
         Returns:
             Diccionario de empresas encontradas
         """
-        text_lower = text.lower()
-        found = {}
+        if knowledge_base is None:
+            return self.company_index.find(text)
         
-        for company, info in knowledge_base.items():
-            if company.lower() in text_lower:
-                found[company] = info
-        
-        return found
+        if self._kb_index is None or self._kb_index[0] is not knowledge_base:
+            self._kb_index = (knowledge_base, CompanyIndex(knowledge_base))
+        return self._kb_index[1].find(text)
+
 
+def _compile_all(keywords) -> Tuple[Phrase, ...]:
+    """Compila una lista de keywords a frases normalizadas."""
+    return tuple(compile_phrase(kw) for kw in keywords)
@@ -175,6 +175,7 @@ class CompanyInfo(BaseModel):
     """Información de una empresa conocida."""
     desc: str
     tier: str
+    aliases: List[str] = Field(default_factory=list)  # Otros nombres con que aparece en CVs
     
 
 class CompanyKnowledge(BaseModel):
@@ -1,30 +1,51 @@
 """
 Extractor de texto de PDFs.
 Soporta múltiples backends: pdfplumber, PyPDF2, y OpenAI Vision.
+
+Todos aceptan un `PDFSource` (ruta, bytes/memoryview, stream o chunks de
+una descarga; ver `pdf_source`), así que un PDF en memoria se procesa sin
+escribirlo a disco.
 """
 
+import logging
 import os
-from typing import Optional
+from typing import Any, Optional
 from abc import ABC, abstractmethod
 
+from . import telemetry
+from .pdf_source import PDFSource, as_pdf_source, describe, is_path, open_pdf_stream, pdf_bytes
+
+logger = logging.getLogger(__name__)
+
 
 class PDFExtractorBase(ABC):
     """Interfaz base para extractores de PDF."""
     
+    name = "base"
+    
+    def timed_extract(self, source: PDFSource) -> str:
+        """`extract()` medido como span "pdf" con el nombre del backend."""
+        with telemetry.span("pdf", self.name, source="path" if is_path(source) else "memory") as span:
+            text = self.extract(source)
+            span.set(chars=len(text))
+            return text
+    
     @abstractmethod
-    def extract(self, pdf_path: str) -> str:
-        """Extrae texto de un PDF."""
+    def extract(self, source: PDFSource) -> str:
+        """Extrae texto de un PDF (ruta, bytes o stream)."""
         pass
 
 
 class PDFPlumberExtractor(PDFExtractorBase):
     """Extractor usando pdfplumber (mejor para tablas)."""
     
-    def extract(self, pdf_path: str) -> str:
+    name = "pdfplumber"
+    
+    def extract(self, source: PDFSource) -> str:
         try:
             import pdfplumber
             text = ""
-            with pdfplumber.open(pdf_path) as pdf:
+            with open_pdf_stream(source) as stream, pdfplumber.open(stream) as pdf:
                 for page in pdf.pages:
                     page_text = page.extract_text()
                     if page_text:
@@ -33,47 +54,62 @@ class PDFPlumberExtractor(PDFExtractorBase):
         except ImportError:
             raise ImportError("pdfplumber no está instalado. Instala con: pip install pdfplumber")
         except Exception as e:
-            raise Exception(f"Error extrayendo texto de {pdf_path}: {e}")
+            raise Exception(f"Error extrayendo texto de {describe(source)}: {e}")
 
 
 class PyPDF2Extractor(PDFExtractorBase):
     """Extractor usando PyPDF2 (más rápido, menos preciso)."""
     
-    def extract(self, pdf_path: str) -> str:
+    name = "pypdf2"
+    
+    def extract(self, source: PDFSource) -> str:
         try:
             from PyPDF2 import PdfReader
-            reader = PdfReader(pdf_path)
             text = ""
-            for page in reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
+            with open_pdf_stream(source) as stream:
+                reader = PdfReader(stream)
+                for page in reader.pages:
+                    page_text = page.extract_text()
+                    if page_text:
+                        text += page_text + "\n"
             return text
         except ImportError:
             raise ImportError("PyPDF2 no está instalado. Instala con: pip install PyPDF2")
         except Exception as e:
-            raise Exception(f"Error extrayendo texto de {pdf_path}: {e}")
+            raise Exception(f"Error extrayendo texto de {describe(source)}: {e}")
 
 
 class OpenAIVisionExtractor(PDFExtractorBase):
     """Extractor usando OpenAI Vision API (mejor para PDFs escaneados)."""
     
-    def __init__(self, api_key: Optional[str] = None):
+    name = "openai"
+    
+    def __init__(self, api_key: Optional[str] = None, client: Optional[Any] = None):
+        """
+        Args:
+            api_key: API key de OpenAI (default: OPENAI_API u OPENAI_API_KEY)
+            client: Cliente de OpenAI ya creado, para reutilizar sus
+                conexiones. Si es None se crea uno por extracción.
+        """
+        self.client = client
         # Buscar en múltiples variables de entorno
         self.api_key = api_key or os.getenv("OPENAI_API") or os.getenv("OPENAI_API_KEY")
-        if not self.api_key:
+        if not self.api_key and client is None:
             raise ValueError("OPENAI_API o OPENAI_API_KEY es requerido para OpenAIVisionExtractor")
     
-    def extract(self, pdf_path: str) -> str:
+    def extract(self, source: PDFSource) -> str:
         try:
             import base64
             from openai import OpenAI
-            from pdf2image import convert_from_path
+            from pdf2image import convert_from_bytes, convert_from_path
             
-            client = OpenAI(api_key=self.api_key)
+            client = self.client or OpenAI(api_key=self.api_key)
             
             # Convertir PDF a imágenes
-            images = convert_from_path(pdf_path)
+            if is_path(source):
+                images = convert_from_path(source)
+            else:
+                images = convert_from_bytes(pdf_bytes(source))
             
             all_text = []
             for i, image in enumerate(images):
@@ -84,7 +120,9 @@ class OpenAIVisionExtractor(PDFExtractorBase):
                 base64_image = base64.b64encode(buffer.getvalue()).decode()
                 
                 # Enviar a OpenAI Vision
-                response = client.chat.completions.create(
+                response = telemetry.chat_completion(
+                    client,
+                    site="OpenAIVisionExtractor.extract",
                     model="gpt-4o",
                     messages=[
                         {
@@ -135,47 +173,55 @@ class PDFExtractor:
         "openai": OpenAIVisionExtractor
     }
     
-    def __init__(self, backend: str = "pdfplumber", **kwargs):
+    def __init__(self, backend: str = "pdfplumber", openai_client: Optional[Any] = None, **kwargs):
         """
         Inicializa el extractor.
         
         Args:
             backend: "pdfplumber" (default), "pypdf2", o "openai"
+            openai_client: Cliente de OpenAI compartido para el backend
+                "openai" y el fallback de OpenAI Vision
             **kwargs: Argumentos adicionales para el backend
         """
         if backend not in self.BACKENDS:
             raise ValueError(f"Backend '{backend}' no soportado. Usa: {list(self.BACKENDS.keys())}")
         
         self.backend_name = backend
+        self.openai_client = openai_client
+        if backend == "openai":
+            kwargs.setdefault("client", openai_client)
         self._extractor = self.BACKENDS[backend](**kwargs)
     
-    def extract(self, pdf_path: str) -> str:
+    def extract(self, source: PDFSource) -> str:
         """
-        Extrae texto de un archivo PDF.
+        Extrae texto de un PDF.
         
         Args:
-            pdf_path: Ruta al archivo PDF
+            source: Ruta al archivo PDF, o el PDF en memoria (bytes,
+                memoryview, stream o chunks de una descarga)
             
         Returns:
             Texto extraído del PDF
         """
-        if not os.path.exists(pdf_path):
-            raise FileNotFoundError(f"Archivo no encontrado: {pdf_path}")
+        if is_path(source) and not os.path.exists(source):
+            raise FileNotFoundError(f"Archivo no encontrado: {source}")
         
-        return self._extractor.extract(pdf_path)
+        return self._extractor.timed_extract(as_pdf_source(source))
     
-    def extract_with_fallback(self, pdf_path: str) -> str:
+    def extract_with_fallback(self, source: PDFSource) -> str:
         """
         Intenta extraer con el backend principal, si falla usa fallback.
         
         Args:
-            pdf_path: Ruta al archivo PDF
+            source: Ruta al archivo PDF, o el PDF en memoria (ver `extract`)
             
         Returns:
             Texto extraído del PDF
         """
+        # Chunks de una descarga se juntan una vez: cada fallback relee desde el inicio
+        source = as_pdf_source(source)
         try:
-            text = self.extract(pdf_path)
+            text = self.extract(source)
             if text.strip():
                 return text
         except Exception:
@@ -185,7 +231,7 @@ class PDFExtractor:
         if self.backend_name != "pypdf2":
             try:
                 fallback = PyPDF2Extractor()
-                text = fallback.extract(pdf_path)
+                text = fallback.timed_extract(source)
                 if text.strip():
                     return text
             except Exception:
@@ -195,13 +241,13 @@ class PDFExtractor:
         try:
             import os
             api_key = os.getenv("OPENAI_API") or os.getenv("OPENAI_API_KEY")
-            if api_key:
-                vision = OpenAIVisionExtractor(api_key)
-                text = vision.extract(pdf_path)
+            if api_key or self.openai_client is not None:
+                vision = OpenAIVisionExtractor(api_key, client=self.openai_client)
+                text = vision.timed_extract(source)
                 if text.strip():
                     return text
         except Exception as e:
-            print(f"[DEBUG] OpenAI Vision fallback failed: {e}")
+            logger.debug("OpenAI Vision fallback falló: %s", e)
             pass
         
         # Si todo falla, retornar string vacío
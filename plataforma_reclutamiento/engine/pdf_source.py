@@ -0,0 +1,107 @@
+"""
+Origen de un PDF para los extractores: ruta, bytes o stream.
+
+`PDFExtractor`, los backends de `PDFExtractorBase` y `CVProcessor` aceptan
+cualquier `PDFSource`:
+- str / PathLike: ruta a un archivo (como antes)
+- bytes / bytearray / memoryview: el PDF ya en memoria
+- archivo binario con `read`/`seek` (BytesIO, SpooledTemporaryFile,
+  `open(..., "rb")`)
+- iterable de chunks (p.ej. una descarga en curso): se junta una sola vez
+  con `spool_pdf` para que los fallbacks puedan releerlo
+
+`spool_pdf` usa un SpooledTemporaryFile: queda en memoria hasta
+PDF_SPOOL_MAX_BYTES (default 8 MiB) y solo si lo supera pasa a un archivo
+temporal anónimo.
+"""
+
+import io
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import BinaryIO, Iterable, Iterator, Optional, Union
+
+PDF_SPOOL_MAX_BYTES = int(os.getenv("PDF_SPOOL_MAX_BYTES", str(8 * 1024 * 1024)))
+
+PDFSource = Union[str, os.PathLike, bytes, bytearray, memoryview, BinaryIO, Iterable[bytes]]
+
+_BUFFERS = (bytes, bytearray, memoryview)
+
+
+def is_path(source: PDFSource) -> bool:
+    return isinstance(source, (str, os.PathLike))
+
+
+def _is_stream(source: PDFSource) -> bool:
+    return hasattr(source, "read") and hasattr(source, "seek")
+
+
+def describe(source: PDFSource) -> str:
+    """Texto corto para logs y errores (la ruta, o el tipo y tamaño en memoria)."""
+    if is_path(source):
+        return os.fspath(source)
+    if isinstance(source, _BUFFERS):
+        return f"<PDF en memoria, {memoryview(source).nbytes} bytes>"
+    return f"<PDF {type(source).__name__}>"
+
+
+def spool(max_memory: Optional[int] = None) -> "tempfile.SpooledTemporaryFile":
+    """Buffer vacío: en memoria hasta `max_memory` bytes (default PDF_SPOOL_MAX_BYTES), luego a disco."""
+    return tempfile.SpooledTemporaryFile(max_size=max_memory or PDF_SPOOL_MAX_BYTES, mode="w+b")
+
+
+def spool_pdf(chunks: Iterable[bytes], max_memory: Optional[int] = None) -> "tempfile.SpooledTemporaryFile":
+    """Junta `chunks` en un `spool()` y lo deja posicionado al inicio."""
+    buffer = spool(max_memory)
+    for chunk in chunks:
+        buffer.write(chunk)
+    buffer.seek(0)
+    return buffer
+
+
+def as_pdf_source(source: PDFSource) -> PDFSource:
+    """
+    Fuente que se puede leer más de una vez.
+
+    Rutas, buffers y streams se devuelven tal cual; un iterable de chunks
+    (que solo se puede recorrer una vez) se junta con `spool_pdf`.
+    """
+    if is_path(source) or isinstance(source, _BUFFERS) or _is_stream(source):
+        return source
+    return spool_pdf(source)
+
+
+@contextmanager
+def open_pdf_stream(source: PDFSource) -> Iterator[Union[str, BinaryIO]]:
+    """
+    Lo que reciben pdfplumber y PyPDF2: la ruta tal cual (la abren ellos) o
+    un stream binario posicionado al inicio.
+
+    Los streams del llamador no se cierran: al salir se rebobinan para que
+    el siguiente backend (fallback) los lea desde el principio.
+    """
+    if is_path(source):
+        yield os.fspath(source)
+    elif isinstance(source, _BUFFERS):
+        # BytesIO sobre bytes no copia hasta que alguien escriba
+        yield io.BytesIO(source if isinstance(source, bytes) else bytes(source))
+    else:
+        source = as_pdf_source(source)
+        source.seek(0)
+        try:
+            yield source
+        finally:
+            source.seek(0)
+
+
+def pdf_bytes(source: PDFSource) -> bytes:
+    """Contenido completo en memoria (para renderizar con pdf2image/PyMuPDF)."""
+    if isinstance(source, bytes):
+        return source
+    if isinstance(source, _BUFFERS):
+        return bytes(source)
+    if is_path(source):
+        with open(source, "rb") as f:
+            return f.read()
+    with open_pdf_stream(source) as stream:
+        return stream.read()
@@ -0,0 +1,130 @@
+"""
+Representación compacta de resultados para el hot path del motor.
+
+Los modelos Pydantic de `models.py` (EvaluationResult, CategoryResult,
+InferenceResult) validan en cada construcción. Para scoring en batch
+el motor trabaja con estas dataclasses con __slots__, que guardan
+índices sobre la tupla de keywords compilada en vez de listas de strings,
+y solo se convierten a Pydantic/dict en el borde de la API.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple, Any
+
+from .models import (
+    EvaluationResult,
+    CategoryResult,
+    InferenceResult,
+    ProfileType,
+    RetentionRisk,
+    IndustryTier
+)
+
+
+@dataclass(slots=True)
+class CategoryHits:
+    """Resultado de una categoría expresado como índices sobre `keywords`."""
+    keywords: Tuple[str, ...]
+    found_idx: Tuple[int, ...]
+    recent_idx: Tuple[int, ...]
+    score: int
+    reasoning: str = ""
+    questions: Tuple[str, ...] = ()
+
+    @property
+    def found(self) -> List[str]:
+        """Keywords encontradas, en el orden de la configuración."""
+        keywords = self.keywords
+        return [keywords[i] for i in self.found_idx]
+
+    @property
+    def missing(self) -> List[str]:
+        """Keywords no encontradas, en el orden de la configuración."""
+        found = self.found_idx
+        return [kw for i, kw in enumerate(self.keywords) if i not in found]
+
+    @property
+    def recent(self) -> List[str]:
+        """Keywords encontradas en la experiencia reciente."""
+        keywords = self.keywords
+        return [keywords[i] for i in self.recent_idx]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "score": self.score,
+            "found": self.found,
+            "missing": self.missing,
+            "reasoning": self.reasoning,
+            "questions": list(self.questions)
+        }
+
+    def to_model(self) -> CategoryResult:
+        return CategoryResult(**self.to_dict())
+
+
+@dataclass(slots=True)
+class InferenceRecord:
+    """Métricas de inferencia del perfil (sin validación)."""
+    profile_type: ProfileType = ProfileType.HYBRID
+    hands_on_index: int = 0
+    risk_warning: str = ""
+    retention_risk: RetentionRisk = RetentionRisk.LOW
+    scope_intensity: int = 0
+    potential_score: int = 0
+    industry_tier: IndustryTier = IndustryTier.GENERAL
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "profile_type": self.profile_type.value,
+            "hands_on_index": self.hands_on_index,
+            "risk_warning": self.risk_warning,
+            "retention_risk": self.retention_risk.value,
+            "scope_intensity": self.scope_intensity,
+            "potential_score": self.potential_score,
+            "industry_tier": self.industry_tier.value
+        }
+
+    def to_model(self) -> InferenceResult:
+        return InferenceResult(
+            profile_type=self.profile_type,
+            hands_on_index=self.hands_on_index,
+            risk_warning=self.risk_warning,
+            retention_risk=self.retention_risk,
+            scope_intensity=self.scope_intensity,
+            potential_score=self.potential_score,
+            industry_tier=self.industry_tier
+        )
+
+
+@dataclass(slots=True)
+class EvaluationRecord:
+    """
+    Resultado completo de una evaluación en formato compacto.
+
+    Uso:
+        record = evaluator.evaluate_record(cv_text)
+        data = record.to_dict()      # Para Airtable / respuestas JSON
+        model = record.to_model()    # EvaluationResult (Pydantic)
+    """
+    fits: Dict[str, CategoryHits] = field(default_factory=dict)
+    inference: InferenceRecord = field(default_factory=InferenceRecord)
+    score_promedio: int = 0
+    config_version: str = "1.0"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convierte a dicts planos (mismo formato que guarda Airtable)."""
+        return {
+            "score_promedio": self.score_promedio,
+            "config_version": self.config_version,
+            "fits": {k: v.to_dict() for k, v in self.fits.items()},
+            "inference": self.inference.to_dict()
+        }
+
+    def to_model(self) -> EvaluationResult:
+        """Convierte al modelo Pydantic público."""
+        return EvaluationResult(
+            fits={k: v.to_model() for k, v in self.fits.items()},
+            inference=self.inference.to_model(),
+            score_promedio=self.score_promedio,
+            config_version=self.config_version
+        )
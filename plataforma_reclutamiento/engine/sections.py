@@ -0,0 +1,270 @@
+"""
+Seccionador liviano de CVs para la ventana de recencia.
+
+Detecta una sola vez, sobre el texto normalizado de un `TextIndex`:
+- Encabezados de sección ("Experiencia Laboral", "Educación", "Idiomas"...)
+- Rangos de fechas ("Ago 2020 - May 2025", "2025-Actualidad", "(Jun-2019 –oct-2022)")
+
+Con eso arma los spans de cada cargo dentro de la experiencia y marca
+como recientes los tokens de los cargos más recientes. Si la sección de
+experiencia no tiene fechas se buscan en todo el texto, y si el CV no
+tiene fechas reconocibles se usa el criterio anterior: el primer 35%.
+
+El resultado se cachea junto al índice (`TextIndex.sections`), así que la
+recencia de un hit de keyword es un lookup O(1) por posición de token.
+"""
+
+import re
+from bisect import bisect_left
+from dataclasses import dataclass
+from datetime import date
+from typing import Iterable, List, Optional, Tuple
+
+from .text_index import TextIndex, Phrase, compile_phrase
+
+
+# Fracción del texto usada como "reciente" cuando no se detectan cargos
+FALLBACK_RECENT_FRACTION = 0.35
+
+# Un cargo es reciente si terminó a lo más N años antes del más reciente
+RECENT_YEARS = 2
+
+_EXPERIENCE_HEADINGS = (
+    "experiencia", "experiencia laboral", "experiencia profesional",
+    "trayectoria", "trayectoria laboral", "trayectoria profesional",
+    "antecedentes laborales", "antecedentes profesionales", "historial laboral",
+    "experience", "work experience", "professional experience", "employment history"
+)
+
+# Encabezados de resumen: cierran la experiencia, pero si el CV no tiene
+# encabezado de experiencia no excluyen lo que sigue
+_PROFILE_HEADINGS = (
+    "perfil", "perfil profesional", "resumen", "resumen profesional",
+    "presentacion", "sobre mi", "summary", "profile"
+)
+
+_OTHER_HEADINGS = (
+    "educacion", "formacion", "formacion academica", "estudios",
+    "antecedentes academicos", "idiomas", "habilidades", "competencias",
+    "certificaciones", "certificados", "cursos", "conocimientos",
+    "referencias", "informacion de contacto", "contacto",
+    "carta de presentacion", "intereses",
+    "education", "skills", "languages", "references"
+)
+
+EXPERIENCE, PROFILE, OTHER = "experience", "profile", "other"
+
+_HEADINGS: Tuple[Tuple[Phrase, str], ...] = tuple(sorted(
+    [(compile_phrase(h), EXPERIENCE) for h in _EXPERIENCE_HEADINGS]
+    + [(compile_phrase(h), PROFILE) for h in _PROFILE_HEADINGS]
+    + [(compile_phrase(h), OTHER) for h in _OTHER_HEADINGS],
+    key=lambda item: -len(item[0])  # Frases más largas primero
+))
+
+# Encabezados de experiencia de 2+ tokens: se aceptan también al final de
+# una línea (CVs a dos columnas: "... de experiencia liderando HISTORIAL LABORAL")
+_TRAILING_EXPERIENCE_HEADINGS = tuple(
+    phrase for phrase, kind in _HEADINGS if kind == EXPERIENCE and len(phrase) > 1
+)
+
+# Un encabezado es una línea corta compuesta de frases de encabezado
+_MAX_HEADING_TOKENS = 6
+
+_MONTH = r"(?:ene|feb|mar|abr|may|jun|jul|ago|sep|oct|nov|dic|jan|apr|aug|dec)[a-z]*\.?"
+_DATE = rf"(?:{_MONTH}[\s\-/]*)?(?:\d{{1,2}}\s*[./]\s*)?((?:19|20)\d\d)"
+_PRESENT = r"actualidad|presente|present|hoy|la fecha|actual|current|today"
+_DATE_RANGE_RE = re.compile(
+    rf"{_DATE}\s*(?:-|–|—|\ba\b|\bal\b|hasta|\bto\b)\s*(?:{_DATE}|({_PRESENT})\b)"
+)
+
+_LINE_RE = re.compile(r"[^\n]*\n?")
+
+
+@dataclass(slots=True)
+class RoleSpan:
+    """Cargo detectado: offsets en el texto normalizado y años del rango."""
+    start: int
+    end: int
+    start_year: int
+    end_year: int
+
+
+@dataclass(slots=True)
+class CVSections:
+    """
+    Secciones de un CV.
+
+    - `experience`: spans (start, end) de las secciones de experiencia
+    - `roles`: cargos detectados, en orden de aparición
+    - `recent_mask`: 1 por cada token del índice que cae en experiencia reciente
+    - `from_roles`: False si se usó el fallback del primer 35%
+    """
+    experience: Tuple[Tuple[int, int], ...]
+    roles: Tuple[RoleSpan, ...]
+    recent_mask: bytearray
+    from_roles: bool
+
+    def is_recent(self, token_pos: int) -> bool:
+        """True si el token en esa posición pertenece a experiencia reciente."""
+        return bool(self.recent_mask[token_pos])
+
+    def any_recent(self, positions: Iterable[int]) -> bool:
+        """True si alguna de las posiciones de token es reciente."""
+        mask = self.recent_mask
+        return any(mask[p] for p in positions)
+
+
+def _heading_kind(tokens: Phrase) -> Optional[str]:
+    """
+    Retorna el tipo de encabezado de la línea (EXPERIENCE, PROFILE, OTHER)
+    o None si no es encabezado.
+
+    Acepta encabezados combinados por CVs a dos columnas ("Experiencia
+    Laboral Educación") y encabezados de experiencia con un calificativo
+    ("Experiencia profesional Chile y México").
+    """
+    if not tokens:
+        return None
+    if len(tokens) > _MAX_HEADING_TOKENS:
+        for phrase in _TRAILING_EXPERIENCE_HEADINGS:
+            if tokens[-len(phrase):] == phrase:
+                return EXPERIENCE
+        return None
+
+    kind = None
+    i = 0
+    while i < len(tokens):
+        for phrase, phrase_kind in _HEADINGS:
+            if tokens[i:i + len(phrase)] == phrase:
+                if kind is None:
+                    kind = phrase_kind
+                i += len(phrase)
+                break
+        else:
+            return EXPERIENCE if kind == EXPERIENCE else None
+    return kind
+
+
+def _lines(text: str) -> List[Tuple[int, int]]:
+    """Spans (start, end) de cada línea, sin incluir el salto final."""
+    spans = []
+    for match in _LINE_RE.finditer(text):
+        if match.start() == match.end():
+            break
+        end = match.end()
+        if text[end - 1:end] == "\n":
+            end -= 1
+        spans.append((match.start(), end))
+    return spans
+
+
+def _experience_regions(index: TextIndex, lines: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """
+    Spans de las secciones de experiencia.
+
+    Si el CV no tiene encabezado de experiencia, se usa todo el texto
+    excepto las secciones con otros encabezados (educación, idiomas...);
+    los encabezados de resumen/perfil no interrumpen la región.
+    """
+    text, tokens, offsets = index.folded, index.tokens, index.offsets
+    headings = []
+    lo = 0
+    for start, end in lines:
+        # Tokens de la línea tomados del índice (sin re-tokenizar)
+        lo = bisect_left(offsets, start, lo)
+        hi = bisect_left(offsets, end, lo)
+        kind = _heading_kind(tuple(tokens[lo:hi]))
+        if kind is not None:
+            headings.append((start, end, kind))
+
+    has_experience = any(kind == EXPERIENCE for _, _, kind in headings)
+    if not has_experience:
+        headings = [h for h in headings if h[2] != PROFILE]
+    regions = []
+    current = None if has_experience else 0
+    for start, end, kind in headings:
+        if current is not None and start > current:
+            regions.append((current, start))
+        current = end if kind == EXPERIENCE else None
+    if current is not None and current < len(text):
+        regions.append((current, len(text)))
+    return regions
+
+
+def _find_roles(text: str, regions: List[Tuple[int, int]]) -> List[RoleSpan]:
+    """Detecta cargos como rangos de fecha dentro de las regiones de experiencia."""
+    present_year = date.today().year
+    roles: List[RoleSpan] = []
+
+    for region_start, region_end in regions:
+        region_roles = []
+        for match in _DATE_RANGE_RE.finditer(text, region_start, region_end):
+            start_year = int(match.group(1))
+            end_year = int(match.group(2)) if match.group(2) else present_year
+            if end_year < start_year:
+                continue
+
+            # El cargo comienza en su línea; si la fecha va sola en la
+            # línea, el título suele estar en la línea anterior.
+            line_start = text.rfind("\n", region_start, match.start()) + 1
+            line_start = max(line_start, region_start)
+            if not text[line_start:match.start()].strip(" \t(-–—|•"):
+                prev_start = text.rfind("\n", region_start, max(line_start - 1, region_start)) + 1
+                line_start = max(prev_start, region_start)
+            if region_roles and line_start <= region_roles[-1].start:
+                line_start = match.start()
+            region_roles.append(RoleSpan(line_start, region_end, start_year, end_year))
+
+        for current, nxt in zip(region_roles, region_roles[1:]):
+            current.end = nxt.start
+        roles.extend(region_roles)
+
+    return roles
+
+
+def _mask_spans(offsets: List[int], spans: Iterable[Tuple[int, int]]) -> bytearray:
+    """Máscara por token: 1 si el offset del token cae en alguno de los spans."""
+    mask = bytearray(len(offsets))
+    for start, end in spans:
+        lo = bisect_left(offsets, start)
+        hi = bisect_left(offsets, end)
+        if hi > lo:
+            mask[lo:hi] = b"\x01" * (hi - lo)
+    return mask
+
+
+def sectionize(index: TextIndex) -> CVSections:
+    """
+    Secciona el texto de un índice y calcula la máscara de recencia.
+
+    Args:
+        index: Índice del CV (se usan `folded`, `offsets`)
+
+    Returns:
+        CVSections con experiencia, cargos y máscara de tokens recientes
+    """
+    text = index.folded
+    regions = _experience_regions(index, _lines(text))
+    roles = _find_roles(text, regions)
+    if not roles and regions != [(0, len(text))]:
+        # CVs a dos columnas pueden intercalar otra sección dentro de la
+        # experiencia: se buscan fechas en todo el texto
+        roles = _find_roles(text, [(0, len(text))])
+
+    if roles:
+        latest = max(role.end_year for role in roles)
+        recent_spans = [
+            (role.start, role.end) for role in roles
+            if role.end_year >= latest - RECENT_YEARS
+        ]
+        from_roles = True
+    else:
+        recent_spans = [(0, int(len(text) * FALLBACK_RECENT_FRACTION))]
+        from_roles = False
+
+    return CVSections(
+        experience=tuple(regions),
+        roles=tuple(roles),
+        recent_mask=_mask_spans(index.offsets, recent_spans),
+        from_roles=from_roles
+    )
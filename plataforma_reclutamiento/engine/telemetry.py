@@ -0,0 +1,192 @@
+"""
+Bus mínimo de telemetría para llamadas externas y etapas del motor.
+
+El motor y la API marcan cada llamada externa (Airtable, OpenAI, ...) y las
+etapas costosas (extracción de PDF, evaluación) con `span(kind, name)`. Este módulo no sabe qué se hace con esos datos: los
+observadores registrados con `add_observer` los reciben al terminar cada
+span (p.ej. la instrumentación por request de la API). Sin observadores el
+costo es solo medir el tiempo.
+
+Uso:
+    with telemetry.span("airtable", "Postulaciones", method="GET") as s:
+        response = await client.get(...)
+        s.set(status=response.status_code, bytes_in=len(response.content))
+
+    # Llamadas a OpenAI (registra tokens)
+    response = telemetry.chat_completion(client, site="CVProcessor.process_pdf",
+                                         model="gpt-4o", messages=[...])
+
+Las cachés se registran con `register_cache(name, info)` para exponer su
+tasa de aciertos.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+class Span:
+    """Una llamada externa: tipo (airtable, openai...), nombre (tabla, modelo) y atributos."""
+
+    __slots__ = ("kind", "name", "attrs", "start", "duration", "error")
+
+    def __init__(self, kind: str, name: str, attrs: Dict[str, Any]):
+        self.kind = kind
+        self.name = name
+        self.attrs = attrs
+        self.start = time.perf_counter()
+        self.duration = 0.0
+        self.error = False
+
+    def set(self, **attrs: Any) -> None:
+        """Agrega atributos (bytes, retries, status, tokens...)."""
+        self.attrs.update(attrs)
+
+
+Observer = Callable[[Span], None]
+
+_observers: List[Observer] = []
+
+# Tracers: objetos con `start(span) -> token` y `end(span, token)`, llamados
+# al abrir y cerrar cada span (p.ej. OpenTelemetry, que necesita el inicio
+# para anidar los spans). Los observadores solo ven spans terminados.
+_tracers: List[Any] = []
+
+_active: ContextVar[Optional[Span]] = ContextVar("telemetry_span", default=None)
+
+
+def add_observer(observer: Observer) -> None:
+    """Registra un observador que recibe cada span terminado."""
+    if observer not in _observers:
+        _observers.append(observer)
+
+
+def remove_observer(observer: Observer) -> None:
+    if observer in _observers:
+        _observers.remove(observer)
+
+
+def add_tracer(tracer: Any) -> None:
+    """Registra un tracer (`start(span) -> token`, `end(span, token)`)."""
+    if tracer not in _tracers:
+        _tracers.append(tracer)
+
+
+def remove_tracer(tracer: Any) -> None:
+    if tracer in _tracers:
+        _tracers.remove(tracer)
+
+
+def current() -> Optional[Span]:
+    """Span abierto más interno en el contexto actual."""
+    return _active.get()
+
+
+def annotate(**attrs: Any) -> None:
+    """Agrega atributos al span abierto actual (no hace nada si no hay)."""
+    s = _active.get()
+    if s is not None:
+        s.attrs.update(attrs)
+
+
+@contextmanager
+def span(kind: str, name: str, **attrs: Any) -> Iterator[Span]:
+    """
+    Mide una llamada externa y la notifica a los observadores.
+
+    Args:
+        kind: Tipo de servicio ("airtable", "openai", ...)
+        name: Recurso dentro del servicio (tabla, modelo)
+        **attrs: Atributos iniciales (method, ...)
+    """
+    s = Span(kind, name, attrs)
+    opened = [(tracer, _start(tracer, s)) for tracer in _tracers] if _tracers else ()
+    active = _active.set(s)
+    try:
+        yield s
+    except BaseException:
+        s.error = True
+        raise
+    finally:
+        s.duration = time.perf_counter() - s.start
+        _active.reset(active)
+        for tracer, token in reversed(opened):
+            try:
+                tracer.end(s, token)
+            except Exception:
+                pass
+        _notify(s)
+
+
+def _start(tracer: Any, s: Span) -> Any:
+    try:
+        return tracer.start(s)
+    except Exception:
+        return None
+
+
+def _notify(s: Span) -> None:
+    for observer in _observers:
+        try:
+            observer(s)
+        except Exception:
+            # La telemetría nunca debe romper la llamada instrumentada
+            pass
+
+
+def chat_completion(client: Any, site: str = "unknown", **kwargs: Any) -> Any:
+    """
+    `client.chat.completions.create(**kwargs)` dentro de un span "openai".
+
+    Registra los tokens de `response.usage` cuando vienen en la respuesta.
+
+    Args:
+        client: Cliente de OpenAI
+        site: Punto de llamada (p.ej. "CVProcessor.process_pdf")
+        **kwargs: Argumentos de `chat.completions.create`
+    """
+    with span("openai", kwargs.get("model", "unknown"), site=site) as s:
+        response = client.chat.completions.create(**kwargs)
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            s.set(
+                tokens_in=getattr(usage, "prompt_tokens", 0) or 0,
+                tokens_out=getattr(usage, "completion_tokens", 0) or 0
+            )
+        return response
+
+
+# ============================================================================
+# Cachés
+# ============================================================================
+
+_caches: Dict[str, Callable[[], Any]] = {}
+
+
+def register_cache(name: str, info: Callable[[], Any]) -> None:
+    """
+    Registra una caché para exponer su tasa de aciertos.
+
+    Args:
+        name: Nombre de la caché ("text_index", ...)
+        info: Función sin argumentos que retorna un objeto con `hits`,
+            `misses` y `currsize` (como `functools.lru_cache.cache_info()`)
+    """
+    _caches[name] = info
+
+
+def cache_stats() -> Dict[str, Dict[str, int]]:
+    """Estado actual de las cachés registradas."""
+    stats = {}
+    for name, info in _caches.items():
+        try:
+            current = info()
+        except Exception:
+            continue
+        stats[name] = {
+            "hits": current.hits,
+            "misses": current.misses,
+            "size": current.currsize
+        }
+    return stats
@@ -0,0 +1,170 @@
+"""
+Índice tokenizado del texto de un CV.
+
+El matching por substring sobre `text.lower()` genera falsos positivos
+("bi" dentro de "también", "kpi" dentro de otras palabras) y falsos
+negativos por acentos ("imputacion" de OCR vs "imputación"). Este módulo
+normaliza el texto una sola vez (NFKD sin diacríticos + minúsculas),
+lo tokeniza por límites de palabra y construye un índice
+token -> posiciones contra el que se resuelven todas las keywords por
+lookup de hash.
+
+Uso:
+    index = TextIndex.for_text(cv_text)
+    phrase = compile_phrase("Conciliación bancaria")
+    if index.contains(phrase):
+        ...
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from . import telemetry
+
+
+Phrase = Tuple[str, ...]
+
+# Bloque "Combining Diacritical Marks" (U+0300–U+036F): tras NFKD los
+# acentos del español quedan como estos códigos y se eliminan con translate.
+_STRIP_MARKS = {code: None for code in range(0x0300, 0x0370)}
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+# Consonantes tras las que el plural español agrega "es" (operacion-es,
+# red-es, papel-es, mayor-es).
+_ES_PLURAL_STEMS = frozenset("nrld")
+
+
+def fold(text: str) -> str:
+    """Normaliza a minúsculas sin diacríticos (NFKD): 'Imputación' -> 'imputacion'."""
+    return unicodedata.normalize("NFKD", text).translate(_STRIP_MARKS).lower()
+
+
+def stem(token: str) -> str:
+    """
+    Reduce plurales simples para que singular y plural coincidan.
+
+    Se aplica igual a keywords y texto, por lo que solo importa que ambas
+    formas converjan: 'pagos'/'pago' -> 'pago', 'operaciones'/'operacion'
+    -> 'operacion', 'kpis' -> 'kpi'. Tokens cortos no se tocan.
+    """
+    if len(token) <= 3 or token[-1] != "s" or token[-2] == "s":
+        return token
+    if len(token) > 4 and token[-2] == "e" and token[-3] in _ES_PLURAL_STEMS:
+        return token[:-2]
+    return token[:-1]
+
+
+def compile_phrase(keyword: str) -> Phrase:
+    """Convierte una keyword de la configuración en su tupla de tokens normalizados."""
+    return tuple(stem(tok) for tok in _TOKEN_RE.findall(fold(keyword)))
+
+
+class TextIndex:
+    """
+    Índice de tokens de un texto, construido una sola vez.
+
+    - `folded`: texto normalizado (las posiciones se expresan sobre él)
+    - `tokens`: tokens normalizados en orden de aparición
+    - `offsets`: offset de carácter (en `folded`) de cada token
+    - `sections`: secciones/cargos del CV (se calculan al primer acceso)
+    """
+
+    __slots__ = ("folded", "tokens", "offsets", "_positions", "_sections")
+
+    def __init__(self, text: str):
+        self.folded = fold(text)
+        tokens: List[str] = []
+        offsets: List[int] = []
+        positions: Dict[str, List[int]] = {}
+        stems: Dict[str, str] = {}
+
+        for i, match in enumerate(_TOKEN_RE.finditer(self.folded)):
+            raw = match.group()
+            token = stems.get(raw)
+            if token is None:
+                token = stems[raw] = stem(raw)
+            tokens.append(token)
+            offsets.append(match.start())
+            bucket = positions.get(token)
+            if bucket is None:
+                positions[token] = [i]
+            else:
+                bucket.append(i)
+
+        self.tokens = tokens
+        self.offsets = offsets
+        self._positions = positions
+        self._sections = None
+
+    @staticmethod
+    def for_text(text: str) -> "TextIndex":
+        """Retorna el índice del texto, reutilizando uno ya construido si existe."""
+        return _cached_index(text)
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    @property
+    def sections(self):
+        """CVSections del texto (ver `sections.sectionize`), cacheadas con el índice."""
+        if self._sections is None:
+            from .sections import sectionize
+            self._sections = sectionize(self)
+        return self._sections
+
+    def find(self, phrase: Phrase) -> List[int]:
+        """Índices de token donde comienza cada ocurrencia de la frase."""
+        if not phrase:
+            return []
+        starts = self._positions.get(phrase[0])
+        if not starts:
+            return []
+        if len(phrase) == 1:
+            return starts
+
+        tokens = self.tokens
+        rest = list(phrase[1:])
+        n = len(phrase)
+        return [i for i in starts if tokens[i + 1:i + n] == rest]
+
+    def first(self, phrase: Phrase) -> Optional[int]:
+        """Índice de token de la primera ocurrencia, o None si no aparece."""
+        if not phrase:
+            return None
+        starts = self._positions.get(phrase[0])
+        if not starts:
+            return None
+        if len(phrase) == 1:
+            return starts[0]
+
+        tokens = self.tokens
+        rest = list(phrase[1:])
+        n = len(phrase)
+        for i in starts:
+            if tokens[i + 1:i + n] == rest:
+                return i
+        return None
+
+    def contains(self, phrase: Phrase) -> bool:
+        """True si la frase aparece en el texto."""
+        return self.first(phrase) is not None
+
+    def first_offset(self, phrase: Phrase) -> Optional[int]:
+        """Offset de carácter (en `folded`) de la primera ocurrencia."""
+        i = self.first(phrase)
+        return None if i is None else self.offsets[i]
+
+    def any_of(self, phrases) -> bool:
+        """True si aparece al menos una de las frases."""
+        return any(self.first(p) is not None for p in phrases)
+
+
+@lru_cache(maxsize=128)
+def _cached_index(text: str) -> TextIndex:
+    return TextIndex(text)
+
+
+telemetry.register_cache("text_index", _cached_index.cache_info)
@@ -5,9 +5,13 @@ Ejecutar una vez después de crear la tabla Usuarios.
 """
 
 import os
-import hashlib
+import sys
 import httpx
 from getpass import getpass
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from api.services.passwords import password_hasher
 
 # Configuración
 API_KEY = os.getenv("AIRTABLE_API_KEY", "")
@@ -34,9 +38,8 @@ HEADERS = {
 }
 
 def hash_password(password: str) -> str:
-    """Hashea una contraseña."""
-    salt = "neat-platform-salt"
-    return hashlib.sha256(f"{password}{salt}".encode()).hexdigest()
+    """Hashea una contraseña con el esquema actual de la API (scrypt)."""
+    return password_hasher.hash_sync(password)
 
 def create_superadmin():
     print("=" * 60)
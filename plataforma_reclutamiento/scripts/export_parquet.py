@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Exporta Postulaciones + Evaluaciones_AI a un archivo Parquet para analítica.
+
+Mismo contenido que GET /api/admin/export/analytics.parquet, pero directo
+contra Airtable (no necesita la API levantada). Lee Airtable página por
+página y escribe un row group cada --row-group filas.
+
+Requiere pyarrow y las variables AIRTABLE_API_KEY / AIRTABLE_BASE_ID.
+
+Ejecutar desde plataforma_reclutamiento/:
+    python scripts/export_parquet.py -o postulaciones_2025.parquet --desde 2025-01-01 --hasta 2025-12-31
+    python scripts/export_parquet.py -o proceso.parquet --proceso recXXXXXXXXXXXXXX
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from api.services.airtable import AirtableService
+from api.services.exports import ANALYTICS_ROW_GROUP, iter_parquet
+
+
+async def export(args) -> int:
+    airtable = AirtableService.from_env()
+
+    codigo_proceso = None
+    if args.proceso:
+        proceso = await airtable.get_proceso_by_id(args.proceso, count_postulaciones=False, resolve_names=False)
+        if not proceso:
+            print(f"❌ Proceso no encontrado: {args.proceso}")
+            return 1
+        codigo_proceso = proceso.get("codigo_proceso")
+
+    started = time.perf_counter()
+    written = 0
+    tmp = Path(f"{args.output}.tmp")
+    with open(tmp, "wb") as f:
+        async for chunk in iter_parquet(
+            airtable,
+            proceso_id=args.proceso,
+            codigo_proceso=codigo_proceso,
+            desde=args.desde,
+            hasta=args.hasta,
+            row_group_size=args.row_group,
+            compression=args.compression
+        ):
+            f.write(chunk)
+            written += len(chunk)
+    tmp.replace(args.output)
+
+    import pyarrow.parquet as pq
+    rows = pq.ParquetFile(args.output).metadata.num_rows
+    print(f"✅ {rows} filas, {written / 1024:.0f} KB en {args.output} ({time.perf_counter() - started:.1f} s)")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-o", "--output", required=True, help="Archivo .parquet de salida")
+    parser.add_argument("--proceso", help="Record ID del proceso")
+    parser.add_argument("--desde", help="Fecha de postulación mínima (YYYY-MM-DD)")
+    parser.add_argument("--hasta", help="Fecha de postulación máxima (YYYY-MM-DD)")
+    parser.add_argument("--row-group", type=int, default=ANALYTICS_ROW_GROUP, help="Filas por row group")
+    parser.add_argument("--compression", default="zstd", help="zstd, snappy, gzip o none")
+    args = parser.parse_args()
+
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        print("❌ pyarrow no está instalado (pip install pyarrow)")
+        sys.exit(1)
+
+    sys.exit(asyncio.run(export(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Copia los CVs de un directorio local al store configurado (BLOB_BACKEND).
+
+Sirve para pasar `data/cvs` a S3: cada archivo se guarda con su nombre
+como clave, así los cv_url ya registrados en Airtable
+(`/files/<nombre>`) siguen funcionando sin tocarlos. Los que ya están en
+el store con el mismo tamaño se saltan.
+
+Ejecutar desde plataforma_reclutamiento/:
+    BLOB_BACKEND=s3 S3_ENDPOINT_URL=... S3_BUCKET=... \\
+    S3_ACCESS_KEY_ID=... S3_SECRET_ACCESS_KEY=... python scripts/migrate_cvs_to_blobstore.py
+    python scripts/migrate_cvs_to_blobstore.py --source otra/carpeta --dry-run
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api.services.blobs import DEFAULT_BLOB_DIR, CONTENT_TYPES, cv_store
+
+
+async def migrate(source: Path, dry_run: bool) -> int:
+    files = sorted(p for p in source.iterdir()
+                   if p.is_file() and p.suffix.lower() in CONTENT_TYPES and not p.name.startswith("."))
+    print(f"📂 {len(files)} CVs en {source} → store {cv_store.name}")
+
+    copiados = saltados = errores = 0
+    for path in files:
+        existing = await cv_store.stat(path.name)
+        if existing and existing.size == path.stat().st_size:
+            saltados += 1
+            continue
+        if dry_run:
+            print(f"   (dry-run) {path.name}")
+            copiados += 1
+            continue
+        try:
+            await cv_store.put_file(path, key=path.name)
+            copiados += 1
+        except Exception as e:
+            print(f"   ❌ {path.name}: {e}")
+            errores += 1
+
+    await cv_store.close()
+    print(f"✅ Copiados: {copiados}   Ya estaban: {saltados}   Errores: {errores}")
+    return 1 if errores else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", type=Path, default=DEFAULT_BLOB_DIR, help="Directorio con los CVs")
+    parser.add_argument("--dry-run", action="store_true", help="Solo listar lo que se copiaría")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(migrate(args.source, args.dry_run)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """
-Script para subir CVs locales a Airtable como attachments.
+Script para subir CVs del store (BLOB_BACKEND) a Airtable como attachments.
 Los sube a catbox.moe primero y luego Airtable los descarga.
 """
 
@@ -9,7 +9,11 @@ import sys
 import httpx
 import asyncio
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api.services.blobs import cv_store, key_from_url
 
 # Configuración desde variables de entorno
 API_KEY = os.getenv("AIRTABLE_API_KEY", "")
@@ -26,10 +30,7 @@ HEADERS = {
     "Content-Type": "application/json"
 }
 
-CVS_DIR = Path(__file__).parent.parent / "data" / "cvs"
-
-
-async def upload_to_catbox(file_path: Path) -> Optional[str]:
+async def upload_to_catbox(file_path: Path, filename: str) -> Optional[str]:
     """Sube archivo a catbox.moe y retorna URL pública."""
     try:
         async with httpx.AsyncClient(timeout=120.0) as client:
@@ -38,7 +39,7 @@ async def upload_to_catbox(file_path: Path) -> Optional[str]:
             
             files = {
                 'reqtype': (None, 'fileupload'),
-                'fileToUpload': (file_path.name, content, 'application/pdf')
+                'fileToUpload': (filename, content, 'application/pdf')
             }
             
             response = await client.post(
@@ -90,27 +91,29 @@ async def update_candidato_cv(record_id: str, cv_url: str):
         return response.status_code == 200
 
 
-def find_cv_for_candidato(nombre: str, tracking: str) -> Optional[Path]:
-    """Busca el CV local que corresponde al candidato."""
-    if not CVS_DIR.exists():
-        return None
+def find_cv_for_candidato(nombre: str, tracking: str, cv_url: str, keys: List[str]) -> Optional[str]:
+    """Busca en el store la clave del CV que corresponde al candidato."""
+    # El cv_url de la API apunta directo al blob
+    key = key_from_url(cv_url) if cv_url else None
+    if key in keys:
+        return key
     
-    # Buscar por tracking code
+    # Buscar por tracking code (nombres anteriores: TRACKING_Nombre.pdf)
     if tracking:
-        for f in CVS_DIR.glob(f"*{tracking}*"):
-            if f.suffix.lower() == '.pdf':
-                return f
+        for k in keys:
+            if tracking in k and k.lower().endswith('.pdf'):
+                return k
     
     # Buscar por nombre
     nombre_parts = nombre.lower().replace(" ", "_").split("_")
-    for f in CVS_DIR.iterdir():
-        if f.suffix.lower() != '.pdf':
+    for k in keys:
+        if not k.lower().endswith('.pdf'):
             continue
-        fname_lower = f.name.lower()
+        fname_lower = k.lower()
         # Si al menos 2 partes del nombre coinciden
         matches = sum(1 for part in nombre_parts if part in fname_lower)
         if matches >= 2:
-            return f
+            return k
     
     return None
 
@@ -125,9 +128,9 @@ async def main():
     candidatos = await get_candidatos()
     print(f"   Encontrados: {len(candidatos)} candidatos")
     
-    # Listar CVs locales
-    cvs_locales = list(CVS_DIR.glob("*.pdf")) if CVS_DIR.exists() else []
-    print(f"   CVs locales: {len(cvs_locales)} archivos")
+    # Listar CVs del store
+    cv_keys = await cv_store.list_keys()
+    print(f"   CVs en el store ({cv_store.name}): {len(cv_keys)} archivos")
     
     subidos = 0
     errores = 0
@@ -149,19 +152,21 @@ async def main():
             ya_tienen += 1
             continue
         
-        # Buscar CV local
-        cv_local = find_cv_for_candidato(nombre, tracking)
+        # Buscar CV en el store
+        cv_key = find_cv_for_candidato(nombre, tracking, fields.get("cv_url", ""), cv_keys)
         
-        if not cv_local:
+        if not cv_key:
             print(f"⚠️  {nombre}: Sin CV local encontrado")
             sin_cv += 1
             continue
         
         print(f"📤 {nombre}:")
-        print(f"   Archivo: {cv_local.name}")
+        print(f"   Archivo: {cv_key}")
         
-        # Subir a catbox
-        public_url = await upload_to_catbox(cv_local)
+        # Subir a catbox (desde el archivo local o la copia en caché del store)
+        cv_local = await cv_store.local_path(cv_key)
+        nombre_archivo = cv_key if not tracking else f"{tracking}_{nombre.replace(' ', '_')}.pdf"
+        public_url = await upload_to_catbox(cv_local, nombre_archivo)
         
         if not public_url:
             print(f"   ❌ Error subiendo a catbox")
@@ -192,6 +197,8 @@ async def main():
     print(f"   ⚠️  Sin CV local: {sin_cv}")
     print(f"   ❌ Errores: {errores}")
     print("=" * 60)
+    
+    await cv_store.close()
 
 
 if __name__ == "__main__":
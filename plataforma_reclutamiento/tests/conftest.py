@@ -0,0 +1,75 @@
+"""
+Fixtures compartidas de los tests.
+
+Ejecutar desde plataforma_reclutamiento/:
+    python -m pytest -q
+
+Los tests de la API corren in-process (TestClient) contra el stub de
+Airtable de `benchmarks/airtable_stub.py`, sin red ni credenciales.
+"""
+
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+BENCHMARKS = ROOT / "benchmarks"
+for path in (ROOT, BENCHMARKS):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+# Antes de importar la app: sin warm-up en segundo plano ni logs por request
+os.environ.setdefault("WARMUP_STEPS", "none")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+
+@pytest.fixture(scope="session")
+def airtable_stub() -> str:
+    """Stub de Airtable en un thread; la API apunta a él. Retorna su URL."""
+    from load_test import STUB_BASE_ID, start_stub
+
+    url = start_stub(SimpleNamespace(seed=10, latency_ms=0, jitter_ms=0, rate_limit=0))
+    os.environ.update({
+        "AIRTABLE_API_URL": f"{url}/v0",
+        "AIRTABLE_API_KEY": "stub",
+        "AIRTABLE_BASE_ID": STUB_BASE_ID
+    })
+    return url
+
+
+@pytest.fixture
+def stub_table(airtable_stub):
+    """Crea registros en una tabla del stub y los borra al terminar."""
+    import httpx
+
+    from load_test import STUB_BASE_ID
+
+    created = []
+    with httpx.Client(base_url=f"{airtable_stub}/v0/{STUB_BASE_ID}") as stub:
+        def create(table: str, fields: dict) -> str:
+            record = stub.post(f"/{table}", json={"records": [{"fields": fields}]}).json()["records"][0]
+            created.append((table, record["id"]))
+            return record["id"]
+
+        yield create
+        for table, record_id in created:
+            stub.delete(f"/{table}/{record_id}")
+
+
+@pytest.fixture
+def client(airtable_stub):
+    """TestClient de la app (con lifespan) apuntando al stub."""
+    from fastapi.testclient import TestClient
+
+    from api.main import app
+    from api.services.airtable import reference_cache
+    from api.services.container import services
+
+    services.reset()
+    reference_cache.clear()
+    with TestClient(app) as test_client:
+        yield test_client
+    services.reset()
@@ -0,0 +1,104 @@
+"""
+Detección de empresas conocidas (Aho-Corasick por tokens) y tier de
+industria del evaluador, con el fallback por keywords.
+"""
+
+import pytest
+
+from engine.companies import CompanyIndex, normalize_company_name
+from engine.evaluator import CandidateEvaluator
+from engine.models import IndustryTier
+
+KNOWLEDGE = {
+    "Banco Santander": {"desc": "Banco", "tier": "Banking"},
+    "Santander": {"desc": "Grupo", "tier": "Banking"},
+    "Santander Consumer Finance": {"desc": "Créditos", "tier": "Fintech"},
+    "Redpath Chilena Ltda": {"desc": "Minería", "tier": "Mining"},
+    "Zippy SpA": {"desc": "Software", "tier": "Tech", "aliases": ["Zippy Chile"]},
+    "Sociedad Anónima Los Andes": {"desc": "Retail", "tier": "Retail"},
+}
+
+
+@pytest.fixture(scope="module")
+def index():
+    return CompanyIndex(KNOWLEDGE)
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("Redpath Chilena Ltda", ("redpath", "chilena")),
+    ("ZIPPY SPA", ("zippy",)),
+    ("Empresa Sociedad Anónima", ("empresa",)),
+    ("Foo S.A.C.", ("foo",)),
+    ("Acme y Cía Ltda", ("acme",)),       # sufijos encadenados
+    ("Minera Escondida S.A.", ("minera", "escondida")),
+    ("SA", ("sa",)),                      # solo sufijo: se conserva
+])
+def test_normalize_strips_legal_suffixes(name, expected):
+    assert normalize_company_name(name) == expected
+
+
+def test_overlapping_names_are_all_found(index):
+    found = index.find("Trabajé en Banco Santander Consumer Finance entre 2019 y 2022.")
+
+    assert list(found) == ["Banco Santander", "Santander", "Santander Consumer Finance"]
+    assert found["Santander Consumer Finance"].tier == "Fintech"
+
+
+def test_legal_suffix_and_aliases_match(index):
+    found = index.find("REDPATH CHILENA S.A. (2015-2018)\nLuego en Zippy Chile como analista.")
+
+    assert list(found) == ["Redpath Chilena Ltda", "Zippy SpA"]
+
+
+def test_prefix_of_a_name_is_not_a_match(index):
+    assert index.find("Banco de Chile, Redpath, Zippyland") == {}
+
+
+def test_suffix_inside_a_name_is_kept(index):
+    # "Sociedad Anónima" al inicio no es sufijo: el nombre completo es el patrón
+    assert list(index.find("Cajera en Sociedad Anónima Los Andes")) == ["Sociedad Anónima Los Andes"]
+    assert index.find("Cajera en Los Andes") == {}
+
+
+def test_empty_index():
+    assert len(CompanyIndex()) == 0
+    assert CompanyIndex().find("Banco Santander") == {}
+
+
+# =============================================================================
+# Tier de industria
+# =============================================================================
+
+@pytest.fixture(scope="module")
+def evaluator(index):
+    return CandidateEvaluator(company_index=index)
+
+
+def tier(evaluator: CandidateEvaluator, text: str) -> IndustryTier:
+    return evaluator.evaluate_record(text).inference.industry_tier
+
+
+def test_company_tier_wins_over_keywords(evaluator):
+    # Empresa Tech conocida: las keywords tradicionales no cambian el tier
+    assert tier(evaluator, "Analista en Zippy Chile, proyectos de minería.") == IndustryTier.TECH
+    assert tier(evaluator, "Jefe de turno en Redpath Chilena, empresa de software.") == IndustryTier.TRADITIONAL
+
+
+def test_keywords_fallback_when_companies_have_no_tier(evaluator):
+    # Empresas conocidas pero sin tier de industria (Banking): se usan las keywords
+    assert tier(evaluator, "Analista en Banco Santander, equipo fintech de pagos.") == IndustryTier.FINTECH
+    assert tier(evaluator, "Analista en Banco Santander, área de software.") == IndustryTier.TECH
+    assert tier(evaluator, "Analista en Banco Santander.") == IndustryTier.GENERAL
+
+
+def test_keywords_fallback_without_companies(evaluator):
+    assert tier(evaluator, "Contadora en una startup de logística.") == IndustryTier.TECH
+    assert tier(evaluator, "Administrativa en empresa de construcción.") == IndustryTier.TRADITIONAL
+    assert tier(evaluator, "Administrativa en empresa familiar.") == IndustryTier.GENERAL
+
+
+def test_explicit_company_context(evaluator):
+    context = {"Santander Consumer Finance": CompanyIndex(KNOWLEDGE).companies["Santander Consumer Finance"]}
+
+    record = evaluator.evaluate_record("Analista de cobranzas.", company_context=context)
+    assert record.inference.industry_tier == IndustryTier.FINTECH
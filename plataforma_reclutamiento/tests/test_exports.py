@@ -0,0 +1,36 @@
+"""
+Filtro por rango de fechas del export analítico (fórmula de Airtable).
+"""
+
+import pytest
+
+from api.services.exports import date_range_filter
+
+
+def test_no_range_means_no_filter():
+    assert date_range_filter() is None
+    assert date_range_filter("", None) is None
+
+
+def test_inclusive_range():
+    assert date_range_filter("2024-01-01", "2024-03-31") == (
+        "AND({fecha_postulacion}, "
+        "NOT(IS_BEFORE({fecha_postulacion}, '2024-01-01')), "
+        "NOT(IS_AFTER({fecha_postulacion}, '2024-03-31')))"
+    )
+
+
+def test_open_ended_range():
+    assert date_range_filter(hasta="2024-03-31") == (
+        "AND({fecha_postulacion}, NOT(IS_AFTER({fecha_postulacion}, '2024-03-31')))"
+    )
+
+
+@pytest.mark.parametrize("desde, hasta, campo", [
+    ("2024-13-01", None, "desde"),
+    (None, "ayer", "hasta"),
+    ("2024-01-01') OR TRUE() OR ('", None, "desde"),
+])
+def test_invalid_dates_raise_value_error(desde, hasta, campo):
+    with pytest.raises(ValueError, match=f"Fecha inválida en '{campo}'"):
+        date_range_filter(desde, hasta)
@@ -0,0 +1,187 @@
+"""
+Servir CVs: rangos, validadores de caché (ETag, If-Range, 304) y claves
+de blob inválidas.
+"""
+
+import asyncio
+import hashlib
+
+import pytest
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+
+from api.services.blobs import BlobNotFound, LocalBlobStore, check_key
+from api.services.file_serving import RangeNotSatisfiable, parse_range, serve_blob
+
+CONTENT = bytes(range(256)) * 40  # 10240 bytes
+
+
+# =============================================================================
+# parse_range
+# =============================================================================
+
+@pytest.mark.parametrize("header, expected", [
+    (None, None),
+    ("", None),
+    ("bytes=0-99", (0, 99)),
+    ("bytes=100-", (100, 999)),          # abierto: hasta el final
+    ("bytes=-100", (900, 999)),          # sufijo: los últimos 100
+    ("bytes=-5000", (0, 999)),           # sufijo más largo que el archivo
+    ("bytes=900-5000", (900, 999)),      # fin recortado al tamaño
+    ("bytes=999-999", (999, 999)),
+    ("bytes=0-99,200-299", None),        # varios tramos → 200 completo
+    ("bytes=50-10", None),               # fin antes del inicio: inválido
+    ("bytes=-", None),
+    ("items=0-99", None),
+    ("bytes=abc-", None),
+])
+def test_parse_range(header, expected):
+    assert parse_range(header, 1000) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=1000-", "bytes=5000-6000", "bytes=-0"])
+def test_parse_range_unsatisfiable(header):
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range(header, 1000)
+
+
+# =============================================================================
+# check_key
+# =============================================================================
+
+@pytest.mark.parametrize("key", ["", "..", "../secreto.pdf", ".oculto", "a/b.pdf", "a\\b.pdf", "cv\x00.pdf"])
+def test_check_key_rejects_paths(key):
+    with pytest.raises(ValueError):
+        check_key(key)
+
+
+@pytest.mark.parametrize("key", ["cv_juan.pdf", f"{'a' * 64}.pdf", "a..b.pdf"])
+def test_check_key_accepts_plain_names(key):
+    assert check_key(key) == key
+
+
+# =============================================================================
+# serve_blob
+# =============================================================================
+
+@pytest.fixture
+def store(tmp_path):
+    return LocalBlobStore(tmp_path / "cvs")
+
+
+@pytest.fixture
+def key(store):
+    async def put():
+        async def chunks():
+            yield CONTENT
+        return (await store.put_stream(chunks(), ext=".pdf")).key
+
+    return asyncio.run(put())
+
+
+@pytest.fixture
+def client(store):
+    app = FastAPI()
+
+    @app.api_route("/files/{key}", methods=["GET", "HEAD"])
+    async def files(key: str, request: Request):
+        try:
+            return await serve_blob(request, store, key)
+        except BlobNotFound:
+            raise HTTPException(status_code=404)
+
+    return TestClient(app)
+
+
+def test_full_download(client, key):
+    response = client.get(f"/files/{key}")
+
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert response.headers["etag"] == f'"{hashlib.sha256(CONTENT).hexdigest()}"'
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["content-type"] == "application/pdf"
+    assert response.headers["cache-control"] == "private, max-age=31536000, immutable"
+
+
+def test_legacy_key_is_revalidated(client, store):
+    async def put():
+        async def chunks():
+            yield b"%PDF-1.4 anterior"
+        await store.put_stream(chunks(), key="cv_juan.pdf")
+
+    asyncio.run(put())
+    response = client.get("/files/cv_juan.pdf")
+
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "private, no-cache"
+    assert response.headers["etag"] == f'"{hashlib.sha256(b"%PDF-1.4 anterior").hexdigest()}"'
+
+
+def test_head_has_length_without_body(client, key):
+    response = client.head(f"/files/{key}")
+
+    assert response.status_code == 200
+    assert response.headers["content-length"] == str(len(CONTENT))
+    assert response.content == b""
+
+
+@pytest.mark.parametrize("header, start, end", [
+    ("bytes=0-99", 0, 99),
+    ("bytes=10000-", 10000, len(CONTENT) - 1),
+    ("bytes=-240", len(CONTENT) - 240, len(CONTENT) - 1),
+])
+def test_range_returns_206(client, key, header, start, end):
+    response = client.get(f"/files/{key}", headers={"Range": header})
+
+    assert response.status_code == 206
+    assert response.content == CONTENT[start:end + 1]
+    assert response.headers["content-range"] == f"bytes {start}-{end}/{len(CONTENT)}"
+    assert response.headers["content-length"] == str(end - start + 1)
+
+
+def test_multiple_ranges_return_full_content(client, key):
+    response = client.get(f"/files/{key}", headers={"Range": "bytes=0-9,20-29"})
+
+    assert response.status_code == 200
+    assert response.content == CONTENT
+
+
+def test_unsatisfiable_range_returns_416(client, key):
+    response = client.get(f"/files/{key}", headers={"Range": f"bytes={len(CONTENT)}-"})
+
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(CONTENT)}"
+
+
+def test_if_none_match_returns_304(client, key):
+    etag = client.get(f"/files/{key}").headers["etag"]
+
+    for header in (etag, f"W/{etag}", f'"otro", {etag}', "*"):
+        response = client.get(f"/files/{key}", headers={"If-None-Match": header})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    assert client.get(f"/files/{key}", headers={"If-None-Match": '"otro"'}).status_code == 200
+
+
+def test_if_range(client, key):
+    first = client.get(f"/files/{key}")
+    etag, last_modified = first.headers["etag"], first.headers["last-modified"]
+
+    # Validador vigente (ETag o fecha): se sirve el tramo
+    for validator in (etag, last_modified):
+        response = client.get(f"/files/{key}", headers={"Range": "bytes=0-9", "If-Range": validator})
+        assert response.status_code == 206
+        assert response.content == CONTENT[:10]
+
+    # Validador viejo: el archivo cambió, se ignora el Range
+    response = client.get(f"/files/{key}", headers={"Range": "bytes=0-9", "If-Range": '"viejo"'})
+    assert response.status_code == 200
+    assert response.content == CONTENT
+
+
+@pytest.mark.parametrize("bad_key", ["..%2F..%2Fetc%2Fpasswd", "..", ".oculto", "no-existe.pdf"])
+def test_invalid_or_missing_keys_are_404(client, key, bad_key):
+    assert client.get(f"/files/{bad_key}").status_code == 404
@@ -0,0 +1,49 @@
+"""
+Niveles por defecto del logging: las URLs de httpx (con los emails de los
+filtros de Airtable) no salen en INFO.
+"""
+
+import io
+import json
+import logging
+
+import pytest
+
+from api.services import logging_setup
+
+
+@pytest.fixture
+def configure():
+    stream = io.StringIO()
+
+    def apply(**kwargs):
+        logging_setup.configure_logging(fmt="json", level="INFO", debug_rate=0, stream=stream, **kwargs)
+        return stream
+
+    yield apply
+    logging_setup.shutdown_logging()
+    for name in logging_setup.DEFAULT_LEVELS:
+        logging.getLogger(name).setLevel(logging.NOTSET)
+
+
+def lines(stream: io.StringIO):
+    logging_setup.shutdown_logging()  # vacía la cola
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_httpx_urls_not_logged_at_info(configure):
+    stream = configure(levels={})
+    url = "https://api.airtable.com/v0/app/Usuarios?filterByFormula=%7Bemail%7D%3D%27ana%40mail.cl%27"
+    logging.getLogger("httpx").info("HTTP Request: GET %s", url)
+    logging.getLogger("httpcore.connection").info("connect_tcp.started")
+    logging.getLogger("httpx").warning("retry")
+    logging.getLogger("api.test").info("ok")
+
+    assert [(r["logger"], r["msg"]) for r in lines(stream)] == [("httpx", "retry"), ("api.test", "ok")]
+
+
+def test_log_levels_override_defaults(configure):
+    stream = configure(levels={"httpx": "INFO"})
+    logging.getLogger("httpx").info("HTTP Request: GET /v0")
+
+    assert [r["logger"] for r in lines(stream)] == ["httpx"]
@@ -0,0 +1,99 @@
+"""
+Scrape de GET /metrics (exportador Prometheus) tras un request a la API.
+"""
+
+import asyncio
+import re
+
+import pytest
+
+pytest.importorskip("prometheus_client")
+
+
+def series(body: str, name: str):
+    """Líneas de la serie `name` como (labels, valor)."""
+    pattern = re.compile(rf"^{name}\{{(.*)\}} (\S+)$")
+    rows = []
+    for line in body.splitlines():
+        match = pattern.match(line)
+        if match:
+            labels = dict(re.findall(r'(\w+)="([^"]*)"', match.group(1)))
+            rows.append((labels, float(match.group(2))))
+    return rows
+
+
+def test_scrape_after_api_request(client):
+    response = client.get("/api/candidates/", params={"limit": 5})
+    assert response.status_code == 200
+
+    scrape = client.get("/metrics")
+    assert scrape.status_code == 200
+    assert scrape.headers["content-type"].startswith("text/plain")
+    body = scrape.text
+
+    assert "# TYPE neat_http_request_duration_seconds histogram" in body
+    http = series(body, "neat_http_request_duration_seconds_count")
+    assert any(
+        labels == {"method": "GET", "route": "/api/candidates/", "status": "200"} and value >= 1
+        for labels, value in http
+    )
+    # Una serie por template de ruta, nunca por URL concreta
+    assert all("?" not in labels["route"] for labels, _ in http)
+
+    assert "# TYPE neat_airtable_request_duration_seconds histogram" in body
+    airtable = series(body, "neat_airtable_request_duration_seconds_count")
+    assert any(
+        labels == {"table": "Postulaciones", "method": "GET", "status": "200"} and value >= 1
+        for labels, value in airtable
+    )
+    assert "# TYPE neat_airtable_retries_total counter" in body
+
+
+def test_unmatched_routes_share_one_series(client):
+    client.get("/api/no-existe-1")
+    client.get("/api/no-existe-2")
+
+    http = series(client.get("/metrics").text, "neat_http_request_duration_seconds_count")
+    routes = {labels["route"] for labels, _ in http if labels["status"] == "404"}
+    assert routes == {"<unmatched>"}
+
+
+# =============================================================================
+# /api/metrics (agregado por endpoint)
+# =============================================================================
+
+def bearer(rol: str) -> dict:
+    from api.services.sessions import session_store
+
+    token = asyncio.run(session_store.create({
+        "id": f"rec{rol}", "email": f"{rol}@example.com", "nombre_completo": rol, "rol": rol, "activo": True
+    }))
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_endpoint_metrics_require_superadmin(client):
+    assert client.get("/api/metrics").status_code == 401
+    assert client.get("/api/metrics", headers=bearer("admin")).status_code == 403
+
+    response = client.get("/api/metrics", headers=bearer("superadmin"))
+    assert response.status_code == 200
+    assert "endpoints" in response.json()
+
+
+def test_reset_is_a_superadmin_post(client):
+    superadmin = bearer("superadmin")
+    client.get("/api/candidates/", params={"limit": 5})
+
+    # GET no modifica el agregado
+    client.get("/api/metrics", params={"reset": "true"}, headers=superadmin)
+    assert client.get("/api/metrics", headers=superadmin).json()["endpoints"]
+
+    assert client.post("/api/admin/metrics/reset").status_code == 401
+    assert client.post("/api/admin/metrics/reset", headers=bearer("admin")).status_code == 403
+
+    response = client.post("/api/admin/metrics/reset", headers=superadmin)
+    assert response.status_code == 200
+    assert response.json()["endpoints"]
+    # Tras el reset el agregado arranca de cero
+    after = client.get("/api/metrics", headers=superadmin).json()["endpoints"]
+    assert not any("candidates" in name for name in after)
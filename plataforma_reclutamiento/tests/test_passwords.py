@@ -0,0 +1,165 @@
+"""
+Hash de contraseñas: verificación por esquema, migración sha256 → scrypt
+y re-hash en el login (solo para usuarios activos).
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from api.services.passwords import LegacySha256Scheme, PasswordHasher, ScryptScheme
+
+# Parámetros bajos para que los tests sean rápidos
+FAST_N = 2 ** 10
+
+
+def make_hasher(n: int = FAST_N, workers: int = 1) -> PasswordHasher:
+    return PasswordHasher(schemes=(ScryptScheme(n=n), LegacySha256Scheme("sal-de-prueba")), workers=workers)
+
+
+@pytest.fixture
+def hasher():
+    hasher = make_hasher()
+    yield hasher
+    hasher.shutdown()
+
+
+def count_kdf(hasher: PasswordHasher) -> list:
+    """Registra cada scrypt que corre el esquema actual del hasher."""
+    calls = []
+    derive = hasher.default._derive
+
+    def counting(*args):
+        calls.append(args[2])  # n
+        return derive(*args)
+
+    hasher.default._derive = counting
+    return calls
+
+
+def verify(hasher: PasswordHasher, password: str, stored):
+    return asyncio.run(hasher.verify(password, stored))
+
+
+def test_scrypt_roundtrip(hasher):
+    stored = hasher.hash_sync("correcta")
+
+    assert stored.startswith(f"$scrypt$n={FAST_N},r=8,p=1$")
+    assert verify(hasher, "correcta", stored) == (True, False)
+    assert verify(hasher, "incorrecta", stored) == (False, False)
+    # Salt aleatorio: dos hashes de la misma contraseña difieren
+    assert hasher.hash_sync("correcta") != stored
+
+
+def test_legacy_sha256_is_upgraded_to_scrypt(hasher):
+    legacy = LegacySha256Scheme("sal-de-prueba").hash("correcta")
+
+    calls = count_kdf(hasher)
+    assert verify(hasher, "correcta", legacy) == (True, True)
+    # verify solo marca el hash; el re-hash no corre en el camino del login
+    assert calls == []
+
+    new_hash = asyncio.run(hasher.hash("correcta"))
+    assert new_hash.startswith("$scrypt$")
+    assert verify(hasher, "correcta", new_hash) == (True, False)
+    # Con contraseña incorrecta no hay re-hash
+    assert verify(hasher, "incorrecta", legacy) == (False, False)
+    assert hasher.counts["sha256"] == 2
+
+
+def test_needs_update_when_scrypt_params_are_raised(hasher):
+    stored = hasher.hash_sync("correcta")
+    stronger = make_hasher(n=FAST_N * 2)
+    try:
+        assert not hasher.default.needs_update(stored)
+        assert stronger.default.needs_update(stored)
+        assert not stronger.default.needs_update(stronger.hash_sync("correcta"))
+
+        assert verify(stronger, "correcta", stored) == (True, True)
+        assert asyncio.run(stronger.hash("correcta")).startswith(f"$scrypt$n={FAST_N * 2},")
+    finally:
+        stronger.shutdown()
+
+
+@pytest.mark.parametrize("stored", [None, "", "no-es-un-hash"])
+def test_unknown_user_runs_dummy_hash(hasher, stored):
+    assert verify(hasher, "cualquiera", stored) == (False, False)
+    # La verificación de usuarios inexistentes usa un hash de relleno del esquema actual
+    assert hasher._dummy.startswith("$scrypt$")
+    assert hasher.counts == {}
+
+
+def test_every_failed_login_costs_one_kdf(hasher):
+    scrypt_hash = hasher.hash_sync("correcta")
+    legacy = LegacySha256Scheme("sal-de-prueba").hash("correcta")
+    verify(hasher, "x", None)  # calcula el hash de relleno
+    calls = count_kdf(hasher)
+
+    for stored in (None, "no-es-un-hash", legacy, scrypt_hash):
+        calls.clear()
+        assert verify(hasher, "incorrecta", stored) == (False, False)
+        # Inexistente, sin hash, sha256 o scrypt: el mismo trabajo
+        assert calls == [FAST_N], stored
+
+
+# =============================================================================
+# Re-hash en el login
+# =============================================================================
+
+@pytest.fixture
+def stub_user(airtable_stub, stub_table):
+    """Crea un usuario con hash sha256 viejo. Retorna (id, contraseña, hash)."""
+    from api.services.passwords import password_hasher
+    from api.services.users import user_cache
+
+    legacy = next(s for s in password_hasher.schemes if isinstance(s, LegacySha256Scheme))
+
+    def create(email: str, activo: bool):
+        stored = legacy.hash("clave-vieja")
+        user_id = stub_table("Usuarios", {
+            "email": email, "nombre_completo": "Prueba", "rol": "admin",
+            "activo": activo, "password_hash": stored
+        })
+        return user_id, "clave-vieja", stored
+
+    user_cache.clear()
+    yield create
+    user_cache.clear()
+
+
+def stored_hash(airtable_stub, user_id: str) -> str:
+    from load_test import STUB_BASE_ID
+
+    record = httpx.get(f"{airtable_stub}/v0/{STUB_BASE_ID}/Usuarios/{user_id}").json()
+    return record["fields"]["password_hash"]
+
+
+def wait_background_tasks():
+    from api.routes.auth import _background_tasks
+
+    deadline = time.monotonic() + 5
+    while _background_tasks and time.monotonic() < deadline:
+        time.sleep(0.02)
+
+
+def test_login_upgrades_legacy_hash(client, airtable_stub, stub_user):
+    user_id, password, legacy = stub_user("activo@example.com", activo=True)
+
+    response = client.post("/api/auth/login", json={"email": "activo@example.com", "password": password})
+    assert response.status_code == 200
+    wait_background_tasks()
+
+    assert stored_hash(airtable_stub, user_id).startswith("$scrypt$")
+
+
+def test_inactive_user_hash_is_not_upgraded(client, airtable_stub, stub_user):
+    user_id, password, legacy = stub_user("inactivo@example.com", activo=False)
+
+    response = client.post("/api/auth/login", json={"email": "inactivo@example.com", "password": password})
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Usuario desactivado"
+    wait_background_tasks()
+
+    assert stored_hash(airtable_stub, user_id) == legacy
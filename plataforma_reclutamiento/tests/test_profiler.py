@@ -0,0 +1,112 @@
+"""
+Profiling de requests: la respuesta perfilada sigue en streaming, conserva
+los headers repetidos y el profile se cierra al terminar el stream.
+"""
+
+import asyncio
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+from starlette.responses import StreamingResponse
+
+from api.services.profiler import RequestProfiler, _ProfiledBody
+
+
+@pytest.fixture
+def profiler(tmp_path):
+    return RequestProfiler(directory=tmp_path, sample_rate=1.0)
+
+
+def make_request(path: str = "/api/export") -> Request:
+    return Request({"type": "http", "method": "GET", "path": path, "query_string": b"", "headers": []})
+
+
+def test_streaming_body_is_not_buffered(profiler, tmp_path):
+    sent = []
+
+    async def chunks():
+        for i in range(3):
+            sent.append(i)
+            yield f"fila {i}\n".encode()
+
+    async def call_next(request):
+        return StreamingResponse(chunks(), media_type="text/csv")
+
+    async def scenario():
+        response = await profiler.profile(make_request(), call_next, reason="sampled")
+        # Se retorna la misma respuesta, sin leer el body
+        assert isinstance(response, StreamingResponse)
+        assert isinstance(response.body_iterator, _ProfiledBody)
+        assert sent == []
+        assert profiler._busy.locked()
+        assert list(tmp_path.glob("*.json")) == []
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        return response, body
+
+    response, body = asyncio.run(scenario())
+
+    assert body == b"fila 0\nfila 1\nfila 2\n"
+    assert not profiler._busy.locked()
+    [meta_path] = tmp_path.glob("*.json")
+    meta = json.loads(meta_path.read_text())
+    assert meta["id"] == response.headers["x-profile-id"]
+    assert meta["status"] == 200
+
+
+def test_stream_cut_short_closes_profile(profiler, tmp_path):
+    async def chunks():
+        while True:
+            yield b"x" * 1024
+
+    async def call_next(request):
+        return StreamingResponse(chunks())
+
+    async def scenario():
+        response = await profiler.profile(make_request(), call_next, reason="sampled")
+        await response.body_iterator.__anext__()
+        await response.body_iterator.aclose()  # el cliente se desconectó
+
+    asyncio.run(scenario())
+
+    assert not profiler._busy.locked()
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+
+def test_error_in_handler_releases_profiler(profiler, tmp_path):
+    async def call_next(request):
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(profiler.profile(make_request(), call_next, reason="sampled"))
+
+    assert not profiler._busy.locked()
+    assert json.loads(next(tmp_path.glob("*.json")).read_text())["status"] == 500
+
+
+def test_repeated_headers_are_kept(profiler):
+    app = FastAPI()
+
+    @app.get("/api/login")
+    async def login():
+        response = StreamingResponse(iter([b"ok"]))
+        response.set_cookie("session", "abc")
+        response.set_cookie("csrf", "xyz")
+        return response
+
+    @app.middleware("http")
+    async def profile_everything(request, call_next):
+        return await profiler.profile(request, call_next, reason="sampled")
+
+    response = TestClient(app).get("/api/login")
+
+    assert response.status_code == 200
+    assert response.content == b"ok"
+    assert response.headers.get_list("set-cookie") == [
+        "session=abc; Path=/; SameSite=lax",
+        "csrf=xyz; Path=/; SameSite=lax"
+    ]
+    assert response.headers["x-profile-id"]
@@ -0,0 +1,92 @@
+"""
+Caché de reportes PDF: una generación por fingerprint y estado interno
+(locks, candidato → proceso) acotado a los reportes vigentes.
+"""
+
+import asyncio
+
+import pytest
+
+from api.services import pdf_generator
+from api.services.report_cache import ReportCache, ReportData
+
+
+@pytest.fixture
+def generated(monkeypatch):
+    """Reemplaza el render del PDF por uno instantáneo; registra cada generación."""
+    calls = []
+
+    async def fake_pdf(proceso, candidatos, evaluaciones, comentarios):
+        calls.append(proceso["id"])
+        await asyncio.sleep(0.01)
+        return f"%PDF {proceso['id']} {len(candidatos)}".encode()
+
+    monkeypatch.setattr(pdf_generator, "generate_proceso_pdf", fake_pdf)
+    return calls
+
+
+def report(proceso_id: str, *candidatos: str) -> ReportData:
+    return ReportData(
+        proceso={"id": proceso_id, "codigo_proceso": proceso_id.upper()},
+        candidatos=[{"id": c, "codigo_tracking": f"TRK-{c}", "estado_candidato": "nuevo"} for c in candidatos],
+        evaluaciones={},
+        comentarios={}
+    )
+
+
+def test_concurrent_requests_generate_once(tmp_path, generated):
+    cache = ReportCache(directory=tmp_path, refresh_delay=0)
+
+    async def scenario():
+        return await asyncio.gather(*(cache.get_or_generate(report("recP1", "recC1")) for _ in range(5)))
+
+    results = asyncio.run(scenario())
+
+    assert generated == ["recP1"]
+    assert len(set(results)) == 1
+    assert cache._locks == {}
+
+
+def test_locks_are_dropped_after_use(tmp_path, generated):
+    cache = ReportCache(directory=tmp_path, refresh_delay=0)
+
+    async def scenario():
+        for i in range(20):
+            await cache.get_or_generate(report(f"recP{i}", f"recC{i}"))
+
+    asyncio.run(scenario())
+
+    assert len(generated) == 20
+    assert cache._locks == {}
+
+
+def test_owners_follow_the_current_report(tmp_path, generated):
+    cache = ReportCache(directory=tmp_path, refresh_delay=0)
+
+    async def scenario():
+        await cache.get_or_generate(report("recP1", "recC1", "recC2"))
+        await cache.get_or_generate(report("recP2", "recC3"))
+        # Nueva versión de P1: recC2 salió del proceso y entró recC4
+        await cache.get_or_generate(report("recP1", "recC1", "recC4"))
+
+    asyncio.run(scenario())
+
+    assert cache._owners == {
+        "recC1": "recP1", "TRK-recC1": "recP1",
+        "recC4": "recP1", "TRK-recC4": "recP1",
+        "recC3": "recP2", "TRK-recC3": "recP2",
+    }
+    assert [p.name.split("-")[0] for p in tmp_path.glob("*.pdf")].count("recP1") == 1
+
+
+def test_candidate_moved_to_other_proceso_keeps_new_owner(tmp_path, generated):
+    cache = ReportCache(directory=tmp_path, refresh_delay=0)
+
+    async def scenario():
+        await cache.get_or_generate(report("recP1", "recC1", "recC2"))
+        await cache.get_or_generate(report("recP2", "recC2"))
+        await cache.get_or_generate(report("recP1", "recC1"))
+
+    asyncio.run(scenario())
+
+    assert cache._owners["recC2"] == "recP2"
@@ -0,0 +1,128 @@
+"""
+Seccionador de CVs: encabezados, cargos por rango de fechas y máscara de
+experiencia reciente sobre textos de ejemplo.
+"""
+
+from datetime import date
+
+import pytest
+
+from engine.sections import EXPERIENCE, OTHER, PROFILE, _heading_kind, sectionize
+from engine.text_index import TextIndex, compile_phrase
+
+
+def tokens(line: str):
+    return tuple(TextIndex(line).tokens)
+
+
+@pytest.mark.parametrize("line, kind", [
+    ("EXPERIENCIA LABORAL", EXPERIENCE),
+    ("Experiencia Profesional", EXPERIENCE),
+    ("Work Experience", EXPERIENCE),
+    ("Experiencia laboral Educación", EXPERIENCE),       # dos columnas
+    ("Experiencia profesional Chile y México", EXPERIENCE),
+    ("Educación", OTHER),
+    ("Formación Académica", OTHER),
+    ("Idiomas", OTHER),
+    ("Perfil Profesional", PROFILE),
+    ("10 años de experiencia liderando equipos HISTORIAL LABORAL", EXPERIENCE),
+    ("Contador auditor", None),
+    ("Educación de calidad para todos", None),
+    ("", None),
+])
+def test_heading_kind(line, kind):
+    assert _heading_kind(tokens(line)) == kind
+
+
+CV = """María González
+Perfil Profesional
+Contadora con experiencia en cierres contables.
+
+Experiencia Laboral
+Jefa de Contabilidad, Empresa Uno
+Ago 2021 - Actualidad
+Cierre mensual y conciliaciones bancarias.
+
+Analista Contable, Empresa Dos (Mar 2016 – Jul 2019)
+Cuentas por pagar y tesorería.
+
+Asistente Contable, Empresa Tres
+2012 - 2015
+Digitación de facturas.
+
+Educación
+Contador Auditor, Universidad de Chile, 2008 - 2012
+"""
+
+
+@pytest.fixture(scope="module")
+def index():
+    return TextIndex(CV)
+
+
+def test_experience_region_stops_at_next_heading(index):
+    sections = sectionize(index)
+    [(start, end)] = sections.experience
+
+    experience = index.folded[start:end]
+    assert "jefa de contabilidad" in experience
+    assert "digitacion de facturas" in experience
+    assert "universidad" not in experience
+    assert "perfil" not in experience
+
+
+def test_roles_from_date_ranges(index):
+    roles = sectionize(index).roles
+
+    assert [(r.start_year, r.end_year) for r in roles] == [(2021, date.today().year), (2016, 2019), (2012, 2015)]
+    # Fecha sola en su línea: el cargo empieza en la línea del título
+    assert index.folded[roles[0].start:].startswith("jefa de contabilidad")
+    assert index.folded[roles[1].start:].startswith("analista contable")
+    assert index.folded[roles[2].start:].startswith("asistente contable")
+    # Cada cargo termina donde empieza el siguiente
+    assert roles[0].end == roles[1].start and roles[1].end == roles[2].start
+
+
+def test_recent_mask_covers_latest_roles_only(index):
+    sections = index.sections
+    assert sections.from_roles
+
+    def recent(keyword: str) -> bool:
+        return sections.any_recent(index.find(compile_phrase(keyword)))
+
+    assert recent("conciliación bancaria")
+    assert not recent("tesorería")       # terminó en 2019
+    assert not recent("facturas")
+    assert not recent("universidad")
+
+
+def test_cv_without_experience_heading_excludes_other_sections():
+    text = (
+        "Pedro Soto\n"
+        "Analista de Operaciones, Logística Sur\n"
+        "Ene 2020 - Presente\n"
+        "Control de inventario.\n"
+        "Idiomas\n"
+        "Inglés avanzado 2015 - 2018\n"
+    )
+    index = TextIndex(text)
+    sections = sectionize(index)
+
+    assert [(r.start_year, r.end_year) for r in sections.roles] == [(2020, date.today().year)]
+    assert sections.any_recent(index.find(compile_phrase("inventario")))
+    assert not sections.any_recent(index.find(compile_phrase("ingles")))
+
+
+def test_cv_without_dates_falls_back_to_first_fraction():
+    text = "Experiencia\n" + "Gestión de cobranzas. " * 10 + "\nEducación\n" + "Curso de Excel. " * 20
+    index = TextIndex(text)
+    sections = sectionize(index)
+
+    assert not sections.from_roles
+    assert sections.roles == ()
+    assert sections.is_recent(index.first(compile_phrase("cobranza")))
+    assert not sections.is_recent(len(index) - 1)
+
+
+def test_sections_are_cached_with_index(index):
+    assert index.sections is index.sections
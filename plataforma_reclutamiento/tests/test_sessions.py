@@ -0,0 +1,193 @@
+"""
+Backends de sesiones: crear, leer, revocar y vencer en memory, sqlite
+(WAL), redis (contra benchmarks/resp_stub.py) y tokens HS256.
+"""
+
+import asyncio
+import json
+import time
+from datetime import timedelta
+
+import pytest
+
+from api.services.sessions import (
+    MemorySessionStore,
+    RedisSessionStore,
+    SignedTokenSessionStore,
+    SQLiteSessionStore,
+    _b64decode,
+    _b64encode,
+)
+
+USER = {"id": "recUSER1", "email": "ana@example.com", "nombre_completo": "Ana", "rol": "admin", "activo": True}
+SHORT_TTL = timedelta(milliseconds=50)
+
+
+@pytest.fixture(scope="module")
+def redis_url():
+    from resp_stub import start_in_thread
+
+    return start_in_thread()
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis", "token"])
+def make_store(request, tmp_path):
+    """Fábrica del backend (se crea dentro del event loop de cada escenario)."""
+    backend = request.param
+
+    def make(ttl: timedelta = timedelta(hours=1)):
+        if backend == "memory":
+            return MemorySessionStore(ttl=ttl)
+        if backend == "sqlite":
+            return SQLiteSessionStore(tmp_path / "sessions.db", ttl=ttl)
+        if backend == "redis":
+            return RedisSessionStore(request.getfixturevalue("redis_url"), ttl=ttl)
+        return SignedTokenSessionStore("secreto-de-prueba", ttl=ttl)
+
+    make.backend = backend
+    return make
+
+
+def run(scenario):
+    return asyncio.run(scenario())
+
+
+def test_create_and_get(make_store):
+    async def scenario():
+        store = make_store()
+        try:
+            token = await store.create(USER)
+            session = await store.get(token)
+            other = await store.create({**USER, "id": "recUSER2"})
+            return token, session, await store.get(other), await store.get("no-existe")
+        finally:
+            await store.close()
+
+    token, session, other, missing = run(scenario)
+
+    assert token and token != other
+    assert session["user"] == USER
+    assert session["expires_at"].timestamp() > time.time()
+    assert other["user"]["id"] == "recUSER2"
+    assert missing is None
+
+
+def test_delete_revokes(make_store):
+    if make_store.backend == "token":
+        pytest.skip("los tokens firmados no se pueden revocar en el servidor")
+
+    async def scenario():
+        store = make_store()
+        try:
+            token = await store.create(USER)
+            kept = await store.create(USER)
+            await store.delete(token)
+            await store.delete(token)  # idempotente
+            return await store.get(token), await store.get(kept)
+        finally:
+            await store.close()
+
+    revoked, kept = run(scenario)
+
+    assert revoked is None
+    assert kept["user"] == USER
+
+
+def test_expired_session_is_rejected(make_store):
+    async def scenario():
+        store = make_store(ttl=SHORT_TTL)
+        try:
+            token = await store.create(USER)
+            await asyncio.sleep(0.2)
+            return await store.get(token), await store.sweep()
+        finally:
+            await store.close()
+
+    expired, swept = run(scenario)
+
+    assert expired is None
+    if make_store.backend in ("memory", "sqlite"):
+        assert swept == 1
+
+
+def test_sqlite_sessions_shared_between_stores(tmp_path):
+    async def scenario():
+        first = SQLiteSessionStore(tmp_path / "sessions.db")
+        second = SQLiteSessionStore(tmp_path / "sessions.db")
+        try:
+            token = await first.create(USER)
+            shared = await second.get(token)
+            await second.delete(token)
+            return shared, await first.get(token)
+        finally:
+            await first.close()
+            await second.close()
+
+    shared, revoked = run(scenario)
+
+    assert shared["user"] == USER
+    assert revoked is None
+
+
+def test_sqlite_uses_wal(tmp_path):
+    async def scenario():
+        store = SQLiteSessionStore(tmp_path / "sessions.db")
+        try:
+            token = await store.create(USER)
+            mode = await asyncio.to_thread(store._query, "PRAGMA journal_mode")
+            stored = await asyncio.to_thread(store._query, "SELECT token_hash FROM sessions")
+            return token, mode, stored
+        finally:
+            await store.close()
+
+    token, mode, stored = run(scenario)
+
+    assert mode == [("wal",)]
+    # Se guarda el hash del token, no el token
+    assert stored[0][0] != token
+
+
+# =============================================================================
+# Tokens firmados
+# =============================================================================
+
+def signed(secret: str = "secreto-de-prueba", ttl: timedelta = timedelta(hours=1)) -> SignedTokenSessionStore:
+    return SignedTokenSessionStore(secret, ttl=ttl)
+
+
+def test_tampered_payload_is_rejected():
+    store = signed()
+    token = run(lambda: store.create(USER))
+    header, payload, signature = token.split(".")
+
+    data = json.loads(_b64decode(payload))
+    data["user"]["rol"] = "superadmin"
+    forged = f"{header}.{_b64encode(json.dumps(data).encode())}.{signature}"
+
+    assert run(lambda: store.get(token))["user"]["rol"] == "admin"
+    assert run(lambda: store.get(forged)) is None
+
+
+def test_wrong_secret_is_rejected():
+    token = run(lambda: signed("secreto-a").create(USER))
+
+    assert run(lambda: signed("secreto-a").get(token))["user"] == USER
+    assert run(lambda: signed("secreto-b").get(token)) is None
+
+
+def test_alg_none_and_garbage_are_rejected():
+    store = signed()
+    _, payload, _ = run(lambda: store.create(USER)).split(".")
+    none_header = _b64encode(json.dumps({"alg": "none", "typ": "JWT"}).encode())
+
+    for token in (f"{none_header}.{payload}.", "", "a.b", "a.b.c.d", "no-es-un-token"):
+        assert run(lambda: store.get(token)) is None
+
+
+def test_expired_token_with_valid_signature_is_rejected():
+    store = signed(ttl=timedelta(seconds=-1))
+    token = run(lambda: store.create(USER))
+
+    _, payload, _ = token.split(".")
+    assert json.loads(_b64decode(payload))["exp"] < time.time()
+    assert run(lambda: store.get(token)) is None
@@ -0,0 +1,35 @@
+"""
+Arranque en frío: `import api.main` en un proceso nuevo no carga las
+dependencias pesadas ni el motor.
+
+Misma auditoría que `benchmarks/bench_startup.py`. El tiempo de import
+depende de la máquina, así que el presupuesto solo se verifica si se
+pide explícitamente con STARTUP_BUDGET_MS (o con `bench_startup.py
+--budget-ms`).
+"""
+
+import os
+
+import pytest
+
+from bench_startup import HEAVY_MODULES, cold_start
+
+BUDGET_MS = os.getenv("STARTUP_BUDGET_MS")
+
+
+@pytest.fixture(scope="module")
+def warm_pyc():
+    cold_start()  # el primero compila los .pyc
+
+
+def test_heavy_modules_not_imported(warm_pyc):
+    for module in ("pyarrow", "openai", "reportlab", "pdfplumber", "engine.evaluator", "engine.models"):
+        assert module in HEAVY_MODULES
+    assert cold_start()["heavy"] == []
+
+
+@pytest.mark.skipif(not BUDGET_MS, reason="sin STARTUP_BUDGET_MS (el tiempo depende de la máquina)")
+def test_import_within_budget(warm_pyc):
+    # El mejor de los procesos: lo que cuesta el import sin ruido de la máquina
+    import_ms = min(cold_start()["import_ms"] for _ in range(3))
+    assert import_ms <= float(BUDGET_MS), f"import api.main: {import_ms:.0f} ms > {float(BUDGET_MS):.0f} ms"
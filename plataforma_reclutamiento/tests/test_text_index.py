@@ -0,0 +1,100 @@
+"""
+Normalización, stemming y búsqueda de frases del índice de texto de CVs.
+"""
+
+import pytest
+
+from engine.text_index import TextIndex, compile_phrase, fold, stem
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Imputación", "imputacion"),
+    ("CONCILIACIÓN Bancaria", "conciliacion bancaria"),
+    ("Año  Güemes ñandú", "ano  guemes nandu"),
+    ("ﬁnanzas", "finanzas"),     # ligadura (NFKD)
+    ("KPI's", "kpi's"),
+])
+def test_fold(text, expected):
+    assert fold(text) == expected
+
+
+@pytest.mark.parametrize("token, expected", [
+    ("pagos", "pago"),
+    ("pago", "pago"),
+    ("operaciones", "operacion"),
+    ("operacion", "operacion"),
+    ("redes", "red"),
+    ("papeles", "papel"),
+    ("mayores", "mayor"),
+    ("kpis", "kpi"),
+    ("clases", "clase"),         # "s" tras "e" sin consonante n/r/l/d
+    ("proceso", "proceso"),
+    ("stress", "stress"),        # doble s: no es plural
+    ("mes", "mes"),              # tokens cortos no se tocan
+    ("sas", "sas"),
+])
+def test_stem(token, expected):
+    assert stem(token) == expected
+
+
+def test_singular_and_plural_converge():
+    for singular, plural in [("conciliacion", "conciliaciones"), ("cuenta", "cuentas"), ("proveedor", "proveedores")]:
+        assert stem(singular) == stem(plural)
+
+
+def test_compile_phrase():
+    assert compile_phrase("Conciliaciones Bancarias") == ("conciliacion", "bancaria")
+    assert compile_phrase("  Power-BI ") == ("power", "bi")
+    assert compile_phrase("") == ()
+
+
+CV = """Analista Contable
+Responsable de conciliaciones bancarias y cuentas por pagar.
+También preparé reportes de KPIs en Power BI para la gerencia.
+Imputacion de facturas de proveedores (OCR).
+"""
+
+
+@pytest.fixture(scope="module")
+def index():
+    return TextIndex(CV)
+
+
+def test_find_returns_token_positions(index):
+    [start] = index.find(compile_phrase("conciliación bancaria"))
+
+    assert index.tokens[start:start + 2] == ["conciliacion", "bancaria"]
+    assert index.folded[index.offsets[start]:].startswith("conciliaciones bancarias")
+    assert index.first_offset(compile_phrase("conciliación bancaria")) == index.offsets[start]
+
+
+def test_contains_matches_whole_words_only(index):
+    # "bi" está dentro de "también" y "kpi" dentro de "kpis": solo cuentan palabras completas
+    assert index.contains(compile_phrase("BI"))
+    assert index.find(compile_phrase("bi")) == [index.tokens.index("bi")]
+    assert index.contains(compile_phrase("KPI"))
+    assert not index.contains(compile_phrase("gen"))
+    assert not index.contains(compile_phrase("tab"))
+
+
+def test_contains_ignores_accents_and_plurals(index):
+    assert index.contains(compile_phrase("Imputación"))
+    assert index.contains(compile_phrase("cuenta por pagar"))
+    assert index.contains(compile_phrase("Factura de Proveedor"))
+
+
+def test_phrase_tokens_must_be_consecutive(index):
+    assert not index.contains(compile_phrase("bancaria cuenta"))
+    assert not index.contains(compile_phrase("conciliación contable"))
+    assert index.find(()) == []
+    assert index.first(()) is None
+
+
+def test_any_of(index):
+    assert index.any_of([compile_phrase("SAP"), compile_phrase("Power BI")])
+    assert not index.any_of([compile_phrase("SAP"), compile_phrase("Oracle")])
+
+
+def test_for_text_reuses_index():
+    assert TextIndex.for_text(CV) is TextIndex.for_text(CV)
+    assert TextIndex.for_text(CV) is not TextIndex.for_text(CV + " ")
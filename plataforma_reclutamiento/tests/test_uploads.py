@@ -0,0 +1,101 @@
+"""
+Límite de tamaño de las subidas de CV: por Content-Length, contando bytes
+en subidas sin Content-Length y al copiar el archivo al store.
+"""
+
+import pytest
+from fastapi import FastAPI, File, HTTPException, UploadFile
+from fastapi.testclient import TestClient
+
+from api.services.blobs import LocalBlobStore
+from api.services.uploads import UploadSizeLimitMiddleware, UploadTooLarge, save_upload
+
+LIMIT = 64 * 1024
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LocalBlobStore(tmp_path)
+
+
+@pytest.fixture
+def client(store):
+    app = FastAPI()
+    app.add_middleware(UploadSizeLimitMiddleware, max_bytes=LIMIT, path_prefix="/api/applications/")
+    app.state.handled = 0
+
+    @app.post("/api/applications/submit")
+    async def submit(cv_file: UploadFile = File(...)):
+        app.state.handled += 1
+        try:
+            stored = await save_upload(cv_file, store, ext=".pdf", max_bytes=LIMIT // 2)
+        except UploadTooLarge as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        return {"key": stored.key, "size": stored.size}
+
+    test_client = TestClient(app)
+    test_client.app_state = app.state
+    return test_client
+
+
+def multipart(size: int):
+    boundary = "neat-test-boundary"
+    body = (
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="cv_file"; filename="cv.pdf"\r\n'
+        "Content-Type: application/pdf\r\n\r\n"
+    ).encode() + b"%" * size + f"\r\n--{boundary}--\r\n".encode()
+    return body, {"content-type": f"multipart/form-data; boundary={boundary}"}
+
+
+def chunked(body: bytes, chunk_size: int = 8 * 1024):
+    for i in range(0, len(body), chunk_size):
+        yield body[i:i + chunk_size]
+
+
+def test_small_upload_is_stored(client, store):
+    body, headers = multipart(1000)
+    response = client.post("/api/applications/submit", content=body, headers=headers)
+
+    assert response.status_code == 200
+    assert response.json()["size"] == 1000
+    assert response.json()["key"].endswith(".pdf")
+
+
+def test_content_length_over_limit_rejected_before_handler(client):
+    body, headers = multipart(LIMIT * 2)
+    response = client.post("/api/applications/submit", content=body, headers=headers)
+
+    assert response.status_code == 413
+    assert client.app_state.handled == 0
+
+
+def test_chunked_upload_over_limit_rejected_while_receiving(client):
+    body, headers = multipart(LIMIT * 4)
+    # Un generador hace que httpx envíe Transfer-Encoding: chunked, sin Content-Length
+    response = client.post("/api/applications/submit", content=chunked(body), headers=headers)
+
+    assert response.status_code == 413
+    assert "excede" in response.json()["detail"]
+    assert client.app_state.handled == 0
+
+
+def test_file_over_store_limit_leaves_nothing(client, store, tmp_path):
+    # El body pasa el middleware pero el archivo excede el límite de save_upload
+    body, headers = multipart(LIMIT // 2 + 1)
+    response = client.post("/api/applications/submit", content=body, headers=headers)
+
+    assert response.status_code == 413
+    assert [p for p in tmp_path.rglob("*") if p.is_file()] == []
+
+
+def test_other_routes_are_not_limited(store):
+    app = FastAPI()
+    app.add_middleware(UploadSizeLimitMiddleware, max_bytes=10)
+
+    @app.post("/api/candidates/")
+    async def create(payload: dict):
+        return {"n": len(payload["x"])}
+
+    response = TestClient(app).post("/api/candidates/", json={"x": "a" * 100})
+    assert response.status_code == 200
@@ -0,0 +1,50 @@
+"""
+Caché de usuarios del login: vida corta, para que los cambios hechos
+directamente en Airtable (desactivar, cambiar contraseña) se vean pronto.
+"""
+
+import asyncio
+
+import httpx
+
+from api.services.users import UserCache
+
+
+def test_default_ttl_is_short(monkeypatch):
+    monkeypatch.delenv("USER_CACHE_TTL", raising=False)
+    assert UserCache.from_env().ttl <= 10
+
+
+def test_change_in_airtable_seen_after_ttl(airtable_stub, stub_table):
+    from load_test import STUB_BASE_ID
+
+    from api.services.airtable import AirtableConfig, AirtableService, close_shared_client
+
+    user_id = stub_table("Usuarios", {
+        "email": "cache@example.com", "nombre_completo": "Cache", "rol": "admin",
+        "activo": True, "password_hash": "a" * 64
+    })
+    cache = UserCache(ttl=0.2)
+
+    async def scenario():
+        airtable = AirtableService(AirtableConfig.from_env())
+        try:
+            return await login_reads(airtable)
+        finally:
+            await close_shared_client()
+
+    async def login_reads(airtable):
+        first = await cache.get_by_email(airtable, "cache@example.com")
+        # Desactivado directamente en Airtable (sin pasar por la API)
+        async with httpx.AsyncClient() as stub:
+            await stub.patch(f"{airtable_stub}/v0/{STUB_BASE_ID}/Usuarios/{user_id}",
+                             json={"fields": {"activo": False}})
+        cached = await cache.get_by_email(airtable, "cache@example.com")
+        await asyncio.sleep(0.3)
+        return first, cached, await cache.get_by_email(airtable, "cache@example.com")
+
+    first, cached, refreshed = asyncio.run(scenario())
+
+    assert first["activo"] and cached["activo"]
+    assert refreshed["activo"] is False
+    assert (cache.hits, cache.misses) == (1, 2)
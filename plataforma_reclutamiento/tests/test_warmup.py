@@ -0,0 +1,72 @@
+"""
+Warm-up: el paso `engine` compila el evaluador de la config activa de
+Config_Evaluacion, el mismo que después usa `get_evaluator`.
+"""
+
+import asyncio
+
+import pytest
+
+from engine import EvaluationConfig
+
+
+@pytest.fixture
+def fresh_services(airtable_stub):
+    from api.services.airtable import reference_cache
+    from api.services.container import services
+
+    services.reset()
+    reference_cache.clear()
+    yield services
+    services.reset()
+    reference_cache.clear()
+
+
+def active_config_body() -> dict:
+    """Body como lo guarda POST /api/config/ (`str(config_data)`)."""
+    config = EvaluationConfig.default_config().model_dump()
+    config["version"] = "2.5-test"
+    return {"version": "2.5-test", "nombre": "Test", "is_active": True, "config": config}
+
+
+def run_engine_step():
+    from api.services.warmup import WarmUp
+
+    warmup = WarmUp(["airtable", "engine"], timeout=30)
+    asyncio.run(warmup.run())
+    return warmup.results
+
+
+def test_engine_step_compiles_active_config(stub_table, fresh_services):
+    record_id = stub_table("Config_Evaluacion", {
+        "version": "2.5-test", "nombre": "Test", "is_active": True,
+        "config_json": str(active_config_body())
+    })
+
+    results = run_engine_step()
+
+    assert results["engine"]["ok"], results["engine"]
+    assert results["engine"]["config"] == record_id
+    assert results["engine"]["config_version"] == "2.5-test"
+
+    # El request ya encuentra el evaluador compilado (sin recompilar)
+    warmed = fresh_services._active[1]
+    assert asyncio.run(fresh_services.active_evaluator()) is warmed
+    assert warmed.config.version == "2.5-test"
+
+
+def test_engine_step_falls_back_to_default(stub_table, fresh_services):
+    stub_table("Config_Evaluacion", {"version": "rota", "is_active": True, "config_json": "{no es json"})
+
+    results = run_engine_step()
+
+    assert results["engine"]["ok"], results["engine"]
+    assert results["engine"]["config_version"] == EvaluationConfig.default_config().version
+    assert asyncio.run(fresh_services.active_evaluator()) is fresh_services.evaluator()
+
+
+def test_without_active_config_uses_default(fresh_services):
+    results = run_engine_step()
+
+    assert results["engine"]["config"] == "default"
+    assert asyncio.run(fresh_services.active_evaluator()) is fresh_services.evaluator()